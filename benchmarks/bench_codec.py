@@ -0,0 +1,114 @@
+"""
+JSON 코덱 및 envelope 직렬화 벤치마크
+
+기존 saveToJsonl 방식(항목마다 envelope 딕셔너리 생성 + utcnow + json.dumps + f.write)과
+코덱 기반 배치 방식(페이지당 envelope 접두어 1회 + 항목만 인코딩 + 1회 write)을 비교합니다.
+
+사용법:
+  python benchmarks/bench_codec.py [--items 5000] [--repeat 5]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.codec import JsonCodec, orjson
+
+
+def makePage(itemCount: int) -> dict:
+  """ioc/common 형태의 합성 페이지 생성"""
+  items = []
+  for n in range(itemCount):
+    items.append({
+      'id': f"{n:040x}",
+      'type': 'ip',
+      'dateFirstSeen': '2025-01-31T10:30:45+00:00',
+      'dateLastSeen': '2025-02-01T08:00:00+00:00',
+      'indicators': [{'params': {'ipv4': f"10.{n % 256}.{(n // 256) % 256}.{n % 7}"}}],
+      'malwareList': [{'name': 'Agent Tesla', 'id': 'a1b2c3'}],
+      'threatList': [],
+      'evaluation': {'reliability': 90, 'credibility': 80, 'admiraltyCode': 'A2', 'severity': 'red'},
+      'seqUpdate': 1699999999999 + n,
+      'description': '악성 C2 서버로 확인된 IP 주소'
+    })
+  return {'count': itemCount, 'items': items, 'seqUpdate': 1699999999999 + itemCount}
+
+
+def legacyEncode(f, endpoint: str, items: list, seqUpdate: int) -> None:
+  """기존 saveToJsonl의 항목별 직렬화"""
+  for item in items:
+    record = {
+      'timestamp': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z',
+      'source': 'groupib-api',
+      'endpoint': endpoint,
+      'seqUpdate': seqUpdate,
+      'data': item
+    }
+    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def batchedEncode(f, codec: JsonCodec, endpoint: str, items: list, seqUpdate: int) -> None:
+  """코덱 기반 배치 직렬화"""
+  prefix = codec.buildEnvelopePrefix({
+    'timestamp': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z',
+    'source': 'groupib-api',
+    'endpoint': endpoint,
+    'seqUpdate': seqUpdate
+  })
+  f.write(''.join([prefix + codec.dumps(item) + '}\n' for item in items]))
+
+
+def timeIt(func, repeat: int) -> float:
+  """최소 실행 시간(초)"""
+  best = float('inf')
+  for _ in range(repeat):
+    startTime = time.perf_counter()
+    func()
+    best = min(best, time.perf_counter() - startTime)
+  return best
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument('--items', type=int, default=5000, help='페이지당 항목 수')
+  parser.add_argument('--repeat', type=int, default=5, help='반복 횟수 (최소값 사용)')
+  args = parser.parse_args()
+
+  endpoint = '/api/v2/ioc/common/updated'
+  page = makePage(args.items)
+  body = json.dumps(page).encode('utf-8')
+
+  codecNames = ['stdlib'] + (['orjson'] if orjson is not None else [])
+  results = []
+
+  with open(os.devnull, 'w', encoding='utf-8') as f:
+    # 응답 디코딩
+    results.append(('decode  json.loads (기존)', timeIt(lambda: json.loads(body), args.repeat)))
+    for name in codecNames:
+      codec = JsonCodec(name)
+      results.append((f"decode  codec={name}", timeIt(lambda: codec.loads(body), args.repeat)))
+
+    # 레코드 인코딩
+    results.append(('encode  항목별 envelope (기존)',
+                    timeIt(lambda: legacyEncode(f, endpoint, page['items'], page['seqUpdate']), args.repeat)))
+    for name in codecNames:
+      codec = JsonCodec(name)
+      results.append((f"encode  배치 envelope codec={name}",
+                      timeIt(lambda: batchedEncode(f, codec, endpoint, page['items'], page['seqUpdate']),
+                             args.repeat)))
+
+  print(f"페이지: {args.items}건, {len(body) / 1024 / 1024:.1f} MB")
+  baseline = {'decode': results[0][1], 'encode': results[len(codecNames) + 1][1]}
+  for label, seconds in results:
+    kind = label.split()[0]
+    print(f"  {label:<36} {seconds * 1000:8.1f} ms  {args.items / seconds:>10,.0f} items/s  "
+          f"x{baseline[kind] / seconds:.2f}")
+
+
+if __name__ == '__main__':
+  main()
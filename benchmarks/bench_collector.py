@@ -0,0 +1,269 @@
+"""
+수집기 종단 간 벤치마크
+
+로컬 모의 서버(mock_server.py)를 별도 프로세스로 띄우고 GroupIBCollector.collectAllEndpoints를
+실행하여 다음을 측정합니다.
+- records/s, 전송 bytes/s (압축 전송 기준), 사이클 소요 시간 (PDF 다운로드 완료 포함)
+- 수집기 프로세스 최대 RSS
+- 엔드포인트별 페이지 지연 백분위 (p50/p90/p99, 요청 + 파싱 + 저장)
+
+환경 변수(COLLECTION_ENGINE, STREAMING_PARSE, JSON_CODEC 등)는 그대로 수집기에 적용되므로
+설정별로 실행하여 비교합니다. --save/--compare로 결과를 JSON으로 남기고 이전 결과와 비교할 수 있습니다.
+
+사용법:
+  python benchmarks/bench_collector.py [--endpoints 4] [--backlog 20000] [--limit 500]
+  python benchmarks/bench_collector.py --latency 0.05 --error-429 0.02 --save before.json
+  COLLECTION_ENGINE=async python benchmarks/bench_collector.py --compare before.json
+
+  # 실제 API 응답 녹화 후 오프라인 재생 (list.csv 엔드포인트 사용)
+  python benchmarks/bench_collector.py --record cassette/ --upstream https://tap.group-ib.com
+  python benchmarks/bench_collector.py --replay cassette/
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import multiprocessing
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+try:
+  import resource
+except ImportError:  # Windows
+  resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_server import MockGroupIBServer, defaultEndpoints
+
+
+def serveMock(options: Dict[str, Any], ready: Any) -> None:
+  """모의 서버 프로세스 진입점 (기본 URL과 엔드포인트 경로를 ready 큐로 전달)"""
+  endpoints = defaultEndpoints(options.pop('endpointCount'), options.pop('backlog'),
+                               options.pop('pdfRatio'))
+  server = MockGroupIBServer(endpoints, **options)
+  ready.put((server.baseUrl, sorted(server.endpoints)))
+  server.httpd.serve_forever()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+  """최근접 순위 백분위"""
+  if not values:
+    return 0.0
+  ordered = sorted(values)
+  index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+  return ordered[index]
+
+
+def peakRss() -> Optional[int]:
+  """현재 프로세스 최대 RSS(바이트), 측정할 수 없으면 None"""
+  if resource is None:
+    return None
+  usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  return usage if sys.platform == 'darwin' else usage * 1024
+
+
+def runCollector(baseUrl: str, endpointConfigs: List[Dict[str, Any]], cycles: int,
+                 workDir: str, verbose: bool = False) -> Dict[str, Any]:
+  """수집기를 모의 서버에 연결하여 cycles번 수집
+
+  Args:
+    baseUrl: 모의 서버 기본 URL
+    endpointConfigs: 수집할 엔드포인트 설정 (loadEndpoints 형식)
+    cycles: 수집 사이클 수
+    workDir: 출력/PDF/seqUpdate 파일을 만들 임시 디렉토리
+    verbose: 수집기 INFO 로그 출력 여부
+
+  Returns:
+    결과 딕셔너리
+  """
+  from src.collector import GroupIBCollector
+
+  collector = GroupIBCollector()
+  if not verbose:
+    collector.logger.setLevel(logging.WARNING)
+
+  collector.baseUrl = baseUrl
+  collector.dataDir = workDir
+  collector.outputsDir = os.path.join(workDir, 'outputs')
+  collector.pdfsDir = os.path.join(workDir, 'pdfs')
+  collector.seqUpdateFile = os.path.join(workDir, 'seq_update.json')
+  collector.dedupDir = os.path.join(workDir, 'dedup')
+  os.makedirs(collector.outputsDir, exist_ok=True)
+  os.makedirs(collector.pdfsDir, exist_ok=True)
+  collector.endpoints = endpointConfigs
+
+  # 페이지 지연 및 수집 건수 계측 (엔진과 무관하게 인스턴스 메서드를 감쌈)
+  pageLatencies: Dict[str, List[float]] = {}
+  recordCounts: Dict[str, int] = {}
+  collectPage = collector.collectPage
+  collectSingleEndpoint = collector.collectSingleEndpoint
+
+  def timedCollectPage(url, endpoint, params):
+    startTime = time.perf_counter()
+    result = collectPage(url, endpoint, params)
+    pageLatencies.setdefault(endpoint, []).append(time.perf_counter() - startTime)
+    return result
+
+  def countedCollectSingleEndpoint(endpointConfig, seqUpdates):
+    success, count = collectSingleEndpoint(endpointConfig, seqUpdates)
+    endpoint = endpointConfig['endpoint']
+    recordCounts[endpoint] = recordCounts.get(endpoint, 0) + count
+    return success, count
+
+  collector.collectPage = timedCollectPage
+  collector.collectSingleEndpoint = countedCollectSingleEndpoint
+
+  cycleDurations = []
+  try:
+    for _ in range(cycles):
+      startTime = time.perf_counter()
+      seqUpdates = collector.collectAllEndpoints()
+      collector.saveSeqUpdate(seqUpdates)
+      if collector.pdfPool is not None:
+        collector.pdfPool.join()
+      cycleDurations.append(time.perf_counter() - startTime)
+  finally:
+    collector.close()
+
+  totalSeconds = sum(cycleDurations)
+  totalRecords = sum(recordCounts.values())
+  transportStats = collector.transport.getStats()
+  outputBytes = sum(os.path.getsize(os.path.join(collector.outputsDir, name))
+                    for name in os.listdir(collector.outputsDir) if name.endswith('.jsonl'))
+
+  return {
+    'engine': collector.collectionEngine,
+    'streaming': collector.streamingParse,
+    'codec': collector.codec.name,
+    'cycles': cycles,
+    'records': totalRecords,
+    'seconds': totalSeconds,
+    'recordsPerSecond': totalRecords / totalSeconds if totalSeconds else 0.0,
+    'wireBytes': transportStats['bytes'],
+    'wireBytesPerSecond': transportStats['bytes'] / totalSeconds if totalSeconds else 0.0,
+    'outputBytes': outputBytes,
+    'requests': transportStats['requests'],
+    'newConnections': transportStats['newConnections'],
+    'cycleSeconds': cycleDurations,
+    'peakRssBytes': peakRss(),
+    'endpoints': {
+      endpoint: {
+        'pages': len(latencies),
+        'records': recordCounts.get(endpoint, 0),
+        'p50': percentile(latencies, 0.50),
+        'p90': percentile(latencies, 0.90),
+        'p99': percentile(latencies, 0.99)
+      }
+      for endpoint, latencies in sorted(pageLatencies.items())
+    }
+  }
+
+
+def printResult(result: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+  """결과 출력 (baseline이 있으면 변화율 표시)"""
+
+  def delta(key: str, higherIsBetter: bool = True) -> str:
+    if not baseline or not baseline.get(key) or not result.get(key):
+      return ''
+    ratio = result[key] / baseline[key]
+    better = ratio > 1 if higherIsBetter else ratio < 1
+    return f"  ({'▲' if better else '▼'} x{ratio:.2f})"
+
+  rss = result['peakRssBytes']
+  print(f"엔진: {result['engine']}, 스트리밍: {result['streaming']}, 코덱: {result['codec']}")
+  print(f"  레코드: {result['records']:,}건 / {result['cycles']}사이클, 요청 {result['requests']}건 "
+        f"(신규 연결 {result['newConnections']}건)")
+  print(f"  소요 시간: {result['seconds']:.2f}s{delta('seconds', higherIsBetter=False)}")
+  print(f"  처리량: {result['recordsPerSecond']:,.0f} records/s{delta('recordsPerSecond')}")
+  print(f"  전송: {result['wireBytesPerSecond'] / 1024 / 1024:.1f} MB/s "
+        f"(총 {result['wireBytes'] / 1024 / 1024:.1f} MB, 출력 {result['outputBytes'] / 1024 / 1024:.1f} MB)")
+  print(f"  최대 RSS: {rss / 1024 / 1024:.1f} MB{delta('peakRssBytes', higherIsBetter=False)}"
+        if rss else "  최대 RSS: 측정 불가")
+  print(f"  {'엔드포인트':<40} {'pages':>6} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8}")
+  for endpoint, stats in result['endpoints'].items():
+    print(f"  {endpoint:<40} {stats['pages']:>6} {stats['p50'] * 1000:>8.1f} "
+          f"{stats['p90'] * 1000:>8.1f} {stats['p99'] * 1000:>8.1f}")
+
+
+def main():
+  parser = argparse.ArgumentParser(description='수집기 종단 간 벤치마크')
+  parser.add_argument('--endpoints', type=int, default=4, help='합성 엔드포인트 수')
+  parser.add_argument('--backlog', type=int, default=20000, help='엔드포인트별 항목 수')
+  parser.add_argument('--limit', type=int, default=500, help='페이지 크기 (limit 파라미터)')
+  parser.add_argument('--pdf-ratio', type=float, default=0.0, help='PDF 링크를 가진 항목 비율')
+  parser.add_argument('--latency', type=float, default=0.0, help='서버 응답 지연(초)')
+  parser.add_argument('--jitter', type=float, default=0.0, help='무작위 추가 지연 범위(초)')
+  parser.add_argument('--error-429', type=float, default=0.0, help='429 응답 비율')
+  parser.add_argument('--error-5xx', type=float, default=0.0, help='503 응답 비율')
+  parser.add_argument('--cycles', type=int, default=1, help='수집 사이클 수')
+  parser.add_argument('--record', default=None, help='녹화 카세트 디렉토리 (list.csv 엔드포인트)')
+  parser.add_argument('--upstream', default=None, help='녹화 시 실제 API 기본 URL')
+  parser.add_argument('--replay', default=None, help='재생 카세트 디렉토리 (list.csv 엔드포인트)')
+  parser.add_argument('--save', default=None, help='결과를 JSON 파일로 저장')
+  parser.add_argument('--compare', default=None, help='이전 결과 JSON 파일과 비교')
+  parser.add_argument('--verbose', action='store_true', help='수집기 로그 출력')
+  args = parser.parse_args()
+
+  # 합성 부하에서는 drain 모드로 백로그를 끝까지 수집하고, 속도 제한은 서버 지연만 반영
+  os.environ.setdefault('GROUPIB_USERNAME', 'bench@example.com')
+  os.environ.setdefault('GROUPIB_API_KEY', 'bench')
+  os.environ.setdefault('RATE_LIMIT_WAIT', '0')
+  os.environ.setdefault('DRAIN_MODE', 'true')
+  os.environ.setdefault('DRAIN_MAX_PAGES', '1000000')
+  os.environ.setdefault('DRAIN_MAX_SECONDS', '86400')
+
+  options = {'endpointCount': args.endpoints, 'backlog': args.backlog, 'pdfRatio': args.pdf_ratio,
+             'latency': args.latency, 'jitter': args.jitter, 'error429Rate': args.error_429,
+             'error5xxRate': args.error_5xx, 'recordDir': args.record, 'replayDir': args.replay,
+             'upstream': args.upstream}
+
+  context = multiprocessing.get_context('spawn')
+  ready = context.Queue()
+  serverProcess = context.Process(target=serveMock, args=(options, ready), daemon=True)
+  serverProcess.start()
+  baseUrl, paths = ready.get(timeout=30)
+
+  workDir = tempfile.mkdtemp(prefix='groupib-bench-')
+  try:
+    if args.record or args.replay:
+      # 녹화/재생: list.csv 엔드포인트를 모의 서버로 보냄 (항상 빈 seqUpdate에서 시작하므로 요청 순서 동일)
+      from src.collector import GroupIBCollector
+      loader = GroupIBCollector()
+      loader.logger.setLevel(logging.WARNING)
+      endpointConfigs = loader.loadEndpoints()
+      loader.close()
+      for config in endpointConfigs:
+        config['url'] = baseUrl + urlparse(config['url']).path
+    else:
+      endpointConfigs = [{'url': baseUrl + path, 'endpoint': path,
+                          'params': {'limit': str(args.limit)},
+                          'maxPages': None, 'maxSeconds': None}
+                         for path in paths]
+
+    result = runCollector(baseUrl, endpointConfigs, args.cycles, workDir, args.verbose)
+  finally:
+    serverProcess.terminate()
+    serverProcess.join()
+    shutil.rmtree(workDir, ignore_errors=True)
+
+  baseline = None
+  if args.compare:
+    with open(args.compare, 'r', encoding='utf-8') as f:
+      baseline = json.load(f)
+
+  printResult(result, baseline)
+
+  if args.save:
+    with open(args.save, 'w', encoding='utf-8') as f:
+      json.dump(result, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+  main()
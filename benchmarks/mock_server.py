@@ -0,0 +1,379 @@
+"""
+로컬 Group-IB API 모의 서버
+
+/api/v2/.../updated 계약을 흉내 내는 HTTP 서버입니다. 벤치마크와 오프라인 비교에 사용합니다.
+- seqUpdate 페이징 (seqUpdate보다 큰 항목을 limit개씩 반환, 응답 seqUpdate는 마지막 항목 값)
+- items / data / results 응답 형태
+- file.portalLink PDF (Range 요청 지원)
+- 응답 지연(latency + jitter), 429(Retry-After)/5xx 오류 주입
+- gzip 응답 (Accept-Encoding: gzip인 경우)
+- 녹화(record): 실제 API로 프록시하면서 응답을 카세트 디렉토리에 저장
+- 재생(replay): 카세트에 저장된 응답만 반환 (오프라인 재현)
+
+사용법:
+  python benchmarks/mock_server.py [--port 8080] [--endpoints 4] [--backlog 20000]
+  python benchmarks/mock_server.py --record cassette/ --upstream https://tap.group-ib.com
+  python benchmarks/mock_server.py --replay cassette/
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+import requests
+
+
+SHAPES = ('items', 'data', 'results')
+
+# 합성 seqUpdate 시작값 (실제 API와 비슷한 13자리)
+SEQ_BASE = 1700000000000
+
+
+class MockEndpoint:
+  """모의 엔드포인트 설정"""
+
+  def __init__(self, path: str, backlog: int, shape: str = 'items', pdfRatio: float = 0.0,
+               itemPadding: int = 200):
+    """초기화 메서드
+
+    Args:
+      path: 엔드포인트 경로 (예: /api/v2/ioc/common/updated)
+      backlog: 전체 항목 수
+      shape: 데이터 필드 이름 ('items', 'data', 'results')
+      pdfRatio: file.portalLink를 가진 항목 비율 (0~1)
+      itemPadding: 항목 크기를 맞추기 위한 설명 필드 길이
+    """
+    if shape not in SHAPES:
+      raise ValueError(f"shape는 {SHAPES} 중 하나여야 합니다: {shape}")
+    self.path = path
+    self.backlog = backlog
+    self.shape = shape
+    self.pdfRatio = pdfRatio
+    self.itemPadding = itemPadding
+
+  def makeItem(self, n: int, baseUrl: str) -> Dict[str, Any]:
+    """n번째 합성 항목 (같은 n이면 항상 같은 내용)"""
+    itemId = hashlib.sha1(f"{self.path}:{n}".encode()).hexdigest()
+    item = {
+      'id': itemId,
+      'seqUpdate': SEQ_BASE + n + 1,
+      'type': 'ip',
+      'dateFirstSeen': '2025-01-31T10:30:45+00:00',
+      'indicators': [{'params': {'ipv4': f"10.{n % 256}.{(n // 256) % 256}.{n % 7}"}}],
+      'evaluation': {'reliability': 90, 'credibility': 80, 'admiraltyCode': 'A2'},
+      'description': '합성 위협 정보 ' + 'x' * self.itemPadding
+    }
+    if self.pdfRatio and (n * 2654435761 % 1000) < self.pdfRatio * 1000:
+      item['file'] = {'portalLink': f"{baseUrl}/pdf{self.path}/{itemId}", 'name': f"{itemId}.pdf"}
+    return item
+
+  def page(self, afterSeq: Optional[int], limit: int, baseUrl: str) -> Dict[str, Any]:
+    """seqUpdate 이후 limit개 항목 페이지"""
+    start = 0 if afterSeq is None else max(0, afterSeq - SEQ_BASE)
+    end = min(self.backlog, start + limit)
+    items = [self.makeItem(n, baseUrl) for n in range(start, end)]
+    seqUpdate = items[-1]['seqUpdate'] if items else (afterSeq or SEQ_BASE)
+    return {'count': self.backlog, self.shape: items, 'seqUpdate': seqUpdate}
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+  """클라이언트가 연결을 먼저 끊은 경우(오류 응답 후 close 등)는 트레이스백을 출력하지 않음"""
+
+  daemon_threads = True
+
+  def handle_error(self, request, clientAddress):
+    if isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+      return
+    super().handle_error(request, clientAddress)
+
+
+def defaultEndpoints(count: int, backlog: int, pdfRatio: float = 0.0,
+                     itemPadding: int = 200) -> List[MockEndpoint]:
+  """items/data/results 형태를 번갈아 쓰는 엔드포인트 목록"""
+  return [MockEndpoint(f"/api/v2/bench/feed{n}/updated", backlog, SHAPES[n % len(SHAPES)],
+                       pdfRatio, itemPadding)
+          for n in range(count)]
+
+
+def cassetteKey(path: str, query: str) -> str:
+  """카세트 키 (쿼리 파라미터 순서와 무관)"""
+  return path + '?' + urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+
+
+class Cassette:
+  """녹화된 응답 저장소 (index.json + 응답별 gzip 본문 파일)
+
+  index.json의 upstream에 녹화한 API 기본 URL을 남겨 두고, 응답 본문 안의 해당 URL
+  (file.portalLink 등)은 재생 시 모의 서버 주소로 바꿔서 반환합니다.
+  """
+
+  def __init__(self, directory: str, upstream: Optional[str] = None):
+    self.directory = directory
+    self.indexFile = os.path.join(directory, 'index.json')
+    self._lock = threading.Lock()
+    os.makedirs(directory, exist_ok=True)
+    self.upstream = upstream
+    self.index: Dict[str, Dict[str, Any]] = {}
+    if os.path.exists(self.indexFile):
+      with open(self.indexFile, 'r', encoding='utf-8') as f:
+        saved = json.load(f)
+      self.index = saved.get('responses', {})
+      self.upstream = self.upstream or saved.get('upstream')
+
+  def get(self, key: str) -> Optional[Tuple[int, str, bytes]]:
+    """(상태 코드, Content-Type, 본문) 또는 None"""
+    entry = self.index.get(key)
+    if entry is None:
+      return None
+    with gzip.open(os.path.join(self.directory, entry['file']), 'rb') as f:
+      return entry['status'], entry['contentType'], f.read()
+
+  def put(self, key: str, status: int, contentType: str, body: bytes) -> None:
+    filename = hashlib.sha1(key.encode()).hexdigest() + '.gz'
+    with gzip.open(os.path.join(self.directory, filename), 'wb') as f:
+      f.write(body)
+    with self._lock:
+      self.index[key] = {'file': filename, 'status': status, 'contentType': contentType}
+      tempFile = self.indexFile + '.tmp'
+      with open(tempFile, 'w', encoding='utf-8') as f:
+        json.dump({'upstream': self.upstream, 'responses': self.index}, f, indent=2,
+                  ensure_ascii=False)
+      os.replace(tempFile, self.indexFile)
+
+
+class MockGroupIBServer:
+  """모의 API 서버 (별도 스레드에서 실행)
+
+  사용 예:
+    server = MockGroupIBServer(defaultEndpoints(4, 10000))
+    baseUrl = server.start()
+    ...
+    server.stop()
+  """
+
+  def __init__(self, endpoints: List[MockEndpoint], latency: float = 0.0, jitter: float = 0.0,
+               error429Rate: float = 0.0, error5xxRate: float = 0.0, retryAfter: int = 1,
+               pdfBytes: int = 200 * 1024, seed: int = 0, host: str = '127.0.0.1', port: int = 0,
+               recordDir: Optional[str] = None, replayDir: Optional[str] = None,
+               upstream: Optional[str] = None):
+    """초기화 메서드
+
+    Args:
+      endpoints: 합성 엔드포인트 목록 (재생/녹화 모드에서는 사용하지 않음)
+      latency: 응답마다 추가할 지연(초)
+      jitter: 추가 지연의 무작위 범위(초, 0~jitter)
+      error429Rate: 429 응답 비율 (0~1)
+      error5xxRate: 503 응답 비율 (0~1)
+      retryAfter: 429 응답의 Retry-After 값(초)
+      pdfBytes: PDF 응답 크기
+      seed: 지연/오류 주입 난수 시드 (같은 시드면 같은 순서)
+      host, port: 바인드 주소 (port=0이면 임의 포트)
+      recordDir: 녹화 카세트 디렉토리 (upstream으로 프록시하며 저장)
+      replayDir: 재생 카세트 디렉토리
+      upstream: 녹화 시 실제 API 기본 URL
+    """
+    if recordDir and not upstream:
+      raise ValueError("녹화 모드에는 upstream URL이 필요합니다.")
+
+    self.endpoints = {endpoint.path: endpoint for endpoint in endpoints}
+    self.latency = latency
+    self.jitter = jitter
+    self.error429Rate = error429Rate
+    self.error5xxRate = error5xxRate
+    self.retryAfter = retryAfter
+    self.pdfBytes = pdfBytes
+    self.upstream = upstream.rstrip('/') if upstream else None
+    self.recordCassette = Cassette(recordDir, self.upstream) if recordDir else None
+    self.replayCassette = Cassette(replayDir) if replayDir else None
+
+    self._random = random.Random(seed)
+    self._lock = threading.Lock()
+    self.stats: Dict[str, int] = {'requests': 0, 'bytes': 0}
+
+    self.httpd = _QuietHTTPServer((host, port), self._makeHandler())
+    self._thread: Optional[threading.Thread] = None
+
+  @property
+  def baseUrl(self) -> str:
+    host, port = self.httpd.server_address[:2]
+    return f"http://{host}:{port}"
+
+  def start(self) -> str:
+    """서버 시작
+
+    Returns:
+      기본 URL (예: http://127.0.0.1:54321)
+    """
+    self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+    self._thread.start()
+    return self.baseUrl
+
+  def stop(self) -> None:
+    """서버 종료"""
+    self.httpd.shutdown()
+    self.httpd.server_close()
+
+  def _count(self, key: str, amount: int = 1) -> None:
+    with self._lock:
+      self.stats[key] = self.stats.get(key, 0) + amount
+
+  def _draw(self) -> Tuple[float, Optional[int]]:
+    """(지연 시간, 주입할 오류 상태 코드 또는 None)"""
+    with self._lock:
+      delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+      roll = self._random.random()
+    if roll < self.error429Rate:
+      return delay, 429
+    if roll < self.error429Rate + self.error5xxRate:
+      return delay, 503
+    return delay, None
+
+  def _makeHandler(self):
+    server = self
+
+    class Handler(BaseHTTPRequestHandler):
+      protocol_version = 'HTTP/1.1'
+
+      def log_message(self, *args):
+        pass
+
+      def _send(self, status: int, body: bytes, contentType: str = 'application/json',
+                headers: Optional[Dict[str, str]] = None) -> None:
+        if (contentType == 'application/json' and len(body) > 1024
+            and 'gzip' in self.headers.get('Accept-Encoding', '')):
+          body = gzip.compress(body, compresslevel=1)
+          headers = dict(headers or {}, **{'Content-Encoding': 'gzip'})
+        self.send_response(status)
+        self.send_header('Content-Type', contentType)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+          self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        server._count('bytes', len(body))
+        server._count(f"status{status}")
+
+      def do_GET(self):
+        server._count('requests')
+        parsed = urlparse(self.path)
+
+        delay, injected = server._draw()
+        if delay:
+          time.sleep(delay)
+        if injected == 429:
+          return self._send(429, b'{"error": "rate limited"}',
+                            headers={'Retry-After': str(server.retryAfter)})
+        if injected:
+          return self._send(injected, b'{"error": "injected"}')
+
+        if server.replayCassette is not None:
+          return self._replay(parsed)
+        if server.recordCassette is not None:
+          return self._record(parsed)
+
+        if parsed.path == '/api/v2/user/granted_collections':
+          return self._send(200, json.dumps(sorted(server.endpoints)).encode())
+        if parsed.path.startswith('/pdf/'):
+          return self._sendPdf(parsed.path)
+
+        endpoint = server.endpoints.get(parsed.path)
+        if endpoint is None:
+          return self._send(404, b'{"error": "unknown endpoint"}')
+
+        query = dict(parse_qsl(parsed.query))
+        afterSeq = int(query['seqUpdate']) if 'seqUpdate' in query else None
+        limit = int(query.get('limit', 100))
+        host = self.headers.get('Host', '127.0.0.1')
+        body = json.dumps(endpoint.page(afterSeq, limit, f"http://{host}"), ensure_ascii=False)
+        self._send(200, body.encode('utf-8'))
+
+      def _sendPdf(self, path: str) -> None:
+        # 경로마다 같은 내용 (이어받기 검증용)
+        seed = hashlib.sha1(path.encode()).digest()
+        body = b'%PDF-1.4\n' + (seed * (server.pdfBytes // len(seed) + 1))[:max(0, server.pdfBytes - 9)]
+
+        rangeHeader = self.headers.get('Range', '')
+        if rangeHeader.startswith('bytes='):
+          start = int(rangeHeader[len('bytes='):].split('-')[0])
+          if start >= len(body):
+            return self._send(416, b'', 'application/pdf',
+                              {'Content-Range': f"bytes */{len(body)}"})
+          return self._send(206, body[start:], 'application/pdf',
+                            {'Content-Range': f"bytes {start}-{len(body) - 1}/{len(body)}"})
+        self._send(200, body, 'application/pdf')
+
+      def _localize(self, body: bytes, upstream: Optional[str]) -> bytes:
+        """본문의 upstream URL을 모의 서버 주소로 교체 (PDF 링크도 모의 서버를 거치도록)"""
+        if not upstream:
+          return body
+        host = self.headers.get('Host', '127.0.0.1')
+        return body.replace(upstream.encode(), f"http://{host}".encode())
+
+      def _replay(self, parsed) -> None:
+        cassette = server.replayCassette
+        entry = cassette.get(cassetteKey(parsed.path, parsed.query))
+        if entry is None:
+          return self._send(404, b'{"error": "not in cassette"}')
+        status, contentType, body = entry
+        if contentType == 'application/json':
+          body = self._localize(body, cassette.upstream)
+        self._send(status, body, contentType)
+
+      def _record(self, parsed) -> None:
+        headers = {name: value for name, value in self.headers.items()
+                   if name.lower() in ('authorization', 'accept', 'range')}
+        response = requests.get(server.upstream + parsed.path, params=parse_qsl(parsed.query),
+                                headers=headers, timeout=60)
+        contentType = response.headers.get('Content-Type', 'application/json').split(';')[0]
+        server.recordCassette.put(cassetteKey(parsed.path, parsed.query), response.status_code,
+                                  contentType, response.content)
+        body = response.content
+        if contentType == 'application/json':
+          body = self._localize(body, server.upstream)
+        self._send(response.status_code, body, contentType)
+
+    return Handler
+
+
+def main():
+  parser = argparse.ArgumentParser(description='로컬 Group-IB API 모의 서버')
+  parser.add_argument('--host', default='127.0.0.1')
+  parser.add_argument('--port', type=int, default=8080)
+  parser.add_argument('--endpoints', type=int, default=4, help='합성 엔드포인트 수')
+  parser.add_argument('--backlog', type=int, default=20000, help='엔드포인트별 항목 수')
+  parser.add_argument('--pdf-ratio', type=float, default=0.0, help='PDF 링크를 가진 항목 비율')
+  parser.add_argument('--latency', type=float, default=0.0, help='응답 지연(초)')
+  parser.add_argument('--jitter', type=float, default=0.0, help='무작위 추가 지연 범위(초)')
+  parser.add_argument('--error-429', type=float, default=0.0, help='429 응답 비율')
+  parser.add_argument('--error-5xx', type=float, default=0.0, help='503 응답 비율')
+  parser.add_argument('--record', default=None, help='녹화 카세트 디렉토리')
+  parser.add_argument('--upstream', default=None, help='녹화 시 실제 API 기본 URL')
+  parser.add_argument('--replay', default=None, help='재생 카세트 디렉토리')
+  args = parser.parse_args()
+
+  server = MockGroupIBServer(defaultEndpoints(args.endpoints, args.backlog, args.pdf_ratio),
+                             latency=args.latency, jitter=args.jitter,
+                             error429Rate=args.error_429, error5xxRate=args.error_5xx,
+                             host=args.host, port=args.port, recordDir=args.record,
+                             replayDir=args.replay, upstream=args.upstream)
+  print(f"모의 서버 실행 중: {server.baseUrl} (Ctrl+C로 종료)")
+  for path in server.endpoints:
+    print(f"  {server.baseUrl}{path}")
+  try:
+    server.httpd.serve_forever()
+  except KeyboardInterrupt:
+    server.httpd.server_close()
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+  main()
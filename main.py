@@ -2,35 +2,59 @@
 Group-IB API 크롤러 - 메인 엔트리 포인트
 
 이 프로그램은 Group-IB Threat Intelligence API로부터 데이터를 수집합니다.
-- 30분 간격으로 반복 수집
+- 30분 간격으로 반복 수집 (ADAPTIVE_SCHEDULE=true이면 엔드포인트별 적응형 간격)
 - seqUpdate 메커니즘으로 증분 데이터만 수집
-- Ctrl+C로 정상 종료 가능
+- Ctrl+C 또는 SIGTERM으로 정상 종료 (진행 중인 페이지 기록과 커서 저장 후 종료)
 
 사용법:
-  python main.py
+  python main.py          # 수집 (기본)
+  python main.py --once   # 한 번만 수집하고 종료 (cron, Kubernetes Job)
+  python main.py --once --endpoints ioc/common,apt/  # 일부 엔드포인트만
+  python main.py scan     # 수집 데이터 중복/무결성 검사
+  python main.py export   # 새 레코드를 Parquet으로 증분 내보내기
+  python main.py ioc 1.2.3.4  # IOC 인덱스에서 지표 조회
+  python main.py backfill ioc/common --start 2015-01-01  # 기간 창 병렬 백필
 """
 
 import os
 import time
 import sys
+import argparse
+import importlib
 from dotenv import load_dotenv
 from src.collector import GroupIBCollector, AuthenticationError
+from src.config import Config
+from src.scheduler import DeadlineTicker
+from src.shutdown import GracefulShutdown
 
 # 환경 변수 로드
 load_dotenv()
 
 
-def main():
+# 하위 명령 → (모듈, 도움말)
+SUBCOMMANDS = {
+  'scan': ('src.scanner', '수집 데이터 중복/무결성 검사'),
+  'export': ('src.export', '새 레코드를 Parquet으로 증분 내보내기'),
+  'ioc': ('src.iocindex', 'IOC 인덱스에서 지표(IP, 도메인, URL, 해시) 조회'),
+  'backfill': ('src.backfill', '과거 데이터를 기간 창으로 나누어 병렬 백필'),
+}
+
+
+def main(endpointPatterns=None):
   """메인 함수
 
   1. Collector 초기화
   2. API 인증 확인
   3. 엔드포인트 로드
-  4. 무한 루프:
+  4. 종료 신호 처리기 등록 (SIGTERM/SIGINT)
+  5. 종료 요청 전까지 반복:
      - 모든 엔드포인트 수집
      - seqUpdate 저장
-     - 30분 대기
-  5. KeyboardInterrupt 처리 (Ctrl+C)
+     - 다음 사이클 시작 시각(시작 시각 + k × 30분)까지 대기
+  6. 종료 요청 시 커서 저장 후 종료, 두 번째 신호는 KeyboardInterrupt로 즉시 종료
+
+  Args:
+    endpointPatterns: 수집할 엔드포인트 경로에 포함될 문자열 목록 (None이면 전체)
   """
   try:
     # 1. Collector 초기화
@@ -43,39 +67,47 @@ def main():
 
     # 3. 엔드포인트 로드
     collector.loadEndpoints()
+    if endpointPatterns:
+      collector.selectEndpoints(endpointPatterns)
+
+    # 4. 종료 신호 처리 (SIGTERM/SIGINT: 진행 중인 페이지 기록 후 종료)
+    shutdown = GracefulShutdown(float(os.getenv('SHUTDOWN_GRACE_SECONDS', '30')),
+                                onStop=collector.requestStop, logger=collector.logger)
+    shutdown.install()
 
-    # 4. 무한 루프 (30분 간격 수집)
+    # 5. 무한 루프 (30분 주기 수집, 사이클 시작 시각 기준)
     cycleNumber = 0
     seqUpdates = {}  # 변수 초기화 (스코프 문제 해결)
+    ticker = DeadlineTicker(int(os.getenv('WAIT_MINUTES', '30')) * 60,
+                            os.getenv('MISSED_CYCLES', 'coalesce').lower())
 
-    while True:
+    while not shutdown.requested:
       cycleNumber += 1
 
       try:
+        # 적응형 스케줄: 수집 시각이 된 엔드포인트만 수집 (샤딩 모드에서는 리스를 보유한 엔드포인트 중)
+        scheduler = collector.getScheduler()
+        if scheduler is not None:
+          claimedEndpoints = collector.claimEndpoints()
+          dueEndpoints = scheduler.dueEndpoints(claimedEndpoints)
+          if dueEndpoints:
+            seqUpdates = collector.collectAllEndpoints(dueEndpoints)
+            collector.saveSeqUpdate(seqUpdates)
+          if not shutdown.requested:
+            waitForNextDue(collector, scheduler, shutdown, claimedEndpoints)
+          continue
+
         # 모든 엔드포인트 수집
         seqUpdates = collector.collectAllEndpoints()
 
         # seqUpdate 저장
         collector.saveSeqUpdate(seqUpdates)
 
-        # 대기 시간 설정 (환경 변수로 오버라이드 가능, 기본값: 30분)
-        waitMinutes = int(os.getenv('WAIT_MINUTES', '30'))
-        waitSeconds = waitMinutes * 60
-
-        collector.logger.info("")
-        collector.logger.info(f"다음 사이클까지 {waitMinutes}분 대기...")
-        collector.logger.info(f"(Ctrl+C를 눌러 종료할 수 있습니다)")
-        collector.logger.info("")
-
-        # 1분마다 로그 출력하며 대기
-        for minute in range(waitMinutes):
-          time.sleep(60)
-          remainingMinutes = waitMinutes - minute - 1
-          if remainingMinutes > 0:
-            collector.logger.info(f"  대기 중... (남은 시간: {remainingMinutes}분)")
+        if not shutdown.requested:
+          waitForNextCycle(collector, ticker, shutdown)
 
       except KeyboardInterrupt:
-        # Ctrl+C 입력 시 즉시 종료
+        # 두 번째 종료 신호(Ctrl+C) 입력 시 즉시 종료
         raise
 
       except AuthenticationError as e:
@@ -88,15 +120,31 @@ def main():
         # 예상치 못한 에러 발생 시 로그 남기고 1분 대기 후 재시도
         collector.logger.error(f"예상치 못한 에러 발생: {e}")
         collector.logger.error("1분 후 다시 시도합니다...")
-        time.sleep(60)
+        shutdown.wait(60)
+
+    # 6. 종료 신호에 따른 정상 종료 (진행 중이던 페이지는 collectAllEndpoints 안에서 기록 완료)
+    collector.logger.info("=" * 40)
+    collector.logger.info(f"종료 요청({shutdown.reason})에 따라 프로그램을 종료합니다.")
+    if collector.seqUpdates:
+      collector.logger.info("seqUpdate 최종 저장 중...")
+      collector.saveSeqUpdate(collector.seqUpdates)
+    collector.close(timeout=shutdown.remaining())
+    shutdown.finish()
+    collector.logger.info("프로그램을 정상 종료합니다.")
+    collector.logger.info("=" * 40)
+    sys.exit(0)
 
   except KeyboardInterrupt:
-    # 5. KeyboardInterrupt 처리 (Ctrl+C)
+    # 7. KeyboardInterrupt 처리 (종료 요청 중 두 번째 Ctrl+C 등 즉시 종료)
     print("\n")
     if 'collector' in locals():
       collector.logger.info("=" * 40)
       collector.logger.info("사용자가 프로그램 종료를 요청했습니다 (Ctrl+C)")
 
+      # 수집 도중 중단되었을 수 있으므로 collector가 갱신 중이던 딕셔너리를 우선 사용
+      if collector.seqUpdates:
+        seqUpdates = collector.seqUpdates
+
       # seqUpdate 최종 저장 (변수 존재 여부와 빈 딕셔너리 체크)
       if 'seqUpdates' in locals() and seqUpdates:
         collector.logger.info("seqUpdate 최종 저장 중...")
@@ -104,6 +152,9 @@ def main():
       else:
         collector.logger.info("저장할 seqUpdate 데이터가 없습니다.")
 
+      # 남은 PDF 다운로드 처리 후 연결 종료
+      collector.close()
+
       collector.logger.info("프로그램을 정상 종료합니다.")
       collector.logger.info("=" * 40)
     else:
@@ -129,5 +180,200 @@ def main():
     sys.exit(1)
 
 
+def sleepUntil(collector: GroupIBCollector, deadline: float, shutdown: GracefulShutdown) -> None:
+  """절대 시각(time.monotonic 기준)까지 대기 (1분마다 남은 시간 로그, 종료 요청 시 즉시 반환)
+
+  Args:
+    collector: GroupIBCollector 인스턴스
+    deadline: 대기를 마칠 시각
+    shutdown: GracefulShutdown 인스턴스
+  """
+  while True:
+    remaining = deadline - time.monotonic()
+    if remaining <= 0 or shutdown.wait(min(60, remaining)):
+      return
+    remaining = deadline - time.monotonic()
+    if remaining > 0:
+      collector.logger.info(f"  대기 중... (남은 시간: {remaining / 60:.1f}분)")
+
+
+def waitForNextCycle(collector: GroupIBCollector, ticker: DeadlineTicker,
+                     shutdown: GracefulShutdown) -> None:
+  """다음 사이클 시작 시각(시작 시각 + k × WAIT_MINUTES)까지 대기
+
+  Args:
+    collector: GroupIBCollector 인스턴스
+    ticker: DeadlineTicker 인스턴스
+    shutdown: GracefulShutdown 인스턴스
+  """
+  deadline, missedCycles = ticker.next()
+  if missedCycles:
+    collector.logger.warning(f"⚠ 수집 사이클이 주기보다 길어 {missedCycles}회분 일정을 건너뜁니다.")
+
+  waitSeconds = deadline - time.monotonic()
+  collector.logger.info("")
+  if waitSeconds <= 0:
+    collector.logger.info("수집 주기를 넘겨 바로 다음 사이클을 시작합니다.")
+    return
+  collector.logger.info(f"다음 사이클까지 {waitSeconds / 60:.1f}분 대기...")
+  collector.logger.info(f"(Ctrl+C 또는 SIGTERM으로 종료할 수 있습니다)")
+  collector.logger.info("")
+  sleepUntil(collector, deadline, shutdown)
+
+
+def waitForNextDue(collector: GroupIBCollector, scheduler, shutdown: GracefulShutdown,
+                   endpoints=None) -> None:
+  """가장 이른 다음 수집 시각까지 대기 (1분마다 남은 시간 로그)
+
+  샤딩 모드에서는 다른 워커의 만료된 리스를 빨리 넘겨받도록 최대 LEASE_TTL_SECONDS만 대기합니다.
+
+  Args:
+    collector: GroupIBCollector 인스턴스
+    scheduler: PollScheduler 인스턴스
+    shutdown: GracefulShutdown 인스턴스
+    endpoints: 대기 기준 엔드포인트 (None이면 전체)
+  """
+  if endpoints is None:
+    endpoints = collector.endpoints
+  waitSeconds = scheduler.secondsUntilNextDue(endpoints)
+  if collector.shardMode:
+    waitSeconds = min(waitSeconds, collector.leaseTtlSeconds)
+  if waitSeconds <= 0:
+    return
+
+  collector.logger.info("")
+  if endpoints:
+    nextEndpoint = min(endpoints, key=lambda ep: scheduler.nextDue(ep['endpoint']))
+    collector.logger.info(f"다음 수집까지 {waitSeconds / 60:.1f}분 대기... ({nextEndpoint['endpoint']})")
+  else:
+    collector.logger.info(f"보유한 엔드포인트가 없습니다. {waitSeconds / 60:.1f}분 후 다시 확인합니다.")
+  collector.logger.info(f"(Ctrl+C 또는 SIGTERM으로 종료할 수 있습니다)")
+  collector.logger.info("")
+  sleepUntil(collector, time.monotonic() + waitSeconds, shutdown)
+
+
+def runOnce(endpointPatterns=None) -> int:
+  """한 번만 수집하고 종료 (cron, Kubernetes Job 등 단발 실행용)
+
+  Args:
+    endpointPatterns: 수집할 엔드포인트 경로에 포함될 문자열 목록 (None이면 전체)
+
+  Returns:
+    종료 코드 (0: 모든 엔드포인트 성공, 1: 일부 엔드포인트 실패 또는 중단, 2: 인증/설정/저장 실패)
+  """
+  try:
+    collector = GroupIBCollector()
+  except ValueError as e:
+    print(f"✗ 초기화 실패: {e}")
+    return 2
+
+  shutdown = GracefulShutdown(float(os.getenv('SHUTDOWN_GRACE_SECONDS', '30')),
+                              onStop=collector.requestStop, logger=collector.logger)
+  shutdown.install()
+
+  try:
+    if not collector.authenticate():
+      collector.logger.error("API 인증에 실패했습니다. 프로그램을 종료합니다.")
+      return 2
+    collector.loadEndpoints()
+    if endpointPatterns:
+      collector.selectEndpoints(endpointPatterns)
+
+    seqUpdates = collector.collectAllEndpoints()
+    if not collector.saveSeqUpdate(seqUpdates):
+      return 2
+    if shutdown.requested:
+      collector.logger.warning(f"⚠ 종료 요청({shutdown.reason})으로 수집을 마치지 못했습니다.")
+      return 1
+    failed = [ep['endpoint'] for ep in collector.failedEndpoints]
+    if failed:
+      collector.logger.warning(f"⚠ {len(failed)}개 엔드포인트 수집 실패: {', '.join(failed)}")
+      return 1
+    return 0
+  except KeyboardInterrupt:
+    collector.logger.info("사용자가 프로그램 종료를 요청했습니다. 수집한 seqUpdate를 저장합니다.")
+    if collector.seqUpdates:
+      collector.saveSeqUpdate(collector.seqUpdates)
+    return 1
+  except AuthenticationError as e:
+    collector.logger.error(f"인증 실패: {e}")
+    return 2
+  except (OSError, ValueError) as e:
+    collector.logger.error(f"✗ 수집 실패: {e}")
+    return 2
+  finally:
+    collector.close(timeout=shutdown.remaining())
+    shutdown.finish()
+
+
+def runBackfill(args: argparse.Namespace) -> int:
+  """backfill 하위 명령 실행 (인증 및 엔드포인트 로드 후 백필)
+
+  Returns:
+    종료 코드 (0: 성공, 1: 일부 창 미완료, 2: 실패)
+  """
+  collector = GroupIBCollector()
+  try:
+    if not collector.authenticate():
+      collector.logger.error("API 인증에 실패했습니다. 프로그램을 종료합니다.")
+      return 2
+    collector.loadEndpoints()
+    from src import backfill
+    return backfill.runBackfill(args, collector)
+  except AuthenticationError as e:
+    collector.logger.error(f"인증 실패: {e}")
+    return 2
+  except KeyboardInterrupt:
+    collector.logger.info("백필을 중단합니다. 다시 실행하면 저장된 창 커서부터 이어서 수집합니다.")
+    return 1
+  finally:
+    collector.close()
+
+
+def parseArgs(argv=None) -> argparse.Namespace:
+  """명령행 인자 파싱
+
+  Args:
+    argv: 인자 리스트 (None이면 sys.argv)
+
+  Returns:
+    파싱된 인자 (command가 None이면 수집 실행)
+  """
+  parser = argparse.ArgumentParser(description='Group-IB API 크롤러')
+  parser.add_argument('--once', action='store_true',
+                      help='한 번만 수집하고 종료 (0: 성공, 1: 일부 엔드포인트 실패, 2: 인증/설정 실패)')
+  parser.add_argument('--endpoints', default=None,
+                      help='수집할 엔드포인트 (경로에 포함될 문자열, 쉼표 구분, 예: ioc/common,apt/)')
+  subparsers = parser.add_subparsers(dest='command')
+
+  # 하위 명령 모듈은 해당 명령이 인자에 있을 때만 가져옴 (수집 시작 시간 단축)
+  argv = sys.argv[1:] if argv is None else argv
+  for command, (moduleName, helpText) in SUBCOMMANDS.items():
+    subparser = subparsers.add_parser(command, help=helpText)
+    if command in argv:
+      importlib.import_module(moduleName).addArguments(subparser)
+
+  return parser.parse_args(argv)
+
+
 if __name__ == '__main__':
-  main()
+  args = parseArgs()
+  if args.command == 'scan':
+    from src import scanner
+    sys.exit(scanner.runScan(args, Config.OUTPUTS_DIR))
+  if args.command == 'export':
+    from src import export
+    sys.exit(export.runExport(args, Config.OUTPUTS_DIR, Config.EXPORT_DIR, Config.SEQ_UPDATE_FILE))
+  if args.command == 'ioc':
+    from src import iocindex
+    sys.exit(iocindex.runLookup(args, Config.IOC_INDEX_DIR, Config.OUTPUTS_DIR,
+                                Config.IOC_INDEX_ENDPOINTS))
+  if args.command == 'backfill':
+    sys.exit(runBackfill(args))
+
+  endpointPatterns = None
+  if args.endpoints:
+    endpointPatterns = [pattern.strip() for pattern in args.endpoints.split(',') if pattern.strip()]
+  if args.once:
+    sys.exit(runOnce(endpointPatterns))
+  main(endpointPatterns)
@@ -6,4 +6,4 @@ Group-IB 위협 인텔리전스 API로부터 데이터를 수집하는 크롤러
 
 __version__ = "0.1.0"
 __author__ = "GroupIB Crawler Development Team"
-__all__ = ["collector"]
+__all__ = ["collector", "engine", "ratelimit", "transport", "downloader", "streaming", "codec", "journal", "segments", "dedup", "scanner", "metrics", "scheduler", "pagesize", "export", "iocindex", "leases", "pipeline", "backfill", "shutdown", "sinks", "writer"]
@@ -0,0 +1,341 @@
+"""
+Group-IB 과거 데이터 병렬 백필 모듈
+
+새 엔드포인트를 추가하거나 seq_update.json을 잃은 경우, seqUpdate 0부터 한 페이지씩 순차로
+수집하면 ioc/common 같은 피드는 며칠이 걸립니다. 백필은 엔드포인트의 이력을 API 날짜 필터
+(date.from/date.to)로 기간 창(window)으로 나누어 여러 스레드에서 동시에 수집합니다.
+- 창마다 seqUpdate 페이징으로 끝까지 수집하여 스테이징 파일(data/backfill/<엔드포인트>/)에 기록
+- 창별 커서와 완료 여부는 state.json에 페이지마다 저장되어 중단 후 재실행하면 이어서 수집
+- 모든 창이 끝나면 스테이징 파일을 창 순서대로 수집기의 페이지 저장 경로(saveToJsonl)로 병합하고,
+  가장 큰 seqUpdate를 seq_update.json에 기록하여 이후 일반 증분 수집이 이어받음
+  (병합하는 레코드도 PDF 다운로드, 중복 제거/IOC 인덱스, 모든 출력 대상을 거침)
+
+사용법:
+  python main.py backfill ioc/common --start 2015-01-01 --window-days 30 --workers 4
+"""
+
+import os
+import json
+import argparse
+import threading
+import logging
+from datetime import date, datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .segments import closedSegmentCount
+
+
+def splitWindows(start: date, end: date, windowDays: int) -> List[Tuple[date, date]]:
+  """[start, end] 기간을 windowDays일 단위 창으로 분할 (양 끝 포함, 겹치지 않음)
+
+  Args:
+    start: 시작일
+    end: 종료일 (포함)
+    windowDays: 창 크기(일)
+
+  Returns:
+    (창 시작일, 창 종료일) 리스트 (오래된 순)
+  """
+  windowDays = max(1, windowDays)
+  windows = []
+  current = start
+  while current <= end:
+    windowEnd = min(end, current + timedelta(days=windowDays - 1))
+    windows.append((current, windowEnd))
+    current = windowEnd + timedelta(days=1)
+  return windows
+
+
+def stagingSize(path: str) -> int:
+  """파일 크기 (없으면 0)"""
+  return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+class BackfillRunner:
+  """엔드포인트 하나의 창 분할 병렬 백필"""
+
+  def __init__(self, collector: Any, endpointConfig: Dict[str, Any], start: date, end: date,
+               windowDays: int = 30, workers: int = 4, stagingDir: Optional[str] = None,
+               dateFromParam: str = 'date.from', dateToParam: str = 'date.to',
+               logger: Optional[logging.Logger] = None):
+    """초기화 메서드
+
+    Args:
+      collector: GroupIBCollector 인스턴스 (요청, 속도 제한, 출력 경로 공유)
+      endpointConfig: 엔드포인트 설정
+      start: 백필 시작일
+      end: 백필 종료일 (포함)
+      windowDays: 창 크기(일)
+      workers: 동시에 수집할 창 수
+      stagingDir: 스테이징 디렉토리 (None이면 data/backfill/<엔드포인트>)
+      dateFromParam: 시작일 쿼리 파라미터 이름
+      dateToParam: 종료일 쿼리 파라미터 이름
+      logger: 로거 (None이면 collector 로거)
+    """
+    self.collector = collector
+    self.endpointConfig = endpointConfig
+    self.endpoint = endpointConfig['endpoint']
+    self.workers = max(1, workers)
+    self.dateFromParam = dateFromParam
+    self.dateToParam = dateToParam
+    self.logger = logger or collector.logger
+
+    self.filename = collector.urlToFilename(self.endpoint)
+    self.stagingDir = stagingDir or os.path.join(collector.dataDir, 'backfill',
+                                                 os.path.splitext(self.filename)[0])
+    self.stateFile = os.path.join(self.stagingDir, 'state.json')
+    os.makedirs(self.stagingDir, exist_ok=True)
+
+    self._lock = threading.Lock()
+    self.state = self._loadState()
+    # 같은 스테이징 디렉토리에서 기간/창 크기를 바꿔 재실행하면 기존 창은 그대로 두고 새 창만 추가
+    for windowStart, windowEnd in splitWindows(start, end, windowDays):
+      key = f"{windowStart.isoformat()}_{windowEnd.isoformat()}"
+      self.state['windows'].setdefault(key, {
+        'from': windowStart.isoformat(), 'to': windowEnd.isoformat(),
+        'seqUpdate': 0, 'records': 0, 'done': False, 'merged': False
+      })
+    self._saveState()
+
+  def _loadState(self) -> Dict[str, Any]:
+    if os.path.exists(self.stateFile):
+      with open(self.stateFile, 'r', encoding='utf-8') as f:
+        return json.load(f)
+    return {'endpoint': self.endpoint, 'windows': {}, 'merging': None}
+
+  def _saveState(self) -> None:
+    # 여러 창 스레드가 같은 임시 파일을 쓰므로 교체까지 잠금 유지
+    with self._lock:
+      tempFile = self.stateFile + '.tmp'
+      with open(tempFile, 'w', encoding='utf-8') as f:
+        json.dump(self.state, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.flush()
+        os.fsync(f.fileno())
+      os.replace(tempFile, self.stateFile)
+
+  def _stagingFile(self, key: str) -> str:
+    return os.path.join(self.stagingDir, f"{key}.jsonl")
+
+  def _truncateStaging(self, key: str, window: Dict[str, Any]) -> None:
+    """마지막 저장된 커서 이후에 기록된 줄 제거 (재실행 시 중복 방지)"""
+    path = self._stagingFile(key)
+    size = window.get('bytes', 0)
+    if os.path.exists(path) and os.path.getsize(path) > size:
+      with open(path, 'r+b') as f:
+        f.truncate(size)
+
+  def crawlWindow(self, key: str) -> bool:
+    """창 하나를 seqUpdate 페이징으로 끝까지 수집 (저장된 커서부터 재개)
+
+    Returns:
+      창 수집을 완료했으면 True, 요청 실패로 중단했으면 False
+    """
+    collector = self.collector
+    window = self.state['windows'][key]
+    if window['done']:
+      return True
+    self._truncateStaging(key, window)
+
+    while True:
+      params = self.endpointConfig['params'].copy()
+      params[self.dateFromParam] = window['from']
+      params[self.dateToParam] = window['to']
+      if window['seqUpdate'] > 0:
+        params['seqUpdate'] = str(window['seqUpdate'])
+
+      response = collector.fetchApi(self.endpointConfig['url'], params)
+      if response is None:
+        self.logger.error(f"  ✗ 백필 창 수집 실패: {self.endpoint} [{key}]")
+        return False
+
+      dataList, seqUpdate = collector.extractDataAndSeqUpdate(response, self.endpoint)
+      if dataList:
+        prefix = collector.buildEnvelopePrefix(self.endpoint, seqUpdate)
+        lines = []
+        for item in dataList:
+          try:
+            lines.append(prefix + collector.codec.dumps(item) + '}\n')
+          except (TypeError, ValueError) as e:
+            self.logger.warning(f"  항목 JSON 직렬화 실패: {e}")
+        with open(self._stagingFile(key), 'a', encoding='utf-8') as f:
+          f.write(''.join(lines))
+          f.flush()
+          os.fsync(f.fileno())
+
+      finished = not dataList or seqUpdate == window['seqUpdate']
+      with self._lock:
+        window['records'] += len(dataList)
+        window['seqUpdate'] = max(window['seqUpdate'], seqUpdate)
+        window['bytes'] = stagingSize(self._stagingFile(key))
+        window['done'] = finished
+      self._saveState()
+
+      if finished:
+        self.logger.info(f"  ✓ 백필 창 완료: {self.endpoint} [{key}] {window['records']:,}건")
+        return True
+
+  def crawl(self) -> bool:
+    """완료되지 않은 창을 병렬 수집
+
+    Returns:
+      모든 창을 완료했으면 True
+    """
+    pending = sorted(key for key, window in self.state['windows'].items() if not window['done'])
+    self.logger.info(f"백필 시작: {self.endpoint} (창 {len(pending)}/{len(self.state['windows'])}개 남음, "
+                     f"동시 {self.workers}개)")
+    with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='backfill') as executor:
+      results = list(executor.map(self.crawlWindow, pending))
+    return all(results)
+
+  def merge(self) -> int:
+    """완료된 창의 스테이징 파일을 창 순서대로 수집기의 페이지 저장 경로로 병합
+
+    스테이징 파일의 페이지마다 saveToJsonl()을 호출하므로 일반 수집과 같이 PDF 다운로드를 예약하고,
+    중복 제거 인덱스로 이미 있는 레코드를 건너뛰며, 모든 출력 대상에 전달합니다.
+    창마다 추가 전 출력 파일 위치를 state.json에 기록하므로, 병합 중 중단되면 재실행 시
+    그 크기로 되돌린 뒤 다시 추가합니다 (같은 창이 두 번 추가되지 않음). 창을 추가한 뒤에는
+    출력 위치를 커서 저널에 기록하고 인덱스 항목을 반영하여, 수집기가 병합한 레코드를 커밋되지 않은
+    꼬리로 잘라내지 않게 합니다.
+
+    Returns:
+      이번에 병합한 레코드 수
+
+    Raises:
+      RuntimeError: 완료되지 않은 창이 있는 경우
+      OSError: 파일 쓰기, 출력 대상 전송 또는 커서 기록 실패
+    """
+    windows = self.state['windows']
+    if not all(window['done'] for window in windows.values()):
+      raise RuntimeError("완료되지 않은 백필 창이 있어 병합할 수 없습니다.")
+
+    collector = self.collector
+    outputFile = os.path.join(collector.outputsDir, self.filename)
+    seqUpdates = collector.loadSeqUpdate()
+    merging = self.state.get('merging')
+    if merging and not windows[merging['window']]['merged']:
+      if closedSegmentCount(collector.outputsDir, self.filename) != merging.get('segments', 0):
+        # 병합 도중 회전되어 일부가 닫힌 세그먼트에 있음 (되돌릴 수 없으므로 다시 추가)
+        self.logger.warning(f"⚠ 병합 도중 세그먼트가 회전되어 중단된 창의 레코드가 중복될 수 있습니다: "
+                            f"{self.endpoint} [{merging['window']}]")
+      elif os.path.exists(outputFile) and os.path.getsize(outputFile) > merging['offset']:
+        with open(outputFile, 'r+b') as f:
+          f.truncate(merging['offset'])
+
+    merged = 0
+    for key in sorted(windows):
+      window = windows[key]
+      if window['merged']:
+        continue
+      stagingFile = self._stagingFile(key)
+      collector.prepareOutputFile(self.filename)
+      self.state['merging'] = {'window': key, 'offset': stagingSize(outputFile),
+                               'segments': closedSegmentCount(collector.outputsDir, self.filename)}
+      self._saveState()
+
+      if os.path.exists(stagingFile):
+        for seqUpdate, items in self._iterStagedPages(stagingFile):
+          if not collector.saveToJsonl(self.endpoint, items, seqUpdate):
+            raise OSError(f"백필 창 병합 실패: {self.endpoint} [{key}]")
+      collector.syncSinks()
+      # 커서는 그대로 두고 출력 위치와 인덱스 항목만 커밋
+      if not collector.commitSeqUpdate(self.endpoint, seqUpdates, seqUpdates.get(self.endpoint, 0)):
+        raise OSError(f"백필 병합 위치 기록 실패: {self.endpoint} [{key}]")
+
+      window['merged'] = True
+      self.state['merging'] = None
+      self._saveState()
+      if os.path.exists(stagingFile):
+        os.remove(stagingFile)
+      merged += window['records']
+
+    return merged
+
+  def _iterStagedPages(self, path: str) -> Iterator[Tuple[int, List[Any]]]:
+    """스테이징 파일을 페이지 단위로 읽기 (같은 seqUpdate의 연속된 레코드가 한 페이지)
+
+    Yields:
+      (seqUpdate, 데이터 항목 리스트) 튜플
+    """
+    codec = self.collector.codec
+    pageSeqUpdate = None
+    items: List[Any] = []
+    with open(path, 'rb') as f:
+      for number, line in enumerate(f, 1):
+        try:
+          record = codec.loads(line)
+          seqUpdate = record['seqUpdate']
+          item = record['data']
+        except (ValueError, KeyError, TypeError) as e:
+          self.logger.warning(f"  ⚠ 손상된 스테이징 레코드 건너뜀: {path}:{number} - {e}")
+          continue
+        if items and seqUpdate != pageSeqUpdate:
+          yield pageSeqUpdate, items
+          items = []
+        pageSeqUpdate = seqUpdate
+        items.append(item)
+    if items:
+      yield pageSeqUpdate, items
+
+  def handOff(self) -> int:
+    """백필에서 도달한 가장 큰 seqUpdate를 seq_update.json에 기록 (기존 값보다 큰 경우만)
+
+    Returns:
+      일반 증분 수집이 이어받을 seqUpdate
+    """
+    highest = max((window['seqUpdate'] for window in self.state['windows'].values()), default=0)
+    seqUpdates = self.collector.loadSeqUpdate()
+    if highest > seqUpdates.get(self.endpoint, 0):
+      seqUpdates[self.endpoint] = highest
+      if not self.collector.saveSeqUpdate(seqUpdates):
+        raise OSError(f"seqUpdate 저장 실패: {self.collector.seqUpdateFile}")
+    return seqUpdates.get(self.endpoint, 0)
+
+
+def parseDate(value: str) -> date:
+  """YYYY-MM-DD 문자열을 날짜로 변환 (argparse type)"""
+  try:
+    return datetime.strptime(value, '%Y-%m-%d').date()
+  except ValueError:
+    raise argparse.ArgumentTypeError(f"날짜 형식은 YYYY-MM-DD여야 합니다: {value}")
+
+
+def addArguments(parser: argparse.ArgumentParser) -> None:
+  """backfill 하위 명령 인자 등록"""
+  parser.add_argument('endpoint', help='list.csv 엔드포인트 경로 (일부 문자열로 지정 가능, 예: ioc/common)')
+  parser.add_argument('--start', type=parseDate, required=True, help='백필 시작일 (YYYY-MM-DD)')
+  parser.add_argument('--end', type=parseDate, default=None, help='백필 종료일 (기본값: 오늘)')
+  parser.add_argument('--window-days', type=int, default=30, help='창 크기(일, 기본값: 30)')
+  parser.add_argument('--workers', type=int, default=4, help='동시에 수집할 창 수 (기본값: 4)')
+  parser.add_argument('--date-from-param', default='date.from', help='시작일 쿼리 파라미터 이름')
+  parser.add_argument('--date-to-param', default='date.to', help='종료일 쿼리 파라미터 이름')
+  parser.add_argument('--no-merge', action='store_true', help='창 수집만 하고 병합/커서 인계는 하지 않음')
+
+
+def runBackfill(args: argparse.Namespace, collector: Any) -> int:
+  """backfill 하위 명령 실행
+
+  Returns:
+    종료 코드 (0: 성공, 1: 일부 창 미완료, 2: 실패)
+  """
+  matches = [ep for ep in collector.endpoints if args.endpoint in ep['endpoint']]
+  if len(matches) != 1:
+    candidates = ', '.join(ep['endpoint'] for ep in matches) or '없음'
+    collector.logger.error(f"✗ 엔드포인트를 하나로 특정할 수 없습니다: {args.endpoint} (후보: {candidates})")
+    return 2
+
+  end = args.end or date.today()
+  try:
+    runner = BackfillRunner(collector, matches[0], args.start, end, args.window_days, args.workers,
+                            dateFromParam=args.date_from_param, dateToParam=args.date_to_param)
+    if not runner.crawl():
+      collector.logger.warning("⚠ 일부 백필 창을 완료하지 못했습니다. 다시 실행하면 이어서 수집합니다.")
+      return 1
+    if not args.no_merge:
+      records = runner.merge()
+      seqUpdate = runner.handOff()
+      collector.logger.info(f"✓ 백필 병합 완료: {runner.endpoint} ({records:,}건, seqUpdate {seqUpdate})")
+  except (OSError, ValueError, RuntimeError) as e:
+    collector.logger.error(f"✗ 백필 실패: {e}")
+    return 2
+  return 0
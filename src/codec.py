@@ -0,0 +1,120 @@
+"""
+Group-IB JSON 코덱 모듈
+
+더 빠른 JSON 라이브러리(orjson)가 설치되어 있으면 사용하고,
+없으면 표준 라이브러리 json으로 대체합니다.
+API 응답 디코딩과 JSONL 레코드 인코딩에 모두 사용됩니다.
+"""
+
+import json
+from typing import Any, Dict, Union
+
+# 선택 의존성, 처음 코덱을 만들 때 loadOrjson()으로 가져옴 (시작 시간 단축)
+orjson = None
+_orjsonLoaded = False
+
+
+def loadOrjson():
+  """orjson 모듈 반환
+
+  Returns:
+    orjson 모듈, 설치되지 않았으면 None
+  """
+  global orjson, _orjsonLoaded
+  if not _orjsonLoaded:
+    try:
+      import orjson as module
+    except ImportError:
+      module = None
+    orjson, _orjsonLoaded = module, True
+  return orjson
+
+
+class JsonCodec:
+  """JSON 인코딩/디코딩 코덱
+
+  orjson은 64비트를 넘는 정수나 문자열이 아닌 키를 처리하지 못하므로,
+  해당 값은 표준 라이브러리로 다시 처리합니다.
+  """
+
+  def __init__(self, name: str = 'auto'):
+    """초기화 메서드
+
+    Args:
+      name: 'auto'(orjson 설치 시 사용), 'orjson', 'stdlib'
+
+    Raises:
+      ValueError: 알 수 없는 코덱 이름이거나 orjson이 설치되지 않은 경우
+    """
+    name = name.lower()
+    if name == 'auto':
+      name = 'orjson' if loadOrjson() is not None else 'stdlib'
+
+    if name == 'orjson' and loadOrjson() is None:
+      raise ValueError("JSON_CODEC=orjson이지만 orjson 패키지가 설치되어 있지 않습니다.")
+    if name not in ('orjson', 'stdlib'):
+      raise ValueError(f"JSON_CODEC은 'auto', 'orjson', 'stdlib' 중 하나여야 합니다: {name}")
+
+    self.name = name
+
+    # 인코더별 구분자 (envelope 접두어를 직접 만들 때 사용)
+    if name == 'orjson':
+      self.itemSeparator, self.keySeparator = ',', ':'
+    else:
+      self.itemSeparator, self.keySeparator = ', ', ': '
+
+  def loads(self, data: Union[bytes, str]) -> Any:
+    """JSON 디코딩
+
+    Args:
+      data: JSON 바이트 또는 문자열
+
+    Returns:
+      디코딩된 값
+
+    Raises:
+      ValueError: JSON 형식 오류
+    """
+    if self.name == 'orjson':
+      try:
+        return orjson.loads(data)
+      except orjson.JSONDecodeError:
+        pass  # 64비트 초과 정수 등은 표준 라이브러리로 재시도
+    if isinstance(data, bytes):
+      data = data.decode('utf-8')
+    return json.loads(data)
+
+  def dumps(self, obj: Any) -> str:
+    """JSON 인코딩 (한 줄, 비 ASCII 문자 그대로 유지)
+
+    Args:
+      obj: 인코딩할 값
+
+    Returns:
+      JSON 문자열
+
+    Raises:
+      TypeError, ValueError: 직렬화할 수 없는 값
+    """
+    if self.name == 'orjson':
+      try:
+        return orjson.dumps(obj).decode('utf-8')
+      except TypeError:
+        pass  # orjson.JSONEncodeError는 TypeError의 하위 클래스
+    return json.dumps(obj, ensure_ascii=False)
+
+  def buildEnvelopePrefix(self, fields: Dict[str, Any]) -> str:
+    """envelope 공통 필드를 미리 직렬화한 접두어 생성
+
+    반환값 뒤에 항목 JSON과 '}'를 붙이면 'data'가 마지막 필드인 레코드가 됩니다.
+    페이지당 한 번만 호출하여 항목마다 envelope 딕셔너리를 만들지 않도록 합니다.
+
+    Args:
+      fields: data를 제외한 envelope 필드 (timestamp, source, endpoint, seqUpdate)
+
+    Returns:
+      '{"timestamp": ..., "seqUpdate": N, "data": ' 형태의 문자열
+    """
+    envelope = self.dumps(fields)
+    return envelope[:-1] + self.itemSeparator + '"data"' + self.keySeparator
+
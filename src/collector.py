@@ -6,19 +6,41 @@ seqUpdate 메커니즘을 활용하여 증분 데이터만 효율적으로 수
 """
 
 import os
+import csv
 import json
 import time
 import base64
 import logging
+import tempfile
+import threading
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional, Any, Callable
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple, Optional, Any, Callable
 from urllib.parse import urlparse
 from functools import wraps
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 import requests
-import pandas as pd
 from dotenv import load_dotenv
 
+from .ratelimit import AdaptiveRateLimiter, parseRetryAfter
+from .transport import HttpTransport
+from .downloader import PdfDownloadPool
+from .streaming import StreamingPageParser, splitResponse
+from .codec import JsonCodec
+from .journal import CursorJournal
+from .segments import SegmentStore, closedSegmentCount
+from .scheduler import PollScheduler
+from .pagesize import PageSizeTuner
+from .sinks import JsonlFileSink, Sink, SinkError, buildSinks, validateSpecs
+from .writer import JsonlWriter
+
+# 선택 기능 모듈(중복 제거, 샤딩, 파이프라인, IOC 인덱스, 메트릭)은 기능을 켤 때 가져옴
+if TYPE_CHECKING:
+  from .dedup import DedupIndex
+  from .leases import LeaseManager
+  from .pipeline import PagePipeline
+  from .iocindex import IocIndexWriter
+
 
 # ===== 예외 클래스 정의 =====
 
@@ -94,6 +116,21 @@ def retryOnError(maxAttempts: int = 3,
   return decorator
 
 
+class SpoolLines:
+  """스풀 파일의 항목 줄에 envelope를 붙여 읽는 줄 목록 (출력 대상마다 처음부터 다시 읽음)"""
+
+  def __init__(self, spool: Any, prefix: str, keep: List[bool]):
+    self.spool = spool
+    self.prefix = prefix
+    self.keep = keep
+
+  def __iter__(self):
+    self.spool.seek(0)
+    for line, kept in zip(self.spool, self.keep):
+      if kept:
+        yield self.prefix + line[:-1] + '}\n'
+
+
 # ===== Collector 클래스 =====
 
 class GroupIBCollector:
@@ -130,6 +167,130 @@ class GroupIBCollector:
     self.rateLimitWait = int(os.getenv('RATE_LIMIT_WAIT', '1'))
     self.maxRetries = int(os.getenv('MAX_RETRIES', '3'))
 
+    # Drain 모드 설정 (한 사이클에서 seqUpdate 백로그를 끝까지 수집)
+    self.drainMode = os.getenv('DRAIN_MODE', 'false').lower() == 'true'
+    self.drainMaxPages = int(os.getenv('DRAIN_MAX_PAGES', '50'))
+    self.drainMaxSeconds = float(os.getenv('DRAIN_MAX_SECONDS', '300'))
+
+    # 수집 엔진 설정 (sync: 순차 수집, async: asyncio 기반 동시 수집)
+    self.collectionEngine = os.getenv('COLLECTION_ENGINE', 'sync').lower()
+    if self.collectionEngine not in ('sync', 'async'):
+      raise ValueError(f"COLLECTION_ENGINE은 'sync' 또는 'async'여야 합니다: {self.collectionEngine}")
+    self.maxConcurrency = int(os.getenv('MAX_CONCURRENCY', '4'))
+
+    # PDF 백그라운드 다운로드 설정 (PDF_WORKERS=0이면 저장 중 인라인 다운로드)
+    self.pdfWorkers = int(os.getenv('PDF_WORKERS', '4'))
+    self.pdfQueueSize = int(os.getenv('PDF_QUEUE_SIZE', '1000'))
+    self.pdfChunkSize = int(os.getenv('PDF_CHUNK_SIZE', str(256 * 1024)))
+
+    # 스트리밍 파싱 설정 (응답을 전체 문서로 만들지 않고 항목 단위로 처리)
+    self.streamingParse = os.getenv('STREAMING_PARSE', 'false').lower() == 'true'
+    self.streamingChunkSize = int(os.getenv('STREAMING_CHUNK_SIZE', str(64 * 1024)))
+    self.streamingSpoolSize = int(os.getenv('STREAMING_SPOOL_SIZE', str(8 * 1024 * 1024)))
+
+    # JSON 코덱 (auto: orjson 설치 시 사용, 없으면 표준 라이브러리)
+    self.codec = JsonCodec(os.getenv('JSON_CODEC', 'auto'))
+
+    # seqUpdate 저널 설정 (페이지마다 커서를 추가 전용 저널에 기록)
+    self.cursorJournal = os.getenv('CURSOR_JOURNAL', 'true').lower() == 'true'
+    self.journalCompactEvery = int(os.getenv('JOURNAL_COMPACT_EVERY', '500'))
+    self.journalFsync = os.getenv('JOURNAL_FSYNC', 'true').lower() == 'true'
+    self._cursorStore = None
+
+    # 세그먼트 회전 설정 (크기/시간 기준으로 JSONL 파일을 닫고 압축)
+    self.segmentRotation = os.getenv('SEGMENT_ROTATION', 'false').lower() == 'true'
+    self.segmentMaxBytes = int(os.getenv('SEGMENT_MAX_BYTES', str(256 * 1024 * 1024)))
+    self.segmentMaxAgeHours = float(os.getenv('SEGMENT_MAX_AGE_HOURS', '24'))
+    self.segmentCompression = os.getenv('SEGMENT_COMPRESSION', 'auto')
+    self._segmentStore = None
+
+    # 수집 시점 중복 제거 인덱스 설정 (ID와 내용이 같은 재전달 레코드는 기록하지 않음)
+    self.dedupIndex = os.getenv('DEDUP_INDEX', 'false').lower() == 'true'
+    self.dedupRetentionDays = float(os.getenv('DEDUP_RETENTION_DAYS', '30'))
+    self.dedupMaxEntries = int(os.getenv('DEDUP_MAX_ENTRIES', '1000000'))
+    self._dedupStore = None
+
+    # 적응형 수집 스케줄 설정 (엔드포인트별 유입량 EWMA로 다음 수집 시각 결정)
+    self.adaptiveSchedule = os.getenv('ADAPTIVE_SCHEDULE', 'false').lower() == 'true'
+    self.scheduleMinMinutes = float(os.getenv('SCHEDULE_MIN_MINUTES', '5'))
+    self.scheduleMaxMinutes = float(os.getenv('SCHEDULE_MAX_MINUTES', '360'))
+    self.scheduleTargetItems = float(os.getenv('SCHEDULE_TARGET_ITEMS', '100'))
+    self.scheduleEwmaAlpha = float(os.getenv('SCHEDULE_EWMA_ALPHA', '0.3'))
+    self._scheduler = None
+
+    # 페이지 크기 자동 조정 설정 (목표 응답 시간/바이트에 맞춰 엔드포인트별 limit 조정)
+    self.pageSizeAutotune = os.getenv('PAGE_SIZE_AUTOTUNE', 'false').lower() == 'true'
+    self.pageSizeTargetSeconds = float(os.getenv('PAGE_SIZE_TARGET_SECONDS', '5'))
+    self.pageSizeTargetBytes = int(os.getenv('PAGE_SIZE_TARGET_BYTES', str(8 * 1024 * 1024)))
+    self.pageSizeMin = int(os.getenv('PAGE_SIZE_MIN', '10'))
+    self.pageSizeMax = int(os.getenv('PAGE_SIZE_MAX', '5000'))
+    self._pageSizeTuner = None
+    # 스레드별 마지막 페이지 응답 타이밍 (페이지 크기 조정용)
+    self._pageTiming = threading.local()
+
+    # IOC 조회 인덱스 설정 (지표 해시 → 엔드포인트/seqUpdate, python main.py ioc로 조회)
+    self.iocIndex = os.getenv('IOC_INDEX', 'false').lower() == 'true'
+    self.iocIndexEndpoints: List[str] = []
+    if self.iocIndex:
+      from .iocindex import DEFAULT_ENDPOINTS
+      self.iocIndexEndpoints = [pattern.strip() for pattern in
+                                os.getenv('IOC_INDEX_ENDPOINTS', ','.join(DEFAULT_ENDPOINTS)).split(',')
+                                if pattern.strip()]
+    self.iocIndexCompactEvery = int(os.getenv('IOC_INDEX_COMPACT_EVERY', '1000000'))
+    self._iocIndexWriter = None
+    # 커서 기록을 기다리는 페이지의 인덱스 항목 (엔드포인트 → [(파일명, 중복 키, seqUpdate, 지표 해시)])
+    self._deferredIndexes: Dict[str, List[Tuple[str, List[Tuple[str, bytes]], int, List[bytes]]]] = {}
+
+    # 샤딩 수집 설정 (여러 워커가 엔드포인트 리스를 나누어 갖고 커서를 리스에 기록)
+    self.shardMode = os.getenv('SHARD_MODE', 'false').lower() == 'true'
+    self.shardWorkerId = os.getenv('SHARD_WORKER_ID', '')
+    if self.shardMode:
+      from .leases import defaultWorkerId
+      self.shardWorkerId = self.shardWorkerId or defaultWorkerId()
+    self.leaseTtlSeconds = float(os.getenv('LEASE_TTL_SECONDS', '120'))
+    self._leaseManager = None
+    # 로드하거나 리스에 기록한 커서 (샤딩 모드에서 보유하지 않은 엔드포인트의 값이 저장된 값인지 판별)
+    self._savedCursors: Dict[str, int] = {}
+
+    # 파이프라인 설정 (요청/디코딩/기록 단계 분리, 디코딩과 직렬화는 프로세스 풀에서 실행)
+    self.pipelineMode = os.getenv('PIPELINE', 'false').lower() == 'true'
+    self.pipelineWorkers = int(os.getenv('PIPELINE_WORKERS', str(os.cpu_count() or 1)))
+    self.pipelineQueueSize = int(os.getenv('PIPELINE_QUEUE_SIZE', '8'))
+    self._pipeline = None
+
+    # 출력 대상 설정 (jsonl, stdout, unix:<경로>, http(s)://... 쉼표 구분, 모든 대상이 받은 뒤 커서 전진)
+    self.outputSinks = [spec.strip() for spec in os.getenv('OUTPUT_SINKS', 'jsonl').split(',')
+                        if spec.strip()]
+    self.sinkBatchSize = int(os.getenv('SINK_BATCH_SIZE', '500'))
+    self.sinkLingerMs = float(os.getenv('SINK_LINGER_MS', '200'))
+    self.sinkMaxBuffered = int(os.getenv('SINK_MAX_BUFFERED', '10000'))
+    self.sinkAckTimeout = float(os.getenv('SINK_ACK_TIMEOUT', '60'))
+    validateSpecs(self.outputSinks)
+    self._sinks = None
+    self._sinksOutputsDir = None
+
+    # JSONL 기록 설정 (엔드포인트별 핸들 캐시, 페이지당 write 한 번, fsync 정책 none/page/interval)
+    self.jsonlFsync = os.getenv('JSONL_FSYNC', 'none').lower()
+    self.jsonlFsyncInterval = float(os.getenv('JSONL_FSYNC_INTERVAL', '1.0'))
+    self.jsonlMaxHandles = int(os.getenv('JSONL_MAX_HANDLES', '64'))
+    if self.jsonlFsync not in JsonlWriter.DURABILITY:
+      raise ValueError(f"JSONL_FSYNC는 'none', 'page', 'interval' 중 하나여야 합니다: {self.jsonlFsync}")
+
+    # 메트릭 설정 (METRICS_PORT가 0이면 /metrics 서버를 띄우지 않음)
+    self.metricsPort = int(os.getenv('METRICS_PORT', '0'))
+    self.metricsHost = os.getenv('METRICS_HOST', '127.0.0.1')
+    from .metrics import CollectorMetrics
+    self.metrics = CollectorMetrics()
+    self.metricsServer = None
+
+    # 적응형 속도 제한 설정 (AIMD: 정상 응답마다 가산 증가, 429마다 승산 감소)
+    self.rateLimitAdaptive = os.getenv('RATE_LIMIT_ADAPTIVE', 'true').lower() == 'true'
+    self.rateLimitMaxRps = float(os.getenv('RATE_LIMIT_MAX_RPS', '10'))
+    self.rateLimitMinRps = float(os.getenv('RATE_LIMIT_MIN_RPS', '0.05'))
+    self.rateLimitIncrease = float(os.getenv('RATE_LIMIT_INCREASE', '0.05'))
+    self.rateLimitDecrease = float(os.getenv('RATE_LIMIT_DECREASE', '0.5'))
+    self.rateLimitMaxPause = float(os.getenv('RATE_LIMIT_MAX_PAUSE', '300'))
+
     # 경로 설정
     self.projectRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     self.dataDir = os.path.join(self.projectRoot, "data")
@@ -137,6 +298,16 @@ class GroupIBCollector:
     self.pdfsDir = os.path.join(self.dataDir, "pdfs")
     self.logsDir = os.path.join(self.projectRoot, "logs")
     self.seqUpdateFile = os.path.join(self.dataDir, "seq_update.json")
+    self.dedupDir = os.path.join(self.dataDir, "dedup")
+    # 샤딩 모드에서는 워커별 파일 (여러 워커가 같은 상태 파일을 잠금 없이 덮어쓰지 않도록)
+    stateSuffix = ''
+    if self.shardMode:
+      from .leases import leaseName
+      stateSuffix = f".{leaseName(self.shardWorkerId)}"
+    self.scheduleFile = os.path.join(self.dataDir, f"schedule{stateSuffix}.json")
+    self.pageSizeFile = os.path.join(self.dataDir, f"page_size{stateSuffix}.json")
+    self.iocIndexDir = os.path.join(self.dataDir, "ioc_index")
+    self.leaseDir = os.path.join(self.dataDir, "leases")
     self.csvFile = os.path.join(self.projectRoot, "list.csv")
 
     # 디렉토리 생성
@@ -145,15 +316,64 @@ class GroupIBCollector:
     os.makedirs(self.pdfsDir, exist_ok=True)
     os.makedirs(self.logsDir, exist_ok=True)
 
-    # 로거 설정
+    # 로거 설정 (_setupLogger가 핸들러를 구성하기 전에도 logger 속성은 항상 존재)
+    self.logger = logging.getLogger("GroupIBCollector")
     self._setupLogger()
 
+    # IOC 인덱스(delta.bin 병합, endpoints.json 번호)는 단일 프로세스 전용이므로 샤딩 모드에서는 끔
+    if self.shardMode and self.iocIndex:
+      self.logger.warning("⚠ 샤딩 모드에서는 IOC_INDEX를 사용할 수 없어 끕니다. "
+                          "주기적으로 python main.py ioc --rebuild를 실행하세요.")
+      self.iocIndex = False
+
+    # 모든 요청 경로(API, PDF)가 공유하는 속도 제한기
+    # 초기 간격은 RATE_LIMIT_WAIT초, RATE_LIMIT_ADAPTIVE=false이면 간격은 고정하고 Retry-After만 반영
+    self.rateLimiter = AdaptiveRateLimiter(
+      self.rateLimitWait,
+      maxRate=self.rateLimitMaxRps,
+      minRate=self.rateLimitMinRps,
+      increaseStep=self.rateLimitIncrease if self.rateLimitAdaptive else 0.0,
+      decreaseFactor=self.rateLimitDecrease if self.rateLimitAdaptive else 1.0,
+      maxPause=self.rateLimitMaxPause,
+      logger=self.logger
+    )
+
+    # HTTP 전송 객체 (커넥션 풀 크기는 수집 엔진의 동시 실행 수에 맞춤)
+    self._authHeaders = None
+    poolSize = self.maxConcurrency if self.collectionEngine == 'async' else 1
+    poolSize += max(0, self.pdfWorkers)
+    self.transport = HttpTransport(self.buildAuthHeader(), poolSize,
+                                   self.requestTimeout, self.logger)
+
+    # PDF 다운로드 워커 풀
+    self.pdfPool = None
+    if self.pdfWorkers > 0:
+      self.pdfPool = PdfDownloadPool(self.downloadPdf, self.pdfWorkers,
+                                     self.pdfQueueSize, self.logger)
+
+    # 메트릭 HTTP 엔드포인트
+    if self.metricsPort > 0:
+      from .metrics import MetricsServer
+      try:
+        self.metricsServer = MetricsServer(self.metrics, self.metricsHost, self.metricsPort)
+        self.metricsServer.start()
+        self.logger.info(f"✓ 메트릭 엔드포인트: http://{self.metricsHost}:{self.metricsServer.port}/metrics")
+      except OSError as e:
+        self.metricsServer = None
+        self.logger.warning(f"⚠ 메트릭 서버 시작 실패 (포트 {self.metricsPort}): {e}")
+
     # 엔드포인트 리스트 (나중에 load_endpoints()로 로드)
     self.endpoints = []
 
     # 실패한 엔드포인트 추적
     self.failedEndpoints = []
 
+    # 현재 사이클에서 갱신 중인 seqUpdate 딕셔너리 (중단 시 최종 저장용)
+    self.seqUpdates = {}
+
+    # 종료 요청 (설정되면 새 요청을 보내지 않고 진행 중인 페이지만 마무리)
+    self.stopEvent = threading.Event()
+
     self.logger.info("=" * 40)
     self.logger.info("Group-IB API 크롤러 초기화 완료")
     self.logger.info("=" * 40)
@@ -191,27 +411,32 @@ class GroupIBCollector:
     self.logger.addHandler(consoleHandler)
 
   def buildAuthHeader(self) -> Dict[str, str]:
-    """Basic Authentication 헤더 생성
+    """Basic Authentication 헤더 생성 (최초 1회 생성 후 캐시)
 
     Returns:
-      HTTP 헤더 딕셔너리 (Authorization, User-Agent, Accept)
+      HTTP 헤더 딕셔너리 (Authorization, User-Agent, Accept, Accept-Encoding)
     """
-    # username:api_key 형식으로 조합
-    authString = f"{self.username}:{self.apiKey}"
+    if self._authHeaders is None:
+      # username:api_key 형식으로 조합
+      authString = f"{self.username}:{self.apiKey}"
 
-    # ASCII로 인코딩 후 Base64 인코딩
-    authBytes = authString.encode("ascii")
-    authB64 = base64.b64encode(authBytes)
-    authB64Str = authB64.decode("ascii")
+      # ASCII로 인코딩 후 Base64 인코딩
+      authBytes = authString.encode("ascii")
+      authB64 = base64.b64encode(authBytes)
+      authB64Str = authB64.decode("ascii")
 
-    # Authorization 헤더 생성
-    authHeader = f"Basic {authB64Str}"
+      # Authorization 헤더 생성
+      authHeader = f"Basic {authB64Str}"
 
-    return {
-      "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36 Edg/108.0.1462.54",
-      "Authorization": authHeader,
-      "Accept": "*/*"
-    }
+      self._authHeaders = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36 Edg/108.0.1462.54",
+        "Authorization": authHeader,
+        "Accept": "*/*",
+        # 대용량 JSON 페이지는 반복이 많아 압축 효과가 큼
+        "Accept-Encoding": "gzip, deflate"
+      }
+
+    return dict(self._authHeaders)
 
   def authenticate(self) -> bool:
     """API 인증 확인
@@ -227,10 +452,9 @@ class GroupIBCollector:
     self.logger.info("API 인증 중...")
 
     authUrl = f"{self.baseUrl}/api/v2/user/granted_collections"
-    headers = self.buildAuthHeader()
 
     try:
-      response = requests.get(authUrl, headers=headers, timeout=self.requestTimeout)
+      response = self.transport.get(authUrl)
 
       if response.status_code == 200:
         self.logger.info("✓ API 인증 성공")
@@ -258,7 +482,13 @@ class GroupIBCollector:
         {
           'url': 'https://tap.group-ib.com/api/v2/apt/threat_actor/updated',
           'endpoint': '/api/v2/apt/threat_actor/updated',
-          'params': {'limit': '100'}
+          'params': {'limit': '100'},
+          'maxPages': None,      # 선택 컬럼 (drain 모드 페이지 상한)
+          'maxSeconds': None,    # 선택 컬럼 (drain 모드 시간 상한)
+          'minMinutes': None,    # 선택 컬럼 (적응형 스케줄 최소 간격)
+          'maxMinutes': None,    # 선택 컬럼 (적응형 스케줄 최대 간격)
+          'minLimit': None,      # 선택 컬럼 (페이지 크기 자동 조정 최소 limit)
+          'maxLimit': None       # 선택 컬럼 (페이지 크기 자동 조정 최대 limit)
         },
         ...
       ]
@@ -271,24 +501,32 @@ class GroupIBCollector:
       raise FileNotFoundError(f"list.csv 파일을 찾을 수 없습니다: {self.csvFile}")
 
     try:
-      # pandas로 CSV 읽기
-      df = pd.read_csv(self.csvFile)
+      # csv 모듈로 읽기 (20줄 남짓한 파일에 pandas를 불러오지 않아 단발 실행의 시작 시간/메모리 절약)
+      with open(self.csvFile, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        columns = [col.strip() for col in reader.fieldnames or []]
+        rows = list(reader)
+
+      if not columns:
+        raise ValueError("CSV 파일이 비어 있습니다.")
 
       # 필수 컬럼 검증
       requiredColumns = ['endpoint', 'params']
-      missingColumns = [col for col in requiredColumns if col not in df.columns]
+      missingColumns = [col for col in requiredColumns if col not in columns]
       if missingColumns:
         raise ValueError(f"CSV 파일에 필수 컬럼이 누락되었습니다: {', '.join(missingColumns)}")
 
       endpointsList = []
 
-      for index, row in df.iterrows():
+      for index, row in enumerate(rows):
         try:
-          url = row['endpoint']
-          paramsStr = row['params']
+          row = {(key or '').strip(): (value or '').strip() if isinstance(value, str) else value
+                 for key, value in row.items()}
+          url = row.get('endpoint')
+          paramsStr = row.get('params')
 
           # URL 검증
-          if pd.isna(url) or not isinstance(url, str):
+          if not url or not isinstance(url, str):
             self.logger.warning(f"라인 {index + 2}: URL이 유효하지 않습니다. 건너뜁니다.")
             continue
 
@@ -298,7 +536,7 @@ class GroupIBCollector:
 
           # 파라미터 파싱 (key=value 형식)
           params = {}
-          if pd.notna(paramsStr):
+          if paramsStr:
             for param in paramsStr.split('&'):
               if '=' in param:
                 key, value = param.split('=', 1)
@@ -307,7 +545,13 @@ class GroupIBCollector:
           endpointsList.append({
             'url': url,
             'endpoint': endpointPath,
-            'params': params
+            'params': params,
+            'maxPages': self._parseOptionalNumber(row, 'maxPages', int),
+            'maxSeconds': self._parseOptionalNumber(row, 'maxSeconds', float),
+            'minMinutes': self._parseOptionalNumber(row, 'minMinutes', float),
+            'maxMinutes': self._parseOptionalNumber(row, 'maxMinutes', float),
+            'minLimit': self._parseOptionalNumber(row, 'minLimit', int),
+            'maxLimit': self._parseOptionalNumber(row, 'maxLimit', int)
           })
 
         except Exception as e:
@@ -322,18 +566,249 @@ class GroupIBCollector:
 
       return endpointsList
 
-    except pd.errors.EmptyDataError:
-      raise ValueError("CSV 파일이 비어 있습니다.")
-    except pd.errors.ParserError as e:
+    except csv.Error as e:
       raise ValueError(f"CSV 파일 파싱 오류: {e}")
 
+  def selectEndpoints(self, patterns: List[str]) -> List[Dict[str, Any]]:
+    """로드한 엔드포인트 중 일부만 수집 대상으로 남김
+
+    Args:
+      patterns: 엔드포인트 경로에 포함될 문자열 목록 (예: ['ioc/common', 'apt/'])
+
+    Returns:
+      남은 엔드포인트 설정 리스트
+
+    Raises:
+      ValueError: 일치하는 엔드포인트가 없을 때
+    """
+    selected = [ep for ep in self.endpoints if any(pattern in ep['endpoint'] for pattern in patterns)]
+    if not selected:
+      raise ValueError(f"일치하는 엔드포인트가 없습니다: {', '.join(patterns)}")
+
+    self.endpoints = selected
+    self.logger.info(f"✓ {len(selected)}개 엔드포인트 선택: {', '.join(ep['endpoint'] for ep in selected)}")
+    return selected
+
+  def _parseOptionalNumber(self, row: Dict[str, Any], column: str,
+                          cast: Callable[[Any], Any]) -> Optional[Any]:
+    """CSV 행에서 선택 컬럼 값을 숫자로 변환
+
+    Args:
+      row: CSV 행 딕셔너리
+      column: 컬럼명
+      cast: 변환 함수 (int, float)
+
+    Returns:
+      변환된 값 또는 None (컬럼이 없거나 비어 있는 경우)
+    """
+    value = row.get(column)
+    if value is None or value == '':
+      return None
+    # 빈 칸이 섞인 정수 컬럼이 '5.0'으로 저장된 경우도 허용
+    return cast(float(value)) if cast is int else cast(value)
+
+  def getCursorStore(self) -> CursorJournal:
+    """seqUpdate 저널 저장소 반환 (seqUpdateFile 경로가 바뀌면 다시 생성)
+
+    Returns:
+      CursorJournal 인스턴스
+    """
+    if self._cursorStore is None or self._cursorStore.snapshotFile != self.seqUpdateFile:
+      if self._cursorStore is not None:
+        self._cursorStore.close()
+      self._cursorStore = CursorJournal(self.seqUpdateFile, self.journalCompactEvery,
+                                        self.journalFsync)
+    return self._cursorStore
+
+  def getScheduler(self) -> Optional[PollScheduler]:
+    """적응형 수집 스케줄러 반환 (비활성화 시 None, scheduleFile 경로가 바뀌면 다시 로드)
+
+    Returns:
+      PollScheduler 인스턴스 또는 None
+    """
+    if not self.adaptiveSchedule:
+      return None
+    if self._scheduler is None or self._scheduler.stateFile != self.scheduleFile:
+      self._scheduler = PollScheduler(
+        self.scheduleFile,
+        defaultInterval=int(os.getenv('WAIT_MINUTES', '30')) * 60,
+        minInterval=self.scheduleMinMinutes * 60,
+        maxInterval=self.scheduleMaxMinutes * 60,
+        targetItems=self.scheduleTargetItems,
+        alpha=self.scheduleEwmaAlpha
+      )
+      self._scheduler.load()
+    return self._scheduler
+
+  def getPageSizeTuner(self) -> Optional[PageSizeTuner]:
+    """페이지 크기 자동 조정기 반환 (비활성화 시 None, pageSizeFile 경로가 바뀌면 다시 로드)
+
+    Returns:
+      PageSizeTuner 인스턴스 또는 None
+    """
+    if not self.pageSizeAutotune:
+      return None
+    if self._pageSizeTuner is None or self._pageSizeTuner.stateFile != self.pageSizeFile:
+      self._pageSizeTuner = PageSizeTuner(self.pageSizeFile, self.pageSizeTargetSeconds,
+                                          self.pageSizeTargetBytes, self.pageSizeMin,
+                                          self.pageSizeMax)
+      self._pageSizeTuner.load()
+    return self._pageSizeTuner
+
+  def getPipeline(self) -> Optional['PagePipeline']:
+    """페이지 파이프라인 반환 (비활성화 시 None, 처음 호출할 때 프로세스 풀 시작)
+
+    Returns:
+      PagePipeline 인스턴스 또는 None
+    """
+    if not self.pipelineMode:
+      return None
+    if self._pipeline is None:
+      from .pipeline import PagePipeline
+      self._pipeline = PagePipeline(self, self.pipelineWorkers, self.pipelineQueueSize,
+                                    self.logger)
+    return self._pipeline
+
+  def getSinks(self) -> List[Sink]:
+    """출력 대상 목록 반환 (처음 호출할 때 생성, outputsDir이 바뀌면 다시 생성)
+
+    Returns:
+      Sink 인스턴스 리스트
+
+    Raises:
+      ValueError: OUTPUT_SINKS 설정이 올바르지 않은 경우
+    """
+    if self._sinks is None or self._sinksOutputsDir != self.outputsDir:
+      self.closeSinks()
+      writer = JsonlWriter(self.outputsDir, self.jsonlFsync, self.jsonlFsyncInterval,
+                           self.jsonlMaxHandles)
+      self._sinks = buildSinks(self.outputSinks, writer, self.prepareOutputFile,
+                               self.sinkBatchSize, self.sinkLingerMs / 1000, self.sinkMaxBuffered,
+                               self.logger, self.recordCommit, self.stopEvent)
+      self._sinksOutputsDir = self.outputsDir
+    return self._sinks
+
+  def closeSinks(self) -> None:
+    """출력 대상의 남은 레코드를 전송하고 종료 (JSONL 핸들도 닫음)"""
+    if self._sinks is not None:
+      for sink in self._sinks:
+        sink.close()
+      self._sinks = None
+
+  def syncSinks(self) -> None:
+    """JSONL 파일의 남은 변경을 fsync (interval 정책에서 사이클 끝에 호출)"""
+    if self._sinks is None or self.jsonlFsync != 'interval':
+      return
+    for sink in self._sinks:
+      if isinstance(sink, JsonlFileSink):
+        try:
+          sink.sync()
+        except OSError as e:
+          self.logger.error(f"  ✗ JSONL fsync 실패: {e}")
+
+  def recordCommit(self, endpoint: str, written: int, seconds: float) -> None:
+    """JSONL 페이지 커밋의 바이트 수와 소요 시간 기록"""
+    self.metrics.bytesWritten.inc(endpoint, amount=written)
+    self.metrics.writeCommitDuration.observe(endpoint, value=seconds)
+
+  def deliverLines(self, endpoint: str, filename: str, lines: Iterable[str]) -> None:
+    """페이지 레코드를 모든 출력 대상에 보내고 모두 받을 때까지 대기
+
+    Args:
+      endpoint: 엔드포인트 경로
+      filename: 엔드포인트 JSONL 파일명
+      lines: envelope 레코드 줄 (대상마다 처음부터 다시 읽을 수 있어야 함)
+
+    실패하면 다른 대상이 아직 전송하지 않은 이 페이지의 레코드를 취소합니다. 페이지는 다음
+    사이클에 다시 수집되므로, 취소하지 않으면 늦게 전송된 레코드가 중복으로 전달됩니다.
+
+    Raises:
+      OSError: JSONL 파일 기록 실패
+      SinkError: 다른 출력 대상 전송 실패 또는 확인 대기 시간(SINK_ACK_TIMEOUT) 초과
+    """
+    sinks = self.getSinks()
+    futures = []
+    try:
+      for sink in sinks:
+        futures.append((sink, sink.submit(endpoint, filename, lines)))
+      deadline = time.monotonic() + self.sinkAckTimeout
+      for sink, future in futures:
+        try:
+          future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+          raise SinkError(f"{sink.name}: {self.sinkAckTimeout:.0f}초 안에 전송을 확인하지 못했습니다.")
+    except BaseException:
+      for _, future in futures:
+        future.cancel()
+      raise
+
+  def getLeaseManager(self) -> Optional['LeaseManager']:
+    """엔드포인트 리스 관리자 반환 (샤딩 비활성화 시 None, leaseDir이 바뀌면 다시 생성)
+
+    처음 생성할 때 리스를 주기적으로 갱신하는 하트비트 스레드를 시작합니다.
+
+    Returns:
+      LeaseManager 인스턴스 또는 None
+    """
+    if not self.shardMode:
+      return None
+    if self._leaseManager is None or self._leaseManager.leaseDir != self.leaseDir:
+      if self._leaseManager is not None:
+        self._leaseManager.close()
+      from .leases import LeaseManager
+      self._leaseManager = LeaseManager(self.leaseDir, self.shardWorkerId,
+                                        self.leaseTtlSeconds, self.logger)
+      self._leaseManager.startHeartbeat()
+      self.logger.info(f"✓ 샤딩 수집 워커: {self._leaseManager.workerId}")
+    return self._leaseManager
+
+  def claimEndpoints(self) -> List[Dict[str, Any]]:
+    """이번 사이클에 이 워커가 수집할 엔드포인트 (샤딩 비활성화 시 전체)
+
+    Returns:
+      리스를 보유한 엔드포인트 설정 리스트
+    """
+    leases = self.getLeaseManager()
+    if leases is None:
+      return self.endpoints
+
+    try:
+      owned = set(leases.rebalance([ep['endpoint'] for ep in self.endpoints]))
+    except OSError as e:
+      self.logger.error(f"✗ 리스 갱신 실패 (이번 사이클은 보유 중인 엔드포인트만 수집): {e}")
+      owned = {ep['endpoint'] for ep in self.endpoints if leases.owns(ep['endpoint'])}
+
+    claimed = [ep for ep in self.endpoints if ep['endpoint'] in owned]
+    self.logger.info(f"리스 보유: {len(claimed)}/{len(self.endpoints)}개 엔드포인트")
+    return claimed
+
   def loadSeqUpdate(self) -> Dict[str, int]:
     """data/seq_update.json에서 seqUpdate 값 로드
 
+    저널이 활성화되어 있으면 스냅샷을 읽은 뒤 저널(data/seq_update.journal)을 재생하여
+    마지막으로 저장된 페이지의 커서까지 복원합니다.
+
     Returns:
       엔드포인트별 seqUpdate 딕셔너리
       {'/api/v2/apt/threat_actor/updated': 12345, ...}
     """
+    if self.cursorJournal:
+      store = self.getCursorStore()
+      if not os.path.exists(self.seqUpdateFile) and not os.path.exists(store.journalFile):
+        self.logger.info("seqUpdate 파일이 없습니다. 빈 상태로 시작합니다.")
+        return {}
+
+      try:
+        seqUpdates, replayed, skipped = store.load()
+        self.logger.info(f"✓ seqUpdate 파일 로드: {self.seqUpdateFile} (저널 {replayed}건 재생)")
+        if skipped:
+          self.logger.warning(f"⚠ 손상된 저널 레코드 {skipped}건을 건너뛰었습니다.")
+        self._savedCursors.update(seqUpdates)
+        return seqUpdates
+      except Exception as e:
+        self.logger.warning(f"seqUpdate 파일 로드 실패: {e}. 빈 상태로 시작합니다.")
+        return {}
+
     if not os.path.exists(self.seqUpdateFile):
       self.logger.info("seqUpdate 파일이 없습니다. 빈 상태로 시작합니다.")
       return {}
@@ -342,20 +817,206 @@ class GroupIBCollector:
       with open(self.seqUpdateFile, 'r', encoding='utf-8') as f:
         seqUpdates = json.load(f)
       self.logger.info(f"✓ seqUpdate 파일 로드: {self.seqUpdateFile}")
+      self._savedCursors.update(seqUpdates)
       return seqUpdates
     except Exception as e:
       self.logger.warning(f"seqUpdate 파일 로드 실패: {e}. 빈 상태로 시작합니다.")
       return {}
 
+  def loadLeaseCursors(self) -> Dict[str, int]:
+    """보유 중인 리스에 기록된 seqUpdate (샤딩 비활성화 시 빈 딕셔너리)
+
+    리스에 커서가 없는 엔드포인트(샤딩 전환 직후)는 seq_update.json 값을 그대로 사용합니다.
+    """
+    leases = self.getLeaseManager()
+    if leases is None:
+      return {}
+
+    try:
+      cursors = leases.loadCursors()
+    except OSError as e:
+      self.logger.warning(f"⚠ 리스 커서 로드 실패: {e}")
+      return {}
+    self._savedCursors.update(cursors)
+    return cursors
+
+  def recordSeqUpdate(self, endpoint: str, seqUpdate: int,
+                      position: Optional[Dict[str, Any]] = None) -> bool:
+    """페이지 단위 seqUpdate 체크포인트 (저널에 한 줄 추가)
+
+    샤딩 모드에서는 저널 대신 엔드포인트 리스에 커서를 기록합니다.
+
+    Args:
+      endpoint: 엔드포인트 경로
+      seqUpdate: 새 seqUpdate 값
+      position: outputPosition() 결과 (커서와 같은 저널 레코드에 기록)
+
+    Returns:
+      커서를 저장하지 못했으면 (다른 워커가 리스를 넘겨받은 경우 포함) False, 그 외 True
+    """
+    leases = self.getLeaseManager()
+    if leases is not None:
+      from .leases import LeaseLostError
+      try:
+        leases.commitCursor(endpoint, seqUpdate)
+      except LeaseLostError as e:
+        self.logger.warning(f"  ⚠ {e}")
+        return False
+      except OSError as e:
+        self.logger.error(f"  ✗ 리스 커서 기록 실패: {e}")
+        return False
+      self._savedCursors[endpoint] = seqUpdate
+      return True
+
+    if not self.cursorJournal:
+      return True
+
+    try:
+      if self.getCursorStore().record(endpoint, seqUpdate, position):
+        self.logger.info(f"  seqUpdate 저널 압축 완료: {self.seqUpdateFile}")
+    except OSError as e:
+      # 커서(와 JSONL 위치)가 저장되지 않았으므로 이 엔드포인트는 마지막으로 저장된 커서에서 멈춤
+      self.logger.error(f"  ✗ seqUpdate 저널 기록 실패: {e}")
+      return False
+    return True
+
+  def tracksOutputPositions(self) -> bool:
+    """JSONL 출력 위치를 커서와 함께 커밋하는지 (저널 사용, 샤딩 비활성화, jsonl 대상 포함)"""
+    return self.cursorJournal and not self.shardMode and 'jsonl' in self.outputSinks
+
+  def outputPosition(self, endpoint: str) -> Optional[Dict[str, Any]]:
+    """엔드포인트 JSONL 파일의 현재 위치
+
+    세그먼트 회전으로 활성 파일이 바뀌어도 구분할 수 있도록 닫힌 세그먼트 수를 함께 기록합니다.
+
+    Args:
+      endpoint: 엔드포인트 경로
+
+    Returns:
+      {'file': JSONL 파일명, 'segments': 닫힌 세그먼트 수, 'offset': 활성 파일 크기}
+      또는 None (위치를 추적하지 않거나 확인 실패)
+    """
+    if not self.tracksOutputPositions():
+      return None
+    filename = self.urlToFilename(endpoint)
+    activePath = os.path.join(self.outputsDir, filename)
+    try:
+      return {'file': filename,
+              'segments': closedSegmentCount(self.outputsDir, filename),
+              'offset': os.path.getsize(activePath) if os.path.exists(activePath) else 0}
+    except (OSError, ValueError) as e:
+      self.logger.warning(f"  ⚠ 출력 위치 확인 실패: {filename} - {e}")
+      return None
+
+  def rollbackOutput(self, endpoint: str, position: Dict[str, Any]) -> int:
+    """커밋된 위치 이후에 추가된 JSONL 꼬리 잘라내기
+
+    커서 기록 이후에 세그먼트가 회전했다면 (회전은 페이지를 추가하기 직전에만 일어남)
+    활성 파일 전체가 커밋되지 않은 내용입니다. 중복 제거/IOC 인덱스 항목은 커서를 기록한 뒤에만
+    반영되므로 (commitSeqUpdate) 잘라낸 레코드는 다시 수집하면 그대로 기록됩니다.
+
+    Args:
+      endpoint: 엔드포인트 경로
+      position: 커서와 함께 기록된 outputPosition() 결과
+
+    Returns:
+      잘라낸 바이트 수
+
+    Raises:
+      OSError, ValueError: 파일 또는 manifest 접근 실패
+    """
+    filename = self.urlToFilename(endpoint)
+    activePath = os.path.join(self.outputsDir, filename)
+    if not os.path.exists(activePath):
+      return 0
+
+    segments = closedSegmentCount(self.outputsDir, filename)
+    if segments < position['segments']:
+      self.logger.warning(f"⚠ 세그먼트 수가 커밋된 위치보다 적어 잘라내지 않습니다: {filename}")
+      return 0
+    keep = position['offset'] if segments == position['segments'] else 0
+
+    size = os.path.getsize(activePath)
+    if size < keep:
+      # fsync 전에 전원이 나가는 등 커서만 디스크에 남은 경우 (JSONL_FSYNC=page로 방지)
+      self.logger.warning(f"⚠ JSONL 파일이 커밋된 위치보다 짧습니다: {filename} "
+                          f"({size:,} < {keep:,} bytes)")
+      return 0
+    if size == keep:
+      return 0
+
+    with open(activePath, 'r+b') as f:
+      f.truncate(keep)
+      f.flush()
+      os.fsync(f.fileno())
+    return size - keep
+
+  def recoverOutputs(self) -> None:
+    """모든 엔드포인트의 커서 이후 JSONL 꼬리 잘라내기 (사이클 시작 시 커서 로드 직후 호출)
+
+    페이지를 추가한 뒤 커서를 기록하기 전에 중단되었거나, 다른 출력 대상 전송 실패로 커서가
+    전진하지 않은 페이지는 다음 수집에서 다시 추가되므로 남겨 두면 중복 레코드가 됩니다.
+    """
+    if not self.tracksOutputPositions():
+      return
+
+    for endpoint, position in dict(self.getCursorStore().positions).items():
+      filename = self.urlToFilename(endpoint)
+      try:
+        removed = self.rollbackOutput(endpoint, position)
+      except (OSError, ValueError) as e:
+        self.logger.warning(f"⚠ 커밋되지 않은 JSONL 꼬리 정리 실패: {filename} - {e}")
+        continue
+      if removed:
+        self.logger.warning(f"⚠ 커서 이후에 추가된 레코드를 잘라냈습니다: {filename} ({removed:,} bytes)")
+
   def saveSeqUpdate(self, seqUpdates: Dict[str, int]) -> bool:
     """data/seq_update.json에 seqUpdate 값 저장 (원자적 쓰기 + 백업)
 
+    저널이 활성화되어 있으면 스냅샷 저장 후 저널을 비웁니다 (압축).
+    페이지 크기 자동 조정이 활성화되어 있으면 학습한 limit도 함께 저장합니다.
+    샤딩 모드에서는 공유 seq_update.json 대신 보유 중인 리스에 커서를 기록합니다.
+    보유하지 않은 엔드포인트는 이미 저장된 값과 같을 때만 건너뛰고, 값이 다르면(리스를 잃은 뒤
+    전진한 커서, 리스 없이 바꾼 커서) 저장하지 못한 것으로 봅니다.
+
     Args:
       seqUpdates: 엔드포인트별 seqUpdate 딕셔너리
 
     Returns:
       저장 성공 시 True, 실패 시 False
     """
+    tuner = self.getPageSizeTuner()
+    if tuner is not None:
+      try:
+        if tuner.save():
+          self.logger.info(f"✓ 페이지 크기 저장 완료: {self.pageSizeFile}")
+      except OSError as e:
+        self.logger.warning(f"⚠ 페이지 크기 저장 실패: {e}")
+
+    leases = self.getLeaseManager()
+    if leases is not None:
+      unsaved = []
+      for endpoint, seqUpdate in seqUpdates.items():
+        if leases.owns(endpoint):
+          if not self.recordSeqUpdate(endpoint, seqUpdate):
+            unsaved.append(endpoint)
+        elif seqUpdate != self._savedCursors.get(endpoint, 0):
+          unsaved.append(endpoint)
+      if unsaved:
+        self.logger.error(f"✗ seqUpdate 저장 실패 (리스 없음 또는 기록 실패): {', '.join(sorted(unsaved))}")
+        return False
+      self.logger.info(f"✓ seqUpdate 저장 완료: {self.leaseDir} (리스 {len(leases.held)}개)")
+      return True
+
+    if self.cursorJournal:
+      try:
+        self.getCursorStore().compact(seqUpdates)
+        self.logger.info(f"✓ seqUpdate 저장 완료: {self.seqUpdateFile}")
+        return True
+      except Exception as e:
+        self.logger.error(f"✗ seqUpdate 저장 실패: {e}")
+        return False
+
     try:
       # 1. 백업 파일 생성 (기존 파일이 있는 경우)
       if os.path.exists(self.seqUpdateFile):
@@ -403,27 +1064,64 @@ class GroupIBCollector:
     Returns:
       응답 JSON 딕셔너리 또는 None (실패 시)
     """
-    headers = self.buildAuthHeader()
+    response = self.requestApi(url, params, retryCount=retryCount)
+    if response is None:
+      return None
+    return self.codec.loads(response.content)
+
+  def requestApi(self, url: str, params: Dict[str, str], stream: bool = False,
+                 retryCount: int = 0) -> Optional[requests.Response]:
+    """API 요청 및 상태 코드별 재시도 처리
+
+    Args:
+      url: 요청 URL
+      params: 쿼리 파라미터
+      stream: True이면 본문을 읽지 않은 응답 반환 (스트리밍 파싱용)
+      retryCount: 현재 재시도 횟수 (내부 사용)
+
+    Returns:
+      HTTP 200 응답 객체 또는 None (실패 시)
+    """
+    endpoint = urlparse(url).path
 
     try:
-      response = requests.get(url, headers=headers, params=params, timeout=self.requestTimeout)
+      # Retry-After 멈춤은 최대 RATE_LIMIT_MAX_PAUSE초이므로 종료 요청 시 기다리지 않고 요청 취소
+      self.rateLimiter.acquire(self.stopEvent)
+      if self.stopEvent.is_set():
+        self.logger.warning(f"⚠ 종료 요청으로 요청을 취소합니다: {url}")
+        return None
+      startTime = time.perf_counter()
+      response = self.transport.get(url, params=params, stream=stream)
+      self.metrics.requestDuration.observe(endpoint, value=time.perf_counter() - startTime)
+      self.metrics.requests.inc(endpoint, str(response.status_code))
 
       # HTTP 200 성공
       if response.status_code == 200:
-        return response.json()
+        self.rateLimiter.recordSuccess(response.headers)
+        if not stream:
+          self.logResponseTiming(response)
+        return response
+
+      # 실패 응답의 본문은 버리고 연결 반환
+      response.close()
 
       # HTTP 401 인증 실패 (즉시 중단)
-      elif response.status_code == 401:
+      if response.status_code == 401:
         self.logger.error(f"✗ 인증 실패 (401): {url}")
         raise AuthenticationError("API 인증이 실패했습니다.")
 
       # HTTP 429 Rate Limit
       elif response.status_code == 429:
         if retryCount < 3:
-          waitTime = 5 * (retryCount + 1)  # 5초, 10초, 15초
-          self.logger.warning(f"⚠ Rate Limit 도달 (429). {waitTime}초 대기 후 재시도 ({retryCount+1}/3)")
-          time.sleep(waitTime)
-          return self.fetchApi(url, params, retryCount + 1)
+          self.metrics.retries.inc(endpoint, '429')
+          # Retry-After가 없으면 5초, 10초, 15초
+          waitTime = parseRetryAfter(response.headers)
+          if waitTime is None:
+            waitTime = 5 * (retryCount + 1)
+          # 공유 제한기에 반영: 속도를 낮추고 다른 스레드의 요청도 함께 멈춤 (재요청 시 acquire에서 대기)
+          waitTime = self.rateLimiter.recordThrottle(waitTime)
+          self.logger.warning(f"⚠ Rate Limit 도달 (429). {waitTime:g}초 대기 후 재시도 ({retryCount+1}/3)")
+          return self.requestApi(url, params, stream, retryCount + 1)
         else:
           self.logger.error(f"✗ Rate Limit 재시도 3회 실패: {url}")
           return None
@@ -431,10 +1129,16 @@ class GroupIBCollector:
       # HTTP 5xx 서버 오류
       elif 500 <= response.status_code < 600:
         if retryCount < 3:
-          waitTime = retryCount + 1  # 1초, 2초, 3초
-          self.logger.warning(f"⚠ 서버 오류 ({response.status_code}). {waitTime}초 대기 후 재시도 ({retryCount+1}/3)")
-          time.sleep(waitTime)
-          return self.fetchApi(url, params, retryCount + 1)
+          self.metrics.retries.inc(endpoint, '5xx')
+          retryAfter = parseRetryAfter(response.headers)
+          if response.status_code == 503 and retryAfter is not None:
+            # 과부하 응답(503 + Retry-After)은 429와 같이 공유 제한기에 반영
+            waitTime = self.rateLimiter.recordThrottle(retryAfter)
+          else:
+            waitTime = retryCount + 1  # 1초, 2초, 3초
+            self.stopEvent.wait(waitTime)
+          self.logger.warning(f"⚠ 서버 오류 ({response.status_code}). {waitTime:g}초 대기 후 재시도 ({retryCount+1}/3)")
+          return self.requestApi(url, params, stream, retryCount + 1)
         else:
           self.logger.error(f"✗ 서버 오류 재시도 3회 실패: {url} (HTTP {response.status_code})")
           return None
@@ -445,25 +1149,52 @@ class GroupIBCollector:
         return None
 
     except requests.exceptions.Timeout:
+      self.metrics.requests.inc(endpoint, 'timeout')
       if retryCount < 3:
+        self.metrics.retries.inc(endpoint, 'timeout')
+        # 페이지가 너무 커서 타임아웃된 경우를 대비해 limit을 줄여 재시도 (params는 호출자와 공유)
+        tuner = self.getPageSizeTuner()
+        if tuner is not None and 'limit' in params:
+          oldLimit = int(params['limit'])
+          newLimit = tuner.recordTimeout(endpoint, oldLimit)
+          if newLimit != oldLimit:
+            params['limit'] = str(newLimit)
+            self.logger.warning(f"⚠ 타임아웃으로 페이지 크기 축소: {oldLimit} → {newLimit}")
         waitTime = retryCount + 1
         self.logger.warning(f"⚠ 타임아웃. {waitTime}초 대기 후 재시도 ({retryCount+1}/3)")
-        time.sleep(waitTime)
-        return self.fetchApi(url, params, retryCount + 1)
+        self.stopEvent.wait(waitTime)
+        return self.requestApi(url, params, stream, retryCount + 1)
       else:
         self.logger.error(f"✗ 타임아웃 재시도 3회 실패: {url}")
         return None
 
     except requests.exceptions.RequestException as e:
+      self.metrics.requests.inc(endpoint, 'error')
       if retryCount < 3:
+        self.metrics.retries.inc(endpoint, 'network')
         waitTime = retryCount + 1
         self.logger.warning(f"⚠ 네트워크 오류: {e}. {waitTime}초 대기 후 재시도 ({retryCount+1}/3)")
-        time.sleep(waitTime)
-        return self.fetchApi(url, params, retryCount + 1)
+        self.stopEvent.wait(waitTime)
+        return self.requestApi(url, params, stream, retryCount + 1)
       else:
         self.logger.error(f"✗ 네트워크 오류 재시도 3회 실패: {url} - {e}")
         return None
 
+  def logResponseTiming(self, response: requests.Response) -> None:
+    """응답 크기 및 구간별 소요 시간 로그
+
+    Args:
+      response: HttpTransport가 반환한 응답 (timing 속성 포함)
+    """
+    timing = response.timing
+    self._pageTiming.last = timing
+    self.metrics.pageBytes.observe(urlparse(response.url).path, value=timing['bytes'])
+    self.logger.info(
+      f"  응답 수신: {timing['bytes']:,} bytes "
+      f"(연결 {timing['connect'] * 1000:.0f}ms, TTFB {timing['ttfb'] * 1000:.0f}ms, "
+      f"전송 {timing['transfer'] * 1000:.0f}ms{', 연결 재사용' if timing['reused'] else ''})"
+    )
+
   def extractDataAndSeqUpdate(self, response: Dict[str, Any],
                                endpoint: str) -> Tuple[List[Dict[str, Any]], int]:
     """응답에서 데이터와 seqUpdate 추출
@@ -475,24 +1206,10 @@ class GroupIBCollector:
     Returns:
       (데이터 리스트, seqUpdate 값) 튜플
     """
-    # seqUpdate 추출 (응답의 최상위 필드)
-    seqUpdate = response.get('seqUpdate', 0)
-
-    # 데이터 필드 우선순위: items → data → results
-    dataList = []
-    if 'items' in response:
-      dataList = response['items']
-    elif 'data' in response:
-      dataList = response['data']
-    elif 'results' in response:
-      dataList = response['results']
-    else:
+    # 데이터 필드 우선순위: items → data → results, seqUpdate는 응답의 최상위 필드
+    dataList, seqUpdate, dataKey = splitResponse(response)
+    if dataKey is None:
       self.logger.warning(f"⚠ 응답에 데이터 필드가 없습니다 (items/data/results): {endpoint}")
-      dataList = []
-
-    # 리스트가 아닌 경우 처리
-    if not isinstance(dataList, list):
-      dataList = [dataList]
 
     return dataList, seqUpdate
 
@@ -517,7 +1234,7 @@ class GroupIBCollector:
     return filename
 
   def downloadPdf(self, portalLink: str, documentId: str, endpoint: str) -> bool:
-    """portalLink에서 PDF 파일 다운로드 및 저장
+    """portalLink에서 PDF 파일 다운로드 및 저장 (결과별 메트릭 기록)
 
     Args:
       portalLink: PDF 다운로드 링크
@@ -527,6 +1244,17 @@ class GroupIBCollector:
     Returns:
       다운로드 성공 시 True, 실패 시 False
     """
+    success = self._downloadPdfFile(portalLink, documentId, endpoint)
+    if not success:
+      self.metrics.pdfDownloads.inc(endpoint, 'failed')
+    return success
+
+  def _downloadPdfFile(self, portalLink: str, documentId: str, endpoint: str) -> bool:
+    """PDF 다운로드 본체
+
+    본문은 청크 단위로 .tmp 파일에 스트리밍 저장되며, 중단된 .tmp 파일이 남아 있으면
+    HTTP Range 요청으로 이어받습니다.
+    """
     if not portalLink:
       return False
 
@@ -541,25 +1269,64 @@ class GroupIBCollector:
 
       # 이미 다운로드된 파일이면 건너뛰기
       if os.path.exists(pdfFilepath):
+        self.metrics.pdfDownloads.inc(endpoint, 'skipped')
         return True
 
-      # PDF 다운로드
-      headers = self.buildAuthHeader()
-      response = requests.get(portalLink, headers=headers, timeout=self.requestTimeout)
+      # 이전에 중단된 임시 파일이 있으면 이어받기 (HTTP Range)
+      tempFilepath = pdfFilepath + '.tmp'
+      resumeFrom = os.path.getsize(tempFilepath) if os.path.exists(tempFilepath) else 0
 
-      if response.status_code != 200:
-        self.logger.warning(f"  PDF 다운로드 실패 ({response.status_code}): {documentId}")
-        return False
+      # PDF 다운로드 (이미 압축된 바이너리이므로 압축 협상 없이 요청)
+      headers = {'Accept-Encoding': 'identity'}
+      if resumeFrom > 0:
+        headers['Range'] = f"bytes={resumeFrom}-"
 
-      # 파일 저장 (임시 파일에 먼저 저장 후 교체)
-      tempFilepath = pdfFilepath + '.tmp'
-      with open(tempFilepath, 'wb') as f:
-        f.write(response.content)
+      self.rateLimiter.acquire(self.stopEvent)
+      if self.stopEvent.is_set():
+        self.logger.warning(f"  ⚠ 종료 요청으로 PDF 다운로드를 취소합니다: {documentId}")
+        return False
+      response = self.transport.get(portalLink, headers=headers, stream=True)
+
+      try:
+        if response.status_code == 429:
+          # API 요청과 같은 제한기에 반영하고 이번 다운로드는 실패 처리 (다음 사이클에 재시도)
+          retryAfter = parseRetryAfter(response.headers)
+          self.rateLimiter.recordThrottle(5 if retryAfter is None else retryAfter)
+          self.logger.warning(f"  PDF 다운로드 Rate Limit (429): {documentId}")
+          return False
+        if response.status_code in (200, 206):
+          self.rateLimiter.recordSuccess(response.headers)
+
+        if response.status_code == 416 and resumeFrom > 0:
+          # 요청 범위가 파일 크기를 넘음: 임시 파일이 이미 완전한지 확인
+          contentRange = response.headers.get('Content-Range', '')
+          if contentRange.endswith(f"/{resumeFrom}"):
+            writeMode = None
+          else:
+            os.remove(tempFilepath)
+            self.logger.warning(f"  PDF 이어받기 실패, 처음부터 다시 받습니다: {documentId}")
+            return False
+        elif response.status_code == 206 and resumeFrom > 0:
+          writeMode = 'ab'
+        elif response.status_code == 200:
+          # 서버가 Range를 무시한 경우 처음부터 다시 저장
+          writeMode = 'wb'
+        else:
+          self.logger.warning(f"  PDF 다운로드 실패 ({response.status_code}): {documentId}")
+          return False
+
+        # 청크 단위로 임시 파일에 스트리밍 저장
+        if writeMode:
+          with open(tempFilepath, writeMode) as f:
+            for chunk in self.transport.iterContent(response, self.pdfChunkSize):
+              f.write(chunk)
+              self.metrics.pdfBytes.inc(endpoint, amount=len(chunk))
+      finally:
+        response.close()
 
       # 임시 파일을 실제 파일로 교체
-      if os.path.exists(pdfFilepath):
-        os.remove(pdfFilepath)
-      os.rename(tempFilepath, pdfFilepath)
+      os.replace(tempFilepath, pdfFilepath)
+      self.metrics.pdfDownloads.inc(endpoint, 'success')
 
       self.logger.info(f"  ✓ PDF 다운로드: {documentId}")
       return True
@@ -577,9 +1344,194 @@ class GroupIBCollector:
       self.logger.warning(f"  PDF 처리 오류: {documentId} - {e}")
       return False
 
+  def getSegmentStore(self) -> Optional[SegmentStore]:
+    """세그먼트 저장소 반환 (회전 비활성화 시 None, outputsDir이 바뀌면 다시 생성)
+
+    Returns:
+      SegmentStore 인스턴스 또는 None
+    """
+    if not self.segmentRotation:
+      return None
+    if self._segmentStore is None or self._segmentStore.outputsDir != self.outputsDir:
+      self._segmentStore = SegmentStore(self.outputsDir, self.segmentMaxBytes,
+                                        self.segmentMaxAgeHours * 3600,
+                                        self.segmentCompression, self.logger)
+    return self._segmentStore
+
+  def prepareOutputFile(self, filename: str) -> None:
+    """페이지를 추가하기 전에 활성 세그먼트 회전 여부 확인
+
+    Args:
+      filename: 엔드포인트 JSONL 파일명
+    """
+    segmentStore = self.getSegmentStore()
+    if segmentStore is None:
+      return
+
+    try:
+      segmentStore.prepareActive(filename)
+    except (OSError, ValueError) as e:
+      # 회전 실패 시에도 활성 파일에 계속 기록
+      self.logger.warning(f"  ⚠ 세그먼트 회전 실패: {filename} - {e}")
+
+  def getDedupIndex(self) -> Optional['DedupIndex']:
+    """중복 제거 인덱스 반환 (비활성화 시 None, dedupDir이 바뀌면 다시 생성)
+
+    Returns:
+      DedupIndex 인스턴스 또는 None
+    """
+    if not self.dedupIndex:
+      return None
+    if self._dedupStore is None or self._dedupStore.indexDir != self.dedupDir:
+      if self._dedupStore is not None:
+        self._dedupStore.close()
+      from .dedup import DedupIndex
+      self._dedupStore = DedupIndex(self.dedupDir, self.dedupRetentionDays,
+                                    self.dedupMaxEntries, self.logger)
+    return self._dedupStore
+
+  def getDedupKey(self, item: Any) -> Tuple[Optional[str], bytes]:
+    """중복 판별 키 생성 (data.id, 없으면 data.hash)
+
+    Args:
+      item: 데이터 항목
+
+    Returns:
+      (레코드 ID 또는 None, 내용 해시) 튜플
+    """
+    from .dedup import recordKey
+    return recordKey(item)
+
+  def checkDuplicates(self, filename: str, recordKeys: List[Tuple[Optional[str], bytes]],
+                      count: int) -> Tuple[List[bool], List[Tuple[str, bytes]]]:
+    """페이지 항목별 기록 여부 판별
+
+    인덱스가 비활성화되어 있거나 조회에 실패하면 모든 항목을 기록합니다.
+
+    Args:
+      filename: 엔드포인트 JSONL 파일명
+      recordKeys: getDedupKey() 결과 리스트 (항목 순서)
+      count: 페이지 항목 수
+
+    Returns:
+      (항목별 기록 여부 리스트, recordDuplicates()에 넘길 값) 튜플
+    """
+    dedupIndex = self.getDedupIndex()
+    if dedupIndex is None:
+      return [True] * count, []
+
+    import sqlite3
+    try:
+      return dedupIndex.check(os.path.splitext(filename)[0], recordKeys)
+    except sqlite3.Error as e:
+      self.logger.warning(f"  ⚠ 중복 제거 인덱스 조회 실패 (모든 항목 기록): {filename} - {e}")
+      return [True] * count, []
+
+  def deferIndexes(self, endpoint: str, filename: str, pending: List[Tuple[str, bytes]],
+                   seqUpdate: int, digests: List[bytes]) -> None:
+    """기록한 페이지의 인덱스 항목을 커서 기록(commitSeqUpdate) 때까지 보류
+
+    Args:
+      endpoint: 엔드포인트 경로
+      filename: 엔드포인트 JSONL 파일명
+      pending: checkDuplicates()가 반환한 (ID, 해시) 리스트
+      seqUpdate: 페이지의 seqUpdate 값
+      digests: 페이지 항목에서 추출한 지표 해시 리스트
+    """
+    if pending or digests:
+      self._deferredIndexes.setdefault(endpoint, []).append((filename, pending, seqUpdate, digests))
+
+  def recordDuplicates(self, filename: str, pending: List[Tuple[str, bytes]]) -> None:
+    """파일 기록이 끝난 페이지의 레코드를 인덱스에 반영
+
+    Args:
+      filename: 엔드포인트 JSONL 파일명
+      pending: checkDuplicates()가 반환한 (ID, 해시) 리스트
+    """
+    dedupIndex = self.getDedupIndex()
+    if dedupIndex is None or not pending:
+      return
+
+    import sqlite3
+    try:
+      dedupIndex.record(os.path.splitext(filename)[0], pending)
+    except sqlite3.Error as e:
+      # 인덱스에 없으면 다음에 다시 기록될 뿐이므로 수집은 계속
+      self.logger.warning(f"  ⚠ 중복 제거 인덱스 기록 실패: {filename} - {e}")
+
+  def getIocIndexWriter(self) -> Optional['IocIndexWriter']:
+    """IOC 인덱스 기록기 반환 (비활성화 시 None, iocIndexDir이 바뀌면 다시 생성)
+
+    Returns:
+      IocIndexWriter 인스턴스 또는 None
+    """
+    if not self.iocIndex:
+      return None
+    if self._iocIndexWriter is None or self._iocIndexWriter.indexDir != self.iocIndexDir:
+      if self._iocIndexWriter is not None:
+        self._iocIndexWriter.close()
+      from .iocindex import IocIndexWriter
+      self._iocIndexWriter = IocIndexWriter(self.iocIndexDir, self.iocIndexCompactEvery,
+                                            self.logger)
+    return self._iocIndexWriter
+
+  def isIocIndexed(self, endpoint: str) -> bool:
+    """IOC 인덱스 대상 엔드포인트 여부 (IOC_INDEX_ENDPOINTS 패턴이 경로에 포함)"""
+    if not self.iocIndex:
+      return False
+    from .iocindex import matchesEndpoint
+    return matchesEndpoint(endpoint, self.iocIndexEndpoints)
+
+  def getIndicatorDigests(self, item: Any) -> List[bytes]:
+    """항목에서 추출한 IOC 지표 해시 리스트 (isIocIndexed() 대상 엔드포인트에서만 호출)
+
+    Args:
+      item: API 응답 항목
+
+    Returns:
+      지표 해시 리스트
+    """
+    from .iocindex import extractIndicators, indicatorHash
+    return [indicatorHash(value) for value in extractIndicators(item)]
+
+  def recordIndicators(self, endpoint: str, seqUpdate: int, digests: List[bytes]) -> None:
+    """파일 기록이 끝난 페이지의 지표를 IOC 인덱스에 반영
+
+    Args:
+      endpoint: 엔드포인트 경로
+      seqUpdate: 페이지의 seqUpdate 값
+      digests: 페이지 항목에서 추출한 지표 해시 리스트
+    """
+    if not digests:
+      return
+
+    try:
+      self.getIocIndexWriter().add(endpoint, seqUpdate, digests)
+    except OSError as e:
+      # 인덱스는 python main.py ioc --rebuild로 다시 만들 수 있으므로 수집은 계속
+      self.logger.warning(f"  ⚠ IOC 인덱스 기록 실패: {endpoint} - {e}")
+
+  def schedulePdfDownload(self, portalLink: str, documentId: str, endpoint: str) -> None:
+    """PDF 다운로드를 워커 풀에 제출 (풀이 없으면 즉시 다운로드)
+
+    Args:
+      portalLink: PDF 다운로드 링크
+      documentId: 문서 ID
+      endpoint: 엔드포인트 경로
+    """
+    if not portalLink:
+      return
+
+    if self.pdfPool is not None:
+      self.pdfPool.submit(portalLink, documentId, endpoint)
+    else:
+      self.downloadPdf(portalLink, documentId, endpoint)
+
   def saveToJsonl(self, endpoint: str, items: List[Dict[str, Any]],
                   seqUpdate: int) -> bool:
-    """데이터를 JSON Lines 형식으로 저장 및 PDF 다운로드
+    """데이터를 JSON Lines 형식으로 저장 및 PDF 다운로드 예약
+
+    PDF는 백그라운드 워커 풀에서 다운로드되므로 저장은 PDF 완료를 기다리지 않습니다.
 
     Args:
       endpoint: 엔드포인트 경로
@@ -593,48 +1545,85 @@ class GroupIBCollector:
       self.logger.info(f"  저장할 데이터가 없습니다: {endpoint}")
       return True
 
+    failCount = 0
+
+    # envelope 공통 필드는 페이지당 한 번만 직렬화
+    prefix = self.buildEnvelopePrefix(endpoint, seqUpdate)
+    payloads = []
+    recordKeys = []
+    indexIndicators = self.isIocIndexed(endpoint)
+    digests = []
+
+    for index, item in enumerate(items):
+      try:
+        # PDF 다운로드 예약 (file.portalLink가 있는 경우)
+        if isinstance(item, dict):
+          fileData = item.get('file')
+          if isinstance(fileData, dict) and 'portalLink' in fileData:
+            documentId = item.get('id', f"unknown_{index}")
+            portalLink = fileData.get('portalLink')
+            self.schedulePdfDownload(portalLink, documentId, endpoint)
+
+        payload = self.codec.dumps(item)
+        payloads.append(payload)
+        if self.dedupIndex:
+          recordKeys.append(self.getDedupKey(item))
+        if indexIndicators:
+          digests.extend(self.getIndicatorDigests(item))
+
+      except (TypeError, ValueError) as e:
+        failCount += 1
+        self.logger.warning(f"  항목 {index + 1} JSON 직렬화 실패: {e}")
+        continue
+
+    return self.writePayloads(endpoint, seqUpdate, prefix, payloads, recordKeys, digests,
+                              failCount)
+
+  def writePayloads(self, endpoint: str, seqUpdate: int, prefix: str, payloads: List[str],
+                    recordKeys: List[Tuple[Optional[str], bytes]], digests: List[bytes],
+                    failCount: int = 0) -> bool:
+    """직렬화된 페이지 항목에 envelope를 붙여 한 번에 파일에 추가
+
+    Args:
+      endpoint: 엔드포인트 경로
+      seqUpdate: 페이지의 seqUpdate 값
+      prefix: buildEnvelopePrefix() 결과
+      payloads: 항목별 JSON 문자열
+      recordKeys: getDedupKey() 결과 리스트 (중복 제거 비활성화 시 빈 리스트)
+      digests: IOC 지표 해시 리스트
+      failCount: 직렬화에 실패한 항목 수 (로그용)
+
+    Returns:
+      최소 1건 이상 저장(또는 중복으로 건너뜀)했으면 True, 실패 시 False
+    """
     filename = self.urlToFilename(endpoint)
     filepath = os.path.join(self.outputsDir, filename)
+    successCount = len(payloads)
 
-    successCount = 0
-    failCount = 0
+    # 중복 판별 (인덱스 비활성화 시 모두 기록)
+    keep, pending = self.checkDuplicates(filename, recordKeys, len(payloads))
+    lines = [prefix + payload + '}\n' for payload, kept in zip(payloads, keep) if kept]
+    skippedCount = len(payloads) - len(lines)
 
     try:
-      with open(filepath, 'a', encoding='utf-8') as f:
-        for index, item in enumerate(items):
-          try:
-            # PDF 다운로드 시도 (file.portalLink가 있는 경우)
-            if isinstance(item, dict):
-              fileData = item.get('file')
-              if isinstance(fileData, dict) and 'portalLink' in fileData:
-                documentId = item.get('id', f"unknown_{index}")
-                portalLink = fileData.get('portalLink')
-                self.downloadPdf(portalLink, documentId, endpoint)
-
-            record = {
-              'timestamp': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z',
-              'source': 'groupib-api',
-              'endpoint': endpoint,
-              'seqUpdate': seqUpdate,
-              'data': item
-            }
-            # JSON 직렬화 테스트
-            jsonLine = json.dumps(record, ensure_ascii=False)
-            f.write(jsonLine + '\n')
-            successCount += 1
-
-          except (TypeError, ValueError) as e:
-            failCount += 1
-            self.logger.warning(f"  항목 {index + 1} JSON 직렬화 실패: {e}")
-            continue
-
+      # 페이지 전체를 한 번에 기록 (모든 출력 대상이 받은 뒤에만 True 반환 → 커서 전진)
+      if lines:
+        self.deliverLines(endpoint, filename, lines)
+        self.metrics.recordsWritten.inc(endpoint, amount=len(lines))
+      self.deferIndexes(endpoint, filename, pending, seqUpdate, digests)
+
+      if skippedCount:
+        self.logger.info(f"  중복 레코드 {skippedCount}건 건너뜀")
       if failCount > 0:
-        self.logger.warning(f"  ⚠ 저장 완료: {filepath} (성공: {successCount}건, 실패: {failCount}건)")
+        self.logger.warning(f"  ⚠ 저장 완료: {filepath} (성공: {successCount - skippedCount}건, 실패: {failCount}건)")
       else:
-        self.logger.info(f"  ✓ 저장 완료: {filepath} ({successCount}건)")
+        self.logger.info(f"  ✓ 저장 완료: {filepath} ({successCount - skippedCount}건)")
 
-      return successCount > 0  # 최소 1건 이상 성공 시 True
+      return successCount > 0  # 최소 1건 이상 성공 시 True (중복으로 건너뛴 건 포함)
 
+    except SinkError as e:
+      self.logger.error(f"  ✗ 출력 대상 전송 실패: {endpoint} - {e}")
+      return False
     except IOError as e:
       self.logger.error(f"  ✗ 파일 I/O 오류: {filepath} - {e}")
       return False
@@ -642,58 +1631,378 @@ class GroupIBCollector:
       self.logger.error(f"  ✗ 파일 저장 실패: {filepath} - {e}")
       return False
 
+  def writePage(self, endpoint: str, page: Dict[str, Any]) -> bool:
+    """파이프라인에서 디코딩한 페이지 저장 및 PDF 다운로드 예약 (기록 스레드에서 호출)
+
+    Args:
+      endpoint: 엔드포인트 경로
+      page: pipeline.decodePage() 결과
+
+    Returns:
+      저장 성공 시 True, 실패 시 False
+    """
+    for message in page['errors']:
+      self.logger.warning(f"  {message}")
+    if page['itemCount'] == 0:
+      self.logger.info(f"  저장할 데이터가 없습니다: {endpoint}")
+      return True
+
+    for portalLink, documentId in page['pdfLinks']:
+      self.schedulePdfDownload(portalLink, documentId, endpoint)
+
+    return self.writePayloads(endpoint, page['seqUpdate'], page['prefix'], page['payloads'],
+                              page['recordKeys'], page['digests'], len(page['errors']))
+
+  def buildEnvelopePrefix(self, endpoint: str, seqUpdate: int) -> str:
+    """페이지 공통 envelope 접두어 생성 (timestamp는 페이지 단위)
+
+    Args:
+      endpoint: 엔드포인트 경로
+      seqUpdate: 페이지의 seqUpdate 값
+
+    Returns:
+      항목 JSON과 '}'를 붙이면 완성되는 레코드 접두어
+    """
+    return self.codec.buildEnvelopePrefix({
+      'timestamp': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z',
+      'source': 'groupib-api',
+      'endpoint': endpoint,
+      'seqUpdate': seqUpdate
+    })
+
+  def saveStreamToJsonl(self, endpoint: str,
+                        parser: StreamingPageParser) -> Tuple[bool, int, int]:
+    """스트리밍 파서의 항목을 JSON Lines 형식으로 저장 및 PDF 다운로드 예약
+
+    seqUpdate는 문서 끝에서야 확정될 수 있으므로, 항목은 먼저 스풀 파일
+    (STREAMING_SPOOL_SIZE까지는 메모리, 초과분은 디스크)에 한 줄씩 기록하고
+    페이지 파싱이 끝난 뒤 envelope를 붙여 출력 파일에 추가합니다.
+    파싱 도중 실패하면 출력 파일에는 아무것도 기록되지 않습니다.
+
+    Args:
+      endpoint: 엔드포인트 경로
+      parser: 응답 본문에 연결된 StreamingPageParser
+
+    Returns:
+      (저장 성공 여부, 저장된 건수, seqUpdate 값) 튜플
+    """
+    filename = self.urlToFilename(endpoint)
+    filepath = os.path.join(self.outputsDir, filename)
+
+    successCount = 0
+    failCount = 0
+    recordKeys = []
+    indexIndicators = self.isIocIndexed(endpoint)
+    digests = []
+
+    with tempfile.SpooledTemporaryFile(max_size=self.streamingSpoolSize, mode='w+',
+                                       encoding='utf-8') as spool:
+      try:
+        for index, item in enumerate(parser.iterItems()):
+          # PDF 다운로드 예약 (file.portalLink가 있는 경우)
+          if isinstance(item, dict):
+            fileData = item.get('file')
+            if isinstance(fileData, dict) and 'portalLink' in fileData:
+              documentId = item.get('id', f"unknown_{index}")
+              self.schedulePdfDownload(fileData.get('portalLink'), documentId, endpoint)
+
+          try:
+            payload = self.codec.dumps(item)
+            spool.write(payload + '\n')
+            if self.dedupIndex:
+              recordKeys.append(self.getDedupKey(item))
+            if indexIndicators:
+              digests.extend(self.getIndicatorDigests(item))
+            successCount += 1
+          except (TypeError, ValueError) as e:
+            failCount += 1
+            self.logger.warning(f"  항목 {index + 1} JSON 직렬화 실패: {e}")
+
+      except (ValueError, requests.exceptions.RequestException) as e:
+        self.logger.error(f"  ✗ 스트리밍 파싱 실패: {endpoint} - {e}")
+        return False, 0, 0
+
+      if parser.dataKey is None:
+        self.logger.warning(f"⚠ 응답에 데이터 필드가 없습니다 (items/data/results): {endpoint}")
+
+      seqUpdate = parser.seqUpdate if parser.seqUpdate is not None else 0
+
+      if successCount == 0:
+        if failCount == 0:
+          self.logger.info(f"  저장할 데이터가 없습니다: {endpoint}")
+        return failCount == 0, 0, seqUpdate
+
+      # envelope 공통 필드는 페이지당 한 번만 직렬화
+      prefix = self.buildEnvelopePrefix(endpoint, seqUpdate)
+
+      # 중복 판별 (인덱스 비활성화 시 모두 기록)
+      keep, pending = self.checkDuplicates(filename, recordKeys, successCount)
+      skippedCount = keep.count(False)
+
+      try:
+        if skippedCount < successCount:
+          self.deliverLines(endpoint, filename, SpoolLines(spool, prefix, keep))
+          self.metrics.recordsWritten.inc(endpoint, amount=successCount - skippedCount)
+        self.deferIndexes(endpoint, filename, pending, seqUpdate, digests)
+      except SinkError as e:
+        self.logger.error(f"  ✗ 출력 대상 전송 실패: {endpoint} - {e}")
+        return False, 0, seqUpdate
+      except IOError as e:
+        self.logger.error(f"  ✗ 파일 I/O 오류: {filepath} - {e}")
+        return False, 0, seqUpdate
+
+    if skippedCount:
+      self.logger.info(f"  중복 레코드 {skippedCount}건 건너뜀")
+      successCount -= skippedCount
+    if failCount > 0:
+      self.logger.warning(f"  ⚠ 저장 완료: {filepath} (성공: {successCount}건, 실패: {failCount}건)")
+    else:
+      self.logger.info(f"  ✓ 저장 완료: {filepath} ({successCount}건)")
+
+    return True, successCount, seqUpdate
+
+  def collectPage(self, url: str, endpoint: str,
+                  params: Dict[str, str]) -> Optional[Tuple[int, int]]:
+    """한 페이지 요청 및 저장
+
+    STREAMING_PARSE 설정에 따라 전체 응답을 디코딩하거나 스트리밍 파싱합니다.
+
+    Args:
+      url: 요청 URL
+      endpoint: 엔드포인트 경로
+      params: 쿼리 파라미터 (seqUpdate 포함)
+
+    Returns:
+      (페이지 항목 수, 새 seqUpdate) 튜플 또는 None (요청/저장 실패 시)
+    """
+    if not self.streamingParse:
+      response = self.fetchApi(url, params)
+
+      if response is None:
+        self.logger.error(f"  ✗ 수집 실패: {endpoint}")
+        return None
+
+      # 데이터 및 seqUpdate 추출
+      dataList, newSeqUpdate = self.extractDataAndSeqUpdate(response, endpoint)
+
+      # 데이터 저장
+      if not self.saveToJsonl(endpoint, dataList, newSeqUpdate):
+        return None
+
+      self.metrics.pageItems.observe(endpoint, value=len(dataList))
+      return len(dataList), newSeqUpdate
+
+    response = self.requestApi(url, params, stream=True)
+
+    if response is None:
+      self.logger.error(f"  ✗ 수집 실패: {endpoint}")
+      return None
+
+    try:
+      parser = StreamingPageParser(self.transport.iterContent(response, self.streamingChunkSize))
+      saveSuccess, recordCount, newSeqUpdate = self.saveStreamToJsonl(endpoint, parser)
+    finally:
+      response.close()
+
+    if not saveSuccess:
+      return None
+
+    self.logResponseTiming(response)
+    self.metrics.pageItems.observe(endpoint, value=parser.itemCount)
+    return parser.itemCount, newSeqUpdate
+
+  def getDrainLimits(self, endpointConfig: Dict[str, Any]) -> Tuple[int, float]:
+    """엔드포인트별 drain 상한 조회 (list.csv 값 우선, 없으면 환경 변수 기본값)
+
+    Args:
+      endpointConfig: 엔드포인트 설정
+
+    Returns:
+      (최대 페이지 수, 최대 소요 시간(초)) 튜플
+    """
+    maxPages = endpointConfig.get('maxPages') or self.drainMaxPages
+    maxSeconds = endpointConfig.get('maxSeconds') or self.drainMaxSeconds
+    return maxPages, maxSeconds
+
+  def commitSeqUpdate(self, endpoint: str, seqUpdates: Dict[str, int], newSeqUpdate: int) -> bool:
+    """저장이 끝난 페이지의 seqUpdate 반영 (딕셔너리 갱신 및 체크포인트)
+
+    저널을 사용하면 페이지를 추가한 뒤의 JSONL 위치를 커서와 같은 레코드에 기록합니다.
+    페이지의 중복 제거/IOC 인덱스 항목은 커서를 기록한 뒤에만 반영합니다 (커밋되지 않은 꼬리를
+    잘라낸 뒤 다시 수집한 레코드가 인덱스 때문에 건너뛰어지지 않도록).
+
+    Args:
+      endpoint: 엔드포인트 경로
+      seqUpdates: seqUpdate 딕셔너리
+      newSeqUpdate: 페이지의 seqUpdate 값
+
+    Returns:
+      커서를 기록하지 못했으면 (다른 워커가 리스를 넘겨받은 경우 포함) False, 그 외 True
+    """
+    deferred = self._deferredIndexes.pop(endpoint, [])
+    currentSeqUpdate = seqUpdates.get(endpoint, 0)
+    seqUpdates[endpoint] = newSeqUpdate
+    self.metrics.seqUpdate.set(endpoint, value=newSeqUpdate)
+    position = self.outputPosition(endpoint)
+
+    if newSeqUpdate == currentSeqUpdate and (
+        position is None or position == self.getCursorStore().positions.get(endpoint)):
+      # 커서가 그대로여도 레코드를 추가했으면 위치는 커밋 (다음 사이클에 잘리지 않도록)
+      committed = True
+    else:
+      if newSeqUpdate != currentSeqUpdate:
+        self.logger.info(f"  새로운 seqUpdate: {currentSeqUpdate} → {newSeqUpdate}")
+      committed = self.recordSeqUpdate(endpoint, newSeqUpdate, position)
+
+    if committed:
+      for filename, pending, seqUpdate, digests in deferred:
+        self.recordDuplicates(filename, pending)
+        self.recordIndicators(endpoint, seqUpdate, digests)
+    return committed
+
   def collectSingleEndpoint(self, endpointConfig: Dict[str, Any],
                             seqUpdates: Dict[str, int]) -> Tuple[bool, int]:
     """단일 엔드포인트 데이터 수집
 
+    drain 모드에서는 빈 페이지를 받거나 seqUpdate가 더 이상 변하지 않을 때까지
+    반환된 seqUpdate로 다음 페이지를 계속 요청합니다. 한 엔드포인트가 사이클을
+    독점하지 않도록 페이지 수/소요 시간 상한에 도달하면 다음 사이클로 넘깁니다.
+    파이프라인 모드에서는 남은 페이지가 모두 기록될 때까지 기다린 뒤 반환합니다.
+
     Args:
       endpointConfig: 엔드포인트 설정
-      seqUpdates: 현재 seqUpdate 딕셔너리
+      seqUpdates: 현재 seqUpdate 딕셔너리 (페이지마다 갱신)
 
     Returns:
       (성공 여부, 수집된 건수) 튜플
     """
-    url = endpointConfig['url']
     endpoint = endpointConfig['endpoint']
-    params = endpointConfig['params'].copy()
+    if self.stopEvent.is_set():
+      self.logger.info(f"  종료 요청으로 수집하지 않습니다: {endpoint}")
+      return False, 0
 
-    # 저장된 seqUpdate 로드 (기본값: 0)
-    currentSeqUpdate = seqUpdates.get(endpoint, 0)
+    pipeline = self.getPipeline()
+
+    try:
+      success, totalRecords, pageCount = self._collectPages(endpointConfig, seqUpdates, pipeline)
+    finally:
+      if pipeline is not None and not pipeline.wait(endpoint):
+        success = False
+
+    if not success:
+      self.metrics.endpointCollections.inc(endpoint, 'failure')
+      return False, totalRecords
 
-    # seqUpdate 파라미터 추가 (0이 아닌 경우만)
-    if currentSeqUpdate > 0:
-      params['seqUpdate'] = str(currentSeqUpdate)
-      self.logger.info(f"  seqUpdate: {currentSeqUpdate} (증분 수집)")
+    if pageCount > 1:
+      self.logger.info(f"  ✓ 수집 완료: {totalRecords}건 ({pageCount}페이지)")
     else:
-      self.logger.info(f"  seqUpdate: 0 (최초 수집)")
+      self.logger.info(f"  ✓ 수집 완료: {totalRecords}건")
 
-    # API 요청
-    response = self.fetchApi(url, params)
+    self.metrics.endpointCollections.inc(endpoint, 'success')
+    self.metrics.lastSuccess.set(endpoint, value=time.time())
+    return True, totalRecords
 
-    if response is None:
-      self.logger.error(f"  ✗ 수집 실패: {endpoint}")
-      return False, 0
+  def _collectPages(self, endpointConfig: Dict[str, Any], seqUpdates: Dict[str, int],
+                    pipeline: Optional['PagePipeline']) -> Tuple[bool, int, int]:
+    """엔드포인트 페이지 요청 루프
+
+    Returns:
+      (성공 여부, 수집된 건수, 페이지 수) 튜플
+    """
+    url = endpointConfig['url']
+    endpoint = endpointConfig['endpoint']
+    maxPages, maxSeconds = self.getDrainLimits(endpointConfig)
 
-    # 데이터 및 seqUpdate 추출
-    dataList, newSeqUpdate = self.extractDataAndSeqUpdate(response, endpoint)
+    startTime = time.monotonic()
+    pageCount = 0
+    totalRecords = 0
 
-    # 데이터 저장
-    saveSuccess = self.saveToJsonl(endpoint, dataList, newSeqUpdate)
+    tuner = self.getPageSizeTuner()
 
-    if saveSuccess:
-      # seqUpdate 업데이트
-      seqUpdates[endpoint] = newSeqUpdate
+    # 저장된 seqUpdate 로드 (기본값: 0). 파이프라인에서는 딕셔너리가 기록 후에 갱신됨
+    nextSeqUpdate = seqUpdates.get(endpoint, 0)
 
-      if newSeqUpdate != currentSeqUpdate:
-        self.logger.info(f"  새로운 seqUpdate: {currentSeqUpdate} → {newSeqUpdate}")
+    while True:
+      params = endpointConfig['params'].copy()
 
-      self.logger.info(f"  ✓ 수집 완료: {len(dataList)}건")
-      return True, len(dataList)
-    else:
-      return False, 0
+      # 학습한 페이지 크기 적용 (list.csv의 limit은 초기값)
+      if tuner is not None and 'limit' in params:
+        params['limit'] = str(tuner.getLimit(endpoint, int(params['limit']),
+                                             endpointConfig.get('minLimit'),
+                                             endpointConfig.get('maxLimit')))
 
-  def collectAllEndpoints(self) -> Dict[str, int]:
-    """모든 엔드포인트 순차 수집 (실패한 엔드포인트 우선 재시도)
+      currentSeqUpdate = nextSeqUpdate
+
+      # seqUpdate 파라미터 추가 (0이 아닌 경우만)
+      if currentSeqUpdate > 0:
+        params['seqUpdate'] = str(currentSeqUpdate)
+        self.logger.info(f"  seqUpdate: {currentSeqUpdate} (증분 수집)")
+      else:
+        self.logger.info(f"  seqUpdate: 0 (최초 수집)")
+
+      # API 요청 및 저장 (파이프라인에서는 저장을 기록 스레드에 예약)
+      self._pageTiming.last = None
+      if pipeline is not None:
+        pageResult = pipeline.collectPage(url, endpoint, params, seqUpdates)
+      else:
+        pageResult = self.collectPage(url, endpoint, params)
+
+      if pageResult is None:
+        return False, totalRecords, pageCount
+
+      itemCount, newSeqUpdate = pageResult
+
+      # 응답 시간/크기로 다음 페이지 크기 조정
+      timing = self._pageTiming.last
+      if tuner is not None and 'limit' in params and timing and timing['total'] is not None:
+        limit = int(params['limit'])
+        newLimit = tuner.update(endpoint, limit, itemCount, timing['total'], timing['bytes'])
+        if newLimit != limit:
+          self.logger.info(f"  페이지 크기 조정: {limit} → {newLimit}")
+
+      # seqUpdate 업데이트 (페이지 단위)
+      if pipeline is None:
+        if not self.commitSeqUpdate(endpoint, seqUpdates, newSeqUpdate):
+          # 커서를 저장하지 못했거나 다른 워커가 넘겨받은 엔드포인트는 더 이상 수집하지 않음
+          return False, totalRecords + itemCount, pageCount + 1
+      elif pipeline.hasFailed(endpoint):
+        # 이전 페이지 기록 실패: 이후 페이지는 기록되지 않으므로 요청 중단
+        return False, totalRecords, pageCount
+      nextSeqUpdate = newSeqUpdate
+
+      pageCount += 1
+      totalRecords += itemCount
+
+      if not self.drainMode:
+        break
+
+      # drain 종료 조건
+      if self.stopEvent.is_set():
+        self.logger.info(f"  종료 요청으로 drain을 멈춥니다. 나머지는 다음 실행에서 수집합니다.")
+        break
+      if itemCount == 0:
+        break
+      if newSeqUpdate == currentSeqUpdate:
+        self.logger.info(f"  seqUpdate가 변하지 않아 drain을 종료합니다.")
+        break
+      if pageCount >= maxPages:
+        self.logger.warning(f"  ⚠ 페이지 상한 도달 ({maxPages}페이지). 나머지는 다음 사이클에서 수집합니다.")
+        break
+      if time.monotonic() - startTime >= maxSeconds:
+        self.logger.warning(f"  ⚠ 시간 상한 도달 ({maxSeconds:.0f}초). 나머지는 다음 사이클에서 수집합니다.")
+        break
+
+    return True, totalRecords, pageCount
+
+  def collectAllEndpoints(self, endpoints: Optional[List[Dict[str, Any]]] = None) -> Dict[str, int]:
+    """모든 엔드포인트 수집 (실패한 엔드포인트 우선 재시도)
+
+    COLLECTION_ENGINE 설정에 따라 순차 수집(sync) 또는
+    asyncio 기반 동시 수집(async)을 수행합니다.
+
+    Args:
+      endpoints: 이번 사이클에 수집할 엔드포인트 (None이면 전체 또는 샤딩 모드에서 리스를 보유한
+        엔드포인트, 적응형 스케줄에서 사용)
 
     Returns:
       업데이트된 seqUpdate 딕셔너리
@@ -702,40 +2011,58 @@ class GroupIBCollector:
       self.logger.error("엔드포인트가 로드되지 않았습니다. loadEndpoints()를 먼저 호출하세요.")
       return {}
 
+    cycleStartTime = time.monotonic()
+
     # seqUpdate 로드
+    if endpoints is None:
+      endpoints = self.claimEndpoints()
+
     seqUpdates = self.loadSeqUpdate()
+    seqUpdates.update(self.loadLeaseCursors())
+    self.seqUpdates = seqUpdates
+    self.recoverOutputs()
+    for endpoint, seqUpdate in seqUpdates.items():
+      self.metrics.seqUpdate.set(endpoint, value=seqUpdate)
+
+    selectedPaths = {ep['endpoint'] for ep in endpoints}
 
     # 수집할 엔드포인트 목록 (실패한 엔드포인트 우선)
     endpointsToCollect = []
 
     # 1. 이전에 실패한 엔드포인트 우선 추가
-    if self.failedEndpoints:
-      self.logger.info(f"이전 사이클에서 실패한 {len(self.failedEndpoints)}개 엔드포인트를 우선 재시도합니다.")
-      endpointsToCollect.extend(self.failedEndpoints)
+    retryEndpoints = [ep for ep in self.failedEndpoints if ep['endpoint'] in selectedPaths]
+    if retryEndpoints:
+      self.logger.info(f"이전 사이클에서 실패한 {len(retryEndpoints)}개 엔드포인트를 우선 재시도합니다.")
+      endpointsToCollect.extend(retryEndpoints)
 
     # 2. 나머지 엔드포인트 추가 (중복 제거)
     failedEndpointPaths = {ep['endpoint'] for ep in self.failedEndpoints}
-    for ep in self.endpoints:
+    for ep in endpoints:
       if ep['endpoint'] not in failedEndpointPaths:
         endpointsToCollect.append(ep)
 
     totalEndpoints = len(endpointsToCollect)
     self.logger.info("")
     self.logger.info("=" * 40)
-    self.logger.info(f"수집 사이클 시작 ({totalEndpoints}개 엔드포인트)")
+    self.logger.info(f"수집 사이클 시작 ({totalEndpoints}개 엔드포인트, {self.collectionEngine} 엔진)")
     self.logger.info("=" * 40)
 
+    if self.collectionEngine == 'async':
+      # asyncio는 async 엔진을 쓸 때만 불러옴 (단발 실행의 시작 시간 단축)
+      from .engine import AsyncCollectionEngine
+      engine = AsyncCollectionEngine(self, self.maxConcurrency)
+      results = engine.run(endpointsToCollect, seqUpdates)
+    else:
+      results = self._collectSequential(endpointsToCollect, seqUpdates)
+    self.syncSinks()
+
     successCount = 0
     totalRecords = 0
-    newFailedEndpoints = []
-
-    for idx, endpointConfig in enumerate(endpointsToCollect, 1):
-      endpoint = endpointConfig['endpoint']
-
-      self.logger.info(f"\n[{idx}/{totalEndpoints}] {endpoint}")
-
-      success, recordCount = self.collectSingleEndpoint(endpointConfig, seqUpdates)
+    # 이번 사이클에 수집하지 않은 엔드포인트의 실패 기록은 유지
+    newFailedEndpoints = [ep for ep in self.failedEndpoints if ep['endpoint'] not in selectedPaths]
+    scheduler = self.getScheduler()
 
+    for endpointConfig, success, recordCount in results:
       if success:
         successCount += 1
         totalRecords += recordCount
@@ -743,21 +2070,117 @@ class GroupIBCollector:
         # 실패한 엔드포인트 기록
         newFailedEndpoints.append(endpointConfig)
 
-      # Rate Limit 방지를 위한 엔드포인트 간 대기
-      if idx < totalEndpoints:
-        time.sleep(self.rateLimitWait)
+      if scheduler is not None:
+        interval = scheduler.update(endpointConfig, success, recordCount)
+        self.metrics.pollInterval.set(endpointConfig['endpoint'], value=interval)
 
     # 실패한 엔드포인트 목록 업데이트
     self.failedEndpoints = newFailedEndpoints
 
+    cycleDuration = time.monotonic() - cycleStartTime
+    self.metrics.cycleDuration.observe(value=cycleDuration)
+    self.metrics.lastCycleDuration.set(value=cycleDuration)
+
     self.logger.info("")
     self.logger.info("=" * 40)
     self.logger.info(f"수집 사이클 완료")
     self.logger.info(f"  성공: {successCount}/{totalEndpoints} 엔드포인트")
     self.logger.info(f"  실패: {len(newFailedEndpoints)}/{totalEndpoints} 엔드포인트")
     self.logger.info(f"  총 수집: {totalRecords}건")
+    self.logger.info(f"  소요 시간: {cycleDuration:.1f}초")
+    if self.pdfPool is not None:
+      pdfStats = self.pdfPool.getStats()
+      self.logger.info(f"  PDF: 완료 {pdfStats['completed']}건, 실패 {pdfStats['failed']}건, "
+                       f"대기 {pdfStats['pending']}건")
     if newFailedEndpoints:
       self.logger.warning(f"  다음 사이클에서 실패한 엔드포인트를 재시도합니다.")
     self.logger.info("=" * 40)
 
+    # 엔드포인트별 다음 수집 시각 저장
+    if scheduler is not None:
+      try:
+        scheduler.save()
+      except OSError as e:
+        self.logger.warning(f"⚠ 수집 스케줄 저장 실패: {e}")
+
+    # 중복 제거 인덱스 보존 기간/항목 수 제한 적용
+    dedupIndex = self.getDedupIndex()
+    if dedupIndex is not None:
+      import sqlite3
+      try:
+        dedupIndex.prune()
+      except sqlite3.Error as e:
+        self.logger.warning(f"⚠ 중복 제거 인덱스 정리 실패: {e}")
+
+    # IOC 인덱스 delta가 쌓였으면 정렬된 index.bin에 병합
+    iocIndexWriter = self.getIocIndexWriter()
+    if iocIndexWriter is not None:
+      try:
+        iocIndexWriter.maybeCompact()
+      except (OSError, ValueError) as e:
+        self.logger.warning(f"⚠ IOC 인덱스 병합 실패: {e}")
+
     return seqUpdates
+
+  def requestStop(self) -> None:
+    """새 요청을 멈추도록 요청 (진행 중인 페이지는 기록과 커서 저장까지 마침)
+
+    신호 처리기에서 호출되므로 플래그만 설정합니다.
+    """
+    self.stopEvent.set()
+
+  def _collectSequential(self, endpointsToCollect: List[Dict[str, Any]],
+                         seqUpdates: Dict[str, int]) -> List[Tuple[Dict[str, Any], bool, int]]:
+    """엔드포인트 순차 수집 (sync 엔진)
+
+    Args:
+      endpointsToCollect: 수집할 엔드포인트 설정 리스트
+      seqUpdates: seqUpdate 딕셔너리
+
+    Returns:
+      (엔드포인트 설정, 성공 여부, 수집된 건수) 리스트
+    """
+    results = []
+    totalEndpoints = len(endpointsToCollect)
+
+    for idx, endpointConfig in enumerate(endpointsToCollect, 1):
+      endpoint = endpointConfig['endpoint']
+
+      self.logger.info(f"\n[{idx}/{totalEndpoints}] {endpoint}")
+
+      # 엔드포인트 간 간격은 공유 속도 제한기가 요청 단위로 조절
+      success, recordCount = self.collectSingleEndpoint(endpointConfig, seqUpdates)
+      results.append((endpointConfig, success, recordCount))
+
+    return results
+
+  def close(self, timeout: Optional[float] = None) -> None:
+    """남은 PDF 다운로드를 마치고 커넥션 풀 종료
+
+    Args:
+      timeout: PDF 다운로드 전체 최대 대기 시간(초). None이면 끝까지 대기
+    """
+    if self._pipeline is not None:
+      # 기록 스레드가 PDF 다운로드를 예약할 수 있으므로 PDF 풀보다 먼저 종료
+      self._pipeline.close()
+      self._pipeline = None
+    self.closeSinks()
+    if self.pdfPool is not None:
+      pending = self.pdfPool.pendingCount()
+      if pending:
+        self.logger.info(f"남은 PDF 다운로드 {pending}건 처리 중...")
+      self.pdfPool.close(timeout)
+    if self._cursorStore is not None:
+      self._cursorStore.close()
+    if self._dedupStore is not None:
+      self._dedupStore.close()
+    if self._iocIndexWriter is not None:
+      self._iocIndexWriter.close()
+    if self._leaseManager is not None:
+      # 정상 종료 시 리스를 반납하여 다른 워커가 TTL을 기다리지 않고 넘겨받도록 함
+      self._leaseManager.close()
+      self._leaseManager = None
+    if self.metricsServer is not None:
+      self.metricsServer.close()
+      self.metricsServer = None
+    self.transport.close()
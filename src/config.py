@@ -32,8 +32,108 @@ class Config:
   RATE_LIMIT_WAIT: int = int(os.getenv('RATE_LIMIT_WAIT', '1'))
   MAX_RETRIES: int = int(os.getenv('MAX_RETRIES', '3'))
 
+  # 적응형 속도 제한 설정 (AIMD)
+  RATE_LIMIT_ADAPTIVE: bool = os.getenv('RATE_LIMIT_ADAPTIVE', 'true').lower() == 'true'
+  RATE_LIMIT_MAX_RPS: float = float(os.getenv('RATE_LIMIT_MAX_RPS', '10'))
+  RATE_LIMIT_MIN_RPS: float = float(os.getenv('RATE_LIMIT_MIN_RPS', '0.05'))
+  RATE_LIMIT_INCREASE: float = float(os.getenv('RATE_LIMIT_INCREASE', '0.05'))
+  RATE_LIMIT_DECREASE: float = float(os.getenv('RATE_LIMIT_DECREASE', '0.5'))
+  RATE_LIMIT_MAX_PAUSE: float = float(os.getenv('RATE_LIMIT_MAX_PAUSE', '300'))
+
+  # 수집 엔진 설정 (sync / async)
+  COLLECTION_ENGINE: str = os.getenv('COLLECTION_ENGINE', 'sync')
+  MAX_CONCURRENCY: int = int(os.getenv('MAX_CONCURRENCY', '4'))
+
+  # PDF 백그라운드 다운로드 설정
+  PDF_WORKERS: int = int(os.getenv('PDF_WORKERS', '4'))
+  PDF_QUEUE_SIZE: int = int(os.getenv('PDF_QUEUE_SIZE', '1000'))
+  PDF_CHUNK_SIZE: int = int(os.getenv('PDF_CHUNK_SIZE', str(256 * 1024)))
+
+  # 스트리밍 파싱 설정
+  STREAMING_PARSE: bool = os.getenv('STREAMING_PARSE', 'false').lower() == 'true'
+  STREAMING_CHUNK_SIZE: int = int(os.getenv('STREAMING_CHUNK_SIZE', str(64 * 1024)))
+  STREAMING_SPOOL_SIZE: int = int(os.getenv('STREAMING_SPOOL_SIZE', str(8 * 1024 * 1024)))
+
+  # JSON 코덱 설정 (auto / orjson / stdlib)
+  JSON_CODEC: str = os.getenv('JSON_CODEC', 'auto')
+
+  # seqUpdate 저널 설정
+  CURSOR_JOURNAL: bool = os.getenv('CURSOR_JOURNAL', 'true').lower() == 'true'
+  JOURNAL_COMPACT_EVERY: int = int(os.getenv('JOURNAL_COMPACT_EVERY', '500'))
+  JOURNAL_FSYNC: bool = os.getenv('JOURNAL_FSYNC', 'true').lower() == 'true'
+
+  # 세그먼트 회전 설정 (엔드포인트별 JSONL 분할 및 압축)
+  SEGMENT_ROTATION: bool = os.getenv('SEGMENT_ROTATION', 'false').lower() == 'true'
+  SEGMENT_MAX_BYTES: int = int(os.getenv('SEGMENT_MAX_BYTES', str(256 * 1024 * 1024)))
+  SEGMENT_MAX_AGE_HOURS: float = float(os.getenv('SEGMENT_MAX_AGE_HOURS', '24'))
+  SEGMENT_COMPRESSION: str = os.getenv('SEGMENT_COMPRESSION', 'auto')
+
+  # 수집 시점 중복 제거 인덱스 설정
+  DEDUP_INDEX: bool = os.getenv('DEDUP_INDEX', 'false').lower() == 'true'
+  DEDUP_RETENTION_DAYS: float = float(os.getenv('DEDUP_RETENTION_DAYS', '30'))
+  DEDUP_MAX_ENTRIES: int = int(os.getenv('DEDUP_MAX_ENTRIES', '1000000'))
+
+  # 페이지 크기 자동 조정 설정 (엔드포인트별 limit)
+  PAGE_SIZE_AUTOTUNE: bool = os.getenv('PAGE_SIZE_AUTOTUNE', 'false').lower() == 'true'
+  PAGE_SIZE_TARGET_SECONDS: float = float(os.getenv('PAGE_SIZE_TARGET_SECONDS', '5'))
+  PAGE_SIZE_TARGET_BYTES: int = int(os.getenv('PAGE_SIZE_TARGET_BYTES', str(8 * 1024 * 1024)))
+  PAGE_SIZE_MIN: int = int(os.getenv('PAGE_SIZE_MIN', '10'))
+  PAGE_SIZE_MAX: int = int(os.getenv('PAGE_SIZE_MAX', '5000'))
+
+  # IOC 조회 인덱스 설정 (IOC_INDEX_ENDPOINTS: 경로에 포함될 문자열, 쉼표 구분)
+  IOC_INDEX: bool = os.getenv('IOC_INDEX', 'false').lower() == 'true'
+  IOC_INDEX_ENDPOINTS: list = [pattern.strip() for pattern in
+                               os.getenv('IOC_INDEX_ENDPOINTS',
+                                         'ioc/common,malware/cnc,suspicious_ip/scanner').split(',')
+                               if pattern.strip()]
+  IOC_INDEX_COMPACT_EVERY: int = int(os.getenv('IOC_INDEX_COMPACT_EVERY', '1000000'))
+
+  # 샤딩 수집 설정 (SHARD_WORKER_ID가 비어 있으면 호스트명-PID)
+  SHARD_MODE: bool = os.getenv('SHARD_MODE', 'false').lower() == 'true'
+  SHARD_WORKER_ID: str = os.getenv('SHARD_WORKER_ID', '')
+  LEASE_TTL_SECONDS: float = float(os.getenv('LEASE_TTL_SECONDS', '120'))
+
+  # 파이프라인 설정 (PIPELINE_WORKERS=0이면 디코딩을 요청 스레드에서 실행)
+  PIPELINE: bool = os.getenv('PIPELINE', 'false').lower() == 'true'
+  PIPELINE_WORKERS: int = int(os.getenv('PIPELINE_WORKERS', str(os.cpu_count() or 1)))
+  PIPELINE_QUEUE_SIZE: int = int(os.getenv('PIPELINE_QUEUE_SIZE', '8'))
+
+  # 출력 대상 설정 (jsonl, stdout, unix:<경로>, http(s)://... 쉼표 구분)
+  OUTPUT_SINKS: list = [spec.strip() for spec in os.getenv('OUTPUT_SINKS', 'jsonl').split(',')
+                        if spec.strip()]
+  SINK_BATCH_SIZE: int = int(os.getenv('SINK_BATCH_SIZE', '500'))
+  SINK_LINGER_MS: float = float(os.getenv('SINK_LINGER_MS', '200'))
+  SINK_MAX_BUFFERED: int = int(os.getenv('SINK_MAX_BUFFERED', '10000'))
+  SINK_ACK_TIMEOUT: float = float(os.getenv('SINK_ACK_TIMEOUT', '60'))
+
+  # JSONL 기록 설정 (fsync 정책: none, page, interval)
+  JSONL_FSYNC: str = os.getenv('JSONL_FSYNC', 'none').lower()
+  JSONL_FSYNC_INTERVAL: float = float(os.getenv('JSONL_FSYNC_INTERVAL', '1.0'))
+  JSONL_MAX_HANDLES: int = int(os.getenv('JSONL_MAX_HANDLES', '64'))
+
+  # 메트릭 엔드포인트 설정 (0이면 비활성화)
+  METRICS_PORT: int = int(os.getenv('METRICS_PORT', '0'))
+  METRICS_HOST: str = os.getenv('METRICS_HOST', '127.0.0.1')
+
+  # Drain 모드 설정 (엔드포인트별 seqUpdate 백로그 연속 수집)
+  DRAIN_MODE: bool = os.getenv('DRAIN_MODE', 'false').lower() == 'true'
+  DRAIN_MAX_PAGES: int = int(os.getenv('DRAIN_MAX_PAGES', '50'))
+  DRAIN_MAX_SECONDS: float = float(os.getenv('DRAIN_MAX_SECONDS', '300'))
+
   # 수집 사이클 설정 (분)
   WAIT_MINUTES: int = int(os.getenv('WAIT_MINUTES', '30'))
+  # 사이클이 주기보다 길어 놓친 시작 시각 처리 (coalesce: 바로 다음 사이클, skip: 다음 시작 시각까지 대기)
+  MISSED_CYCLES: str = os.getenv('MISSED_CYCLES', 'coalesce').lower()
+
+  # 종료 신호(SIGTERM/SIGINT) 후 강제 종료까지의 유예 시간 (초)
+  SHUTDOWN_GRACE_SECONDS: float = float(os.getenv('SHUTDOWN_GRACE_SECONDS', '30'))
+
+  # 적응형 수집 스케줄 설정 (엔드포인트별 다음 수집 시각)
+  ADAPTIVE_SCHEDULE: bool = os.getenv('ADAPTIVE_SCHEDULE', 'false').lower() == 'true'
+  SCHEDULE_MIN_MINUTES: float = float(os.getenv('SCHEDULE_MIN_MINUTES', '5'))
+  SCHEDULE_MAX_MINUTES: float = float(os.getenv('SCHEDULE_MAX_MINUTES', '360'))
+  SCHEDULE_TARGET_ITEMS: float = float(os.getenv('SCHEDULE_TARGET_ITEMS', '100'))
+  SCHEDULE_EWMA_ALPHA: float = float(os.getenv('SCHEDULE_EWMA_ALPHA', '0.3'))
 
   # 로그 레벨
   LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
@@ -44,6 +144,12 @@ class Config:
   OUTPUTS_DIR: str = os.path.join(DATA_DIR, 'outputs')
   LOGS_DIR: str = os.path.join(PROJECT_ROOT, 'logs')
   SEQ_UPDATE_FILE: str = os.path.join(DATA_DIR, 'seq_update.json')
+  SEQ_UPDATE_JOURNAL: str = os.path.join(DATA_DIR, 'seq_update.journal')
+  DEDUP_DIR: str = os.path.join(DATA_DIR, 'dedup')
+  EXPORT_DIR: str = os.path.join(DATA_DIR, 'parquet')
+  IOC_INDEX_DIR: str = os.path.join(DATA_DIR, 'ioc_index')
+  LEASE_DIR: str = os.path.join(DATA_DIR, 'leases')
+  BACKFILL_DIR: str = os.path.join(DATA_DIR, 'backfill')
   CSV_FILE: str = os.path.join(PROJECT_ROOT, 'list.csv')
 
   @classmethod
@@ -75,7 +181,66 @@ class Config:
       'REQUEST_TIMEOUT': cls.REQUEST_TIMEOUT,
       'RATE_LIMIT_WAIT': cls.RATE_LIMIT_WAIT,
       'MAX_RETRIES': cls.MAX_RETRIES,
+      'RATE_LIMIT_ADAPTIVE': cls.RATE_LIMIT_ADAPTIVE,
+      'RATE_LIMIT_MAX_RPS': cls.RATE_LIMIT_MAX_RPS,
+      'RATE_LIMIT_MIN_RPS': cls.RATE_LIMIT_MIN_RPS,
+      'RATE_LIMIT_INCREASE': cls.RATE_LIMIT_INCREASE,
+      'RATE_LIMIT_DECREASE': cls.RATE_LIMIT_DECREASE,
+      'RATE_LIMIT_MAX_PAUSE': cls.RATE_LIMIT_MAX_PAUSE,
+      'COLLECTION_ENGINE': cls.COLLECTION_ENGINE,
+      'MAX_CONCURRENCY': cls.MAX_CONCURRENCY,
+      'PDF_WORKERS': cls.PDF_WORKERS,
+      'PDF_QUEUE_SIZE': cls.PDF_QUEUE_SIZE,
+      'PDF_CHUNK_SIZE': cls.PDF_CHUNK_SIZE,
+      'STREAMING_PARSE': cls.STREAMING_PARSE,
+      'STREAMING_CHUNK_SIZE': cls.STREAMING_CHUNK_SIZE,
+      'STREAMING_SPOOL_SIZE': cls.STREAMING_SPOOL_SIZE,
+      'JSON_CODEC': cls.JSON_CODEC,
+      'CURSOR_JOURNAL': cls.CURSOR_JOURNAL,
+      'JOURNAL_COMPACT_EVERY': cls.JOURNAL_COMPACT_EVERY,
+      'JOURNAL_FSYNC': cls.JOURNAL_FSYNC,
+      'SEGMENT_ROTATION': cls.SEGMENT_ROTATION,
+      'SEGMENT_MAX_BYTES': cls.SEGMENT_MAX_BYTES,
+      'SEGMENT_MAX_AGE_HOURS': cls.SEGMENT_MAX_AGE_HOURS,
+      'SEGMENT_COMPRESSION': cls.SEGMENT_COMPRESSION,
+      'DEDUP_INDEX': cls.DEDUP_INDEX,
+      'DEDUP_RETENTION_DAYS': cls.DEDUP_RETENTION_DAYS,
+      'DEDUP_MAX_ENTRIES': cls.DEDUP_MAX_ENTRIES,
+      'PAGE_SIZE_AUTOTUNE': cls.PAGE_SIZE_AUTOTUNE,
+      'PAGE_SIZE_TARGET_SECONDS': cls.PAGE_SIZE_TARGET_SECONDS,
+      'PAGE_SIZE_TARGET_BYTES': cls.PAGE_SIZE_TARGET_BYTES,
+      'PAGE_SIZE_MIN': cls.PAGE_SIZE_MIN,
+      'PAGE_SIZE_MAX': cls.PAGE_SIZE_MAX,
+      'IOC_INDEX': cls.IOC_INDEX,
+      'IOC_INDEX_ENDPOINTS': cls.IOC_INDEX_ENDPOINTS,
+      'IOC_INDEX_COMPACT_EVERY': cls.IOC_INDEX_COMPACT_EVERY,
+      'SHARD_MODE': cls.SHARD_MODE,
+      'SHARD_WORKER_ID': cls.SHARD_WORKER_ID,
+      'LEASE_TTL_SECONDS': cls.LEASE_TTL_SECONDS,
+      'PIPELINE': cls.PIPELINE,
+      'PIPELINE_WORKERS': cls.PIPELINE_WORKERS,
+      'PIPELINE_QUEUE_SIZE': cls.PIPELINE_QUEUE_SIZE,
+      'OUTPUT_SINKS': cls.OUTPUT_SINKS,
+      'SINK_BATCH_SIZE': cls.SINK_BATCH_SIZE,
+      'SINK_LINGER_MS': cls.SINK_LINGER_MS,
+      'SINK_MAX_BUFFERED': cls.SINK_MAX_BUFFERED,
+      'SINK_ACK_TIMEOUT': cls.SINK_ACK_TIMEOUT,
+      'JSONL_FSYNC': cls.JSONL_FSYNC,
+      'JSONL_FSYNC_INTERVAL': cls.JSONL_FSYNC_INTERVAL,
+      'JSONL_MAX_HANDLES': cls.JSONL_MAX_HANDLES,
+      'METRICS_PORT': cls.METRICS_PORT,
+      'METRICS_HOST': cls.METRICS_HOST,
+      'DRAIN_MODE': cls.DRAIN_MODE,
+      'DRAIN_MAX_PAGES': cls.DRAIN_MAX_PAGES,
+      'DRAIN_MAX_SECONDS': cls.DRAIN_MAX_SECONDS,
       'WAIT_MINUTES': cls.WAIT_MINUTES,
+      'MISSED_CYCLES': cls.MISSED_CYCLES,
+      'SHUTDOWN_GRACE_SECONDS': cls.SHUTDOWN_GRACE_SECONDS,
+      'ADAPTIVE_SCHEDULE': cls.ADAPTIVE_SCHEDULE,
+      'SCHEDULE_MIN_MINUTES': cls.SCHEDULE_MIN_MINUTES,
+      'SCHEDULE_MAX_MINUTES': cls.SCHEDULE_MAX_MINUTES,
+      'SCHEDULE_TARGET_ITEMS': cls.SCHEDULE_TARGET_ITEMS,
+      'SCHEDULE_EWMA_ALPHA': cls.SCHEDULE_EWMA_ALPHA,
       'LOG_LEVEL': cls.LOG_LEVEL,
       'PROJECT_ROOT': cls.PROJECT_ROOT,
     }
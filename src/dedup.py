@@ -0,0 +1,235 @@
+"""
+Group-IB 수집 시점 중복 제거 인덱스 모듈
+
+*/updated 피드는 같은 data.id/data.hash 레코드를 seqUpdate가 바뀔 때마다, 또는
+커서를 잃은 뒤 다시 전달합니다. 엔드포인트별 SQLite 인덱스에 레코드 ID와 내용 해시를
+기록해 두고, ID와 내용이 모두 이전과 같은 레코드는 JSONL에 다시 쓰지 않습니다.
+- 내용 해시는 전달할 때마다 바뀌는 필드(항목별 seqUpdate, 갱신 시각)를 뺀 정규 JSON으로 계산
+  (JSON 코덱이나 키 순서가 바뀌어도 같은 해시)
+- 인덱스 파일: data/dedup/<엔드포인트>.sqlite
+- 보존 기간(retentionDays)과 최대 항목 수(maxEntries)로 크기 제한
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# SQLite 바인딩 변수 개수 제한(구버전 999)보다 작게 조회
+_QUERY_BATCH = 500
+
+# 내용이 같아도 다시 전달될 때마다 피드가 바꾸는 최상위 필드 (내용 해시에서 제외)
+VOLATILE_KEYS = frozenset(('seqUpdate', 'dateLastSeen', 'dateModified', 'updatedAt'))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+  recordId TEXT PRIMARY KEY,
+  contentHash BLOB NOT NULL,
+  lastSeen REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+
+def contentHash(payload: str) -> bytes:
+  """직렬화된 레코드의 내용 해시 (128비트 BLAKE2b)
+
+  Args:
+    payload: 레코드 JSON 문자열
+
+  Returns:
+    16바이트 해시
+  """
+  return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).digest()
+
+
+def canonicalJson(item: Any) -> str:
+  """내용 해시용 정규 직렬화 (VOLATILE_KEYS 제외, 키 정렬, 공백 없음)
+
+  JSON 코덱(orjson/stdlib)이나 API 응답의 키 순서와 관계없이 같은 내용은 같은 문자열이 됩니다.
+  """
+  if isinstance(item, dict):
+    item = {key: value for key, value in item.items() if key not in VOLATILE_KEYS}
+  return json.dumps(item, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+
+def recordKey(item: Any) -> Tuple[Optional[str], bytes]:
+  """중복 판별 키 생성 (data.id, 없으면 data.hash)
+
+  Args:
+    item: 데이터 항목
+
+  Returns:
+    (레코드 ID 또는 None, canonicalJson() 내용 해시) 튜플
+  """
+  recordId = None
+  if isinstance(item, dict):
+    recordId = item.get('id') or item.get('hash')
+  return (str(recordId) if recordId else None), contentHash(canonicalJson(item))
+
+
+class DedupIndex:
+  """엔드포인트별 레코드 ID → 내용 해시 인덱스
+
+  사용 순서:
+    keep, pending = index.check(name, [recordKey(item), ...])
+    ... keep이 True인 레코드만 파일에 기록 ...
+    index.record(name, pending)
+
+  파일 기록이 끝난 뒤에 record()를 호출하므로, 기록 도중 실패해도
+  인덱스에만 남고 파일에는 없는 레코드가 생기지 않습니다.
+  """
+
+  def __init__(self, indexDir: str, retentionDays: float = 30,
+               maxEntries: int = 0, logger: Optional[logging.Logger] = None):
+    """초기화 메서드
+
+    Args:
+      indexDir: 인덱스 파일 디렉토리
+      retentionDays: 마지막으로 본 뒤 이 기간(일)이 지난 항목은 prune()에서 삭제 (0이면 무제한)
+      maxEntries: 엔드포인트별 최대 항목 수, 초과분은 오래된 순으로 삭제 (0이면 무제한)
+      logger: 로거 (None이면 로그 출력 안 함)
+    """
+    self.indexDir = indexDir
+    self.retentionDays = retentionDays
+    self.maxEntries = maxEntries
+    self.logger = logger
+
+    os.makedirs(indexDir, exist_ok=True)
+
+    self._lock = threading.Lock()
+    self._connections: Dict[str, sqlite3.Connection] = {}
+    self._locks: Dict[str, threading.Lock] = {}
+
+  def _indexPath(self, name: str) -> str:
+    return os.path.join(self.indexDir, f"{name}.sqlite")
+
+  def _open(self, name: str) -> Tuple[sqlite3.Connection, threading.Lock]:
+    """엔드포인트 인덱스 연결과 락 반환 (처음 사용 시 생성)"""
+    with self._lock:
+      if name not in self._connections:
+        conn = sqlite3.connect(self._indexPath(name), check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(_SCHEMA)
+        conn.execute('CREATE INDEX IF NOT EXISTS recordsLastSeen ON records (lastSeen)')
+        conn.commit()
+        self._connections[name] = conn
+        self._locks[name] = threading.Lock()
+      return self._connections[name], self._locks[name]
+
+  def check(self, name: str, records: List[Tuple[Optional[str], bytes]]
+            ) -> Tuple[List[bool], List[Tuple[str, bytes]]]:
+    """기록할 레코드 판별 (인덱스는 변경하지 않음)
+
+    ID가 없는 레코드는 항상 기록합니다. 같은 페이지 안에서 반복되는 레코드도 한 번만 기록합니다.
+
+    Args:
+      name: 엔드포인트 이름 (JSONL 파일명에서 확장자를 뺀 값)
+      records: (레코드 ID 또는 None, contentHash() 값) 리스트
+
+    Returns:
+      (레코드별 기록 여부 리스트, record()에 넘길 (ID, 해시) 리스트) 튜플
+
+    Raises:
+      sqlite3.Error: 인덱스 조회 실패
+    """
+    recordIds = list({recordId for recordId, _ in records if recordId is not None})
+
+    known: Dict[str, bytes] = {}
+    if recordIds:
+      conn, lock = self._open(name)
+      with lock:
+        for start in range(0, len(recordIds), _QUERY_BATCH):
+          batch = recordIds[start:start + _QUERY_BATCH]
+          placeholders = ','.join('?' * len(batch))
+          rows = conn.execute(
+            f"SELECT recordId, contentHash FROM records WHERE recordId IN ({placeholders})", batch
+          )
+          known.update(rows)
+
+    keep = []
+    pending: Dict[str, bytes] = {}
+    for recordId, digest in records:
+      if recordId is None:
+        keep.append(True)
+        continue
+      keep.append(known.get(recordId) != digest)
+      known[recordId] = digest
+      pending[recordId] = digest
+
+    return keep, list(pending.items())
+
+  def record(self, name: str, pending: List[Tuple[str, bytes]]) -> None:
+    """기록한 레코드를 인덱스에 반영 (건너뛴 레코드는 lastSeen만 갱신)
+
+    Args:
+      name: 엔드포인트 이름
+      pending: check()가 반환한 (ID, 해시) 리스트
+
+    Raises:
+      sqlite3.Error: 인덱스 쓰기 실패
+    """
+    if not pending:
+      return
+
+    now = time.time()
+    conn, lock = self._open(name)
+    with lock:
+      with conn:
+        conn.executemany(
+          "INSERT OR REPLACE INTO records (recordId, contentHash, lastSeen) VALUES (?, ?, ?)",
+          [(recordId, digest, now) for recordId, digest in pending]
+        )
+
+  def prune(self) -> int:
+    """보존 기간이 지났거나 최대 항목 수를 넘는 항목 삭제 (모든 엔드포인트 인덱스)
+
+    Returns:
+      삭제된 항목 수
+
+    Raises:
+      sqlite3.Error: 인덱스 쓰기 실패
+    """
+    if not self.retentionDays and not self.maxEntries:
+      return 0
+
+    names = [filename[:-len('.sqlite')] for filename in os.listdir(self.indexDir)
+             if filename.endswith('.sqlite')]
+
+    removed = 0
+    for name in sorted(names):
+      conn, lock = self._open(name)
+      with lock:
+        with conn:
+          if self.retentionDays:
+            cutoff = time.time() - self.retentionDays * 86400
+            removed += conn.execute("DELETE FROM records WHERE lastSeen < ?", (cutoff,)).rowcount
+          if self.maxEntries:
+            removed += conn.execute(
+              "DELETE FROM records WHERE recordId IN "
+              "(SELECT recordId FROM records ORDER BY lastSeen DESC LIMIT -1 OFFSET ?)",
+              (self.maxEntries,)
+            ).rowcount
+
+    if removed and self.logger:
+      self.logger.info(f"  중복 제거 인덱스 정리: {removed}건 삭제")
+    return removed
+
+  def count(self, name: str) -> int:
+    """엔드포인트 인덱스 항목 수"""
+    conn, lock = self._open(name)
+    with lock:
+      return conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+  def close(self) -> None:
+    """모든 인덱스 연결 닫기"""
+    with self._lock:
+      for conn in self._connections.values():
+        conn.close()
+      self._connections.clear()
+      self._locks.clear()
@@ -0,0 +1,176 @@
+"""
+Group-IB PDF 백그라운드 다운로드 모듈
+
+JSONL 저장과 seqUpdate 갱신이 PDF 다운로드를 기다리지 않도록,
+다운로드 작업을 제한된 크기의 큐와 워커 스레드 풀에서 처리합니다.
+"""
+
+import time
+import queue
+import threading
+from typing import Callable, Optional, Any, Dict
+
+
+# 워커 종료 신호
+_STOP = object()
+
+
+class PdfDownloadPool:
+  """큐 기반 PDF 다운로드 워커 풀
+
+  큐가 가득 차면 submit()이 대기하므로 메모리 사용량이 제한됩니다.
+  같은 문서가 여러 번 제출되어도 처리 중인 문서는 중복 다운로드하지 않습니다.
+  close(timeout)의 제한 시간이 지나면 워커는 새 작업을 꺼내지 않고 종료합니다.
+  """
+
+  def __init__(self, downloadFunc: Callable[[str, str, str], bool],
+               workers: int, queueSize: int, logger: Optional[Any] = None):
+    """초기화 메서드
+
+    Args:
+      downloadFunc: (portalLink, documentId, endpoint)를 받아 성공 여부를 반환하는 함수
+      workers: 워커 스레드 수
+      queueSize: 대기열 최대 크기
+      logger: 로거 (선택)
+    """
+    self.downloadFunc = downloadFunc
+    self.logger = logger
+    self.queue = queue.Queue(maxsize=max(1, queueSize))
+
+    self._lock = threading.Lock()
+    self._pending = set()
+    self._closed = False
+    self._stop = threading.Event()
+    self.stats = {'submitted': 0, 'completed': 0, 'failed': 0}
+
+    self._threads = []
+    for n in range(max(1, workers)):
+      thread = threading.Thread(target=self._worker, name=f"pdf-worker-{n}", daemon=True)
+      thread.start()
+      self._threads.append(thread)
+
+  def submit(self, portalLink: str, documentId: str, endpoint: str) -> bool:
+    """다운로드 작업 제출 (큐가 가득 차면 빈 자리가 날 때까지 대기)
+
+    Args:
+      portalLink: PDF 다운로드 링크
+      documentId: 문서 ID
+      endpoint: 엔드포인트 경로
+
+    Returns:
+      새로 제출되었으면 True, 이미 처리 중이거나 풀이 닫혔으면 False
+    """
+    key = (endpoint, documentId)
+    with self._lock:
+      if self._closed or key in self._pending:
+        return False
+      self._pending.add(key)
+      self.stats['submitted'] += 1
+
+    self.queue.put((portalLink, documentId, endpoint))
+    return True
+
+  def _worker(self) -> None:
+    """큐에서 작업을 꺼내 다운로드 수행"""
+    while True:
+      task = self.queue.get()
+      try:
+        if self._stop.is_set():
+          # 종료 제한 시간이 지난 뒤 꺼낸 작업은 다운로드하지 않고,
+          # 대기열 크기만큼만 넣은 종료 신호를 다음 워커에 전달
+          if task is not _STOP:
+            self._discard(task)
+          self._passStop()
+          return
+        if task is _STOP:
+          return
+
+        portalLink, documentId, endpoint = task
+        try:
+          success = self.downloadFunc(portalLink, documentId, endpoint)
+        except Exception as e:
+          success = False
+          if self.logger:
+            self.logger.warning(f"  PDF 워커 오류: {documentId} - {e}")
+
+        with self._lock:
+          self._pending.discard((endpoint, documentId))
+          self.stats['completed' if success else 'failed'] += 1
+      finally:
+        self.queue.task_done()
+
+  def _passStop(self) -> None:
+    """종료 신호를 대기열에 다시 넣기 (가득 차 있으면 다른 워커가 전달)"""
+    try:
+      self.queue.put_nowait(_STOP)
+    except queue.Full:
+      pass
+
+  def _discard(self, task: Any) -> None:
+    """다운로드하지 않고 버린 작업을 처리 중 목록에서 제거"""
+    portalLink, documentId, endpoint = task
+    with self._lock:
+      self._pending.discard((endpoint, documentId))
+
+  def pendingCount(self) -> int:
+    """대기 중이거나 처리 중인 작업 수"""
+    with self._lock:
+      return len(self._pending)
+
+  def getStats(self) -> Dict[str, int]:
+    """누적 처리 통계 반환"""
+    with self._lock:
+      stats = dict(self.stats)
+      stats['pending'] = len(self._pending)
+      return stats
+
+  def join(self) -> None:
+    """제출된 모든 작업이 끝날 때까지 대기"""
+    self.queue.join()
+
+  def close(self, timeout: Optional[float] = None) -> None:
+    """남은 작업을 처리한 뒤 워커 종료
+
+    종료 신호 등록과 워커 대기가 하나의 제한 시간을 공유합니다.
+    제한 시간이 지나면 대기열에 남은 작업을 버리고, 워커는 진행 중인
+    다운로드만 마친 뒤 새 작업을 꺼내지 않고 종료합니다.
+
+    Args:
+      timeout: 전체 최대 대기 시간(초). None이면 남은 작업을 모두 처리할 때까지 대기
+    """
+    with self._lock:
+      if self._closed:
+        return
+      self._closed = True
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    def remaining() -> Optional[float]:
+      return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+    try:
+      for _ in self._threads:
+        self.queue.put(_STOP, timeout=remaining())
+    except queue.Full:
+      pass
+    for thread in self._threads:
+      thread.join(remaining())
+
+    if not any(thread.is_alive() for thread in self._threads):
+      return
+
+    # 제한 시간 초과: 워커가 새 작업을 꺼내지 않도록 중단하고 대기열 정리
+    self._stop.set()
+    dropped = 0
+    while True:
+      try:
+        task = self.queue.get_nowait()
+      except queue.Empty:
+        break
+      if task is not _STOP:
+        self._discard(task)
+        dropped += 1
+      self.queue.task_done()
+    self._passStop()
+    if dropped and self.logger:
+      self.logger.warning(f"⚠ 종료 제한 시간 초과로 PDF 다운로드 {dropped}건을 건너뜁니다")
@@ -0,0 +1,87 @@
+"""
+Group-IB API 비동기 수집 엔진 모듈
+
+asyncio 이벤트 루프에서 엔드포인트들을 동시에 수집합니다.
+HTTP 클라이언트(requests)는 블로킹 방식이므로 각 엔드포인트 수집은 전용 스레드 풀에서
+실행되고, 전역 동시 실행 수는 세마포어로, 요청 속도는 collector의 공유 RateLimiter로
+제한됩니다.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Any
+
+
+class AsyncCollectionEngine:
+  """엔드포인트 동시 수집 엔진
+
+  GroupIBCollector.collectSingleEndpoint를 그대로 재사용하므로
+  seqUpdates 딕셔너리 계약과 JSONL 출력 형식은 순차 엔진과 동일합니다.
+  """
+
+  def __init__(self, collector: Any, maxConcurrency: int):
+    """초기화 메서드
+
+    Args:
+      collector: GroupIBCollector 인스턴스
+      maxConcurrency: 동시에 수집할 최대 엔드포인트 수
+    """
+    self.collector = collector
+    self.maxConcurrency = max(1, maxConcurrency)
+
+  async def _collectOne(self, semaphore: asyncio.Semaphore,
+                        executor: ThreadPoolExecutor,
+                        idx: int, total: int,
+                        endpointConfig: Dict[str, Any],
+                        seqUpdates: Dict[str, int]) -> Tuple[Dict[str, Any], bool, int]:
+    """세마포어 안에서 단일 엔드포인트 수집
+
+    Returns:
+      (엔드포인트 설정, 성공 여부, 수집된 건수) 튜플
+    """
+    endpoint = endpointConfig['endpoint']
+    loop = asyncio.get_running_loop()
+
+    async with semaphore:
+      self.collector.logger.info(f"\n[{idx}/{total}] {endpoint}")
+      # 예외(AuthenticationError 등)는 순차 엔진과 동일하게 호출자에게 전파
+      success, recordCount = await loop.run_in_executor(
+        executor, self.collector.collectSingleEndpoint, endpointConfig, seqUpdates
+      )
+
+    return endpointConfig, success, recordCount
+
+  async def collect(self, endpointsToCollect: List[Dict[str, Any]],
+                    seqUpdates: Dict[str, int]) -> List[Tuple[Dict[str, Any], bool, int]]:
+    """모든 엔드포인트를 동시에 수집
+
+    Args:
+      endpointsToCollect: 수집할 엔드포인트 설정 리스트 (우선순위 순)
+      seqUpdates: seqUpdate 딕셔너리 (엔드포인트별로 갱신됨)
+
+    Returns:
+      입력 순서와 동일한 (엔드포인트 설정, 성공 여부, 수집된 건수) 리스트
+    """
+    semaphore = asyncio.Semaphore(self.maxConcurrency)
+    total = len(endpointsToCollect)
+
+    with ThreadPoolExecutor(max_workers=self.maxConcurrency,
+                            thread_name_prefix="collector") as executor:
+      tasks = [
+        self._collectOne(semaphore, executor, idx, total, endpointConfig, seqUpdates)
+        for idx, endpointConfig in enumerate(endpointsToCollect, 1)
+      ]
+      return await asyncio.gather(*tasks)
+
+  def run(self, endpointsToCollect: List[Dict[str, Any]],
+          seqUpdates: Dict[str, int]) -> List[Tuple[Dict[str, Any], bool, int]]:
+    """동기 코드에서 호출하는 진입점
+
+    Args:
+      endpointsToCollect: 수집할 엔드포인트 설정 리스트
+      seqUpdates: seqUpdate 딕셔너리
+
+    Returns:
+      (엔드포인트 설정, 성공 여부, 수집된 건수) 리스트
+    """
+    return asyncio.run(self.collect(endpointsToCollect, seqUpdates))
@@ -0,0 +1,447 @@
+"""
+Group-IB 수집 데이터 Parquet 내보내기 모듈
+
+data/outputs의 JSONL 레코드(회전된 세그먼트 포함)를 엔드포인트/날짜별로 분할된 Parquet 파일로
+증분 내보냅니다.
+- 출력: <exportDir>/endpoint=<이름>/date=<YYYY-MM-DD>/part-<원본>-<오프셋>-<번호>.parquet
+- envelope 필드는 _timestamp, _source, _endpoint, _seqUpdate 컬럼으로,
+  data의 최상위 필드는 같은 이름의 컬럼으로 평탄화 (중첩 값은 JSON 문자열)
+- 워터마크(<exportDir>/_watermarks.json)에 데이터셋별 처리 위치를 기록하여 새 레코드만 처리
+  (활성 파일은 바이트 오프셋, 세그먼트는 파일 단위, 회전 경계는 seqUpdate로 판별)
+- 커서 저널(seq_update.journal, seq_update.positions.json)에 출력 위치가 있으면 활성 파일은
+  커서와 함께 커밋된 위치까지만 읽음 (재시작 시 잘려 나갈 수 있는 커밋되지 않은 꼬리는 내보내지 않음)
+
+사용법:
+  python main.py export [--outputs DIR] [--export-dir DIR] [--batch-rows N]
+
+pyarrow 패키지가 필요합니다 (pip install pyarrow).
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .codec import JsonCodec
+from .scanner import findDatasets
+from .journal import CursorJournal
+from .segments import openSegment, extractSeqUpdate, closedSegmentCount
+
+# 선택 의존성 (수집 실행의 시작 시간/메모리에 영향을 주지 않도록 내보내기 시점에 불러옴)
+pa = None
+pq = None
+
+
+WATERMARK_FILENAME = '_watermarks.json'
+BATCH_ROWS = 100000
+
+ENVELOPE_COLUMNS = {
+  'timestamp': '_timestamp',
+  'source': '_source',
+  'endpoint': '_endpoint',
+  'seqUpdate': '_seqUpdate'
+}
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+_SEGMENT_SUFFIX = re.compile(r'\.jsonl(\.gz|\.zst)?$')
+
+_ARROW_TYPES = {'bool': 'bool_', 'int64': 'int64', 'float64': 'float64', 'string': 'string'}
+
+
+def loadPyarrow() -> None:
+  """pyarrow를 처음 사용할 때 불러오기
+
+  Raises:
+    RuntimeError: pyarrow가 설치되지 않은 경우
+  """
+  global pa, pq
+  if pa is not None:
+    return
+  try:
+    import pyarrow
+    import pyarrow.parquet
+  except ImportError:
+    raise RuntimeError("Parquet 내보내기에는 pyarrow 패키지가 필요합니다 (pip install pyarrow).")
+  pa, pq = pyarrow, pyarrow.parquet
+
+
+def _isInt64(value: Any) -> bool:
+  return (isinstance(value, int) and not isinstance(value, bool)
+          and _INT64_MIN <= value <= _INT64_MAX)
+
+
+def flattenRecord(record: Dict[str, Any], codec: JsonCodec) -> Dict[str, Any]:
+  """envelope 레코드를 한 행으로 평탄화
+
+  Args:
+    record: JSONL 레코드 ({timestamp, source, endpoint, seqUpdate, data})
+    codec: 중첩 값 직렬화용 코덱
+
+  Returns:
+    {컬럼명: 스칼라 값} 딕셔너리
+  """
+  row = {column: record.get(field) for field, column in ENVELOPE_COLUMNS.items()}
+  data = record.get('data')
+  if isinstance(data, dict):
+    for key, value in data.items():
+      if isinstance(value, (dict, list)):
+        value = codec.dumps(value)
+      row[key] = value
+  elif data is not None:
+    row['data'] = codec.dumps(data)
+  return row
+
+
+def inferType(values: List[Any]) -> str:
+  """컬럼 값들의 Parquet 타입 결정 ('bool', 'int64', 'float64', 'string')"""
+  kinds = set()
+  for value in values:
+    if value is None:
+      continue
+    if isinstance(value, bool):
+      kinds.add('bool')
+    elif _isInt64(value):
+      kinds.add('int64')
+    elif isinstance(value, float):
+      kinds.add('float64')
+    else:
+      kinds.add('string')
+
+  if kinds == {'bool'}:
+    return 'bool'
+  if kinds and kinds <= {'int64', 'float64'}:
+    return 'float64' if 'float64' in kinds else 'int64'
+  return 'string'
+
+
+def coerceValue(value: Any, columnType: str, codec: JsonCodec) -> Tuple[Any, bool]:
+  """값을 컬럼 타입에 맞게 변환
+
+  Returns:
+    (변환된 값 또는 None, 타입 불일치 여부) 튜플
+  """
+  if value is None:
+    return None, False
+  if columnType == 'string':
+    return value if isinstance(value, str) else codec.dumps(value), False
+  if columnType == 'bool':
+    return (value, False) if isinstance(value, bool) else (None, True)
+  if columnType == 'int64':
+    return (value, False) if _isInt64(value) else (None, True)
+  if columnType == 'float64':
+    if isinstance(value, float) or _isInt64(value):
+      return float(value), False
+    return None, True
+  return None, True
+
+
+def segmentKey(path: str) -> str:
+  """세그먼트 식별자 (압축 전/후 파일이 같은 값을 갖도록 확장자 제거)"""
+  return _SEGMENT_SUFFIX.sub('', os.path.basename(path))
+
+
+def loadCommittedPositions(seqUpdateFile: str) -> Dict[str, Dict[str, Any]]:
+  """커서와 함께 커밋된 출력 위치를 JSONL 파일명별로 로드
+
+  Args:
+    seqUpdateFile: 커서 스냅샷 파일 경로 (seq_update.json)
+
+  Returns:
+    {JSONL 파일명: {'file', 'segments', 'offset'}} 딕셔너리 (위치를 추적하지 않으면 빈 딕셔너리)
+
+  Raises:
+    OSError, ValueError: 스냅샷/위치 파일을 읽을 수 없는 경우
+  """
+  journal = CursorJournal(seqUpdateFile, compactEvery=0, fsync=False)
+  journal.load()
+  return {position['file']: position for position in journal.positions.values()
+          if 'file' in position}
+
+
+def committedLimit(outputsDir: str, position: Optional[Dict[str, Any]]) -> Optional[int]:
+  """활성 파일에서 내보낼 수 있는 마지막 바이트 위치
+
+  Args:
+    outputsDir: JSONL 출력 디렉토리
+    position: loadCommittedPositions()의 데이터셋 위치 (None이면 제한 없음)
+
+  Returns:
+    커밋된 활성 파일 크기, 커밋 후 회전되었으면 0, 판단할 수 없으면 None
+
+  Raises:
+    OSError, ValueError: manifest를 읽을 수 없는 경우
+  """
+  if position is None:
+    return None
+  segments = closedSegmentCount(outputsDir, position['file'])
+  if segments == position['segments']:
+    return position['offset']
+  # 커밋 뒤에 회전된 새 활성 파일은 아직 커밋되지 않음 (세그먼트가 줄었으면 판단하지 않음)
+  return 0 if segments > position['segments'] else None
+
+
+def iterNewLines(paths: List[str], outputsDir: str, state: Dict[str, Any],
+                 limit: Optional[int] = None) -> Iterator[Tuple[str, int, str]]:
+  """데이터셋에서 아직 내보내지 않은 레코드 줄 반환
+
+  처리한 만큼 state(워터마크)를 갱신합니다. 활성 파일은 마지막 완성된 줄까지만 읽습니다.
+
+  Args:
+    paths: findDatasets()가 반환한 데이터셋 파일 목록 (세그먼트 순서, 활성 파일은 마지막)
+    outputsDir: JSONL 출력 디렉토리 (활성 파일 판별용)
+    state: 데이터셋 워터마크 {'segments': [...], 'offset': n, 'inode': n, 'generation': n, 'seqUpdate': n}
+    limit: 활성 파일에서 읽을 최대 바이트 위치 (committedLimit(), None이면 파일 끝까지)
+
+  Yields:
+    (원본 식별자, 시작 오프셋, 레코드 줄) 튜플
+  """
+  exportedSegments = set(state.setdefault('segments', []))
+
+  outputsDir = os.path.normpath(outputsDir)
+  for path in paths:
+    if os.path.normpath(os.path.dirname(path)) == outputsDir:
+      yield from _iterActiveLines(path, state, limit)
+      continue
+
+    key = segmentKey(path)
+    if key in exportedSegments:
+      continue
+    # 회전 전에 활성 파일에서 내보낸 부분은 seqUpdate로 건너뜀
+    watermarkSeq = state.get('seqUpdate')
+    with openSegment(path) as f:
+      for line in f:
+        seqUpdate = extractSeqUpdate(line)
+        if watermarkSeq is not None and seqUpdate is not None and seqUpdate <= watermarkSeq:
+          continue
+        yield key, 0, line
+        if seqUpdate is not None:
+          state['seqUpdate'] = max(seqUpdate, state.get('seqUpdate') or seqUpdate)
+    exportedSegments.add(key)
+    state['segments'].append(key)
+
+
+def _iterActiveLines(path: str, state: Dict[str, Any],
+                     limit: Optional[int] = None) -> Iterator[Tuple[str, int, str]]:
+  """활성 파일의 새 줄 (같은 파일이면 오프셋부터, 회전된 새 파일이면 처음부터 seqUpdate로 판별)"""
+  stat = os.stat(path)
+  offset = state.get('offset', 0)
+  sameFile = (state.get('inode') == stat.st_ino and stat.st_size >= offset
+              and (limit is None or limit >= offset))
+  if not sameFile:
+    # 회전 등으로 새 파일: 파일 이름이 겹치지 않도록 세대 번호 증가 (inode는 재사용될 수 있음)
+    # 커밋된 위치가 워터마크보다 앞이면 꼬리가 잘린 뒤 다시 자란 파일이므로 같은 방식으로 처리
+    state['generation'] = state.get('generation', 0) + 1
+    state['offset'] = 0
+  offset = state['offset']
+  startOffset = offset
+  watermarkSeq = None if sameFile else state.get('seqUpdate')
+  key = f"active{state['generation']}"
+
+  with open(path, 'rb') as f:
+    f.seek(offset)
+    for raw in f:
+      if not raw.endswith(b'\n'):
+        break  # 쓰는 중인 마지막 줄은 다음 실행에서 처리
+      if limit is not None and offset + len(raw) > limit:
+        break  # 커서가 커밋되지 않은 줄은 다음 실행에서 처리
+      offset += len(raw)
+      line = raw.decode('utf-8', 'replace')
+      seqUpdate = extractSeqUpdate(line)
+      if watermarkSeq is not None and seqUpdate is not None and seqUpdate <= watermarkSeq:
+        continue
+      yield key, startOffset, line
+      if seqUpdate is not None:
+        state['seqUpdate'] = max(seqUpdate, state.get('seqUpdate') or seqUpdate)
+
+  state['inode'] = stat.st_ino
+  state['offset'] = offset
+
+
+class ParquetExporter:
+  """데이터셋별 증분 Parquet 내보내기"""
+
+  def __init__(self, outputsDir: str, exportDir: str, batchRows: int = BATCH_ROWS,
+               codec: Optional[JsonCodec] = None, compression: str = 'zstd',
+               seqUpdateFile: Optional[str] = None):
+    """초기화 메서드
+
+    Args:
+      outputsDir: JSONL 출력 디렉토리
+      exportDir: Parquet 출력 디렉토리
+      batchRows: Parquet 파일 하나에 담을 최대 행 수
+      codec: JSON 코덱 (None이면 auto)
+      compression: Parquet 압축 방식
+      seqUpdateFile: 커서 스냅샷 파일 경로 (None이면 활성 파일을 끝까지 읽음)
+
+    Raises:
+      RuntimeError: pyarrow가 설치되지 않은 경우
+    """
+    loadPyarrow()
+
+    self.outputsDir = outputsDir
+    self.exportDir = exportDir
+    self.batchRows = max(1, batchRows)
+    self.codec = codec or JsonCodec()
+    self.compression = compression
+    self.seqUpdateFile = seqUpdateFile
+    self.watermarkFile = os.path.join(exportDir, WATERMARK_FILENAME)
+
+  def loadWatermarks(self) -> Dict[str, Any]:
+    if not os.path.exists(self.watermarkFile):
+      return {}
+    with open(self.watermarkFile, 'r', encoding='utf-8') as f:
+      return json.load(f)
+
+  def saveWatermarks(self, watermarks: Dict[str, Any]) -> None:
+    tempFile = self.watermarkFile + '.tmp'
+    with open(tempFile, 'w', encoding='utf-8') as f:
+      json.dump(watermarks, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(tempFile, self.watermarkFile)
+
+  def exportAll(self) -> Dict[str, Dict[str, int]]:
+    """모든 데이터셋 증분 내보내기 (데이터셋마다 워터마크 저장)
+
+    Returns:
+      {데이터셋 이름: {'records', 'files', 'malformed', 'typeMismatches'}} 딕셔너리
+
+    Raises:
+      OSError, ValueError: 파일을 읽거나 쓸 수 없는 경우
+    """
+    os.makedirs(self.exportDir, exist_ok=True)
+    watermarks = self.loadWatermarks()
+    # 활성 파일 크기보다 먼저 읽어야 커밋된 위치가 파일 안에 있음
+    positions = loadCommittedPositions(self.seqUpdateFile) if self.seqUpdateFile else {}
+    report = {}
+
+    for name, paths in sorted(findDatasets(self.outputsDir).items()):
+      state = watermarks.setdefault(name, {})
+      limit = committedLimit(self.outputsDir, positions.get(name + '.jsonl'))
+      report[name] = self.exportDataset(name, paths, state, limit)
+      self.saveWatermarks(watermarks)
+
+    return report
+
+  def exportDataset(self, name: str, paths: List[str], state: Dict[str, Any],
+                    limit: Optional[int] = None) -> Dict[str, int]:
+    """데이터셋 하나의 새 레코드 내보내기 (limit: 활성 파일에서 읽을 최대 바이트 위치)
+
+    파일 이름은 (원본, 시작 오프셋, 번호)로 정해지므로, 워터마크 저장 전에 중단되어
+    다시 실행해도 같은 파일을 덮어쓸 뿐 중복 행이 생기지 않습니다.
+    """
+    stats = {'records': 0, 'files': 0, 'malformed': 0, 'typeMismatches': 0}
+    schema = state.setdefault('schema', {})
+    # 날짜별 대기 행과 원본별 파일 번호
+    pending: Dict[str, List[Dict[str, Any]]] = {}
+    partNumbers: Dict[Tuple[str, int], int] = {}
+    current = None
+
+    def flush(date: str) -> None:
+      rows = pending.pop(date, [])
+      if not rows:
+        return
+      source, startOffset = current
+      number = partNumbers.get(current, 0)
+      partNumbers[current] = number + 1
+      self._writePart(name, date, f"part-{source}-{startOffset}-{number:05d}", rows, schema, stats)
+
+    for source, startOffset, line in iterNewLines(paths, self.outputsDir, state, limit):
+      if current != (source, startOffset):
+        for date in list(pending):
+          flush(date)
+        current = (source, startOffset)
+
+      try:
+        record = self.codec.loads(line)
+      except ValueError:
+        stats['malformed'] += 1
+        continue
+      if not isinstance(record, dict):
+        stats['malformed'] += 1
+        continue
+
+      row = flattenRecord(record, self.codec)
+      date = str(row.get('_timestamp') or '')[:10] or 'unknown'
+      pending.setdefault(date, []).append(row)
+      stats['records'] += 1
+      if len(pending[date]) >= self.batchRows:
+        flush(date)
+
+    for date in list(pending):
+      flush(date)
+    return stats
+
+  def _writePart(self, name: str, date: str, stem: str, rows: List[Dict[str, Any]],
+                 schema: Dict[str, str], stats: Dict[str, int]) -> None:
+    """행 묶음을 Parquet 파일로 기록 (임시 파일에 쓴 뒤 원자적 교체)
+
+    컬럼 타입은 처음 본 묶음에서 정해져 워터마크에 저장되며, 이후 타입이 맞지 않는 값은
+    null로 기록하고 typeMismatches에 집계합니다 (문자열 컬럼은 모든 값을 문자열로 저장).
+    """
+    columns: Dict[str, List[Any]] = {}
+    for index, row in enumerate(rows):
+      for column, value in row.items():
+        columns.setdefault(column, [None] * index).append(value)
+      for values in columns.values():
+        if len(values) <= index:
+          values.append(None)
+
+    arrays = {}
+    for column in sorted(columns, key=lambda c: (not c.startswith('_'), c)):
+      values = columns[column]
+      if column not in schema:
+        schema[column] = inferType(values)
+      columnType = schema[column]
+      coerced = []
+      for value in values:
+        value, mismatch = coerceValue(value, columnType, self.codec)
+        stats['typeMismatches'] += mismatch
+        coerced.append(value)
+      arrays[column] = pa.array(coerced, type=getattr(pa, _ARROW_TYPES[columnType])())
+
+    partitionDir = os.path.join(self.exportDir, f"endpoint={name}", f"date={date}")
+    os.makedirs(partitionDir, exist_ok=True)
+    path = os.path.join(partitionDir, stem + '.parquet')
+    tempPath = path + '.tmp'
+    pq.write_table(pa.table(arrays), tempPath, compression=self.compression)
+    os.replace(tempPath, path)
+    stats['files'] += 1
+
+
+def addArguments(parser: argparse.ArgumentParser) -> None:
+  """export 하위 명령 인자 등록"""
+  parser.add_argument('--outputs', default=None,
+                      help='JSONL 출력 디렉토리 (기본값: data/outputs)')
+  parser.add_argument('--export-dir', default=None,
+                      help='Parquet 출력 디렉토리 (기본값: data/parquet)')
+  parser.add_argument('--batch-rows', type=int, default=BATCH_ROWS,
+                      help='Parquet 파일 하나의 최대 행 수')
+
+
+def runExport(args: argparse.Namespace, defaultOutputsDir: str, defaultExportDir: str,
+              seqUpdateFile: Optional[str] = None) -> int:
+  """export 하위 명령 실행 (seqUpdateFile: 커밋된 위치를 읽을 커서 스냅샷 파일)
+
+  Returns:
+    종료 코드 (0: 성공, 2: 실패)
+  """
+  outputsDir = args.outputs or defaultOutputsDir
+  exportDir = args.export_dir or defaultExportDir
+  try:
+    report = ParquetExporter(outputsDir, exportDir, args.batch_rows,
+                             seqUpdateFile=seqUpdateFile).exportAll()
+  except (RuntimeError, OSError, ValueError) as e:
+    print(f"✗ 내보내기 실패: {e}", file=sys.stderr)
+    return 2
+
+  print(f"Parquet 내보내기: {outputsDir} → {exportDir}")
+  for name, stats in report.items():
+    line = f"  {name}: {stats['records']:,}건, 파일 {stats['files']}개"
+    if stats['malformed']:
+      line += f", 손상된 줄 {stats['malformed']}건"
+    if stats['typeMismatches']:
+      line += f", 타입 불일치 {stats['typeMismatches']}건"
+    print(line)
+  return 0
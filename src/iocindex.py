@@ -0,0 +1,525 @@
+"""
+Group-IB IOC 조회 인덱스 모듈
+
+ioc/common, malware/cnc, suspicious_ip/scanner 등의 레코드에서 지표(IP, 도메인, URL, 해시)를
+추출하여 "이 값을 본 적이 있는가?"를 마이크로초 단위로 답하는 인덱스를 유지합니다.
+- index.bin: (지표 해시, 엔드포인트 ID, seqUpdate) 고정 길이 레코드를 해시 순으로 정렬한 파일
+  (첫 바이트별 fanout 테이블 + 이진 탐색, mmap으로 열어 프로세스 간 페이지 캐시 공유)
+- delta.bin: 수집 중 추가된 레코드 (정렬되지 않음, 압축 시 index.bin에 병합)
+- endpoints.json: 엔드포인트 ID → 경로 목록
+
+사용법:
+  python main.py ioc 1.2.3.4 evil.example.com      # 단건/여러 건 조회
+  python main.py ioc --file indicators.txt --json  # 파일(또는 -: stdin)에서 일괄 조회
+  python main.py ioc --rebuild                     # 수집 데이터에서 인덱스 재구축
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+import hashlib
+import argparse
+import threading
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .codec import JsonCodec
+from .scanner import findDatasets
+from .segments import openSegment
+
+
+MAGIC = b'GIBIOC01'
+HASH_SIZE = 16
+_RECORD = struct.Struct('>16sHQ')  # 지표 해시, 엔드포인트 ID, seqUpdate
+RECORD_SIZE = _RECORD.size
+_HEADER = struct.Struct('>8sQ')    # MAGIC, 레코드 수
+_FANOUT = struct.Struct('>256Q')   # 첫 바이트가 i 이하인 레코드 수 (누적)
+DATA_OFFSET = _HEADER.size + _FANOUT.size
+
+INDEX_FILENAME = 'index.bin'
+DELTA_FILENAME = 'delta.bin'
+ENDPOINTS_FILENAME = 'endpoints.json'
+
+# 기본 인덱스 대상 엔드포인트 (경로에 포함된 문자열)
+DEFAULT_ENDPOINTS = ('ioc/common', 'malware/cnc', 'suspicious_ip/scanner')
+
+# 지표로 취급하는 필드 이름 (값이 문자열이거나 문자열 리스트인 경우)
+INDICATOR_KEYS = frozenset({
+  'ip', 'ipv4', 'ipv6', 'domain', 'host', 'url', 'cnc',
+  'hash', 'md5', 'sha1', 'sha256'
+})
+_MAX_DEPTH = 6
+_MAX_INDICATOR_LENGTH = 2048
+
+
+def normalizeIndicator(value: str) -> str:
+  """조회용 정규화 (앞뒤 공백 제거, 소문자)"""
+  return value.strip().lower()
+
+
+def indicatorHash(value: str) -> bytes:
+  """정규화한 지표 값의 128비트 BLAKE2b 해시"""
+  return hashlib.blake2b(normalizeIndicator(value).encode('utf-8'), digest_size=HASH_SIZE).digest()
+
+
+def extractIndicators(item: Any) -> List[str]:
+  """레코드에서 지표 값 추출
+
+  INDICATOR_KEYS에 해당하는 필드의 문자열 값(리스트 포함)을 중첩 구조까지 찾습니다.
+  예: {'ipv4': [{'ip': '1.2.3.4', 'countryCode': 'RU'}]} → ['1.2.3.4']
+
+  Args:
+    item: API 응답 항목
+
+  Returns:
+    중복이 제거된 지표 값 리스트
+  """
+  found = []
+  stack = [(item, None, 0)]
+  while stack:
+    value, key, depth = stack.pop()
+    if isinstance(value, str):
+      if key in INDICATOR_KEYS and 0 < len(value) <= _MAX_INDICATOR_LENGTH:
+        value = normalizeIndicator(value)
+        if value:
+          found.append(value)
+    elif depth >= _MAX_DEPTH:
+      continue
+    elif isinstance(value, dict):
+      stack.extend((child, childKey, depth + 1) for childKey, child in value.items())
+    elif isinstance(value, list):
+      stack.extend((child, key, depth + 1) for child in value)
+  return list(dict.fromkeys(found))
+
+
+def _loadEndpoints(indexDir: str) -> List[str]:
+  path = os.path.join(indexDir, ENDPOINTS_FILENAME)
+  if not os.path.exists(path):
+    return []
+  with open(path, 'r', encoding='utf-8') as f:
+    return json.load(f)
+
+
+def _iterRecords(buffer: Any, start: int, count: int) -> Iterator[Tuple[bytes, int, int]]:
+  for offset in range(start, start + count * RECORD_SIZE, RECORD_SIZE):
+    yield _RECORD.unpack_from(buffer, offset)
+
+
+def _mapIndex(indexFile: str) -> Tuple[Optional[mmap.mmap], int, Tuple[int, ...]]:
+  """index.bin을 mmap으로 열기
+
+  Returns:
+    (mmap 또는 None, 레코드 수, fanout 테이블)
+
+  Raises:
+    ValueError: 파일 형식이 올바르지 않은 경우
+  """
+  if not os.path.exists(indexFile) or os.path.getsize(indexFile) < DATA_OFFSET:
+    return None, 0, (0,) * 256
+
+  with open(indexFile, 'rb') as f:
+    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+  magic, count = _HEADER.unpack_from(mapped, 0)
+  if magic != MAGIC or len(mapped) < DATA_OFFSET + count * RECORD_SIZE:
+    mapped.close()
+    raise ValueError(f"IOC 인덱스 파일 형식이 올바르지 않습니다: {indexFile}")
+  return mapped, count, _FANOUT.unpack_from(mapped, _HEADER.size)
+
+
+class IocIndex:
+  """읽기 전용 IOC 조회 인덱스
+
+  다른 프로세스(수집기)가 인덱스를 갱신해도 refresh()를 호출하면 새 내용을 반영합니다.
+  """
+
+  def __init__(self, indexDir: str):
+    """초기화 메서드
+
+    Args:
+      indexDir: 인덱스 디렉토리
+    """
+    self.indexDir = indexDir
+    self.indexFile = os.path.join(indexDir, INDEX_FILENAME)
+    self.deltaFile = os.path.join(indexDir, DELTA_FILENAME)
+
+    self.endpoints: List[str] = []
+    self.count = 0
+    self._mmap: Optional[mmap.mmap] = None
+    self._fanout: Tuple[int, ...] = (0,) * 256
+    self._indexStat: Optional[Tuple[int, int]] = None
+    self._delta: Dict[bytes, Dict[int, int]] = {}
+    self._deltaOffset = 0
+    self._lock = threading.Lock()
+    self.refresh()
+
+  def refresh(self) -> None:
+    """변경된 index.bin/delta.bin 다시 읽기
+
+    Raises:
+      ValueError: index.bin 형식이 올바르지 않은 경우
+    """
+    with self._lock:
+      self.endpoints = _loadEndpoints(self.indexDir)
+
+      indexStat = None
+      if os.path.exists(self.indexFile):
+        stat = os.stat(self.indexFile)
+        indexStat = (stat.st_ino, stat.st_mtime_ns)
+      if indexStat != self._indexStat:
+        self._openIndex()
+        self._indexStat = indexStat
+
+      deltaSize = os.path.getsize(self.deltaFile) if os.path.exists(self.deltaFile) else 0
+      if deltaSize < self._deltaOffset:
+        # 압축으로 delta가 비워짐
+        self._delta = {}
+        self._deltaOffset = 0
+      if deltaSize > self._deltaOffset:
+        self._readDelta()
+
+  def _openIndex(self) -> None:
+    if self._mmap is not None:
+      self._mmap.close()
+    self._mmap, self.count, self._fanout = _mapIndex(self.indexFile)
+
+  def _readDelta(self) -> None:
+    with open(self.deltaFile, 'rb') as f:
+      f.seek(self._deltaOffset)
+      data = f.read()
+    # 기록 중인 마지막 레코드는 다음 refresh에서 읽음
+    usable = len(data) - len(data) % RECORD_SIZE
+    for digest, endpointId, seqUpdate in _iterRecords(data, 0, usable // RECORD_SIZE):
+      entries = self._delta.setdefault(digest, {})
+      if seqUpdate >= entries.get(endpointId, 0):
+        entries[endpointId] = seqUpdate
+    self._deltaOffset += usable
+
+  def _keyAt(self, index: int) -> bytes:
+    offset = DATA_OFFSET + index * RECORD_SIZE
+    return self._mmap[offset:offset + HASH_SIZE]
+
+  def _lookupHash(self, digest: bytes) -> Dict[int, int]:
+    hits: Dict[int, int] = {}
+    if self._mmap is not None:
+      first = digest[0]
+      low = self._fanout[first - 1] if first else 0
+      high = self._fanout[first]
+      # 이진 탐색 (fanout으로 범위를 1/256로 줄인 뒤)
+      while low < high:
+        middle = (low + high) // 2
+        if self._keyAt(middle) < digest:
+          low = middle + 1
+        else:
+          high = middle
+      while low < self.count and self._keyAt(low) == digest:
+        _, endpointId, seqUpdate = _RECORD.unpack_from(self._mmap, DATA_OFFSET + low * RECORD_SIZE)
+        hits[endpointId] = seqUpdate
+        low += 1
+
+    for endpointId, seqUpdate in self._delta.get(digest, {}).items():
+      if seqUpdate >= hits.get(endpointId, 0):
+        hits[endpointId] = seqUpdate
+    return hits
+
+  def lookup(self, value: str) -> List[Tuple[str, int]]:
+    """지표 값 조회
+
+    Args:
+      value: IP, 도메인, URL, 해시 등 (대소문자/앞뒤 공백 무시)
+
+    Returns:
+      (엔드포인트 경로, 마지막으로 본 seqUpdate) 리스트 (없으면 빈 리스트)
+    """
+    with self._lock:
+      hits = self._lookupHash(indicatorHash(value))
+      endpoints = self.endpoints
+    return sorted((endpoints[endpointId] if endpointId < len(endpoints) else str(endpointId), seqUpdate)
+                  for endpointId, seqUpdate in hits.items())
+
+  def lookupMany(self, values: Iterable[str]) -> Dict[str, List[Tuple[str, int]]]:
+    """여러 지표 값 일괄 조회
+
+    Returns:
+      {지표 값: lookup() 결과} 딕셔너리 (본 적 없는 값 포함)
+    """
+    return {value: self.lookup(value) for value in values}
+
+  def close(self) -> None:
+    with self._lock:
+      if self._mmap is not None:
+        self._mmap.close()
+        self._mmap = None
+
+
+class IocIndexWriter:
+  """수집 중 IOC 인덱스 갱신 (delta.bin에 추가, 일정량이 쌓이면 index.bin에 병합)"""
+
+  def __init__(self, indexDir: str, compactEvery: int = 1000000,
+               logger: Optional[logging.Logger] = None):
+    """초기화 메서드
+
+    Args:
+      indexDir: 인덱스 디렉토리
+      compactEvery: delta 레코드가 이 수 이상이면 maybeCompact()에서 병합
+      logger: 로거 (None이면 로그 출력 안 함)
+    """
+    self.indexDir = indexDir
+    self.compactEvery = compactEvery
+    self.logger = logger
+    self.indexFile = os.path.join(indexDir, INDEX_FILENAME)
+    self.deltaFile = os.path.join(indexDir, DELTA_FILENAME)
+
+    os.makedirs(indexDir, exist_ok=True)
+    self.endpoints = _loadEndpoints(indexDir)
+    self._endpointIds = {endpoint: index for index, endpoint in enumerate(self.endpoints)}
+
+    # 기록 중 중단되어 잘린 마지막 레코드 제거
+    deltaSize = os.path.getsize(self.deltaFile) if os.path.exists(self.deltaFile) else 0
+    if deltaSize % RECORD_SIZE:
+      with open(self.deltaFile, 'r+b') as f:
+        f.truncate(deltaSize - deltaSize % RECORD_SIZE)
+    self.deltaRecords = deltaSize // RECORD_SIZE
+
+    self._lock = threading.Lock()
+    self._handle = None
+
+  def _endpointId(self, endpoint: str) -> int:
+    endpointId = self._endpointIds.get(endpoint)
+    if endpointId is None:
+      endpointId = len(self.endpoints)
+      self.endpoints.append(endpoint)
+      self._endpointIds[endpoint] = endpointId
+      # delta 레코드보다 먼저 엔드포인트 목록을 기록
+      path = os.path.join(self.indexDir, ENDPOINTS_FILENAME)
+      with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(self.endpoints, f, ensure_ascii=False)
+      os.replace(path + '.tmp', path)
+    return endpointId
+
+  def add(self, endpoint: str, seqUpdate: int, digests: Sequence[bytes]) -> None:
+    """지표 해시를 delta.bin에 추가
+
+    Args:
+      endpoint: 엔드포인트 경로
+      seqUpdate: 페이지의 seqUpdate
+      digests: indicatorHash() 값 리스트
+
+    Raises:
+      OSError: 파일 쓰기 실패
+    """
+    if not digests:
+      return
+    with self._lock:
+      endpointId = self._endpointId(endpoint)
+      data = b''.join(_RECORD.pack(digest, endpointId, seqUpdate) for digest in digests)
+      if self._handle is None:
+        self._handle = open(self.deltaFile, 'ab')
+      self._handle.write(data)
+      self._handle.flush()
+      self.deltaRecords += len(digests)
+
+  def maybeCompact(self) -> int:
+    """delta가 compactEvery 이상이면 병합
+
+    Returns:
+      병합 후 index.bin 레코드 수 (병합하지 않았으면 0)
+    """
+    if self.deltaRecords < max(1, self.compactEvery):
+      return 0
+    return self.compact()
+
+  def compact(self) -> int:
+    """delta.bin을 index.bin에 병합 (엔드포인트별로 가장 큰 seqUpdate만 유지)
+
+    새 index.bin을 임시 파일에 만든 뒤 원자적으로 교체하고 delta.bin을 비웁니다.
+    교체 후 비우기 전에 중단되어도 다음 병합 결과는 같습니다.
+
+    Returns:
+      병합 후 index.bin 레코드 수
+
+    Raises:
+      OSError: 파일 쓰기 실패
+    """
+    with self._lock:
+      if self._handle is not None:
+        self._handle.close()
+        self._handle = None
+
+      delta: Dict[Tuple[bytes, int], int] = {}
+      if os.path.exists(self.deltaFile):
+        with open(self.deltaFile, 'rb') as f:
+          data = f.read()
+        usable = len(data) - len(data) % RECORD_SIZE
+        for digest, endpointId, seqUpdate in _iterRecords(data, 0, usable // RECORD_SIZE):
+          key = (digest, endpointId)
+          if seqUpdate >= delta.get(key, 0):
+            delta[key] = seqUpdate
+      deltaItems = sorted(delta.items())
+
+      mapped, existingCount, _ = _mapIndex(self.indexFile)
+      records = _iterRecords(mapped, DATA_OFFSET, existingCount) if mapped is not None else iter(())
+
+      tempFile = self.indexFile + '.tmp'
+      fanout = [0] * 256
+      count = 0
+      try:
+        with open(tempFile, 'wb') as out:
+          out.write(b'\0' * DATA_OFFSET)
+          buffer = []
+          for digest, endpointId, seqUpdate in self._merge(records, deltaItems):
+            buffer.append(_RECORD.pack(digest, endpointId, seqUpdate))
+            fanout[digest[0]] += 1
+            count += 1
+            if len(buffer) >= 65536:
+              out.write(b''.join(buffer))
+              buffer = []
+          out.write(b''.join(buffer))
+
+          cumulative = 0
+          for index in range(256):
+            cumulative += fanout[index]
+            fanout[index] = cumulative
+          out.seek(0)
+          out.write(_HEADER.pack(MAGIC, count))
+          out.write(_FANOUT.pack(*fanout))
+          out.flush()
+          os.fsync(out.fileno())
+      finally:
+        if mapped is not None:
+          mapped.close()
+
+      os.replace(tempFile, self.indexFile)
+      open(self.deltaFile, 'wb').close()
+      self.deltaRecords = 0
+
+    if self.logger:
+      self.logger.info(f"  IOC 인덱스 병합 완료: {count:,}건")
+    return count
+
+  @staticmethod
+  def _merge(records: Iterator[Tuple[bytes, int, int]],
+             deltaItems: List[Tuple[Tuple[bytes, int], int]]) -> Iterator[Tuple[bytes, int, int]]:
+    """정렬된 index.bin 레코드와 정렬된 delta를 병합 (같은 키는 큰 seqUpdate)"""
+    current = next(records, None)
+    position = 0
+
+    while current is not None or position < len(deltaItems):
+      if position < len(deltaItems):
+        (digest, endpointId), seqUpdate = deltaItems[position]
+        candidate = (digest, endpointId, seqUpdate)
+      else:
+        candidate = None
+
+      if candidate is None or (current is not None and current[:2] < candidate[:2]):
+        yield current
+        current = next(records, None)
+      elif current is not None and current[:2] == candidate[:2]:
+        yield (current[0], current[1], max(current[2], candidate[2]))
+        current = next(records, None)
+        position += 1
+      else:
+        yield candidate
+        position += 1
+
+  def close(self) -> None:
+    with self._lock:
+      if self._handle is not None:
+        self._handle.close()
+        self._handle = None
+
+
+def matchesEndpoint(endpoint: str, patterns: Sequence[str]) -> bool:
+  """인덱스 대상 엔드포인트 여부 (경로에 패턴 문자열 포함)"""
+  return any(pattern in endpoint for pattern in patterns)
+
+
+def rebuildIndex(outputsDir: str, indexDir: str, patterns: Sequence[str] = DEFAULT_ENDPOINTS,
+                 codec: Optional[JsonCodec] = None) -> int:
+  """수집 데이터(회전된 세그먼트 포함)에서 인덱스 재구축
+
+  Returns:
+    index.bin 레코드 수
+
+  Raises:
+    OSError, ValueError: 파일을 읽거나 쓸 수 없는 경우
+  """
+  codec = codec or JsonCodec()
+  for filename in (INDEX_FILENAME, DELTA_FILENAME, ENDPOINTS_FILENAME):
+    path = os.path.join(indexDir, filename)
+    if os.path.exists(path):
+      os.remove(path)
+
+  writer = IocIndexWriter(indexDir)
+  try:
+    for paths in findDatasets(outputsDir).values():
+      for path in paths:
+        with openSegment(path) as f:
+          for line in f:
+            try:
+              record = codec.loads(line)
+            except ValueError:
+              continue
+            endpoint = record.get('endpoint') if isinstance(record, dict) else None
+            if not isinstance(endpoint, str) or not matchesEndpoint(endpoint, patterns):
+              continue
+            digests = [indicatorHash(value) for value in extractIndicators(record.get('data'))]
+            writer.add(endpoint, int(record.get('seqUpdate') or 0), digests)
+    return writer.compact()
+  finally:
+    writer.close()
+
+
+def addArguments(parser: argparse.ArgumentParser) -> None:
+  """ioc 하위 명령 인자 등록"""
+  parser.add_argument('values', nargs='*', help='조회할 지표 값 (IP, 도메인, URL, 해시)')
+  parser.add_argument('--file', default=None, help='한 줄에 하나씩 지표 값이 있는 파일 (-: stdin)')
+  parser.add_argument('--index-dir', default=None, help='인덱스 디렉토리 (기본값: data/ioc_index)')
+  parser.add_argument('--outputs', default=None, help='--rebuild 시 읽을 출력 디렉토리')
+  parser.add_argument('--rebuild', action='store_true', help='수집 데이터에서 인덱스 재구축')
+  parser.add_argument('--json', action='store_true', help='결과를 JSON Lines로 출력')
+
+
+def runLookup(args: argparse.Namespace, defaultIndexDir: str, defaultOutputsDir: str,
+              patterns: Sequence[str] = DEFAULT_ENDPOINTS) -> int:
+  """ioc 하위 명령 실행
+
+  Returns:
+    종료 코드 (0: 모두 발견 또는 재구축 성공, 1: 발견하지 못한 값 있음, 2: 실패)
+  """
+  indexDir = args.index_dir or defaultIndexDir
+  try:
+    if args.rebuild:
+      count = rebuildIndex(args.outputs or defaultOutputsDir, indexDir, patterns)
+      print(f"✓ IOC 인덱스 재구축: {count:,}건 ({indexDir})")
+      return 0
+
+    values = list(args.values)
+    if args.file:
+      handle = sys.stdin if args.file == '-' else open(args.file, 'r', encoding='utf-8')
+      with handle:
+        values.extend(line.strip() for line in handle if line.strip())
+
+    index = IocIndex(indexDir)
+  except (OSError, ValueError) as e:
+    print(f"✗ IOC 인덱스 오류: {e}", file=sys.stderr)
+    return 2
+
+  missing = 0
+  try:
+    for value in values:
+      hits = index.lookup(value)
+      missing += not hits
+      if args.json:
+        print(json.dumps({'value': value, 'hits': [{'endpoint': endpoint, 'seqUpdate': seqUpdate}
+                                                   for endpoint, seqUpdate in hits]},
+                         ensure_ascii=False))
+      elif hits:
+        print(f"{value}\t" + ', '.join(f"{endpoint} (seqUpdate {seqUpdate})"
+                                       for endpoint, seqUpdate in hits))
+      else:
+        print(f"{value}\t-")
+  finally:
+    index.close()
+  return 1 if missing else 0
@@ -0,0 +1,197 @@
+"""
+Group-IB seqUpdate 저널 모듈
+
+seqUpdate 커서를 스냅샷 파일(seq_update.json)과 추가 전용 저널 파일로 관리합니다.
+- 페이지 저장이 끝날 때마다 작은 레코드 한 줄을 저널에 추가하고 fsync
+- 시작 시 스냅샷을 읽은 뒤 저널을 재생하여 마지막 커서 복원
+- 저널이 일정 길이를 넘으면 스냅샷으로 압축(compaction)하고 저널 비우기
+- 커서와 함께 출력 JSONL 파일의 위치(파일명, 닫힌 세그먼트 수, 활성 파일 크기)를 같은 레코드에
+  기록하여 재시작 시 커서 이후에 추가된(커밋되지 않은) 꼬리를 잘라낼 수 있게 함
+  (압축 시 위치는 seq_update.positions.json에 저장, Parquet 내보내기도 이 위치까지만 읽음)
+"""
+
+import os
+import json
+import shutil
+import threading
+from typing import Any, Dict, Tuple, Optional, IO
+
+
+# 커서 레코드에 함께 기록하는 출력 위치 필드
+POSITION_KEYS = ('file', 'segments', 'offset')
+
+
+class CursorJournal:
+  """추가 전용 저널 기반 seqUpdate 저장소
+
+  페이지 단위 내구성 비용은 fsync된 작은 append 한 번입니다.
+  압축은 스냅샷을 원자적으로 교체한 뒤 저널을 비우므로, 그 사이에 중단되어도
+  저널 재생 결과는 같습니다 (저널 레코드는 스냅샷에 이미 반영된 값).
+  """
+
+  def __init__(self, snapshotFile: str, compactEvery: int = 500, fsync: bool = True):
+    """초기화 메서드
+
+    Args:
+      snapshotFile: 스냅샷 파일 경로 (seq_update.json)
+      compactEvery: 저널 레코드가 이 수 이상 쌓이면 자동 압축 (0이면 자동 압축 안 함)
+      fsync: 레코드마다 fsync 수행 여부
+    """
+    self.snapshotFile = snapshotFile
+    self.journalFile = os.path.splitext(snapshotFile)[0] + '.journal'
+    self.positionsFile = os.path.splitext(snapshotFile)[0] + '.positions.json'
+    self.compactEvery = compactEvery
+    self.fsync = fsync
+
+    self.state: Dict[str, int] = {}
+    # 엔드포인트별 마지막 커서와 함께 기록된 출력 위치 {'file': 파일명, 'segments': n, 'offset': bytes}
+    self.positions: Dict[str, Dict[str, Any]] = {}
+    self.journalRecords = 0
+
+    self._lock = threading.Lock()
+    self._handle: Optional[IO[str]] = None
+
+  def load(self) -> Tuple[Dict[str, int], int, int]:
+    """스냅샷 로드 후 저널 재생
+
+    Returns:
+      (seqUpdate 딕셔너리, 재생한 레코드 수, 건너뛴 손상 레코드 수) 튜플
+
+    Raises:
+      OSError, ValueError: 스냅샷 파일을 읽을 수 없는 경우
+    """
+    with self._lock:
+      state = {}
+      if os.path.exists(self.snapshotFile):
+        with open(self.snapshotFile, 'r', encoding='utf-8') as f:
+          state = json.load(f)
+
+      positions = {}
+      if os.path.exists(self.positionsFile):
+        with open(self.positionsFile, 'r', encoding='utf-8') as f:
+          positions = json.load(f)
+
+      replayed = 0
+      skipped = 0
+      if os.path.exists(self.journalFile):
+        with open(self.journalFile, 'r', encoding='utf-8') as f:
+          for line in f:
+            try:
+              entry = json.loads(line)
+              state[entry['endpoint']] = entry['seqUpdate']
+              if 'offset' in entry:
+                positions[entry['endpoint']] = {key: entry[key] for key in POSITION_KEYS
+                                                if key in entry}
+              replayed += 1
+            except (ValueError, KeyError, TypeError):
+              # 기록 도중 중단된 마지막 줄 등
+              skipped += 1
+
+      self.state = state
+      self.positions = positions
+      self.journalRecords = replayed
+      return dict(state), replayed, skipped
+
+  def record(self, endpoint: str, seqUpdate: int,
+             position: Optional[Dict[str, Any]] = None) -> bool:
+    """페이지 커서 기록 (저널에 한 줄 추가)
+
+    Args:
+      endpoint: 엔드포인트 경로
+      seqUpdate: 새 seqUpdate 값
+      position: 페이지를 추가한 뒤의 출력 위치 {'file', 'segments', 'offset'} (커서와 함께 커밋)
+
+    Returns:
+      이번 기록으로 자동 압축이 수행되었으면 True
+
+    Raises:
+      OSError: 저널 쓰기 실패
+    """
+    entry: Dict[str, Any] = {'endpoint': endpoint, 'seqUpdate': seqUpdate}
+    if position is not None:
+      entry.update((key, position[key]) for key in POSITION_KEYS if key in position)
+    line = json.dumps(entry, ensure_ascii=False) + '\n'
+
+    with self._lock:
+      handle = self._openJournal()
+      handle.write(line)
+      handle.flush()
+      if self.fsync:
+        os.fsync(handle.fileno())
+
+      self.state[endpoint] = seqUpdate
+      if position is not None:
+        self.positions[endpoint] = dict(position)
+      self.journalRecords += 1
+
+      if self.compactEvery and self.journalRecords >= self.compactEvery:
+        self._compactLocked(self.state)
+        return True
+
+    return False
+
+  def compact(self, seqUpdates: Optional[Dict[str, int]] = None) -> None:
+    """스냅샷 저장 후 저널 비우기
+
+    Args:
+      seqUpdates: 저장할 전체 seqUpdate 딕셔너리 (None이면 현재 상태)
+
+    Raises:
+      OSError: 파일 쓰기 실패
+    """
+    with self._lock:
+      self._compactLocked(self.state if seqUpdates is None else seqUpdates)
+
+  def _compactLocked(self, seqUpdates: Dict[str, int]) -> None:
+    """락을 잡은 상태에서 압축 수행"""
+    snapshot = dict(seqUpdates)
+
+    # 0. 출력 위치 저장 (저널을 비우기 전에 기록해야 재시작 시 잘라낼 기준이 남음)
+    if self.positions or os.path.exists(self.positionsFile):
+      self._writeAtomic(self.positionsFile, self.positions)
+
+    # 1. 백업 파일 생성 (기존 스냅샷이 있는 경우)
+    if os.path.exists(self.snapshotFile):
+      shutil.copyfile(self.snapshotFile, self.snapshotFile + '.bak')
+
+    # 2. 임시 파일에 쓰고 fsync 후 원자적으로 교체
+    self._writeAtomic(self.snapshotFile, snapshot)
+
+    # 3. 스냅샷에 반영된 저널 비우기
+    self._closeJournal()
+    with open(self.journalFile, 'w', encoding='utf-8') as f:
+      if self.fsync:
+        os.fsync(f.fileno())
+
+    self.state = snapshot
+    self.journalRecords = 0
+
+  def _writeAtomic(self, path: str, data: Dict[str, Any]) -> None:
+    """임시 파일에 쓰고 fsync 후 원자적으로 교체"""
+    tempFile = path + '.tmp'
+    try:
+      with open(tempFile, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        if self.fsync:
+          os.fsync(f.fileno())
+      os.replace(tempFile, path)
+    finally:
+      if os.path.exists(tempFile):
+        os.remove(tempFile)
+
+  def _openJournal(self) -> IO[str]:
+    """저널 파일 핸들 (추가 모드, 재사용)"""
+    if self._handle is None or self._handle.closed:
+      self._handle = open(self.journalFile, 'a', encoding='utf-8')
+    return self._handle
+
+  def _closeJournal(self) -> None:
+    if self._handle is not None and not self._handle.closed:
+      self._handle.close()
+    self._handle = None
+
+  def close(self) -> None:
+    """저널 파일 핸들 닫기"""
+    with self._lock:
+      self._closeJournal()
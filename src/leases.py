@@ -0,0 +1,324 @@
+"""
+Group-IB 샤딩 수집용 엔드포인트 리스 모듈
+
+여러 수집기 프로세스(같은 호스트 또는 공유 파일시스템을 쓰는 여러 호스트)가 엔드포인트를
+나누어 수집하도록, 엔드포인트마다 리스 파일로 소유자를 정합니다.
+- 리스 파일: data/leases/<엔드포인트>.json {endpoint, owner, token, expires, seqUpdate}
+- 워커 하트비트: data/leases/workers/<워커 ID>.json (활성 워커 수로 공평 분배량 계산)
+- 리스는 TTL 안에 갱신하지 않으면 만료되어 다른 워커가 넘겨받음 (빠른 장애 조치)
+- 커서(seqUpdate)는 리스 파일에 함께 기록되며, 소유권을 넘겨받을 때마다 증가하는
+  token이 일치해야만 전진 (만료 후 늦게 깨어난 이전 소유자는 커서를 바꿀 수 없음)
+
+리스 파일 갱신은 엔드포인트별 잠금 파일(fcntl.lockf)로 직렬화합니다. 만료 판단에 벽시계를
+사용하므로 여러 호스트의 시계는 NTP 등으로 맞춰져 있어야 합니다 (오차 << TTL).
+"""
+
+import os
+import json
+import math
+import time
+import socket
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+  import fcntl
+except ImportError:  # Windows
+  fcntl = None
+
+
+class LeaseLostError(Exception):
+  """다른 워커가 리스를 넘겨받아 커서를 전진시킬 수 없는 경우"""
+  pass
+
+
+def defaultWorkerId() -> str:
+  """기본 워커 ID (호스트명-PID)"""
+  return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def leaseName(endpoint: str) -> str:
+  """엔드포인트 경로를 리스 파일 이름으로 변환 (/api/v2/ioc/common → api_v2_ioc_common)"""
+  return endpoint.strip('/').replace('/', '_') or '_'
+
+
+def _writeJson(path: str, payload: Dict[str, Any]) -> None:
+  tempFile = f"{path}.{os.getpid()}.tmp"
+  with open(tempFile, 'w', encoding='utf-8') as f:
+    json.dump(payload, f, ensure_ascii=False)
+  os.replace(tempFile, path)
+
+
+def _readJson(path: str) -> Optional[Dict[str, Any]]:
+  try:
+    with open(path, 'r', encoding='utf-8') as f:
+      return json.load(f)
+  except FileNotFoundError:
+    return None
+  except ValueError:
+    # 손상된 리스는 만료된 것으로 취급
+    return {}
+
+
+class LeaseManager:
+  """엔드포인트 리스 획득/갱신/반납 및 리스에 묶인 커서 관리"""
+
+  def __init__(self, leaseDir: str, workerId: Optional[str] = None, ttl: float = 120,
+               logger: Optional[logging.Logger] = None):
+    """초기화 메서드
+
+    Args:
+      leaseDir: 리스 디렉토리 (모든 워커가 공유)
+      workerId: 워커 ID (None이면 호스트명-PID)
+      ttl: 리스 유효 시간(초). 하트비트는 TTL/3마다 갱신
+      logger: 로거 (None이면 로그 출력 안 함)
+
+    Raises:
+      RuntimeError: 파일 잠금(fcntl)을 지원하지 않는 플랫폼
+    """
+    if fcntl is None:
+      raise RuntimeError("샤딩 수집은 fcntl 파일 잠금을 지원하는 플랫폼에서만 사용할 수 있습니다.")
+
+    self.leaseDir = leaseDir
+    self.workersDir = os.path.join(leaseDir, 'workers')
+    self.workerId = workerId or defaultWorkerId()
+    self.ttl = ttl
+    self.logger = logger
+
+    os.makedirs(self.workersDir, exist_ok=True)
+
+    self._lock = threading.Lock()
+    self._fileLock = threading.Lock()
+    # 보유 중인 리스: 엔드포인트 → token
+    self.held: Dict[str, int] = {}
+    self._stopEvent = threading.Event()
+    self._thread: Optional[threading.Thread] = None
+
+  def _leasePath(self, endpoint: str) -> str:
+    return os.path.join(self.leaseDir, leaseName(endpoint) + '.json')
+
+  @contextmanager
+  def _locked(self, endpoint: str) -> Iterator[str]:
+    """엔드포인트 리스 파일을 잠근 상태로 경로 반환 (프로세스/호스트 간 직렬화)"""
+    path = self._leasePath(endpoint)
+    # POSIX 레코드 잠금은 프로세스 단위이므로 같은 프로세스의 스레드(하트비트)는 별도로 직렬화
+    with self._fileLock, open(path[:-len('.json')] + '.lock', 'a') as lockFile:
+      fcntl.lockf(lockFile, fcntl.LOCK_EX)
+      try:
+        yield path
+      finally:
+        fcntl.lockf(lockFile, fcntl.LOCK_UN)
+
+  # ===== 워커 하트비트 =====
+
+  def heartbeat(self, now: Optional[float] = None) -> None:
+    """워커 하트비트 기록 (활성 워커 수 계산용)
+
+    Raises:
+      OSError: 파일 쓰기 실패
+    """
+    now = time.time() if now is None else now
+    _writeJson(os.path.join(self.workersDir, leaseName(self.workerId) + '.json'),
+               {'worker': self.workerId, 'expires': now + self.ttl})
+
+  def activeWorkers(self, now: Optional[float] = None) -> List[str]:
+    """하트비트가 만료되지 않은 워커 ID 목록 (자신 포함)"""
+    now = time.time() if now is None else now
+    workers = {self.workerId}
+    for filename in os.listdir(self.workersDir):
+      if not filename.endswith('.json'):
+        continue
+      record = _readJson(os.path.join(self.workersDir, filename))
+      if record and record.get('expires', 0) > now:
+        workers.add(record.get('worker', filename[:-len('.json')]))
+    return sorted(workers)
+
+  def fairShare(self, total: int, now: Optional[float] = None) -> int:
+    """워커당 보유할 최대 리스 수 (전체 엔드포인트 / 활성 워커 수, 올림)"""
+    return max(1, math.ceil(total / len(self.activeWorkers(now))))
+
+  # ===== 리스 =====
+
+  def tryAcquire(self, endpoint: str, now: Optional[float] = None) -> bool:
+    """리스 획득 시도 (비어 있거나 만료된 경우 획득, 이미 보유 중이면 갱신)
+
+    Returns:
+      획득(또는 갱신)했으면 True
+    """
+    now = time.time() if now is None else now
+    with self._locked(endpoint) as path:
+      lease = _readJson(path) or {}
+      owner = lease.get('owner')
+      token = int(lease.get('token', 0))
+
+      if owner and owner != self.workerId and lease.get('expires', 0) > now:
+        return False
+      if owner != self.workerId or self.held.get(endpoint) != token:
+        # 새로 획득 (다른 워커의 만료된 리스 또는 재시작 전 자신의 리스)
+        token += 1
+
+      lease.update({'endpoint': endpoint, 'owner': self.workerId, 'token': token,
+                    'expires': now + self.ttl})
+      _writeJson(path, lease)
+
+    with self._lock:
+      self.held[endpoint] = token
+    return True
+
+  def renew(self, endpoint: str, now: Optional[float] = None) -> bool:
+    """보유 중인 리스 만료 시각 연장
+
+    Returns:
+      여전히 소유자이면 True, 다른 워커가 넘겨받았으면 False (보유 목록에서 제거)
+    """
+    now = time.time() if now is None else now
+    token = self.held.get(endpoint)
+    if token is None:
+      return False
+
+    with self._locked(endpoint) as path:
+      lease = _readJson(path) or {}
+      if lease.get('owner') != self.workerId or lease.get('token') != token:
+        with self._lock:
+          self.held.pop(endpoint, None)
+        if self.logger:
+          self.logger.warning(f"  ⚠ 리스를 잃었습니다: {endpoint} (현재 소유자: {lease.get('owner')})")
+        return False
+      lease['expires'] = now + self.ttl
+      _writeJson(path, lease)
+    return True
+
+  def release(self, endpoint: str) -> None:
+    """리스 반납 (다른 워커가 즉시 획득 가능, 커서는 유지)"""
+    token = self.held.get(endpoint)
+    if token is None:
+      return
+
+    with self._locked(endpoint) as path:
+      lease = _readJson(path) or {}
+      if lease.get('owner') == self.workerId and lease.get('token') == token:
+        lease['owner'] = None
+        lease['expires'] = 0
+        _writeJson(path, lease)
+    with self._lock:
+      self.held.pop(endpoint, None)
+
+  def releaseAll(self) -> None:
+    """보유 중인 모든 리스 반납 및 하트비트 삭제 (정상 종료 시)"""
+    for endpoint in list(self.held):
+      try:
+        self.release(endpoint)
+      except OSError as e:
+        if self.logger:
+          self.logger.warning(f"⚠ 리스 반납 실패: {endpoint} - {e}")
+    try:
+      os.remove(os.path.join(self.workersDir, leaseName(self.workerId) + '.json'))
+    except OSError:
+      pass
+
+  def owns(self, endpoint: str) -> bool:
+    """리스 보유 여부 (로컬 상태 기준)"""
+    return endpoint in self.held
+
+  def rebalance(self, endpoints: List[str], now: Optional[float] = None) -> List[str]:
+    """이번 사이클에 수집할 엔드포인트 결정
+
+    하트비트를 기록하고, 보유 중인 리스를 갱신하고, 공평 분배량을 넘으면 초과분을 반납하고,
+    모자라면 비어 있거나 만료된 리스를 획득합니다. 워커마다 시작 위치를 달리하여
+    동시에 시작한 워커들이 같은 엔드포인트를 두고 경쟁하지 않도록 합니다.
+
+    Args:
+      endpoints: 전체 엔드포인트 경로 리스트
+      now: 기준 시각 (None이면 현재 시각)
+
+    Returns:
+      보유 중인 엔드포인트 경로 리스트 (endpoints 순서)
+    """
+    now = time.time() if now is None else now
+    self.heartbeat(now)
+    share = self.fairShare(len(endpoints), now)
+
+    for endpoint in list(self.held):
+      if endpoint not in endpoints:
+        self.release(endpoint)
+      else:
+        self.renew(endpoint, now)
+
+    excess = len(self.held) - share
+    if excess > 0:
+      for endpoint in sorted(self.held)[-excess:]:
+        self.release(endpoint)
+
+    if len(self.held) < share and endpoints:
+      offset = sum(self.workerId.encode('utf-8')) % len(endpoints)
+      for endpoint in endpoints[offset:] + endpoints[:offset]:
+        if len(self.held) >= share:
+          break
+        if endpoint not in self.held:
+          self.tryAcquire(endpoint, now)
+
+    return [endpoint for endpoint in endpoints if endpoint in self.held]
+
+  # ===== 커서 =====
+
+  def loadCursors(self) -> Dict[str, int]:
+    """보유 중인 리스에 기록된 커서 (기록이 없는 엔드포인트는 제외)"""
+    cursors = {}
+    for endpoint in list(self.held):
+      lease = _readJson(self._leasePath(endpoint)) or {}
+      if lease.get('seqUpdate') is not None:
+        cursors[endpoint] = int(lease['seqUpdate'])
+    return cursors
+
+  def commitCursor(self, endpoint: str, seqUpdate: int, now: Optional[float] = None) -> None:
+    """커서 전진 (리스 token이 일치할 때만, 리스 만료 시각도 연장)
+
+    Raises:
+      LeaseLostError: 리스를 보유하고 있지 않거나 다른 워커가 넘겨받은 경우
+      OSError: 파일 쓰기 실패
+    """
+    now = time.time() if now is None else now
+    token = self.held.get(endpoint)
+    if token is None:
+      raise LeaseLostError(f"리스를 보유하고 있지 않습니다: {endpoint}")
+
+    with self._locked(endpoint) as path:
+      lease = _readJson(path) or {}
+      if lease.get('owner') != self.workerId or lease.get('token') != token:
+        with self._lock:
+          self.held.pop(endpoint, None)
+        raise LeaseLostError(f"다른 워커가 리스를 넘겨받았습니다: {endpoint} ({lease.get('owner')})")
+      lease['seqUpdate'] = seqUpdate
+      lease['expires'] = now + self.ttl
+      _writeJson(path, lease)
+
+  # ===== 백그라운드 하트비트 =====
+
+  def startHeartbeat(self) -> None:
+    """TTL/3마다 하트비트와 보유 리스를 갱신하는 스레드 시작 (긴 수집 중 만료 방지)"""
+    if self._thread is not None:
+      return
+    self._stopEvent.clear()
+    self._thread = threading.Thread(target=self._heartbeatLoop, name='lease-heartbeat',
+                                    daemon=True)
+    self._thread.start()
+
+  def _heartbeatLoop(self) -> None:
+    while not self._stopEvent.wait(self.ttl / 3):
+      try:
+        self.heartbeat()
+        for endpoint in list(self.held):
+          self.renew(endpoint)
+      except OSError as e:
+        if self.logger:
+          self.logger.warning(f"⚠ 리스 갱신 실패: {e}")
+
+  def close(self) -> None:
+    """하트비트 스레드를 멈추고 모든 리스 반납"""
+    self._stopEvent.set()
+    if self._thread is not None:
+      self._thread.join()
+      self._thread = None
+    self.releaseAll()
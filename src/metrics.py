@@ -0,0 +1,273 @@
+"""
+Group-IB 수집기 메트릭 모듈
+
+Prometheus 텍스트 형식(0.0.4)의 카운터/게이지/히스토그램과 /metrics HTTP 엔드포인트를 제공합니다.
+외부 의존성 없이 표준 라이브러리만 사용하며, METRICS_PORT가 설정된 경우에만 서버를 띄웁니다.
+"""
+
+import time
+import math
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# 버킷 기본값
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BYTES_BUCKETS = tuple(1024 * 4 ** n for n in range(9))  # 1KB ~ 64MB
+ITEMS_BUCKETS = (0, 1, 10, 50, 100, 250, 500, 1000, 2500, 5000)
+WRITE_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+CYCLE_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value: str) -> str:
+  return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _formatNumber(value: float) -> str:
+  if math.isinf(value):
+    return '+Inf' if value > 0 else '-Inf'
+  if float(value).is_integer() and abs(value) < 1e15:
+    return str(int(value))
+  return repr(float(value))
+
+
+def _formatLabels(names: Sequence[str], values: Sequence[str],
+                  extra: Optional[Tuple[str, str]] = None) -> str:
+  pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+  if extra:
+    pairs.append(f'{extra[0]}="{extra[1]}"')
+  return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+  """레이블별 값을 가진 메트릭 공통 클래스"""
+
+  kind = ''
+
+  def __init__(self, name: str, documentation: str, labelNames: Sequence[str] = ()):
+    self.name = name
+    self.documentation = documentation
+    self.labelNames = tuple(labelNames)
+    self._lock = threading.Lock()
+
+  def _key(self, labels: Sequence[str]) -> Tuple[str, ...]:
+    if len(labels) != len(self.labelNames):
+      raise ValueError(f"{self.name}: 레이블 {self.labelNames} 필요, {tuple(labels)} 전달됨")
+    return tuple(str(label) for label in labels)
+
+  def render(self) -> List[str]:
+    lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+    lines.extend(self._samples())
+    return lines
+
+  def _samples(self) -> List[str]:
+    raise NotImplementedError
+
+
+class Counter(_Metric):
+  """증가만 하는 값"""
+
+  kind = 'counter'
+
+  def __init__(self, name: str, documentation: str, labelNames: Sequence[str] = ()):
+    super().__init__(name, documentation, labelNames)
+    self._values: Dict[Tuple[str, ...], float] = {}
+
+  def inc(self, *labels: str, amount: float = 1) -> None:
+    key = self._key(labels)
+    with self._lock:
+      self._values[key] = self._values.get(key, 0) + amount
+
+  def get(self, *labels: str) -> float:
+    with self._lock:
+      return self._values.get(self._key(labels), 0)
+
+  def _samples(self) -> List[str]:
+    with self._lock:
+      items = sorted(self._values.items())
+    return [f"{self.name}{_formatLabels(self.labelNames, key)} {_formatNumber(value)}"
+            for key, value in items]
+
+
+class Gauge(Counter):
+  """임의로 설정하는 값"""
+
+  kind = 'gauge'
+
+  def set(self, *labels: str, value: float) -> None:
+    key = self._key(labels)
+    with self._lock:
+      self._values[key] = value
+
+  def items(self) -> List[Tuple[Tuple[str, ...], float]]:
+    with self._lock:
+      return list(self._values.items())
+
+
+class Histogram(_Metric):
+  """누적 버킷 히스토그램"""
+
+  kind = 'histogram'
+
+  def __init__(self, name: str, documentation: str, labelNames: Sequence[str] = (),
+               buckets: Sequence[float] = LATENCY_BUCKETS):
+    super().__init__(name, documentation, labelNames)
+    self.buckets = tuple(sorted(buckets)) + (math.inf,)
+    # 레이블별 [버킷별 개수..., 합계, 개수]
+    self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+  def observe(self, *labels: str, value: float) -> None:
+    key = self._key(labels)
+    with self._lock:
+      state = self._values.get(key)
+      if state is None:
+        state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+      for index, bound in enumerate(self.buckets):
+        if value <= bound:
+          state[index] += 1
+          break
+      state[-2] += value
+      state[-1] += 1
+
+  def count(self, *labels: str) -> int:
+    with self._lock:
+      state = self._values.get(self._key(labels))
+      return int(state[-1]) if state else 0
+
+  def _samples(self) -> List[str]:
+    with self._lock:
+      items = sorted((key, list(state)) for key, state in self._values.items())
+
+    lines = []
+    for key, state in items:
+      cumulative = 0
+      for index, bound in enumerate(self.buckets):
+        cumulative += state[index]
+        labels = _formatLabels(self.labelNames, key, ('le', _formatNumber(bound)))
+        lines.append(f"{self.name}_bucket{labels} {_formatNumber(cumulative)}")
+      labels = _formatLabels(self.labelNames, key)
+      lines.append(f"{self.name}_sum{labels} {_formatNumber(state[-2])}")
+      lines.append(f"{self.name}_count{labels} {_formatNumber(state[-1])}")
+    return lines
+
+
+class CollectorMetrics:
+  """수집기 메트릭 모음
+
+  endpoint 레이블은 API 경로(예: /api/v2/ioc/common/updated)입니다.
+  """
+
+  def __init__(self):
+    self.requestDuration = Histogram(
+      'groupib_request_duration_seconds', 'API 요청 소요 시간 (응답 헤더 수신까지, 재시도 포함 시도별)',
+      ('endpoint',), LATENCY_BUCKETS)
+    self.requests = Counter(
+      'groupib_requests_total', 'HTTP 상태 코드별 API 요청 수', ('endpoint', 'status'))
+    self.retries = Counter(
+      'groupib_retries_total', '원인별 재시도 수 (429, 5xx, timeout, network)', ('endpoint', 'cause'))
+    self.pageBytes = Histogram(
+      'groupib_page_bytes', '페이지 응답 크기 (전송 바이트)', ('endpoint',), BYTES_BUCKETS)
+    self.pageItems = Histogram(
+      'groupib_page_items', '페이지당 항목 수', ('endpoint',), ITEMS_BUCKETS)
+    self.recordsWritten = Counter(
+      'groupib_records_written_total', 'JSONL에 기록한 레코드 수', ('endpoint',))
+    self.bytesWritten = Counter(
+      'groupib_bytes_written_total', 'JSONL에 기록한 바이트', ('endpoint',))
+    self.writeCommitDuration = Histogram(
+      'groupib_write_commit_seconds', 'JSONL 페이지 커밋 소요 시간 (write와 정책에 따른 fsync)',
+      ('endpoint',), WRITE_BUCKETS)
+    self.pdfDownloads = Counter(
+      'groupib_pdf_downloads_total', '결과별 PDF 다운로드 수 (success, skipped, failed)',
+      ('endpoint', 'result'))
+    self.pdfBytes = Counter(
+      'groupib_pdf_bytes_total', '다운로드한 PDF 바이트', ('endpoint',))
+    self.seqUpdate = Gauge(
+      'groupib_seq_update', '엔드포인트별 현재 seqUpdate 커서', ('endpoint',))
+    self.lastSuccess = Gauge(
+      'groupib_last_success_timestamp_seconds', '마지막으로 수집에 성공한 시각 (Unix time)', ('endpoint',))
+    self.sinceLastSuccess = Gauge(
+      'groupib_seconds_since_last_success', '마지막 수집 성공 이후 경과 시간', ('endpoint',))
+    self.pollInterval = Gauge(
+      'groupib_poll_interval_seconds', '적응형 스케줄의 다음 수집 간격', ('endpoint',))
+    self.endpointCollections = Counter(
+      'groupib_endpoint_collections_total', '결과별 엔드포인트 수집 수 (success, failure)',
+      ('endpoint', 'result'))
+    self.cycleDuration = Histogram(
+      'groupib_cycle_duration_seconds', '수집 사이클 소요 시간', (), CYCLE_BUCKETS)
+    self.lastCycleDuration = Gauge(
+      'groupib_last_cycle_duration_seconds', '마지막 수집 사이클 소요 시간')
+
+    self._metrics = [
+      self.requestDuration, self.requests, self.retries, self.pageBytes, self.pageItems,
+      self.recordsWritten, self.bytesWritten, self.writeCommitDuration, self.pdfDownloads, self.pdfBytes, self.seqUpdate, self.lastSuccess,
+      self.sinceLastSuccess, self.pollInterval, self.endpointCollections, self.cycleDuration,
+      self.lastCycleDuration
+    ]
+
+  def render(self) -> str:
+    """Prometheus 텍스트 형식으로 출력"""
+    now = time.time()
+    for labels, timestamp in self.lastSuccess.items():
+      self.sinceLastSuccess.set(*labels, value=now - timestamp)
+
+    lines = []
+    for metric in self._metrics:
+      lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsServer:
+  """/metrics HTTP 엔드포인트 (데몬 스레드에서 실행)"""
+
+  def __init__(self, metrics: CollectorMetrics, host: str = '127.0.0.1', port: int = 9108):
+    """초기화 메서드
+
+    Args:
+      metrics: 노출할 CollectorMetrics
+      host: 바인드 주소
+      port: 포트 (0이면 임의 포트)
+
+    Raises:
+      OSError: 포트를 열 수 없는 경우
+    """
+    # 서버를 띄울 때만 http.server를 가져옴 (METRICS_PORT=0이면 불필요)
+    from http.server import ThreadingHTTPServer
+    self.metrics = metrics
+    self.httpd = ThreadingHTTPServer((host, port), self._makeHandler())
+    self.httpd.daemon_threads = True
+    self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True,
+                                    name='MetricsServer')
+
+  @property
+  def port(self) -> int:
+    return self.httpd.server_address[1]
+
+  def start(self) -> None:
+    self._thread.start()
+
+  def close(self) -> None:
+    self.httpd.shutdown()
+    self.httpd.server_close()
+
+  def _makeHandler(self):
+    from http.server import BaseHTTPRequestHandler
+    metrics = self.metrics
+
+    class Handler(BaseHTTPRequestHandler):
+      def do_GET(self):
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+          self.send_error(404)
+          return
+        body = metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+      def log_message(self, *args):
+        pass
+
+    return Handler
@@ -0,0 +1,157 @@
+"""
+Group-IB 엔드포인트별 페이지 크기(limit) 자동 조정 모듈
+
+list.csv의 limit 값은 초기값으로만 사용하고, 실제 응답 시간과 크기를 보고 엔드포인트마다
+목표 응답 시간(targetSeconds)과 바이트 예산(targetBytes)에 맞도록 limit을 조정합니다.
+- 항목당 소요 시간/바이트로 목표에 맞는 limit을 계산하고, 한 번에 절반~두 배까지만 변경
+- 가득 차지 않은 페이지는 limit을 늘리지 않음 (더 받을 데이터가 없음)
+- 타임아웃이 나면 즉시 절반으로 줄임
+- 상태 파일: data/page_size.json (seq_update.json 옆, 재시작 후에도 학습한 값 유지)
+"""
+
+import os
+import json
+import math
+import threading
+from typing import Dict, Optional, Tuple
+
+
+class PageSizeTuner:
+  """엔드포인트별 limit 자동 조정기"""
+
+  def __init__(self, stateFile: str, targetSeconds: float = 5.0,
+               targetBytes: int = 8 * 1024 * 1024, minLimit: int = 10, maxLimit: int = 5000):
+    """초기화 메서드
+
+    Args:
+      stateFile: 상태 파일 경로 (page_size.json)
+      targetSeconds: 페이지당 목표 응답 시간(초)
+      targetBytes: 페이지당 목표 응답 크기(바이트)
+      minLimit: 기본 최소 limit (list.csv의 minLimit 컬럼으로 엔드포인트별 지정)
+      maxLimit: 기본 최대 limit (list.csv의 maxLimit 컬럼으로 엔드포인트별 지정)
+    """
+    self.stateFile = stateFile
+    self.targetSeconds = targetSeconds
+    self.targetBytes = targetBytes
+    self.minLimit = minLimit
+    self.maxLimit = maxLimit
+
+    self._lock = threading.Lock()
+    self.limits: Dict[str, int] = {}
+    self.bounds: Dict[str, Tuple[int, int]] = {}
+    self._dirty = False
+
+  def load(self) -> None:
+    """상태 파일 로드 (없거나 손상된 경우 빈 상태)"""
+    limits = {}
+    if os.path.exists(self.stateFile):
+      try:
+        with open(self.stateFile, 'r', encoding='utf-8') as f:
+          limits = {endpoint: int(limit) for endpoint, limit in json.load(f).items()}
+      except (OSError, ValueError, AttributeError):
+        limits = {}
+    with self._lock:
+      self.limits = limits
+      self._dirty = False
+
+  def save(self) -> bool:
+    """변경된 경우 상태 파일 저장 (임시 파일에 쓴 뒤 원자적 교체)
+
+    Returns:
+      저장했으면 True, 변경 사항이 없으면 False
+
+    Raises:
+      OSError: 파일 쓰기 실패
+    """
+    with self._lock:
+      if not self._dirty:
+        return False
+      payload = json.dumps(self.limits, indent=2, ensure_ascii=False, sort_keys=True)
+      self._dirty = False
+
+    tempFile = self.stateFile + '.tmp'
+    with open(tempFile, 'w', encoding='utf-8') as f:
+      f.write(payload)
+    os.replace(tempFile, self.stateFile)
+    return True
+
+  def _bounds(self, endpoint: str) -> Tuple[int, int]:
+    return self.bounds.get(endpoint, (self.minLimit, self.maxLimit))
+
+  def getLimit(self, endpoint: str, initial: int, minLimit: Optional[int] = None,
+               maxLimit: Optional[int] = None) -> int:
+    """현재 limit 반환 (학습한 값이 없으면 list.csv 초기값)
+
+    엔드포인트별 범위를 함께 등록하여 이후 update()/recordTimeout()에 사용합니다.
+
+    Args:
+      endpoint: 엔드포인트 경로
+      initial: list.csv의 limit 값
+      minLimit: 엔드포인트별 최소 limit (None이면 기본값)
+      maxLimit: 엔드포인트별 최대 limit (None이면 기본값)
+
+    Returns:
+      이번 요청에 사용할 limit
+    """
+    low = max(1, minLimit if minLimit is not None else self.minLimit)
+    high = max(low, maxLimit if maxLimit is not None else self.maxLimit)
+    with self._lock:
+      self.bounds[endpoint] = (low, high)
+      limit = self.limits.get(endpoint, initial)
+    return min(high, max(low, limit))
+
+  def _store(self, endpoint: str, limit: int) -> None:
+    if self.limits.get(endpoint) != limit:
+      self.limits[endpoint] = limit
+      self._dirty = True
+
+  def update(self, endpoint: str, limit: int, itemCount: int,
+             seconds: float, byteCount: int) -> int:
+    """페이지 응답 결과를 반영하여 다음 limit 계산
+
+    Args:
+      endpoint: 엔드포인트 경로
+      limit: 이번 요청의 limit
+      itemCount: 받은 항목 수
+      seconds: 응답 소요 시간(초)
+      byteCount: 응답 크기(바이트)
+
+    Returns:
+      다음 요청에 사용할 limit
+    """
+    if itemCount <= 0:
+      return limit
+
+    desired = math.inf
+    if seconds > 0:
+      desired = min(desired, self.targetSeconds * itemCount / seconds)
+    if byteCount > 0:
+      desired = min(desired, self.targetBytes * itemCount / byteCount)
+    if itemCount < limit:
+      # 가득 차지 않은 페이지: 더 큰 페이지가 도움이 되지 않으므로 줄이기만 함
+      desired = min(desired, limit)
+    if math.isinf(desired):
+      return limit
+
+    ratio = min(2.0, max(0.5, desired / limit))
+
+    with self._lock:
+      low, high = self._bounds(endpoint)
+      newLimit = min(high, max(low, int(limit * ratio)))
+      self._store(endpoint, newLimit)
+    return newLimit
+
+  def recordTimeout(self, endpoint: str, limit: int) -> int:
+    """타임아웃 반영: limit을 절반으로 줄임
+
+    Args:
+      endpoint: 엔드포인트 경로
+      limit: 타임아웃이 난 요청의 limit
+
+    Returns:
+      재시도에 사용할 limit
+    """
+    with self._lock:
+      newLimit = max(self._bounds(endpoint)[0], limit // 2)
+      self._store(endpoint, newLimit)
+    return newLimit
@@ -0,0 +1,235 @@
+"""
+Group-IB 페이지 수집 파이프라인 모듈
+
+한 페이지를 요청 → 디코딩/직렬화 → 파일 기록 단계로 나누어, 단계 사이를 크기가 제한된
+큐로 연결합니다.
+- 요청: 엔드포인트 수집 스레드 (HTTP 요청, 응답 본문 수신)
+- 디코딩/직렬화: 프로세스 풀 (JSON 파싱, 항목별 직렬화, 중복 판별 키/IOC 지표 계산)
+  GIL 밖에서 실행되므로 여러 엔드포인트의 CPU 작업이 여러 코어를 사용
+- 기록: 단일 기록 스레드 (중복 판별, 파일 추가, PDF 예약, 커서 기록)
+
+다음 요청에는 이전 페이지의 seqUpdate가 필요하므로 같은 엔드포인트의 요청은 디코딩이 끝난
+뒤에 보내지만, 파일 기록은 다음 요청과 겹쳐 실행됩니다. 기록 스레드는 큐 순서대로 처리하므로
+엔드포인트별 커서는 페이지 순서대로만 전진하고, 기록에 실패한 페이지 이후의 페이지는
+기록하지 않습니다 (다음 사이클에 실패한 페이지부터 다시 수집).
+"""
+
+import os
+import queue
+import threading
+import logging
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .codec import JsonCodec
+from .streaming import splitResponse
+from .dedup import recordKey
+from .iocindex import extractIndicators, indicatorHash
+
+
+# 워커 프로세스별 코덱 캐시
+_codecs: Dict[str, JsonCodec] = {}
+
+
+def decodePage(content: bytes, endpoint: str, codecName: str, timestamp: str,
+               withRecordKeys: bool = False, withIndicators: bool = False) -> Dict[str, Any]:
+  """응답 본문을 디코딩하여 기록할 페이지로 변환 (프로세스 풀에서 실행)
+
+  Args:
+    content: 응답 본문
+    endpoint: 엔드포인트 경로
+    codecName: JSON 코덱 이름
+    timestamp: envelope timestamp (페이지 단위)
+    withRecordKeys: 중복 판별 키 계산 여부
+    withIndicators: IOC 지표 해시 계산 여부
+
+  Returns:
+    {'seqUpdate', 'dataKey', 'itemCount', 'prefix', 'payloads', 'recordKeys', 'digests',
+     'pdfLinks', 'errors'} 딕셔너리
+
+  Raises:
+    ValueError: 응답이 올바른 JSON이 아닌 경우
+  """
+  codec = _codecs.get(codecName)
+  if codec is None:
+    codec = _codecs[codecName] = JsonCodec(codecName)
+
+  dataList, seqUpdate, dataKey = splitResponse(codec.loads(content))
+
+  payloads = []
+  recordKeys = []
+  digests = []
+  pdfLinks = []
+  errors = []
+
+  for index, item in enumerate(dataList):
+    # PDF 다운로드 대상 (file.portalLink가 있는 경우)
+    if isinstance(item, dict):
+      fileData = item.get('file')
+      if isinstance(fileData, dict) and 'portalLink' in fileData:
+        pdfLinks.append((fileData.get('portalLink'), item.get('id', f"unknown_{index}")))
+
+    try:
+      payload = codec.dumps(item)
+    except (TypeError, ValueError) as e:
+      errors.append(f"항목 {index + 1} JSON 직렬화 실패: {e}")
+      continue
+
+    payloads.append(payload)
+    if withRecordKeys:
+      recordKeys.append(recordKey(item))
+    if withIndicators:
+      digests.extend(indicatorHash(value) for value in extractIndicators(item))
+
+  prefix = codec.buildEnvelopePrefix({
+    'timestamp': timestamp,
+    'source': 'groupib-api',
+    'endpoint': endpoint,
+    'seqUpdate': seqUpdate
+  })
+
+  return {
+    'seqUpdate': seqUpdate,
+    'dataKey': dataKey,
+    'itemCount': len(dataList),
+    'prefix': prefix,
+    'payloads': payloads,
+    'recordKeys': recordKeys,
+    'digests': digests,
+    'pdfLinks': pdfLinks,
+    'errors': errors
+  }
+
+
+class PagePipeline:
+  """디코딩 프로세스 풀 + 순서 보장 기록 스레드
+
+  collector의 writePage()/commitSeqUpdate()를 기록 스레드에서 호출합니다.
+  """
+
+  def __init__(self, collector: Any, workers: int = 0, queueSize: int = 8,
+               logger: Optional[logging.Logger] = None):
+    """초기화 메서드
+
+    Args:
+      collector: GroupIBCollector 인스턴스
+      workers: 디코딩 프로세스 수 (0이면 요청 스레드에서 직접 디코딩)
+      queueSize: 기록 대기 페이지 최대 수 (가득 차면 다음 요청을 멈춤)
+      logger: 로거 (None이면 로그 출력 안 함)
+    """
+    self.collector = collector
+    self.workers = workers
+    self.logger = logger
+
+    self.executor = None
+    if workers > 0:
+      # 수집기는 여러 스레드(PDF, 하트비트)를 쓰므로 fork 대신 spawn
+      self.executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+
+    self._queue: queue.Queue = queue.Queue(max(1, queueSize))
+    self._condition = threading.Condition()
+    # 엔드포인트별 {'pending': 기록 대기 페이지 수, 'failed': 기록 실패 여부}
+    self._state: Dict[str, Dict[str, Any]] = {}
+
+    self._writer = threading.Thread(target=self._writeLoop, name='page-writer', daemon=True)
+    self._writer.start()
+
+  def decode(self, content: bytes, endpoint: str) -> Dict[str, Any]:
+    """응답 본문 디코딩 (프로세스 풀이 있으면 워커 프로세스에서)
+
+    Raises:
+      ValueError: 응답이 올바른 JSON이 아닌 경우
+    """
+    args = (content, endpoint, self.collector.codec.name,
+            datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z',
+            self.collector.dedupIndex, self.collector.isIocIndexed(endpoint))
+    if self.executor is None:
+      return decodePage(*args)
+    return self.executor.submit(decodePage, *args).result()
+
+  def collectPage(self, url: str, endpoint: str, params: Dict[str, str],
+                  seqUpdates: Dict[str, int]) -> Optional[Tuple[int, int]]:
+    """한 페이지 요청 및 디코딩 후 기록 예약
+
+    Args:
+      url: 요청 URL
+      endpoint: 엔드포인트 경로
+      params: 쿼리 파라미터 (seqUpdate 포함)
+      seqUpdates: 기록이 끝난 뒤 갱신할 seqUpdate 딕셔너리
+
+    Returns:
+      (페이지 항목 수, 새 seqUpdate) 튜플 또는 None (요청/디코딩 실패 시)
+    """
+    collector = self.collector
+    response = collector.requestApi(url, params)
+    if response is None:
+      collector.logger.error(f"  ✗ 수집 실패: {endpoint}")
+      return None
+
+    try:
+      page = self.decode(response.content, endpoint)
+    except ValueError as e:
+      collector.logger.error(f"  ✗ 응답 디코딩 실패: {endpoint} - {e}")
+      return None
+
+    if page['dataKey'] is None:
+      collector.logger.warning(f"⚠ 응답에 데이터 필드가 없습니다 (items/data/results): {endpoint}")
+    collector.metrics.pageItems.observe(endpoint, value=page['itemCount'])
+
+    with self._condition:
+      state = self._state.setdefault(endpoint, {'pending': 0, 'failed': False})
+      state['pending'] += 1
+    # 기록 대기 페이지가 가득 차면 여기서 멈춤 (메모리 사용량 제한)
+    self._queue.put((endpoint, page, seqUpdates))
+    return page['itemCount'], page['seqUpdate']
+
+  def hasFailed(self, endpoint: str) -> bool:
+    """엔드포인트의 페이지 기록 또는 커서 기록 실패 여부"""
+    with self._condition:
+      return self._state.get(endpoint, {}).get('failed', False)
+
+  def wait(self, endpoint: str) -> bool:
+    """엔드포인트의 기록 대기 페이지가 모두 처리될 때까지 대기
+
+    Returns:
+      모든 페이지를 기록하고 커서를 전진시켰으면 True
+    """
+    with self._condition:
+      self._condition.wait_for(lambda: self._state.get(endpoint, {}).get('pending', 0) == 0)
+      state = self._state.pop(endpoint, {})
+    return not state.get('failed', False)
+
+  def _writeLoop(self) -> None:
+    while True:
+      job = self._queue.get()
+      if job is None:
+        break
+      endpoint, page, seqUpdates = job
+
+      if not self.hasFailed(endpoint):
+        try:
+          ok = (self.collector.writePage(endpoint, page) and
+                self.collector.commitSeqUpdate(endpoint, seqUpdates, page['seqUpdate']))
+        except Exception as e:
+          ok = False
+          if self.logger:
+            self.logger.error(f"  ✗ 페이지 기록 실패: {endpoint} - {e}")
+      else:
+        # 실패한 페이지 뒤의 페이지는 커서 순서를 지키기 위해 버림
+        ok = False
+
+      with self._condition:
+        state = self._state[endpoint]
+        state['pending'] -= 1
+        state['failed'] = state['failed'] or not ok
+        self._condition.notify_all()
+
+  def close(self) -> None:
+    """남은 페이지를 기록하고 기록 스레드와 프로세스 풀 종료"""
+    self._queue.put(None)
+    self._writer.join()
+    if self.executor is not None:
+      self.executor.shutdown()
+      self.executor = None
@@ -0,0 +1,224 @@
+"""
+Group-IB API 요청 속도 제한 모듈
+
+여러 스레드(비동기 엔진의 워커 포함)가 공유하는 요청 속도 제한기를 제공합니다.
+AdaptiveRateLimiter는 정상 응답마다 요청 속도를 조금씩 올리고(additive increase),
+429를 받으면 절반으로 낮추며(multiplicative decrease), Retry-After와 X-RateLimit-* 헤더가
+알려주는 시각까지 모든 요청 경로를 함께 멈춥니다.
+"""
+
+import math
+import time
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+
+def parseRetryAfter(headers: Mapping[str, str]) -> Optional[float]:
+  """Retry-After 헤더를 대기 시간(초)으로 변환
+
+  Args:
+    headers: 응답 헤더 (대소문자 구분 없는 매핑)
+
+  Returns:
+    대기 시간(초) 또는 None (헤더가 없거나 해석할 수 없는 경우)
+  """
+  value = headers.get('Retry-After')
+  if not value:
+    return None
+
+  value = value.strip()
+  try:
+    return max(0.0, float(value))
+  except ValueError:
+    pass
+
+  # HTTP-date 형식 (예: Wed, 21 Oct 2015 07:28:00 GMT)
+  try:
+    return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+  except (TypeError, ValueError, OverflowError):
+    return None
+
+
+def parseRateLimitReset(headers: Mapping[str, str]) -> Optional[float]:
+  """남은 요청 수가 0일 때 X-RateLimit-Reset/RateLimit-Reset까지의 대기 시간(초)
+
+  Reset 값은 초 단위 남은 시간 또는 Unix time 모두 허용합니다.
+
+  Args:
+    headers: 응답 헤더
+
+  Returns:
+    대기 시간(초) 또는 None (남은 요청이 있거나 헤더가 없는 경우)
+  """
+  for prefix in ('X-RateLimit-', 'RateLimit-'):
+    remaining = headers.get(prefix + 'Remaining')
+    if remaining is None:
+      continue
+    try:
+      if float(remaining) > 0:
+        return None
+      reset = float(headers.get(prefix + 'Reset', ''))
+    except ValueError:
+      return None
+    # 10억 이상이면 Unix time으로 간주
+    if reset > 1e9:
+      reset -= time.time()
+    return max(0.0, reset)
+  return None
+
+
+class RateLimiter:
+  """요청 시작 간 최소 간격을 보장하는 스레드 안전 속도 제한기
+
+  모든 요청 경로가 같은 인스턴스를 공유하여, 동시 수집 중에도 전체 요청 속도가
+  설정값을 넘지 않도록 합니다.
+  """
+
+  def __init__(self, minInterval: float):
+    """초기화 메서드
+
+    Args:
+      minInterval: 요청 시작 간 최소 간격(초). 0이면 제한 없음
+    """
+    self.minInterval = max(0.0, float(minInterval))
+    self._lock = threading.Lock()
+    self._nextSlot = 0.0
+
+  def acquire(self, stopEvent: Optional[threading.Event] = None) -> float:
+    """다음 요청 슬롯까지 대기
+
+    슬롯 예약은 락 안에서, 실제 대기는 락 밖에서 수행하여
+    대기 중인 스레드가 다른 스레드의 예약을 막지 않도록 합니다.
+
+    Args:
+      stopEvent: 종료 요청 이벤트 (설정되면 대기를 즉시 끝냄, 호출자가 요청 여부 판단)
+
+    Returns:
+      예약한 슬롯까지의 대기 시간(초)
+    """
+    if self.minInterval <= 0:
+      return 0.0
+
+    with self._lock:
+      now = time.monotonic()
+      slot = max(now, self._nextSlot)
+      self._nextSlot = slot + self.minInterval
+
+    return self._wait(slot - now, stopEvent)
+
+  @staticmethod
+  def _wait(waitTime: float, stopEvent: Optional[threading.Event]) -> float:
+    if waitTime > 0:
+      if stopEvent is not None:
+        stopEvent.wait(waitTime)
+      else:
+        time.sleep(waitTime)
+    return waitTime
+
+
+class AdaptiveRateLimiter(RateLimiter):
+  """AIMD 방식으로 요청 속도를 조절하는 공유 속도 제한기
+
+  - 정상 응답(recordSuccess): 초당 요청 수를 increaseStep만큼 올림 (maxRate까지)
+  - 429/과부하 응답(recordThrottle): 초당 요청 수에 decreaseFactor를 곱하고 (minRate까지),
+    Retry-After 시간 동안 모든 스레드의 요청을 멈춤
+  - 남은 요청 수가 0인 정상 응답: 속도는 유지하고 Reset 시각까지 멈춤
+
+  동시에 진행 중이던 요청들이 같은 429를 연달아 받아도 속도는 한 번만 낮춥니다.
+  """
+
+  def __init__(self, minInterval: float, maxRate: float = 10.0, minRate: float = 0.05,
+               increaseStep: float = 0.05, decreaseFactor: float = 0.5,
+               maxPause: float = 300.0, logger: Optional[logging.Logger] = None):
+    """초기화 메서드
+
+    Args:
+      minInterval: 초기 요청 시작 간 최소 간격(초). 0이면 429를 받기 전까지 제한 없음
+      maxRate: 속도를 올릴 때의 상한(초당 요청 수)
+      minRate: 속도를 낮출 때의 하한(초당 요청 수)
+      increaseStep: 정상 응답마다 올리는 초당 요청 수 (0이면 올리지 않음)
+      decreaseFactor: 429마다 곱하는 비율 (1이면 낮추지 않음)
+      maxPause: 한 번에 멈추는 최대 시간(초)
+      logger: 로거 (None이면 로그 출력 안 함)
+    """
+    super().__init__(minInterval)
+    self.maxRate = maxRate
+    self.minRate = minRate
+    self.increaseStep = increaseStep
+    self.decreaseFactor = decreaseFactor
+    self.maxPause = maxPause
+    self.logger = logger
+
+    self.rate = 1.0 / self.minInterval if self.minInterval > 0 else math.inf
+    self._pausedUntil = 0.0
+    self._holdUntil = 0.0
+
+  def _setRate(self, rate: float) -> None:
+    self.rate = rate
+    self.minInterval = 0.0 if math.isinf(rate) else 1.0 / rate
+
+  def acquire(self, stopEvent: Optional[threading.Event] = None) -> float:
+    """다음 요청 슬롯까지 대기 (멈춤 시각이 설정되어 있으면 그때까지)
+
+    Args:
+      stopEvent: 종료 요청 이벤트 (설정되면 Retry-After 멈춤 중에도 대기를 즉시 끝냄)
+
+    Returns:
+      예약한 슬롯까지의 대기 시간(초)
+    """
+    with self._lock:
+      now = time.monotonic()
+      slot = max(now, self._nextSlot, self._pausedUntil)
+      self._nextSlot = slot + self.minInterval
+
+    return self._wait(slot - now, stopEvent)
+
+  def recordSuccess(self, headers: Optional[Mapping[str, str]] = None) -> None:
+    """정상 응답 반영: 속도를 올리고, 남은 요청 수가 0이면 Reset까지 멈춤
+
+    Args:
+      headers: 응답 헤더 (X-RateLimit-Remaining/Reset 확인용)
+    """
+    resetAfter = parseRateLimitReset(headers) if headers is not None else None
+
+    with self._lock:
+      if self.increaseStep > 0 and self.rate < self.maxRate:
+        self._setRate(min(self.maxRate, self.rate + self.increaseStep))
+      if resetAfter:
+        self._pausedUntil = max(self._pausedUntil,
+                                time.monotonic() + min(resetAfter, self.maxPause))
+
+  def recordThrottle(self, waitTime: float) -> float:
+    """429/과부하 응답 반영: 속도를 낮추고 모든 요청을 waitTime 동안 멈춤
+
+    Args:
+      waitTime: 멈출 시간(초). 보통 Retry-After 값
+
+    Returns:
+      실제로 적용한 멈춤 시간(초, maxPause로 제한)
+    """
+    waitTime = min(max(0.0, waitTime), self.maxPause)
+
+    with self._lock:
+      now = time.monotonic()
+      previousRate = self.rate
+      if self.decreaseFactor < 1 and now >= self._holdUntil:
+        baseRate = self.maxRate if math.isinf(self.rate) else self.rate
+        self._setRate(max(self.minRate, baseRate * self.decreaseFactor))
+        # 멈춤이 끝나고 낮춘 속도로 한 번 요청할 때까지 추가 감속 보류
+        self._holdUntil = now + waitTime + self.minInterval
+      self._pausedUntil = max(self._pausedUntil, now + waitTime)
+      self._nextSlot = max(self._nextSlot, self._pausedUntil)
+      rate = self.rate
+
+    if self.logger and rate != previousRate:
+      self.logger.warning(
+        f"  요청 속도 하향: {self._formatRate(previousRate)} → {self._formatRate(rate)}"
+      )
+    return waitTime
+
+  @staticmethod
+  def _formatRate(rate: float) -> str:
+    return '제한 없음' if math.isinf(rate) else f"{rate:.2f} req/s"
@@ -0,0 +1,370 @@
+"""
+Group-IB 수집 데이터 중복/무결성 검사 모듈
+
+data/outputs의 JSONL 파일(회전된 세그먼트 포함)을 여러 프로세스로 나누어 검사합니다.
+- 큰 파일은 바이트 구간 단위로 나누어 병렬 처리
+- 레코드 ID는 해시(16바이트)로 바꿔 샤드 파일에 기록한 뒤 샤드별로 고유 개수 계산
+  (메모리 사용량은 전체 레코드 수가 아니라 샤드 하나의 크기에 비례)
+- 중복, 손상된 줄, seqUpdate 분포를 엔드포인트별로 보고
+
+사용법:
+  python main.py scan [--outputs DIR] [--workers N] [--json]
+
+종료 코드:
+  0: 문제 없음, 1: 손상된 줄 또는 허용 비율을 넘는 중복 발견, 2: 검사 실패
+"""
+
+import os
+import sys
+import json
+import math
+import shutil
+import hashlib
+import argparse
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .codec import JsonCodec
+from .segments import SEGMENTS_DIRNAME, openSegment
+
+
+DIGEST_SIZE = 16
+
+# 파일을 나누는 구간 크기와 샤드 하나가 담당하는 입력 크기 (기본값)
+RANGE_BYTES = 64 * 1024 * 1024
+SHARD_INPUT_BYTES = 256 * 1024 * 1024
+
+# 압축 세그먼트의 압축 전 크기 추정 배율 (샤드 수 계산용)
+_COMPRESSED_RATIO = 8
+
+# 보고서에 남길 손상된 줄 예시 수
+_MALFORMED_SAMPLES = 5
+
+
+def findDatasets(outputsDir: str) -> Dict[str, List[str]]:
+  """엔드포인트별 검사 대상 파일 목록
+
+  활성 파일(<이름>.jsonl)과 segments/<이름>/ 아래 세그먼트를 하나의 데이터셋으로 묶습니다.
+
+  Args:
+    outputsDir: JSONL 출력 디렉토리
+
+  Returns:
+    {데이터셋 이름: 파일 경로 리스트} 딕셔너리
+
+  Raises:
+    OSError: 디렉토리를 읽을 수 없는 경우
+  """
+  datasets: Dict[str, List[str]] = {}
+
+  segmentsRoot = os.path.join(outputsDir, SEGMENTS_DIRNAME)
+  if os.path.isdir(segmentsRoot):
+    for name in sorted(os.listdir(segmentsRoot)):
+      segmentDir = os.path.join(segmentsRoot, name)
+      if not os.path.isdir(segmentDir):
+        continue
+      for filename in sorted(os.listdir(segmentDir)):
+        if filename.endswith(('.jsonl', '.jsonl.gz', '.jsonl.zst')):
+          datasets.setdefault(name, []).append(os.path.join(segmentDir, filename))
+
+  for filename in sorted(os.listdir(outputsDir)):
+    if filename.endswith('.jsonl'):
+      name = filename[:-len('.jsonl')]
+      datasets.setdefault(name, []).append(os.path.join(outputsDir, filename))
+
+  return datasets
+
+
+def planTasks(datasets: Dict[str, List[str]], rangeBytes: int,
+              shardInputBytes: int) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+  """파일을 검사 작업 단위로 분할
+
+  압축되지 않은 파일은 rangeBytes 구간으로 나누고, 압축 세그먼트는 파일 하나가 작업 하나입니다.
+
+  Args:
+    datasets: findDatasets() 결과
+    rangeBytes: 구간 크기
+    shardInputBytes: 샤드 하나가 담당할 입력 크기
+
+  Returns:
+    (작업 리스트, {데이터셋 이름: 샤드 수}) 튜플
+  """
+  tasks = []
+  shardCounts = {}
+
+  for name, paths in datasets.items():
+    estimatedBytes = 0
+    for path in paths:
+      size = os.path.getsize(path)
+      if path.endswith('.jsonl'):
+        estimatedBytes += size
+        for start in range(0, max(size, 1), rangeBytes):
+          tasks.append({'dataset': name, 'path': path, 'start': start,
+                        'end': min(start + rangeBytes, size)})
+      else:
+        estimatedBytes += size * _COMPRESSED_RATIO
+        tasks.append({'dataset': name, 'path': path, 'start': 0, 'end': None})
+    shardCounts[name] = max(1, math.ceil(estimatedBytes / shardInputBytes))
+
+  for index, task in enumerate(tasks):
+    task['index'] = index
+    task['shards'] = shardCounts[task['dataset']]
+
+  return tasks, shardCounts
+
+
+def _iterRangeLines(path: str, start: int, end: Optional[int]):
+  """구간에서 시작하는 줄을 (위치 설명, 줄) 형태로 반환
+
+  줄은 첫 바이트가 속한 구간에서 처리합니다. 압축 세그먼트(end=None)는 줄 번호로 위치를 표시합니다.
+  """
+  if end is None:
+    with openSegment(path) as f:
+      for lineNumber, line in enumerate(f, 1):
+        yield f"{os.path.basename(path)}:{lineNumber}", line
+    return
+
+  with open(path, 'rb') as f:
+    position = start
+    if start > 0:
+      # 이전 구간에서 시작한 줄은 건너뜀
+      f.seek(start - 1)
+      position = start - 1 + len(f.readline())
+    while position < end:
+      line = f.readline()
+      if not line:
+        break
+      yield f"{os.path.basename(path)}@{position}", line
+      position += len(line)
+
+
+def scanRange(task: Dict[str, Any], shardDir: str) -> Dict[str, Any]:
+  """작업 하나 검사 (워커 프로세스에서 실행)
+
+  레코드 ID 해시는 샤드별로 모아 '<데이터셋>.<샤드>.<작업 번호>' 파일에 한 번에 기록합니다.
+
+  Args:
+    task: planTasks()가 만든 작업
+    shardDir: 샤드 파일 디렉토리
+
+  Returns:
+    검사 통계 딕셔너리 (records, withId, malformed, malformedSamples, seqUpdates, bytes)
+  """
+  codec = JsonCodec('auto')
+  shardCount = task['shards']
+  shards = [bytearray() for _ in range(shardCount)]
+
+  records = 0
+  withId = 0
+  malformed = 0
+  samples = []
+  seqUpdates: Counter = Counter()
+  bytesRead = 0
+
+  for location, line in _iterRangeLines(task['path'], task['start'], task['end']):
+    bytesRead += len(line)
+    if not line.strip():
+      continue
+
+    try:
+      if not line.endswith(b'\n' if isinstance(line, bytes) else '\n'):
+        raise ValueError("줄바꿈 없이 끝난 마지막 줄 (기록 도중 중단)")
+      record = codec.loads(line)
+      if not isinstance(record, dict):
+        raise ValueError("JSON 객체가 아닌 레코드")
+    except ValueError as e:
+      malformed += 1
+      if len(samples) < _MALFORMED_SAMPLES:
+        samples.append(f"{location}: {e}")
+      continue
+
+    records += 1
+    seqUpdates[record.get('seqUpdate')] += 1
+
+    data = record.get('data')
+    recordId = (data.get('id') or data.get('hash')) if isinstance(data, dict) else None
+    if recordId:
+      withId += 1
+      digest = hashlib.blake2b(str(recordId).encode('utf-8'), digest_size=DIGEST_SIZE).digest()
+      shards[int.from_bytes(digest[:4], 'big') % shardCount] += digest
+
+  for shard, digests in enumerate(shards):
+    if digests:
+      shardFile = os.path.join(shardDir, f"{task['dataset']}.{shard}.{task['index']}")
+      with open(shardFile, 'wb') as f:
+        f.write(digests)
+
+  return {'dataset': task['dataset'], 'records': records, 'withId': withId,
+          'malformed': malformed, 'malformedSamples': samples,
+          'seqUpdates': seqUpdates, 'bytes': bytesRead}
+
+
+def countShard(paths: List[str]) -> int:
+  """샤드 파일들의 고유 해시 개수 (워커 프로세스에서 실행)
+
+  Args:
+    paths: 같은 데이터셋/샤드의 파일 경로 리스트
+
+  Returns:
+    고유 해시 개수
+  """
+  unique = set()
+  for path in paths:
+    with open(path, 'rb') as f:
+      data = f.read()
+    unique.update(data[i:i + DIGEST_SIZE] for i in range(0, len(data), DIGEST_SIZE))
+  return len(unique)
+
+
+def _runAll(executor: Optional[ProcessPoolExecutor], func, argsList: List[tuple]) -> List[Any]:
+  if executor is None:
+    return [func(*args) for args in argsList]
+  futures = [executor.submit(func, *args) for args in argsList]
+  return [future.result() for future in futures]
+
+
+def scanOutputs(outputsDir: str, workers: int = 0, rangeBytes: int = RANGE_BYTES,
+                shardInputBytes: int = SHARD_INPUT_BYTES,
+                tempDir: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+  """출력 디렉토리 전체 검사
+
+  Args:
+    outputsDir: JSONL 출력 디렉토리
+    workers: 프로세스 수 (0이면 CPU 수, 1이면 현재 프로세스에서 실행)
+    rangeBytes: 파일 분할 구간 크기
+    shardInputBytes: 샤드 하나가 담당할 입력 크기
+    tempDir: 샤드 파일을 만들 디렉토리 (None이면 시스템 임시 디렉토리)
+
+  Returns:
+    {데이터셋 이름: 통계 딕셔너리} (files, records, withId, unique, duplicates,
+    malformed, malformedSamples, seqUpdates, bytes)
+
+  Raises:
+    OSError: 파일을 읽거나 샤드 파일을 쓸 수 없는 경우
+  """
+  datasets = findDatasets(outputsDir)
+  tasks, shardCounts = planTasks(datasets, rangeBytes, shardInputBytes)
+
+  workers = workers or os.cpu_count() or 1
+  shardDir = tempfile.mkdtemp(prefix='groupib-scan-', dir=tempDir)
+  executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 and len(tasks) > 1 else None
+
+  try:
+    # 1단계: 구간별 검사 및 ID 해시 샤딩
+    partials = _runAll(executor, scanRange, [(task, shardDir) for task in tasks])
+
+    report: Dict[str, Dict[str, Any]] = {
+      name: {'files': len(paths), 'records': 0, 'withId': 0, 'unique': 0, 'duplicates': 0,
+             'malformed': 0, 'malformedSamples': [], 'seqUpdates': Counter(), 'bytes': 0}
+      for name, paths in datasets.items()
+    }
+    for partial in partials:
+      stats = report[partial['dataset']]
+      for key in ('records', 'withId', 'malformed', 'bytes'):
+        stats[key] += partial[key]
+      stats['seqUpdates'].update(partial['seqUpdates'])
+      room = _MALFORMED_SAMPLES - len(stats['malformedSamples'])
+      stats['malformedSamples'].extend(partial['malformedSamples'][:room])
+
+    # 2단계: 샤드별 고유 개수 계산
+    shardFiles: Dict[Tuple[str, int], List[str]] = {}
+    for filename in os.listdir(shardDir):
+      name, shard, _ = filename.rsplit('.', 2)
+      shardFiles.setdefault((name, int(shard)), []).append(os.path.join(shardDir, filename))
+
+    keys = sorted(shardFiles)
+    counts = _runAll(executor, countShard, [(shardFiles[key],) for key in keys])
+    for (name, _), unique in zip(keys, counts):
+      report[name]['unique'] += unique
+
+  finally:
+    if executor is not None:
+      executor.shutdown()
+    shutil.rmtree(shardDir, ignore_errors=True)
+
+  for stats in report.values():
+    stats['duplicates'] = stats['withId'] - stats['unique']
+    stats['seqUpdates'] = dict(stats['seqUpdates'])
+
+  return report
+
+
+def hasProblems(report: Dict[str, Dict[str, Any]], maxDuplicateRatio: float = 0.0) -> bool:
+  """게이트 판정 (손상된 줄 또는 허용 비율을 넘는 중복이 있으면 True)"""
+  for stats in report.values():
+    if stats['malformed']:
+      return True
+    if stats['withId'] and stats['duplicates'] / stats['withId'] > maxDuplicateRatio:
+      return True
+  return False
+
+
+def printReport(report: Dict[str, Dict[str, Any]]) -> None:
+  """검사 결과 출력 (check_duplicates.py와 같은 형식)"""
+  problems = {name: stats for name, stats in report.items()
+              if stats['duplicates'] or stats['malformed']}
+
+  if not problems:
+    print(f"✓ 모든 엔드포인트에서 중복/손상 데이터 없음 ({len(report)}개 검사)")
+    return
+
+  print("=" * 70)
+  print("중복 또는 손상된 데이터가 발견된 엔드포인트")
+  print("=" * 70)
+  for name, stats in problems.items():
+    ratio = (stats['duplicates'] / stats['withId'] * 100) if stats['withId'] else 0.0
+    print(f"\n📄 {name} (파일 {stats['files']}개, {stats['bytes']:,} bytes)")
+    print(f"   총 레코드: {stats['records']}개")
+    print(f"   고유 레코드: {stats['unique']}개")
+    print(f"   중복: {stats['duplicates']}개 ({ratio:.1f}%)")
+    if stats['malformed']:
+      print(f"   손상된 줄: {stats['malformed']}개")
+      for sample in stats['malformedSamples']:
+        print(f"     - {sample}")
+    print(f"   seqUpdate 분포:")
+    for seq in sorted(stats['seqUpdates'], key=lambda value: (value is None, str(value))):
+      print(f"     - {seq}: {stats['seqUpdates'][seq]}개")
+
+
+def addArguments(parser: argparse.ArgumentParser) -> None:
+  """scan 하위 명령 인자 등록"""
+  parser.add_argument('--outputs', default=None,
+                      help='검사할 출력 디렉토리 (기본값: data/outputs)')
+  parser.add_argument('--workers', type=int, default=0,
+                      help='프로세스 수 (기본값: CPU 수)')
+  parser.add_argument('--max-duplicate-ratio', type=float, default=0.0,
+                      help='허용할 중복 비율 0~1 (기본값: 0, 중복이 하나라도 있으면 실패)')
+  parser.add_argument('--range-mb', type=int, default=RANGE_BYTES // (1024 * 1024),
+                      help='파일 분할 구간 크기(MB)')
+  parser.add_argument('--temp-dir', default=None,
+                      help='샤드 파일 임시 디렉토리')
+  parser.add_argument('--json', action='store_true',
+                      help='결과를 JSON으로 출력')
+
+
+def runScan(args: argparse.Namespace, defaultOutputsDir: str) -> int:
+  """scan 하위 명령 실행
+
+  Args:
+    args: addArguments()로 등록한 인자
+    defaultOutputsDir: --outputs가 없을 때 사용할 출력 디렉토리
+
+  Returns:
+    종료 코드 (0: 문제 없음, 1: 문제 발견, 2: 검사 실패)
+  """
+  outputsDir = args.outputs or defaultOutputsDir
+  try:
+    report = scanOutputs(outputsDir, args.workers, args.range_mb * 1024 * 1024,
+                         tempDir=args.temp_dir)
+  except (OSError, ValueError) as e:
+    print(f"✗ 검사 실패: {outputsDir} - {e}", file=sys.stderr)
+    return 2
+
+  if args.json:
+    print(json.dumps(report, ensure_ascii=False, indent=2, default=str))
+  else:
+    printReport(report)
+
+  return 1 if hasProblems(report, args.max_duplicate_ratio) else 0
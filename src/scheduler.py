@@ -0,0 +1,216 @@
+"""
+Group-IB 엔드포인트별 적응형 수집 스케줄러 모듈
+
+모든 엔드포인트를 같은 주기(WAIT_MINUTES)로 수집하지 않고, 엔드포인트마다 다음 수집 시각을
+따로 관리합니다.
+- 최근 수집에서 받은 신규 항목 수로 초당 유입량의 EWMA(지수 가중 이동 평균)를 계산
+- 다음 수집 간격 = 목표 항목 수 / 유입량, 엔드포인트별 최소/최대 간격으로 제한
+- 상태 파일: data/schedule.json (재시작 후에도 유입량 추정과 다음 수집 시각 유지)
+"""
+
+import os
+import json
+import heapq
+import time
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class PollScheduler:
+  """다음 수집 시각 기준 우선순위 큐 스케줄러
+
+  유입이 잦은 피드(ioc/common 등)는 최소 간격에 가깝게, 거의 변하지 않는 피드
+  (apt/threat_actor 등)는 최대 간격에 가깝게 수집됩니다. 수집에 실패한 엔드포인트는
+  유입량 추정을 바꾸지 않고 최소 간격 뒤에 다시 수집합니다.
+  """
+
+  def __init__(self, stateFile: str, defaultInterval: float = 1800,
+               minInterval: float = 300, maxInterval: float = 21600,
+               targetItems: float = 100, alpha: float = 0.3):
+    """초기화 메서드
+
+    Args:
+      stateFile: 상태 파일 경로 (schedule.json)
+      defaultInterval: 유입량 추정이 없을 때의 간격(초)
+      minInterval: 기본 최소 간격(초). list.csv의 minMinutes 컬럼으로 엔드포인트별 지정
+      maxInterval: 기본 최대 간격(초). list.csv의 maxMinutes 컬럼으로 엔드포인트별 지정
+      targetItems: 한 번 수집할 때 받을 목표 신규 항목 수
+      alpha: EWMA 가중치 (0~1, 클수록 최근 수집 결과를 크게 반영)
+    """
+    self.stateFile = stateFile
+    self.defaultInterval = defaultInterval
+    self.minInterval = minInterval
+    self.maxInterval = maxInterval
+    self.targetItems = targetItems
+    self.alpha = alpha
+
+    self._lock = threading.Lock()
+    # 엔드포인트별 {'rate': 초당 항목 수 EWMA 또는 None, 'lastPoll': 시각, 'nextDue': 시각, 'interval': 초}
+    self.state: Dict[str, Dict[str, Any]] = {}
+
+  def load(self) -> None:
+    """상태 파일 로드 (없거나 손상된 경우 빈 상태)"""
+    state = {}
+    if os.path.exists(self.stateFile):
+      try:
+        with open(self.stateFile, 'r', encoding='utf-8') as f:
+          state = json.load(f)
+      except (OSError, ValueError):
+        state = {}
+    with self._lock:
+      self.state = state
+
+  def save(self) -> None:
+    """상태 파일 저장 (임시 파일에 쓴 뒤 원자적 교체)
+
+    Raises:
+      OSError: 파일 쓰기 실패
+    """
+    with self._lock:
+      payload = json.dumps(self.state, indent=2, ensure_ascii=False, sort_keys=True)
+
+    tempFile = self.stateFile + '.tmp'
+    with open(tempFile, 'w', encoding='utf-8') as f:
+      f.write(payload)
+    os.replace(tempFile, self.stateFile)
+
+  def getBounds(self, endpointConfig: Dict[str, Any]) -> Tuple[float, float]:
+    """엔드포인트별 (최소 간격, 최대 간격) 초 단위 반환 (list.csv 선택 컬럼 우선)"""
+    minMinutes = endpointConfig.get('minMinutes')
+    maxMinutes = endpointConfig.get('maxMinutes')
+    low = minMinutes * 60 if minMinutes is not None else self.minInterval
+    high = maxMinutes * 60 if maxMinutes is not None else self.maxInterval
+    return low, max(low, high)
+
+  def nextDue(self, endpoint: str) -> float:
+    """다음 수집 시각 (Unix time, 기록이 없으면 0 = 즉시)"""
+    with self._lock:
+      return self.state.get(endpoint, {}).get('nextDue', 0.0)
+
+  def dueEndpoints(self, endpoints: List[Dict[str, Any]],
+                   now: Optional[float] = None) -> List[Dict[str, Any]]:
+    """수집 시각이 된 엔드포인트를 다음 수집 시각이 이른 순서로 반환
+
+    Args:
+      endpoints: 엔드포인트 설정 리스트
+      now: 기준 시각 (None이면 현재 시각)
+
+    Returns:
+      수집할 엔드포인트 설정 리스트
+    """
+    now = time.time() if now is None else now
+    queue = [(self.nextDue(ep['endpoint']), index, ep) for index, ep in enumerate(endpoints)]
+    heapq.heapify(queue)
+
+    due = []
+    while queue and queue[0][0] <= now:
+      due.append(heapq.heappop(queue)[2])
+    return due
+
+  def secondsUntilNextDue(self, endpoints: List[Dict[str, Any]],
+                          now: Optional[float] = None) -> float:
+    """가장 이른 다음 수집 시각까지 남은 시간(초, 0 이상)"""
+    if not endpoints:
+      return self.defaultInterval
+    now = time.time() if now is None else now
+    return max(0.0, min(self.nextDue(ep['endpoint']) for ep in endpoints) - now)
+
+  def update(self, endpointConfig: Dict[str, Any], success: bool, itemCount: int,
+             now: Optional[float] = None) -> float:
+    """수집 결과를 반영하여 다음 수집 시각 계산
+
+    Args:
+      endpointConfig: 엔드포인트 설정
+      success: 수집 성공 여부
+      itemCount: 이번 수집에서 받은 신규 항목 수
+      now: 기준 시각 (None이면 현재 시각)
+
+    Returns:
+      다음 수집까지의 간격(초)
+    """
+    now = time.time() if now is None else now
+    endpoint = endpointConfig['endpoint']
+    low, high = self.getBounds(endpointConfig)
+
+    with self._lock:
+      entry = self.state.setdefault(endpoint, {'rate': None, 'lastPoll': None})
+
+      if not success:
+        interval = low
+      else:
+        lastPoll = entry.get('lastPoll')
+        rate = entry.get('rate')
+        # 첫 수집(백로그 포함)은 유입량 추정에 쓰지 않음
+        if lastPoll is not None and now > lastPoll:
+          observed = itemCount / (now - lastPoll)
+          rate = observed if rate is None else self.alpha * observed + (1 - self.alpha) * rate
+          entry['rate'] = rate
+        entry['lastPoll'] = now
+
+        if rate is None:
+          interval = self.defaultInterval
+        elif rate <= 0:
+          interval = high
+        else:
+          interval = self.targetItems / rate
+        interval = min(high, max(low, interval))
+
+      entry['interval'] = interval
+      entry['nextDue'] = now + interval
+    return interval
+
+
+class DeadlineTicker:
+  """고정 주기 수집용 절대 마감 시각 계산기
+
+  "사이클 종료 후 WAIT_MINUTES 대기"는 실제 주기가 사이클 소요 시간만큼 늘어나고 백로그가
+  쌓일수록 점점 밀립니다. 시작 시각 + k × 주기의 격자에 맞춰 다음 사이클 시작 시각을 정하므로
+  사이클 소요 시간과 관계없이 주기가 유지됩니다.
+  사이클이 주기보다 길어 격자 시각을 놓친 경우:
+  - coalesce: 놓친 시각들을 한 번으로 합쳐 바로 다음 사이클 시작
+  - skip: 놓친 시각은 건너뛰고 다음 격자 시각까지 대기
+  """
+
+  POLICIES = ('coalesce', 'skip')
+
+  def __init__(self, period: float, missedPolicy: str = 'coalesce', start: Optional[float] = None):
+    """초기화 메서드
+
+    Args:
+      period: 수집 주기(초)
+      missedPolicy: 놓친 시각 처리 방식 (coalesce 또는 skip)
+      start: 첫 사이클 시작 시각 (time.monotonic 기준, None이면 현재)
+
+    Raises:
+      ValueError: missedPolicy가 올바르지 않은 경우
+    """
+    if missedPolicy not in self.POLICIES:
+      raise ValueError(f"MISSED_CYCLES는 'coalesce' 또는 'skip'이어야 합니다: {missedPolicy}")
+    self.period = max(1.0, period)
+    self.missedPolicy = missedPolicy
+    self.deadline = (time.monotonic() if start is None else start) + self.period
+
+  def next(self, now: Optional[float] = None) -> Tuple[float, int]:
+    """사이클이 끝난 뒤 다음 사이클 시작 시각 계산
+
+    Args:
+      now: 현재 시각 (time.monotonic 기준, None이면 현재)
+
+    Returns:
+      (다음 사이클 시작 시각, 놓친 격자 시각 수) 튜플
+    """
+    now = time.monotonic() if now is None else now
+    if now < self.deadline:
+      deadline = self.deadline
+      self.deadline += self.period
+      return deadline, 0
+
+    # now 이전에 지나간 격자 시각 수
+    passed = int((now - self.deadline) // self.period) + 1
+    nextGrid = self.deadline + passed * self.period
+    if self.missedPolicy == 'coalesce':
+      self.deadline = nextGrid
+      return now, passed - 1
+
+    self.deadline = nextGrid + self.period
+    return nextGrid, passed
@@ -0,0 +1,327 @@
+"""
+Group-IB JSONL 세그먼트 저장 모듈
+
+엔드포인트별 JSONL 파일을 크기/시간 기준으로 세그먼트 단위로 분할합니다.
+- 활성 세그먼트는 기존 경로(data/outputs/<엔드포인트>.jsonl)에 그대로 추가 기록
+- 닫힌 세그먼트는 data/outputs/segments/<엔드포인트>/ 아래로 옮겨 압축 (gzip, zstd 설치 시 zstd)
+- manifest.json에 세그먼트별 seqUpdate 범위, 레코드 수, 바이트 크기 기록
+
+읽는 쪽은 manifest를 보고 필요한 세그먼트만 열 수 있습니다.
+"""
+
+import io
+import os
+import re
+import gzip
+import json
+import time
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Any, IO
+
+try:
+  import zstandard
+except ImportError:  # 선택 의존성
+  zstandard = None
+
+
+SEGMENTS_DIRNAME = 'segments'
+MANIFEST_FILENAME = 'manifest.json'
+
+# envelope의 seqUpdate는 data보다 앞에 있으므로 줄 앞부분만 검사
+_SEQ_PATTERN = re.compile(r'"seqUpdate":\s*(-?\d+)')
+_SEQ_SCAN_CHARS = 512
+
+_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst', 'none': ''}
+
+
+def resolveCompression(name: str) -> str:
+  """압축 방식 이름 확정
+
+  Args:
+    name: 'auto'(zstd 설치 시 zstd, 아니면 gzip), 'gzip', 'zstd', 'none'
+
+  Returns:
+    'gzip', 'zstd', 'none' 중 하나
+
+  Raises:
+    ValueError: 알 수 없는 이름이거나 zstandard가 설치되지 않은 경우
+  """
+  name = name.lower()
+  if name == 'auto':
+    return 'zstd' if zstandard is not None else 'gzip'
+  if name == 'zstd' and zstandard is None:
+    raise ValueError("SEGMENT_COMPRESSION=zstd이지만 zstandard 패키지가 설치되어 있지 않습니다.")
+  if name not in _EXTENSIONS:
+    raise ValueError(f"SEGMENT_COMPRESSION은 'auto', 'gzip', 'zstd', 'none' 중 하나여야 합니다: {name}")
+  return name
+
+
+def openSegment(path: str) -> IO[str]:
+  """세그먼트 파일을 압축 방식과 관계없이 텍스트 모드로 열기
+
+  Args:
+    path: .jsonl, .jsonl.gz, .jsonl.zst 파일 경로
+
+  Returns:
+    텍스트 파일 객체 (UTF-8)
+  """
+  if path.endswith('.gz'):
+    return gzip.open(path, 'rt', encoding='utf-8')
+  if path.endswith('.zst'):
+    if zstandard is None:
+      raise ValueError(f"zstd 세그먼트를 읽으려면 zstandard 패키지가 필요합니다: {path}")
+    reader = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+    return io.TextIOWrapper(reader, encoding='utf-8')
+  return open(path, 'r', encoding='utf-8')
+
+
+def segmentDirFor(outputsDir: str, filename: str) -> str:
+  """엔드포인트의 세그먼트 디렉토리 (예: segments/ioc_common_updated)"""
+  stem = filename[:-len('.jsonl')] if filename.endswith('.jsonl') else filename
+  return os.path.join(outputsDir, SEGMENTS_DIRNAME, stem)
+
+
+def closedSegmentCount(outputsDir: str, filename: str) -> int:
+  """manifest에 등록된 닫힌 세그먼트 수 (회전 설정과 관계없이 manifest만 확인, 없으면 0)
+
+  Raises:
+    OSError, ValueError: manifest를 읽을 수 없는 경우
+  """
+  manifestFile = os.path.join(segmentDirFor(outputsDir, filename), MANIFEST_FILENAME)
+  if not os.path.exists(manifestFile):
+    return 0
+  with open(manifestFile, 'r', encoding='utf-8') as f:
+    return len(json.load(f)['segments'])
+
+
+def extractSeqUpdate(line: str) -> Optional[int]:
+  """레코드 줄에서 envelope의 seqUpdate 값 추출 (전체 JSON 파싱 없이)"""
+  match = _SEQ_PATTERN.search(line, 0, _SEQ_SCAN_CHARS)
+  return int(match.group(1)) if match else None
+
+
+class SegmentStore:
+  """엔드포인트별 세그먼트 회전 및 manifest 관리 클래스"""
+
+  def __init__(self, outputsDir: str, maxBytes: int, maxAgeSeconds: float,
+               compression: str = 'auto', logger: Optional[Any] = None):
+    """초기화 메서드
+
+    Args:
+      outputsDir: JSONL 출력 디렉토리
+      maxBytes: 활성 세그먼트 최대 크기(바이트, 0이면 크기 기준 회전 안 함)
+      maxAgeSeconds: 활성 세그먼트 최대 유지 시간(초, 0이면 시간 기준 회전 안 함)
+      compression: 닫힌 세그먼트 압축 방식 ('auto', 'gzip', 'zstd', 'none')
+      logger: 로거 (선택)
+    """
+    self.outputsDir = outputsDir
+    self.maxBytes = maxBytes
+    self.maxAgeSeconds = maxAgeSeconds
+    self.compression = resolveCompression(compression)
+    self.logger = logger
+
+    self._lock = threading.Lock()
+    self._recovered = set()
+
+  def segmentDir(self, filename: str) -> str:
+    """엔드포인트의 세그먼트 디렉토리 (예: segments/ioc_common_updated)"""
+    return segmentDirFor(self.outputsDir, filename)
+
+  def loadManifest(self, filename: str) -> Dict[str, Any]:
+    """manifest 로드
+
+    Returns:
+      {'segments': [...], 'activeCreatedAt': epoch 초 또는 None}
+    """
+    manifestFile = os.path.join(self.segmentDir(filename), MANIFEST_FILENAME)
+    if not os.path.exists(manifestFile):
+      return {'segments': [], 'activeCreatedAt': None}
+    with open(manifestFile, 'r', encoding='utf-8') as f:
+      return json.load(f)
+
+  def _saveManifest(self, filename: str, manifest: Dict[str, Any]) -> None:
+    """manifest 원자적 저장"""
+    segmentDir = self.segmentDir(filename)
+    os.makedirs(segmentDir, exist_ok=True)
+    manifestFile = os.path.join(segmentDir, MANIFEST_FILENAME)
+    tempFile = manifestFile + '.tmp'
+    with open(tempFile, 'w', encoding='utf-8') as f:
+      json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tempFile, manifestFile)
+
+  def prepareActive(self, filename: str) -> Optional[Dict[str, Any]]:
+    """페이지를 추가하기 전에 호출: 필요하면 활성 세그먼트를 닫고 새로 시작
+
+    Args:
+      filename: 엔드포인트 JSONL 파일명
+
+    Returns:
+      닫힌 세그먼트의 manifest 항목 또는 None (회전하지 않은 경우)
+    """
+    with self._lock:
+      if filename not in self._recovered:
+        self._recoverOrphans(filename)
+        self._recovered.add(filename)
+
+      activePath = os.path.join(self.outputsDir, filename)
+      manifest = self.loadManifest(filename)
+      activeSize = os.path.getsize(activePath) if os.path.exists(activePath) else 0
+
+      if activeSize == 0:
+        if manifest.get('activeCreatedAt') is None:
+          manifest['activeCreatedAt'] = time.time()
+          self._saveManifest(filename, manifest)
+        return None
+
+      createdAt = manifest.get('activeCreatedAt') or os.path.getmtime(activePath)
+      tooLarge = self.maxBytes > 0 and activeSize >= self.maxBytes
+      tooOld = self.maxAgeSeconds > 0 and time.time() - createdAt >= self.maxAgeSeconds
+      if not (tooLarge or tooOld):
+        return None
+
+      return self._rollLocked(filename, manifest, createdAt)
+
+  def roll(self, filename: str) -> Optional[Dict[str, Any]]:
+    """활성 세그먼트를 즉시 닫기 (비어 있으면 아무것도 하지 않음)"""
+    with self._lock:
+      activePath = os.path.join(self.outputsDir, filename)
+      if not os.path.exists(activePath) or os.path.getsize(activePath) == 0:
+        return None
+      manifest = self.loadManifest(filename)
+      createdAt = manifest.get('activeCreatedAt') or os.path.getmtime(activePath)
+      return self._rollLocked(filename, manifest, createdAt)
+
+  def _rollLocked(self, filename: str, manifest: Dict[str, Any],
+                  createdAt: float) -> Dict[str, Any]:
+    """활성 세그먼트를 세그먼트 디렉토리로 옮기고 압축 후 manifest에 등록"""
+    segmentDir = self.segmentDir(filename)
+    os.makedirs(segmentDir, exist_ok=True)
+
+    stem = os.path.basename(segmentDir)
+    stamp = datetime.utcfromtimestamp(createdAt).strftime('%Y%m%dT%H%M%S')
+    rawName = f"{stem}-{stamp}-{len(manifest['segments']):05d}.jsonl"
+    rawPath = os.path.join(segmentDir, rawName)
+
+    # 1. 활성 파일을 옮겨 다음 쓰기부터 새 활성 세그먼트 시작
+    os.replace(os.path.join(self.outputsDir, filename), rawPath)
+
+    # 2. 압축 및 manifest 등록
+    entry = self._closeSegment(rawPath, createdAt)
+    manifest['segments'].append(entry)
+    manifest['activeCreatedAt'] = time.time()
+    self._saveManifest(filename, manifest)
+
+    if self.logger:
+      self.logger.info(f"  세그먼트 회전: {entry['file']} ({entry['records']}건, "
+                       f"{entry['rawBytes']:,} → {entry['bytes']:,} bytes)")
+    return entry
+
+  def _closeSegment(self, rawPath: str, createdAt: float) -> Dict[str, Any]:
+    """옮겨진 원본 세그먼트를 압축하고 통계 계산
+
+    Returns:
+      manifest 항목 딕셔너리
+    """
+    records = 0
+    seqMin = None
+    seqMax = None
+    rawBytes = os.path.getsize(rawPath)
+    finalPath = rawPath + _EXTENSIONS[self.compression]
+    tempPath = finalPath + '.tmp'
+
+    if self.compression == 'gzip':
+      output = gzip.open(tempPath, 'wb')
+    elif self.compression == 'zstd':
+      output = zstandard.ZstdCompressor().stream_writer(open(tempPath, 'wb'), closefd=True)
+    else:
+      output = None
+
+    try:
+      with open(rawPath, 'rb') as f:
+        for line in f:
+          records += 1
+          seqUpdate = extractSeqUpdate(line[:_SEQ_SCAN_CHARS].decode('utf-8', 'ignore'))
+          if seqUpdate is not None:
+            seqMin = seqUpdate if seqMin is None else min(seqMin, seqUpdate)
+            seqMax = seqUpdate if seqMax is None else max(seqMax, seqUpdate)
+          if output is not None:
+            output.write(line)
+    finally:
+      if output is not None:
+        output.close()
+
+    if output is not None:
+      os.replace(tempPath, finalPath)
+      os.remove(rawPath)
+
+    return {
+      'file': os.path.basename(finalPath),
+      'seqUpdateMin': seqMin,
+      'seqUpdateMax': seqMax,
+      'records': records,
+      'bytes': os.path.getsize(finalPath),
+      'rawBytes': rawBytes,
+      'compression': self.compression,
+      'createdAt': datetime.utcfromtimestamp(createdAt).strftime('%Y-%m-%dT%H:%M:%SZ'),
+      'closedAt': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    }
+
+  def _recoverOrphans(self, filename: str) -> None:
+    """회전 도중 중단되어 manifest에 없는 원본 세그먼트를 압축 및 등록"""
+    segmentDir = self.segmentDir(filename)
+    if not os.path.isdir(segmentDir):
+      return
+
+    manifest = self.loadManifest(filename)
+    known = {entry['file'] for entry in manifest['segments']}
+    changed = False
+
+    for name in sorted(os.listdir(segmentDir)):
+      path = os.path.join(segmentDir, name)
+      if name.endswith('.tmp'):
+        os.remove(path)
+        continue
+      if not name.endswith('.jsonl'):
+        continue
+
+      # 압축은 끝났지만 원본 삭제 전에 중단된 경우
+      compressedName = name + _EXTENSIONS[self.compression]
+      if compressedName in known or name in known:
+        if compressedName != name:
+          os.remove(path)
+        continue
+
+      entry = self._closeSegment(path, os.path.getmtime(path))
+      manifest['segments'].append(entry)
+      changed = True
+      if self.logger:
+        self.logger.warning(f"  ⚠ 중단된 세그먼트 복구: {entry['file']}")
+
+    if changed:
+      self._saveManifest(filename, manifest)
+
+  def listSegments(self, filename: str, minSeqUpdate: Optional[int] = None,
+                   includeActive: bool = True) -> List[str]:
+    """읽을 세그먼트 파일 경로 목록 (오래된 순, 활성 세그먼트는 마지막)
+
+    Args:
+      filename: 엔드포인트 JSONL 파일명
+      minSeqUpdate: 지정 시 seqUpdateMax가 이 값보다 작은 세그먼트는 제외
+      includeActive: 활성 세그먼트 포함 여부
+
+    Returns:
+      파일 경로 리스트
+    """
+    paths = []
+    segmentDir = self.segmentDir(filename)
+    for entry in self.loadManifest(filename)['segments']:
+      if minSeqUpdate is not None and entry['seqUpdateMax'] is not None \
+          and entry['seqUpdateMax'] < minSeqUpdate:
+        continue
+      paths.append(os.path.join(segmentDir, entry['file']))
+
+    activePath = os.path.join(self.outputsDir, filename)
+    if includeActive and os.path.exists(activePath):
+      paths.append(activePath)
+    return paths
@@ -0,0 +1,113 @@
+"""
+Group-IB 크롤러 종료 신호 처리 모듈
+
+컨테이너는 SIGTERM을 보낸 뒤 유예 시간이 지나면 SIGKILL로 종료하므로, 신호를 받는 즉시
+중단하면 기록 중인 페이지와 커서가 어긋날 수 있습니다.
+- 첫 SIGTERM/SIGINT: 새 요청을 멈추고(collector.requestStop) 진행 중인 페이지 기록과 커서 저장을
+  마친 뒤 종료하도록 요청
+- 유예 시간(SHUTDOWN_GRACE_SECONDS) 안에 끝나지 않으면 감시 스레드가 강제 종료
+- 두 번째 신호: KeyboardInterrupt로 즉시 중단 (기존 Ctrl+C 처리 경로)
+"""
+
+import os
+import signal
+import threading
+import time
+import logging
+from typing import Callable, Dict, Optional, Sequence
+
+
+class GracefulShutdown:
+  """종료 신호를 받아 수집 루프에 종료를 요청하고 유예 시간을 감시"""
+
+  def __init__(self, graceSeconds: float = 30.0, onStop: Optional[Callable[[], None]] = None,
+               logger: Optional[logging.Logger] = None):
+    """초기화 메서드
+
+    Args:
+      graceSeconds: 종료 요청 후 강제 종료까지의 유예 시간(초)
+      onStop: 종료 요청 시 호출할 함수 (새 요청 중단)
+      logger: 로거 (None이면 로그 출력 안 함)
+    """
+    self.graceSeconds = max(0.0, graceSeconds)
+    self.onStop = onStop
+    self.logger = logger
+    self.reason: Optional[str] = None
+
+    self._event = threading.Event()
+    self._deadline: Optional[float] = None
+    self._watchdog: Optional[threading.Timer] = None
+    self._previous: Dict[int, object] = {}
+
+  @property
+  def requested(self) -> bool:
+    """종료 요청 여부"""
+    return self._event.is_set()
+
+  def install(self, signals: Sequence[int] = (signal.SIGTERM, signal.SIGINT)) -> None:
+    """신호 처리기 등록 (메인 스레드에서만 호출 가능)"""
+    for signum in signals:
+      self._previous[signum] = signal.signal(signum, self._handle)
+
+  def restore(self) -> None:
+    """등록 전 신호 처리기로 복원"""
+    for signum, handler in self._previous.items():
+      signal.signal(signum, handler)
+    self._previous = {}
+
+  def _handle(self, signum: int, frame) -> None:
+    if self.requested:
+      # 두 번째 신호는 즉시 중단
+      raise KeyboardInterrupt
+    self.request(signal.Signals(signum).name)
+
+  def request(self, reason: str) -> None:
+    """종료 요청 (새 요청을 멈추고 유예 시간 감시 시작)
+
+    Args:
+      reason: 종료 사유 (신호 이름 등)
+    """
+    if self.requested:
+      return
+    self.reason = reason
+    self._deadline = time.monotonic() + self.graceSeconds
+    self._event.set()
+
+    if self.logger:
+      self.logger.warning(f"⚠ {reason} 수신: 새 요청을 멈추고 진행 중인 페이지를 기록한 뒤 종료합니다 "
+                          f"(최대 {self.graceSeconds:.0f}초, 한 번 더 보내면 즉시 중단)")
+    if self.onStop is not None:
+      self.onStop()
+
+    self._watchdog = threading.Timer(self.graceSeconds, self._expire)
+    self._watchdog.daemon = True
+    self._watchdog.start()
+
+  def remaining(self) -> Optional[float]:
+    """남은 유예 시간(초). 종료 요청 전이면 None"""
+    if self._deadline is None:
+      return None
+    return max(0.0, self._deadline - time.monotonic())
+
+  def wait(self, seconds: float) -> bool:
+    """최대 seconds초 대기 (종료 요청 시 즉시 반환)
+
+    Returns:
+      종료 요청 여부
+    """
+    return self._event.wait(max(0.0, seconds))
+
+  def finish(self) -> None:
+    """종료 처리를 마쳤으면 감시 스레드 취소 및 신호 처리기 복원"""
+    if self._watchdog is not None:
+      self._watchdog.cancel()
+      self._watchdog = None
+    self.restore()
+
+  def _expire(self) -> None:
+    if self.logger:
+      self.logger.error(f"✗ 종료 유예 시간({self.graceSeconds:.0f}초)을 넘겨 강제 종료합니다. "
+                        "기록을 마친 페이지의 커서는 seqUpdate 저널(CURSOR_JOURNAL)에 남아 있습니다.")
+      for handler in self.logger.handlers:
+        handler.flush()
+    os._exit(1)
@@ -0,0 +1,423 @@
+"""
+Group-IB 수집 레코드 출력 대상(sink) 모듈
+
+수집한 페이지의 JSON Lines 레코드를 파일 외의 대상에도 바로 전달합니다.
+- jsonl: data/outputs/<엔드포인트>.jsonl 파일에 추가 (기본, 기존 동작)
+- stdout: 표준 출력에 NDJSON으로 출력 (로그는 표준 에러로 출력됨)
+- unix:<경로>: Unix 도메인 소켓(SOCK_STREAM)에 NDJSON으로 전송
+- http(s)://...: NDJSON 본문(application/x-ndjson)으로 일괄 POST
+
+파일 외의 대상은 배치 크기(SINK_BATCH_SIZE) 또는 대기 시간(SINK_LINGER_MS)이 차면 한 번에
+전송하는 백그라운드 스레드를 가지며, 전송 대기 레코드 수는 SINK_MAX_BUFFERED로 제한됩니다
+(가득 차면 기록 단계가 멈춤). 페이지 제출 시 받은 Future는 페이지의 마지막 레코드가 포함된
+배치가 전송되면 완료되고, collector는 모든 대상의 Future가 완료된 뒤에만 커서를 전진시킵니다.
+확인 대기 시간이 지나 Future를 취소하면 아직 전송하지 않은 그 페이지의 레코드는 버립니다.
+"""
+
+import sys
+import time
+import queue
+import socket
+import threading
+import logging
+from concurrent.futures import Future, InvalidStateError
+from typing import Callable, Dict, Iterable, List, Optional
+
+import requests
+
+from .writer import JsonlWriter
+
+
+# 배치 대기 시간 만료 표시
+_LINGER_EXPIRED = object()
+
+
+class SinkError(Exception):
+  """출력 대상 전달 실패"""
+  pass
+
+
+class Sink:
+  """출력 대상 기본 클래스"""
+
+  name = 'sink'
+
+  def submit(self, endpoint: str, filename: str, lines: Iterable[str]) -> Future:
+    """페이지 레코드 제출
+
+    lines는 반환 전에 모두 소비합니다 (여러 대상에 같은 줄 목록을 차례로 넘길 수 있음).
+
+    Args:
+      endpoint: 엔드포인트 경로
+      filename: 엔드포인트 JSONL 파일명
+      lines: '\\n'으로 끝나는 envelope 레코드 줄
+
+    Returns:
+      대상이 페이지를 모두 받았을 때 완료되는 Future (실패 시 예외 설정)
+    """
+    raise NotImplementedError
+
+  def close(self) -> None:
+    """남은 레코드를 전송하고 종료"""
+    pass
+
+
+class JsonlFileSink(Sink):
+  """엔드포인트별 JSONL 파일에 추가 (제출한 스레드에서 바로 기록, 페이지당 write 한 번)"""
+
+  name = 'jsonl'
+
+  def __init__(self, writer: JsonlWriter, prepare: Optional[Callable[[str], None]] = None,
+               onCommit: Optional[Callable[[str, int, float], None]] = None):
+    """초기화 메서드
+
+    Args:
+      writer: JSONL 그룹 커밋 기록기
+      prepare: 추가 전에 파일명으로 호출할 함수 (세그먼트 회전)
+      onCommit: 커밋 후 (엔드포인트, 바이트 수, 소요 시간)으로 호출할 함수 (메트릭)
+    """
+    self.writer = writer
+    self.prepare = prepare
+    self.onCommit = onCommit
+
+  def submit(self, endpoint: str, filename: str, lines: Iterable[str]) -> Future:
+    future: Future = Future()
+    try:
+      if self.prepare is not None:
+        self.prepare(filename)
+      written, seconds = self.writer.append(filename, lines)
+      if self.onCommit is not None:
+        self.onCommit(endpoint, written, seconds)
+      future.set_result(None)
+    except OSError as e:
+      future.set_exception(e)
+    return future
+
+  def sync(self) -> None:
+    """변경된 파일 fsync (interval 정책의 사이클 끝)"""
+    self.writer.sync()
+
+  def close(self) -> None:
+    self.writer.close()
+
+
+class _Submission:
+  """제출한 페이지의 전송 상태 (배치 스레드에서만 갱신)"""
+
+  __slots__ = ('future', 'closed', 'error')
+
+  def __init__(self):
+    self.future: Future = Future()
+    self.closed = False
+    self.error: Optional[BaseException] = None
+
+
+class BatchingSink(Sink):
+  """배치 크기/대기 시간 기준으로 모아서 전송하는 대상
+
+  하위 클래스는 send(batch)만 구현합니다. send가 예외를 던지면 그 배치에 레코드가 포함된
+  페이지의 Future는 모두 실패합니다. 취소된 Future의 레코드는 배치에 담지 않으며,
+  전송 중인 배치는 retryBatch()로 재시도 전에 취소된 레코드를 뺄 수 있습니다.
+  """
+
+  def __init__(self, batchSize: int = 500, linger: float = 0.2, maxBuffered: int = 10000,
+               logger: Optional[logging.Logger] = None):
+    """초기화 메서드
+
+    Args:
+      batchSize: 한 번에 전송할 최대 레코드 수
+      linger: 배치의 첫 레코드 이후 전송까지 기다리는 최대 시간(초)
+      maxBuffered: 전송 대기 레코드 최대 수 (가득 차면 submit이 멈춤)
+      logger: 로거 (None이면 로그 출력 안 함)
+    """
+    self.batchSize = max(1, batchSize)
+    self.linger = max(0.0, linger)
+    self.logger = logger
+    self._queue: queue.Queue = queue.Queue(max(1, maxBuffered))
+    self._closed = False
+    self._sending: Optional[List[tuple]] = None
+    self._thread = threading.Thread(target=self._run, name=f"sink-{self.name}", daemon=True)
+    self._thread.start()
+
+  def send(self, batch: List[str]) -> None:
+    """배치 전송 (실패 시 예외)"""
+    raise NotImplementedError
+
+  def retryBatch(self, batch: List[str]) -> List[str]:
+    """재시도할 배치 반환 (전송 중 확인 대기 시간이 지나 취소된 페이지의 레코드 제외)
+
+    Args:
+      batch: 직전에 전송한 배치
+
+    Returns:
+      아직 취소되지 않은 페이지의 레코드 (모두 취소되었으면 빈 리스트)
+    """
+    if self._sending is None:
+      return batch
+    return [line for line, submission in self._sending if not submission.future.cancelled()]
+
+  def submit(self, endpoint: str, filename: str, lines: Iterable[str]) -> Future:
+    if self._closed:
+      raise SinkError(f"닫힌 출력 대상입니다: {self.name}")
+    submission = _Submission()
+    for line in lines:
+      self._queue.put((line, submission))
+    # 페이지 끝 표시 (이 표시가 처리된 뒤 페이지가 포함된 배치가 모두 전송되면 완료)
+    self._queue.put((None, submission))
+    return submission.future
+
+  def _run(self) -> None:
+    batch: List[tuple] = []
+    members: Dict[int, _Submission] = {}
+    deadline = None
+
+    while True:
+      timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+      try:
+        item = self._queue.get(timeout=timeout)
+      except queue.Empty:
+        item = _LINGER_EXPIRED
+
+      if item is _LINGER_EXPIRED or item is None:
+        self._flush(batch, members)
+        batch, members, deadline = [], {}, None
+        if item is None:
+          break
+        continue
+
+      line, submission = item
+      if line is None:
+        if id(submission) in members:
+          submission.closed = True
+        else:
+          self._resolve(submission)
+        continue
+
+      if submission.future.cancelled():
+        continue
+      batch.append((line, submission))
+      members[id(submission)] = submission
+      if deadline is None:
+        deadline = time.monotonic() + self.linger
+      if len(batch) >= self.batchSize:
+        self._flush(batch, members)
+        batch, members, deadline = [], {}, None
+
+  def _flush(self, batch: List[tuple], members: Dict[int, _Submission]) -> None:
+    # 배치에 담은 뒤 취소된 페이지의 레코드는 전송하지 않음
+    entries = [entry for entry in batch if not entry[1].future.cancelled()]
+    if not entries:
+      return
+    error = None
+    self._sending = entries
+    try:
+      self.send([line for line, _ in entries])
+    except Exception as e:
+      error = e
+      if self.logger:
+        self.logger.error(f"  ✗ 출력 대상 전송 실패: {self.name} ({len(entries)}건) - {e}")
+    finally:
+      self._sending = None
+
+    for submission in members.values():
+      if error is not None and submission.error is None:
+        submission.error = error
+      if submission.closed:
+        self._resolve(submission)
+
+  def _resolve(self, submission: _Submission) -> None:
+    try:
+      if submission.error is not None:
+        submission.future.set_exception(SinkError(f"{self.name}: {submission.error}"))
+      else:
+        submission.future.set_result(None)
+    except InvalidStateError:
+      # 확인 대기 시간이 지나 이미 취소된 페이지
+      pass
+
+  def close(self) -> None:
+    if self._closed:
+      return
+    self._closed = True
+    self._queue.put(None)
+    self._thread.join()
+
+
+class StdoutSink(BatchingSink):
+  """표준 출력 NDJSON"""
+
+  name = 'stdout'
+
+  def __init__(self, stream=None, **kwargs):
+    """초기화 메서드
+
+    Args:
+      stream: 출력 스트림 (None이면 sys.stdout)
+      **kwargs: BatchingSink 인자
+    """
+    self.stream = stream or sys.stdout
+    super().__init__(**kwargs)
+
+  def send(self, batch: List[str]) -> None:
+    self.stream.write(''.join(batch))
+    self.stream.flush()
+
+
+class UnixSocketSink(BatchingSink):
+  """Unix 도메인 소켓 NDJSON (연결이 끊기면 한 번 다시 연결하여 배치 재전송)
+
+  커널 소켓 버퍼에 배치를 모두 넘기면 완료로 봅니다. 재연결 시 이전 연결에 일부만 전송된
+  줄이 있을 수 있으므로 수신 측은 연결 종료 시 개행으로 끝나지 않은 줄을 버려야 합니다.
+  """
+
+  name = 'unix'
+
+  def __init__(self, path: str, timeout: float = 10.0, **kwargs):
+    """초기화 메서드
+
+    Args:
+      path: 소켓 경로
+      timeout: 연결/전송 제한 시간(초)
+      **kwargs: BatchingSink 인자
+    """
+    self.path = path
+    self.timeout = timeout
+    self._sock: Optional[socket.socket] = None
+    super().__init__(**kwargs)
+
+  def send(self, batch: List[str]) -> None:
+    data = ''.join(batch).encode('utf-8')
+    for attempt in range(2):
+      try:
+        if self._sock is None:
+          sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+          sock.settimeout(self.timeout)
+          try:
+            sock.connect(self.path)
+          except OSError:
+            sock.close()
+            raise
+          self._sock = sock
+        self._sock.sendall(data)
+        return
+      except OSError as e:
+        self._disconnect()
+        if attempt:
+          raise SinkError(f"{self.path}: {e}") from e
+
+  def _disconnect(self) -> None:
+    if self._sock is not None:
+      self._sock.close()
+      self._sock = None
+
+  def close(self) -> None:
+    super().close()
+    self._disconnect()
+
+
+class HttpBulkSink(BatchingSink):
+  """NDJSON 일괄 POST (2xx 응답을 받으면 완료, 429/5xx/연결 오류는 지수 백오프로 재시도)
+
+  백오프 대기는 stopEvent가 설정되면 바로 중단하고, 재시도 전에 취소된 페이지의 레코드는 뺍니다.
+  """
+
+  name = 'http'
+
+  def __init__(self, url: str, timeout: float = 30.0, retries: int = 3,
+               stopEvent: Optional[threading.Event] = None, **kwargs):
+    """초기화 메서드
+
+    Args:
+      url: 수신 URL
+      timeout: 요청 제한 시간(초)
+      retries: 재시도 횟수
+      stopEvent: 종료 요청 이벤트 (설정되면 재시도 대기 중단, None이면 끝까지 대기)
+      **kwargs: BatchingSink 인자
+    """
+    self.url = url
+    self.timeout = timeout
+    self.retries = max(0, retries)
+    self.stopEvent = stopEvent or threading.Event()
+    self.session = requests.Session()
+    super().__init__(**kwargs)
+
+  def send(self, batch: List[str]) -> None:
+    error = None
+    for attempt in range(self.retries + 1):
+      if attempt:
+        if self.stopEvent.wait(min(30, 2 ** (attempt - 1))):
+          raise SinkError(f"{self.url}: 종료 요청으로 재시도를 중단했습니다 ({error})")
+        batch = self.retryBatch(batch)
+        if not batch:
+          # 모든 페이지가 확인 대기 시간 초과로 취소됨 (다음 사이클에 다시 수집)
+          return
+      body = ''.join(batch).encode('utf-8')
+      try:
+        response = self.session.post(self.url, data=body, timeout=self.timeout,
+                                     headers={'Content-Type': 'application/x-ndjson'})
+      except requests.exceptions.RequestException as e:
+        error = e
+        continue
+      if response.status_code < 300:
+        return
+      error = f"HTTP {response.status_code}"
+      if response.status_code < 500 and response.status_code != 429:
+        # 요청 자체가 잘못된 경우 재시도해도 같은 결과
+        break
+    raise SinkError(f"{self.url}: {error}")
+
+  def close(self) -> None:
+    super().close()
+    self.session.close()
+
+
+def validateSpecs(specs: List[str]) -> None:
+  """OUTPUT_SINKS 설정 검증
+
+  Raises:
+    ValueError: 알 수 없는 대상이거나 대상이 없는 경우
+  """
+  if not specs:
+    raise ValueError("OUTPUT_SINKS에 출력 대상이 하나 이상 있어야 합니다.")
+  for spec in specs:
+    if spec not in ('jsonl', 'stdout') and not spec.startswith(('unix:', 'http://', 'https://')):
+      raise ValueError(f"알 수 없는 출력 대상입니다 (jsonl, stdout, unix:<경로>, http(s)://...): {spec}")
+
+
+def buildSinks(specs: List[str], writer: JsonlWriter, prepare: Optional[Callable[[str], None]] = None,
+               batchSize: int = 500, linger: float = 0.2, maxBuffered: int = 10000,
+               logger: Optional[logging.Logger] = None,
+               onCommit: Optional[Callable[[str, int, float], None]] = None,
+               stopEvent: Optional[threading.Event] = None) -> List[Sink]:
+  """OUTPUT_SINKS 설정으로 출력 대상 생성
+
+  Args:
+    specs: 대상 목록 (jsonl, stdout, unix:<경로>, http(s)://...)
+    writer: JSONL 그룹 커밋 기록기 (jsonl 대상이 사용)
+    prepare: JSONL 파일에 추가하기 전에 호출할 함수
+    batchSize: 배치 최대 레코드 수
+    linger: 배치 최대 대기 시간(초)
+    maxBuffered: 대상별 전송 대기 레코드 최대 수
+    logger: 로거
+    onCommit: JSONL 커밋 후 (엔드포인트, 바이트 수, 소요 시간)으로 호출할 함수
+    stopEvent: 종료 요청 이벤트 (HTTP 대상의 재시도 대기를 중단)
+
+  Returns:
+    출력 대상 리스트
+
+  Raises:
+    ValueError: 알 수 없는 대상이거나 대상이 없는 경우
+  """
+  validateSpecs(specs)
+  options = {'batchSize': batchSize, 'linger': linger, 'maxBuffered': maxBuffered, 'logger': logger}
+  sinks: List[Sink] = []
+  for spec in specs:
+    if spec == 'jsonl':
+      sinks.append(JsonlFileSink(writer, prepare, onCommit))
+    elif spec == 'stdout':
+      sinks.append(StdoutSink(**options))
+    elif spec.startswith('unix:'):
+      sinks.append(UnixSocketSink(spec[len('unix:'):], **options))
+    else:
+      sinks.append(HttpBulkSink(spec, stopEvent=stopEvent, **options))
+  return sinks
@@ -0,0 +1,201 @@
+"""
+Group-IB API 응답 스트리밍 파싱 모듈
+
+대용량 페이지(최대 5000개 IOC 객체)를 전체 문서로 만들지 않고,
+응답 본문을 청크 단위로 읽으면서 데이터 배열의 항목을 하나씩 반환합니다.
+버퍼에는 현재 파싱 중인 항목과 청크 하나 정도만 유지되므로
+페이지 크기와 관계없이 메모리 사용량이 거의 일정합니다.
+"""
+
+import json
+import codecs
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+
+# 데이터 필드 후보 (extractDataAndSeqUpdate와 동일)
+DATA_KEYS = ('items', 'data', 'results')
+
+_WHITESPACE = ' \t\n\r'
+
+
+def splitResponse(response: Any) -> Tuple[List[Any], int, Optional[str]]:
+  """응답에서 데이터 리스트와 seqUpdate 추출
+
+  Args:
+    response: API 응답 JSON
+
+  Returns:
+    (데이터 리스트, seqUpdate 값, 데이터 필드 이름 또는 None) 튜플
+    데이터 필드 우선순위: items → data → results
+  """
+  if not isinstance(response, dict):
+    return [], 0, None
+
+  seqUpdate = response.get('seqUpdate', 0)
+  for dataKey in DATA_KEYS:
+    if dataKey in response:
+      dataList = response[dataKey]
+      # 리스트가 아닌 경우 처리
+      if not isinstance(dataList, list):
+        dataList = [dataList]
+      return dataList, seqUpdate, dataKey
+  return [], seqUpdate, None
+
+
+class StreamingPageParser:
+  """최상위 JSON 객체 증분 파서
+
+  사용 예:
+    parser = StreamingPageParser(response.iter_content(65536))
+    for item in parser.iterItems():
+      ...
+    seqUpdate = parser.seqUpdate
+
+  데이터 필드(items → data → results 중 문서에서 처음 나오는 필드)의 배열 항목만
+  하나씩 반환하고, 나머지 최상위 필드는 값 하나씩만 디코딩하여 seqUpdate를 기록합니다.
+  seqUpdate는 문서 순서상 데이터 배열 뒤에 올 수 있으므로 iterItems()를
+  끝까지 소비한 뒤에 확정됩니다.
+  """
+
+  def __init__(self, chunks: Iterable[bytes]):
+    """초기화 메서드
+
+    Args:
+      chunks: 응답 본문 바이트 청크 이터러블
+    """
+    self._chunks = iter(chunks)
+    self._textDecoder = codecs.getincrementaldecoder('utf-8')()
+    self._jsonDecoder = json.JSONDecoder()
+    self._buf = ''
+    self._pos = 0
+    self._eof = False
+
+    # 파싱 결과
+    self.seqUpdate: Optional[int] = None
+    self.dataKey: Optional[str] = None
+    self.itemCount = 0
+    self.bytesRead = 0
+
+  def _fill(self) -> bool:
+    """다음 청크를 버퍼에 추가 (이미 소비한 앞부분은 버림)
+
+    Returns:
+      새 데이터가 추가되었으면 True, 스트림이 끝났으면 False
+    """
+    if self._eof:
+      return False
+
+    text = ''
+    while not text:
+      try:
+        chunk = next(self._chunks)
+      except StopIteration:
+        self._eof = True
+        text = self._textDecoder.decode(b'', final=True)
+        break
+      self.bytesRead += len(chunk)
+      text = self._textDecoder.decode(chunk)
+
+    self._buf = self._buf[self._pos:] + text
+    self._pos = 0
+    return bool(text)
+
+  def _peek(self) -> Optional[str]:
+    """공백을 건너뛰고 다음 문자 반환 (스트림 끝이면 None)"""
+    while True:
+      while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+        self._pos += 1
+      if self._pos < len(self._buf):
+        return self._buf[self._pos]
+      if not self._fill():
+        return None
+
+  def _expect(self, char: str) -> None:
+    """다음 문자가 char인지 확인하고 소비"""
+    found = self._peek()
+    if found != char:
+      raise ValueError(f"JSON 형식 오류: '{char}' 예상, '{found}' 발견 (오프셋 {self.bytesRead})")
+    self._pos += 1
+
+  def _decodeValue(self) -> Any:
+    """현재 위치의 JSON 값 하나를 디코딩
+
+    값이 버퍼 끝에서 잘렸으면 남은 길이만큼 더 읽어 다시 시도합니다.
+    (숫자는 버퍼 끝에서 끝나면 잘린 것인지 알 수 없으므로 한 번 더 읽음)
+    """
+    self._peek()
+    while True:
+      try:
+        value, end = self._jsonDecoder.raw_decode(self._buf, self._pos)
+        if end < len(self._buf) or self._eof:
+          self._pos = end
+          return value
+      except json.JSONDecodeError:
+        if self._eof:
+          raise
+
+      # 남은 미소비 구간만큼 더 읽어서 재시도 횟수를 로그 규모로 제한
+      pending = len(self._buf) - self._pos
+      targetLength = pending * 2
+      while len(self._buf) - self._pos < targetLength:
+        if not self._fill():
+          break
+
+  def iterItems(self) -> Iterator[Any]:
+    """데이터 배열의 항목을 하나씩 반환
+
+    Yields:
+      데이터 항목 (dict 등 JSON 값)
+
+    Raises:
+      ValueError: JSON 형식이 잘못되었거나 본문이 중간에 끊긴 경우
+    """
+    self._expect('{')
+
+    while True:
+      char = self._peek()
+      if char is None:
+        raise ValueError("JSON 형식 오류: 응답 본문이 중간에 끊겼습니다.")
+      if char == '}':
+        self._pos += 1
+        # 남은 본문(후행 공백)까지 읽어 연결이 커넥션 풀로 반환되도록 함
+        while self._fill():
+          pass
+        return
+      if char == ',':
+        self._pos += 1
+        continue
+
+      key = self._decodeValue()
+      self._expect(':')
+
+      if key in DATA_KEYS and self.dataKey is None:
+        self.dataKey = key
+        yield from self._iterDataValue()
+      else:
+        value = self._decodeValue()
+        if key == 'seqUpdate':
+          self.seqUpdate = value
+
+  def _iterDataValue(self) -> Iterator[Any]:
+    """데이터 필드 값 반환 (배열이면 항목별, 아니면 단일 값)"""
+    if self._peek() != '[':
+      # 리스트가 아닌 경우 단일 항목으로 처리
+      self.itemCount += 1
+      yield self._decodeValue()
+      return
+
+    self._pos += 1
+    while True:
+      char = self._peek()
+      if char is None:
+        raise ValueError("JSON 형식 오류: 데이터 배열이 중간에 끊겼습니다.")
+      if char == ']':
+        self._pos += 1
+        return
+      if char == ',':
+        self._pos += 1
+        continue
+
+      self.itemCount += 1
+      yield self._decodeValue()
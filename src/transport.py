@@ -0,0 +1,204 @@
+"""
+Group-IB API HTTP 전송 모듈
+
+GroupIBCollector가 소유하는 단일 HTTP 전송 객체를 제공합니다.
+- 커넥션 풀 (keep-alive로 TCP+TLS 연결 재사용)
+- 미리 만들어 둔 인증 헤더 캐시
+- gzip/deflate 압축 응답 협상
+- 요청별 연결/TTFB/전송 시간 측정
+"""
+
+import time
+import threading
+from typing import Dict, Optional, Any, Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+# 연결 수립 시간은 요청을 보내는 스레드에서 측정되므로 스레드별로 보관
+_timingLocal = threading.local()
+
+
+class _TimedHTTPConnection(HTTPConnection):
+  """connect() 소요 시간을 기록하는 HTTP 연결"""
+
+  def connect(self):
+    startTime = time.perf_counter()
+    super().connect()
+    _timingLocal.connectTime = getattr(_timingLocal, 'connectTime', 0.0) + (time.perf_counter() - startTime)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+  """connect() 소요 시간(TLS 핸드셰이크 포함)을 기록하는 HTTPS 연결"""
+
+  def connect(self):
+    startTime = time.perf_counter()
+    super().connect()
+    _timingLocal.connectTime = getattr(_timingLocal, 'connectTime', 0.0) + (time.perf_counter() - startTime)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+  ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+  ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+  """연결 시간 측정용 커넥션 풀을 사용하는 어댑터"""
+
+  def init_poolmanager(self, *args, **kwargs):
+    super().init_poolmanager(*args, **kwargs)
+    self.poolmanager.pool_classes_by_scheme = {
+      'http': _TimedHTTPConnectionPool,
+      'https': _TimedHTTPSConnectionPool
+    }
+
+
+class HttpTransport:
+  """커넥션 풀 기반 HTTP 전송 클래스
+
+  모든 요청 경로(인증, API 페이지, PDF)가 하나의 requests.Session을 공유합니다.
+  각 응답에는 timing 속성이 추가됩니다:
+    {
+      'connect': 연결 수립 시간(초, 재사용 시 0),
+      'ttfb': 요청 시작부터 응답 헤더 수신까지 시간(초),
+      'transfer': 본문 수신 시간(초, 스트리밍 응답은 소비 후 채워짐),
+      'total': 전체 소요 시간(초),
+      'bytes': 수신한 본문 바이트 수 (압축 해제 전),
+      'reused': 기존 연결 재사용 여부
+    }
+  """
+
+  def __init__(self, headers: Dict[str, str], poolSize: int, timeout: int,
+               logger: Optional[Any] = None):
+    """초기화 메서드
+
+    Args:
+      headers: 모든 요청에 보낼 헤더 (인증 헤더 포함, 한 번만 생성)
+      poolSize: 호스트별 커넥션 풀 크기 (수집 엔진의 동시 실행 수에 맞춤)
+      timeout: 요청 타임아웃(초)
+      logger: 타이밍 로그를 남길 로거 (선택)
+    """
+    self.headers = dict(headers)
+    self.poolSize = max(1, poolSize)
+    self.timeout = timeout
+    self.logger = logger
+
+    self.session = requests.Session()
+    self.session.headers.update(self.headers)
+
+    adapter = _TimedHTTPAdapter(pool_connections=self.poolSize,
+                                pool_maxsize=self.poolSize)
+    self.session.mount('https://', adapter)
+    self.session.mount('http://', adapter)
+
+    # 누적 통계
+    self._statsLock = threading.Lock()
+    self.stats = {
+      'requests': 0,
+      'newConnections': 0,
+      'bytes': 0,
+      'connectTime': 0.0,
+      'ttfbTime': 0.0,
+      'transferTime': 0.0
+    }
+
+  def get(self, url: str, params: Optional[Dict[str, str]] = None,
+          headers: Optional[Dict[str, str]] = None,
+          stream: bool = False) -> requests.Response:
+    """GET 요청
+
+    Args:
+      url: 요청 URL
+      params: 쿼리 파라미터
+      headers: 이 요청에만 추가/변경할 헤더
+      stream: True이면 본문을 읽지 않고 반환 (iterContent로 소비)
+
+    Returns:
+      timing 속성이 추가된 응답 객체
+
+    Raises:
+      requests.exceptions.RequestException: 네트워크 오류, 타임아웃
+    """
+    _timingLocal.connectTime = 0.0
+    startTime = time.perf_counter()
+
+    response = self.session.get(url, params=params, headers=headers,
+                                timeout=self.timeout, stream=True)
+    ttfb = time.perf_counter() - startTime
+    connectTime = _timingLocal.connectTime
+
+    response.timing = {
+      'connect': connectTime,
+      'ttfb': ttfb,
+      'transfer': None,
+      'total': None,
+      'bytes': 0,
+      'reused': connectTime == 0.0
+    }
+    response._transportStart = startTime
+
+    if not stream:
+      # 본문을 즉시 읽고 연결을 풀에 반환
+      response.content
+      self._finishTiming(response)
+
+    return response
+
+  def iterContent(self, response: requests.Response,
+                  chunkSize: int = 64 * 1024) -> Iterator[bytes]:
+    """스트리밍 응답 본문을 청크 단위로 반환하고 전송 시간을 기록
+
+    Args:
+      response: stream=True로 받은 응답
+      chunkSize: 청크 크기(바이트)
+
+    Yields:
+      본문 청크 (압축 해제됨)
+    """
+    try:
+      for chunk in response.iter_content(chunk_size=chunkSize):
+        if chunk:
+          yield chunk
+    finally:
+      self._finishTiming(response)
+
+  def _finishTiming(self, response: requests.Response) -> None:
+    """본문 수신 완료 시점의 타이밍 및 누적 통계 기록"""
+    timing = response.timing
+    if timing['total'] is not None:
+      return
+
+    timing['total'] = time.perf_counter() - response._transportStart
+    timing['transfer'] = timing['total'] - timing['ttfb']
+    # raw.tell()은 압축 해제 전(실제 전송된) 바이트 수
+    try:
+      timing['bytes'] = int(response.raw.tell())
+    except (AttributeError, TypeError, ValueError):
+      timing['bytes'] = len(response.content) if isinstance(response._content, bytes) else 0
+
+    with self._statsLock:
+      self.stats['requests'] += 1
+      self.stats['newConnections'] += 0 if timing['reused'] else 1
+      self.stats['bytes'] += timing['bytes']
+      self.stats['connectTime'] += timing['connect']
+      self.stats['ttfbTime'] += timing['ttfb']
+      self.stats['transferTime'] += timing['transfer']
+
+  def getStats(self) -> Dict[str, Any]:
+    """누적 전송 통계 반환
+
+    Returns:
+      요청 수, 신규 연결 수, 수신 바이트, 구간별 누적 시간 딕셔너리
+    """
+    with self._statsLock:
+      return dict(self.stats)
+
+  def close(self) -> None:
+    """커넥션 풀 종료"""
+    self.session.close()
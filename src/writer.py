@@ -0,0 +1,183 @@
+"""
+Group-IB JSONL 그룹 커밋 기록 모듈
+
+페이지마다 파일을 다시 열고 레코드마다 write를 호출하는 대신,
+- 엔드포인트 파일별 핸들을 캐시하고 (LRU, 세그먼트 회전 등으로 파일이 바뀌면 다시 열기)
+- 페이지 전체를 하나의 버퍼로 만들어 한 번의 write로 추가하며 (O_APPEND)
+- 내구성 정책에 따라 fsync 합니다.
+  - none: fsync 안 함 (OS 페이지 캐시에 맡김, 기존 동작)
+  - page: 페이지마다 fsync (커서 기록 전에 데이터가 디스크에 있음)
+  - interval: 마지막 fsync 후 JSONL_FSYNC_INTERVAL초가 지난 커밋에서 변경된 파일을 모두 fsync
+    (사이클 끝과 종료 시에도 fsync)
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Tuple
+
+
+# 스트리밍 파싱처럼 큰 페이지는 이 크기마다 나누어 기록 (메모리 사용량 제한)
+MAX_BUFFER_BYTES = 8 * 1024 * 1024
+
+
+class _Handle:
+  """캐시된 파일 핸들"""
+
+  __slots__ = ('file', 'path', 'dirty', 'lock')
+
+  def __init__(self, path: str):
+    self.path = path
+    self.file = open(path, 'ab', buffering=0)
+    self.dirty = False
+    self.lock = threading.Lock()
+
+  def isCurrent(self) -> bool:
+    """경로가 아직 이 핸들의 파일을 가리키는지 (회전/삭제 시 False)"""
+    try:
+      pathStat = os.stat(self.path)
+    except FileNotFoundError:
+      return False
+    fileStat = os.fstat(self.file.fileno())
+    return (pathStat.st_dev, pathStat.st_ino) == (fileStat.st_dev, fileStat.st_ino)
+
+  def write(self, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+      written = self.file.write(view)
+      view = view[written:]
+    self.dirty = True
+
+  def sync(self) -> None:
+    if self.dirty:
+      os.fsync(self.file.fileno())
+      self.dirty = False
+
+  def close(self, sync: bool) -> None:
+    if sync:
+      self.sync()
+    self.file.close()
+
+
+class JsonlWriter:
+  """엔드포인트 JSONL 파일 그룹 커밋 기록기"""
+
+  DURABILITY = ('none', 'page', 'interval')
+
+  def __init__(self, outputsDir: str, durability: str = 'none', syncInterval: float = 1.0,
+               maxHandles: int = 64):
+    """초기화 메서드
+
+    Args:
+      outputsDir: JSONL 출력 디렉토리
+      durability: 내구성 정책 (none, page, interval)
+      syncInterval: interval 정책의 fsync 간격(초)
+      maxHandles: 캐시할 최대 파일 핸들 수
+
+    Raises:
+      ValueError: durability가 올바르지 않은 경우
+    """
+    if durability not in self.DURABILITY:
+      raise ValueError(f"JSONL_FSYNC는 'none', 'page', 'interval' 중 하나여야 합니다: {durability}")
+    self.outputsDir = outputsDir
+    self.durability = durability
+    self.syncInterval = max(0.0, syncInterval)
+    self.maxHandles = max(1, maxHandles)
+
+    self._handles: 'OrderedDict[str, _Handle]' = OrderedDict()
+    self._lock = threading.Lock()
+    self._lastSync = time.monotonic()
+
+  def _getHandle(self, filename: str) -> _Handle:
+    with self._lock:
+      handle = self._handles.get(filename)
+      if handle is not None and not handle.isCurrent():
+        # 회전된 파일의 남은 데이터를 내리고 새 활성 파일을 염
+        del self._handles[filename]
+        self._closeHandle(handle)
+        handle = None
+      if handle is None:
+        handle = _Handle(os.path.join(self.outputsDir, filename))
+        self._handles[filename] = handle
+        while len(self._handles) > self.maxHandles:
+          _, oldest = self._handles.popitem(last=False)
+          self._closeHandle(oldest)
+      self._handles.move_to_end(filename)
+      return handle
+
+  def _closeHandle(self, handle: _Handle) -> None:
+    # none 정책은 닫을 때도 fsync 하지 않음 (다른 정책은 남은 변경을 내린 뒤 닫음)
+    with handle.lock:
+      handle.close(self.durability != 'none')
+
+  def append(self, filename: str, lines: Iterable[str]) -> Tuple[int, float]:
+    """페이지 레코드를 한 번의 write로 추가 (정책에 따라 fsync)
+
+    Args:
+      filename: 엔드포인트 JSONL 파일명
+      lines: '\\n'으로 끝나는 레코드 줄
+
+    Returns:
+      (기록한 바이트 수, 커밋 소요 시간(초)) 튜플
+
+    Raises:
+      OSError: 파일 기록 실패
+    """
+    startTime = time.perf_counter()
+    written = 0
+
+    while True:
+      handle = self._getHandle(filename)
+      handle.lock.acquire()
+      if not handle.file.closed:
+        break
+      # 받은 직후 다른 스레드가 LRU로 닫은 핸들
+      handle.lock.release()
+
+    try:
+      buffer = bytearray()
+      for line in lines:
+        buffer += line.encode('utf-8')
+        if len(buffer) >= MAX_BUFFER_BYTES:
+          handle.write(buffer)
+          written += len(buffer)
+          buffer = bytearray()
+      if buffer:
+        handle.write(buffer)
+        written += len(buffer)
+      if self.durability == 'page':
+        handle.sync()
+    finally:
+      handle.lock.release()
+
+    if self.durability == 'interval' and time.monotonic() - self._lastSync >= self.syncInterval:
+      self.sync()
+    return written, time.perf_counter() - startTime
+
+  def sync(self) -> None:
+    """변경된 모든 파일 fsync
+
+    Raises:
+      OSError: fsync 실패
+    """
+    with self._lock:
+      handles = list(self._handles.values())
+      self._lastSync = time.monotonic()
+    for handle in handles:
+      with handle.lock:
+        if not handle.file.closed:
+          handle.sync()
+
+  def openFiles(self) -> Dict[str, str]:
+    """캐시된 핸들의 파일명 → 경로 (테스트/진단용)"""
+    with self._lock:
+      return {filename: handle.path for filename, handle in self._handles.items()}
+
+  def close(self) -> None:
+    """모든 핸들 닫기 (none 외의 정책은 닫기 전에 fsync)"""
+    with self._lock:
+      handles = list(self._handles.values())
+      self._handles.clear()
+    for handle in handles:
+      self._closeHandle(handle)
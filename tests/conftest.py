@@ -0,0 +1,33 @@
+"""
+공통 테스트 fixture
+"""
+
+import os
+import pytest
+from unittest.mock import patch
+from src.collector import GroupIBCollector
+
+
+@pytest.fixture
+def makeCollector(monkeypatch):
+  """테스트용 collector 생성 함수
+
+  반환한 함수는 (임시 디렉토리, **환경 변수)를 받아 환경 변수를 덮어쓴 뒤 collector를 만들고,
+  출력 파일과 상태 파일(커서, 중복 제거, 스케줄, 페이지 크기, IOC 인덱스, 리스) 경로를
+  임시 디렉토리로 옮깁니다. 상태 파일 이름(샤딩 모드의 워커별 이름 포함)은 그대로 유지합니다.
+  """
+  def factory(tempDir, **env):
+    monkeypatch.setenv('GROUPIB_USERNAME', 'test@example.com')
+    monkeypatch.setenv('GROUPIB_API_KEY', 'test_api_key_12345')
+    for name, value in env.items():
+      monkeypatch.setenv(name, str(value))
+
+    with patch.object(GroupIBCollector, '_setupLogger'):
+      collector = GroupIBCollector()
+    collector.dataDir = tempDir
+    collector.outputsDir = tempDir
+    for name in ('seqUpdateFile', 'dedupDir', 'scheduleFile', 'pageSizeFile', 'iocIndexDir', 'leaseDir'):
+      setattr(collector, name, os.path.join(tempDir, os.path.basename(getattr(collector, name))))
+    return collector
+
+  return factory
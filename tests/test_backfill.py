@@ -0,0 +1,189 @@
+"""
+기간 창 병렬 백필 단위 테스트
+
+실행 방법:
+  pytest tests/test_backfill.py -v
+"""
+
+import os
+import json
+import tempfile
+import threading
+import pytest
+from datetime import date
+from unittest.mock import patch
+from src.backfill import BackfillRunner, splitWindows
+from src.dedup import recordKey
+
+
+ENDPOINT = '/api/v2/ioc/common/updated'
+
+
+@pytest.fixture
+def tempDir():
+  """임시 디렉토리 생성"""
+  with tempfile.TemporaryDirectory() as tmpdir:
+    yield tmpdir
+
+
+def makeItems():
+  """2024-01-01부터 하루 2건씩 60일치 항목 (seqUpdate는 날짜 순으로 증가)"""
+  items = []
+  for day in range(60):
+    current = date.fromordinal(date(2024, 1, 1).toordinal() + day)
+    for i in range(2):
+      items.append({'id': f"{current.isoformat()}-{i}", 'date': current.isoformat(),
+                    'seq': 1000 + day * 2 + i})
+  return items
+
+
+class FakeApi:
+  """date.from/date.to/seqUpdate/limit를 해석하는 가짜 API"""
+
+  def __init__(self, items, failWindow=None):
+    self.items = items
+    self.failWindow = failWindow
+    self.calls = []
+    self._lock = threading.Lock()
+
+  def __call__(self, url, params):
+    with self._lock:
+      self.calls.append(dict(params))
+    if params['date.from'] == self.failWindow:
+      return None
+    limit = int(params.get('limit', '100'))
+    seqUpdate = int(params.get('seqUpdate', '0'))
+    page = [item for item in self.items
+            if params['date.from'] <= item['date'] <= params['date.to'] and item['seq'] > seqUpdate][:limit]
+    return {'items': page, 'seqUpdate': page[-1]['seq'] if page else seqUpdate}
+
+
+class TestSplitWindows:
+  """기간 분할 테스트"""
+
+  def testWindowsCoverRangeWithoutOverlap(self):
+    windows = splitWindows(date(2024, 1, 1), date(2024, 3, 1), 30)
+    assert windows == [(date(2024, 1, 1), date(2024, 1, 30)),
+                       (date(2024, 1, 31), date(2024, 2, 29)),
+                       (date(2024, 3, 1), date(2024, 3, 1))]
+    assert splitWindows(date(2024, 1, 2), date(2024, 1, 1), 30) == []
+
+
+class TestBackfillRunner:
+  """백필 수집/병합/커서 인계 테스트"""
+
+  def config(self):
+    return {'url': f"https://example.com{ENDPOINT}", 'endpoint': ENDPOINT, 'params': {'limit': '7'}}
+
+  def readOutput(self, collector):
+    with open(os.path.join(collector.outputsDir, collector.urlToFilename(ENDPOINT)), encoding='utf-8') as f:
+      return [json.loads(line) for line in f]
+
+  def testParallelWindowsMergedInOrder(self, makeCollector, tempDir):
+    """창들을 병렬 수집한 뒤 날짜 순서대로 병합하고 가장 큰 seqUpdate를 인계"""
+    collector = makeCollector(tempDir)
+    items = makeItems()
+    api = FakeApi(items)
+    runner = BackfillRunner(collector, self.config(), date(2024, 1, 1), date(2024, 2, 29),
+                            windowDays=10, workers=4)
+
+    with patch.object(collector, 'fetchApi', side_effect=api):
+      assert runner.crawl()
+    assert runner.merge() == len(items)
+    assert runner.handOff() == items[-1]['seq']
+
+    records = self.readOutput(collector)
+    assert [record['data']['id'] for record in records] == [item['id'] for item in items]
+    assert all(record['endpoint'] == ENDPOINT for record in records)
+    assert collector.loadSeqUpdate() == {ENDPOINT: items[-1]['seq']}
+    assert {(call['date.from'], call['date.to']) for call in api.calls} == \
+      {(start.isoformat(), end.isoformat()) for start, end in
+       splitWindows(date(2024, 1, 1), date(2024, 2, 29), 10)}
+    collector.close()
+
+  def testResumeAfterFailedWindow(self, makeCollector, tempDir):
+    """실패한 창만 재실행 시 이어서 수집하고, 완료된 창은 다시 요청하지 않음"""
+    collector = makeCollector(tempDir)
+    items = makeItems()
+    failing = FakeApi(items, failWindow='2024-01-21')
+    runner = BackfillRunner(collector, self.config(), date(2024, 1, 1), date(2024, 2, 29),
+                            windowDays=20, workers=3)
+    with patch.object(collector, 'fetchApi', side_effect=failing):
+      assert not runner.crawl()
+    with pytest.raises(RuntimeError):
+      runner.merge()
+
+    api = FakeApi(items)
+    resumed = BackfillRunner(collector, self.config(), date(2024, 1, 1), date(2024, 2, 29),
+                             windowDays=20, workers=3)
+    with patch.object(collector, 'fetchApi', side_effect=api):
+      assert resumed.crawl()
+    assert {call['date.from'] for call in api.calls} == {'2024-01-21'}
+    resumed.merge()
+
+    assert [record['data']['id'] for record in self.readOutput(collector)] == [item['id'] for item in items]
+    collector.close()
+
+  def testInterruptedMergeIsNotDuplicated(self, makeCollector, tempDir):
+    """병합 도중 중단된 창은 기록된 크기로 되돌린 뒤 다시 추가"""
+    collector = makeCollector(tempDir)
+    items = makeItems()
+    runner = BackfillRunner(collector, self.config(), date(2024, 1, 1), date(2024, 2, 29),
+                            windowDays=30, workers=2)
+    with patch.object(collector, 'fetchApi', side_effect=FakeApi(items)):
+      assert runner.crawl()
+
+    # 첫 창의 병합 기록만 남기고 일부만 추가된 상태를 재현
+    outputFile = os.path.join(collector.outputsDir, collector.urlToFilename(ENDPOINT))
+    firstKey = sorted(runner.state['windows'])[0]
+    runner.state['merging'] = {'window': firstKey, 'offset': 0}
+    runner._saveState()
+    with open(outputFile, 'w', encoding='utf-8') as f:
+      f.write('{"partial": ')
+
+    resumed = BackfillRunner(collector, self.config(), date(2024, 1, 1), date(2024, 2, 29),
+                             windowDays=30, workers=2)
+    assert resumed.merge() == len(items)
+    assert [record['data']['id'] for record in self.readOutput(collector)] == [item['id'] for item in items]
+    collector.close()
+
+  def testHandOffKeepsHigherCursor(self, makeCollector, tempDir):
+    """일반 수집 커서가 이미 더 앞서 있으면 되돌리지 않음"""
+    collector = makeCollector(tempDir)
+    collector.saveSeqUpdate({ENDPOINT: 10 ** 6})
+    runner = BackfillRunner(collector, self.config(), date(2024, 1, 1), date(2024, 1, 10),
+                            windowDays=5, workers=2)
+    with patch.object(collector, 'fetchApi', side_effect=FakeApi(makeItems())):
+      assert runner.crawl()
+    runner.merge()
+    assert runner.handOff() == 10 ** 6
+    collector.close()
+
+  def testMergeUsesCollectorPagePath(self, makeCollector, tempDir):
+    """병합한 레코드도 PDF 다운로드 예약과 중복 제거 인덱스를 거침"""
+    collector = makeCollector(tempDir, DEDUP_INDEX='true')
+    items = makeItems()[:20]
+    items[3]['file'] = {'portalLink': 'https://example.com/report.pdf'}
+
+    runner = BackfillRunner(collector, self.config(), date(2024, 1, 1), date(2024, 1, 10),
+                            windowDays=5, workers=2)
+    with patch.object(collector, 'fetchApi', side_effect=FakeApi(items)):
+      assert runner.crawl()
+    # 첫 창 레코드 하나는 일반 수집에서 이미 기록됨
+    assert collector.saveToJsonl(ENDPOINT, [items[0]], 1)
+    assert collector.commitSeqUpdate(ENDPOINT, {}, 1)
+
+    with patch.object(collector, 'schedulePdfDownload') as schedule:
+      assert runner.merge() == len(items)
+    schedule.assert_called_once_with('https://example.com/report.pdf', items[3]['id'], ENDPOINT)
+
+    assert [record['data']['id'] for record in self.readOutput(collector)] == \
+      [item['id'] for item in items]
+    keep, _ = collector.getDedupIndex().check(
+      'ioc_common_updated', [recordKey(item) for item in items])
+    assert keep == [False] * len(items)
+    collector.close()
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
@@ -0,0 +1,63 @@
+"""
+JsonCodec 단위 테스트
+
+실행 방법:
+  pytest tests/test_codec.py -v
+"""
+
+import json
+import pytest
+from src.codec import JsonCodec, loadOrjson
+
+
+orjson = loadOrjson()
+CODECS = ['stdlib'] + (['orjson'] if orjson is not None else [])
+
+
+class TestJsonCodec:
+  """JSON 코덱 테스트"""
+
+  @pytest.mark.parametrize('name', CODECS)
+  def testEnvelopePrefixBuildsValidRecord(self, name):
+    """접두어 + 항목 + '}'는 data가 마지막인 유효한 레코드"""
+    codec = JsonCodec(name)
+    fields = {'timestamp': '2025-01-31T10:30:45.123Z', 'source': 'groupib-api',
+              'endpoint': '/api/v2/ioc/common/updated', 'seqUpdate': 1773648764815883515}
+    item = {'id': 'abc', 'name': '위협 그룹', 'ips': ['1.1.1.1']}
+
+    line = codec.buildEnvelopePrefix(fields) + codec.dumps(item) + '}'
+
+    assert json.loads(line) == dict(fields, data=item)
+    assert list(json.loads(line).keys())[-1] == 'data'
+
+  def testStdlibMatchesLegacyFormat(self):
+    """stdlib 코덱 출력은 기존 json.dumps(record) 출력과 바이트 단위로 동일"""
+    codec = JsonCodec('stdlib')
+    fields = {'timestamp': 't', 'source': 'groupib-api', 'endpoint': '/e', 'seqUpdate': 1}
+    item = {'id': 1, 'name': '한글'}
+
+    line = codec.buildEnvelopePrefix(fields) + codec.dumps(item) + '}'
+
+    assert line == json.dumps(dict(fields, data=item), ensure_ascii=False)
+
+  @pytest.mark.parametrize('name', CODECS)
+  def testOversizedIntegerFallback(self, name):
+    """64비트를 넘는 정수도 처리 (orjson은 표준 라이브러리로 대체)"""
+    codec = JsonCodec(name)
+    bigValue = 2 ** 70
+
+    assert codec.loads(b'{"seqUpdate": %d}' % bigValue)['seqUpdate'] == bigValue
+    assert json.loads(codec.dumps({'v': bigValue}))['v'] == bigValue
+
+  def testAutoSelection(self):
+    """auto는 orjson 설치 여부에 따라 선택"""
+    assert JsonCodec('auto').name == ('orjson' if orjson is not None else 'stdlib')
+
+  def testUnknownCodecRejected(self):
+    """알 수 없는 코덱 이름은 에러"""
+    with pytest.raises(ValueError):
+      JsonCodec('simdjson')
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
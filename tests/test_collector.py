@@ -6,8 +6,12 @@ GroupIBCollector 클래스 단위 테스트
 """
 
 import os
+import sys
 import json
+import time
+import threading
 import tempfile
+import subprocess
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from src.collector import (
@@ -73,6 +77,11 @@ class TestGroupIBCollector:
       assert headers['Authorization'].startswith('Basic ')
       assert 'User-Agent' in headers
       assert 'Accept' in headers
+      assert 'gzip' in headers['Accept-Encoding']
+
+      # 헤더는 한 번만 생성되고 전송 객체와 공유
+      assert collector.buildAuthHeader() == headers
+      assert collector.transport.session.headers['Authorization'] == headers['Authorization']
 
   def testUrlToFilename(self, mockEnv):
     """URL을 파일명으로 변환 테스트"""
@@ -128,7 +137,7 @@ class TestGroupIBCollector:
       assert len(dataList4) == 0
       assert seqUpdate4 == 0
 
-  @patch('src.collector.requests.get')
+  @patch('src.transport.HttpTransport.get')
   def testAuthenticateSuccess(self, mockGet, mockEnv):
     """인증 성공 테스트"""
     with patch.object(GroupIBCollector, '_setupLogger'):
@@ -142,7 +151,7 @@ class TestGroupIBCollector:
       result = collector.authenticate()
       assert result is True
 
-  @patch('src.collector.requests.get')
+  @patch('src.transport.HttpTransport.get')
   def testAuthenticateFailure(self, mockGet, mockEnv):
     """인증 실패 테스트"""
     with patch.object(GroupIBCollector, '_setupLogger'):
@@ -156,6 +165,44 @@ class TestGroupIBCollector:
       with pytest.raises(AuthenticationError):
         collector.authenticate()
 
+  @patch('src.transport.HttpTransport.get')
+  def testRateLimitHonorsRetryAfter(self, mockGet, mockEnv):
+    """429 응답의 Retry-After만큼 공유 제한기에서 대기 후 재시도"""
+    with patch.object(GroupIBCollector, '_setupLogger'):
+      collector = GroupIBCollector()
+
+      throttled = Mock(status_code=429, headers={'Retry-After': '2'})
+      ok = Mock(status_code=200, headers={}, content=b'{"items": [], "seqUpdate": 1}')
+      ok.timing = {'bytes': 30, 'connect': 0, 'ttfb': 0, 'transfer': 0, 'reused': True}
+      ok.url = 'https://tap.group-ib.com/api/v2/test/updated'
+      mockGet.side_effect = [throttled, ok]
+
+      with patch.object(collector.stopEvent, 'wait', return_value=False) as mockWait:
+        result = collector.fetchApi(ok.url, {})
+
+      assert result == {'items': [], 'seqUpdate': 1}
+      assert mockWait.call_args_list[-1][0][0] == pytest.approx(2, abs=0.1)
+      assert collector.rateLimiter.rate < collector.rateLimiter.maxRate
+
+  @patch('src.transport.HttpTransport.get')
+  def testStopDuringRetryAfterAbortsRequest(self, mockGet, mockEnv):
+    """Retry-After 멈춤 중 종료 요청이 오면 기다리지 않고 요청 취소"""
+    with patch.object(GroupIBCollector, '_setupLogger'):
+      collector = GroupIBCollector()
+    mockGet.return_value = Mock(status_code=429, headers={'Retry-After': '300'})
+
+    timer = threading.Timer(0.1, collector.requestStop)
+    timer.start()
+    startTime = time.monotonic()
+    try:
+      assert collector.fetchApi('https://tap.group-ib.com/api/v2/test/updated', {}) is None
+    finally:
+      timer.cancel()
+      collector.close()
+
+    assert time.monotonic() - startTime < 5
+    assert mockGet.call_count == 1
+
   def testLoadSeqUpdate(self, mockEnv, tempDir):
     """seqUpdate 로드 테스트"""
     with patch.object(GroupIBCollector, '_setupLogger'):
@@ -230,5 +277,206 @@ class TestGroupIBCollector:
       assert firstRecord['data']['id'] == 1
 
 
+class TestDrainMode:
+  """drain 모드 (seqUpdate 백로그 연속 수집) 테스트"""
+
+  endpointConfig = {
+    'url': 'https://test.group-ib.com/api/v2/test/updated',
+    'endpoint': '/api/v2/test/updated',
+    'params': {'limit': '2'},
+    'maxPages': None,
+    'maxSeconds': None
+  }
+
+  def _makeCollector(self, monkeypatch, tempDir, drainMode='true'):
+    monkeypatch.setenv('DRAIN_MODE', drainMode)
+    with patch.object(GroupIBCollector, '_setupLogger'):
+      collector = GroupIBCollector()
+    collector.outputsDir = tempDir
+    collector.seqUpdateFile = os.path.join(tempDir, 'seq_update.json')
+    return collector
+
+  def testDrainUntilEmptyPage(self, mockEnv, monkeypatch, tempDir):
+    """빈 페이지를 받을 때까지 반환된 seqUpdate로 계속 요청"""
+    collector = self._makeCollector(monkeypatch, tempDir)
+    pages = [
+      {'seqUpdate': 10, 'items': [{'id': 1}, {'id': 2}]},
+      {'seqUpdate': 20, 'items': [{'id': 3}]},
+      {'seqUpdate': 20, 'items': []}
+    ]
+    collector.fetchApi = Mock(side_effect=pages)
+
+    seqUpdates = {}
+    success, count = collector.collectSingleEndpoint(self.endpointConfig, seqUpdates)
+
+    assert success is True
+    assert count == 3
+    assert seqUpdates['/api/v2/test/updated'] == 20
+    assert collector.fetchApi.call_count == 3
+    sentSeqUpdates = [c.args[1].get('seqUpdate') for c in collector.fetchApi.call_args_list]
+    assert sentSeqUpdates == [None, '10', '20']
+
+  def testDrainStopsOnShutdownRequest(self, mockEnv, monkeypatch, tempDir):
+    """종료 요청 시 진행 중인 페이지는 기록/커서 저장 후 멈추고, 다음 엔드포인트는 요청하지 않음"""
+    collector = self._makeCollector(monkeypatch, tempDir)
+    pages = [
+      {'seqUpdate': 10, 'items': [{'id': 1}, {'id': 2}]},
+      {'seqUpdate': 20, 'items': [{'id': 3}, {'id': 4}]}
+    ]
+
+    def fetchThenStop(url, params):
+      collector.requestStop()
+      return pages.pop(0)
+
+    collector.fetchApi = Mock(side_effect=fetchThenStop)
+    seqUpdates = {}
+    success, count = collector.collectSingleEndpoint(self.endpointConfig, seqUpdates)
+
+    assert success is True and count == 2
+    assert seqUpdates['/api/v2/test/updated'] == 10
+    assert collector.fetchApi.call_count == 1
+    assert collector.collectSingleEndpoint(self.endpointConfig, seqUpdates) == (False, 0)
+    assert collector.fetchApi.call_count == 1
+
+  def testDrainStopsWhenCursorStalls(self, mockEnv, monkeypatch, tempDir):
+    """seqUpdate가 변하지 않으면 drain 종료"""
+    collector = self._makeCollector(monkeypatch, tempDir)
+    collector.fetchApi = Mock(return_value={'seqUpdate': 5, 'items': [{'id': 1}]})
+
+    seqUpdates = {'/api/v2/test/updated': 5}
+    success, count = collector.collectSingleEndpoint(self.endpointConfig, seqUpdates)
+
+    assert success is True
+    assert count == 1
+    assert collector.fetchApi.call_count == 1
+
+  def testDrainRespectsPageCap(self, mockEnv, monkeypatch, tempDir):
+    """엔드포인트별 페이지 상한 적용"""
+    collector = self._makeCollector(monkeypatch, tempDir)
+    pages = [{'seqUpdate': n, 'items': [{'id': n}]} for n in range(1, 10)]
+    collector.fetchApi = Mock(side_effect=pages)
+
+    config = dict(self.endpointConfig, maxPages=3)
+    seqUpdates = {}
+    success, count = collector.collectSingleEndpoint(config, seqUpdates)
+
+    assert success is True
+    assert count == 3
+    assert seqUpdates['/api/v2/test/updated'] == 3
+
+  def testDrainKeepsProgressOnFailure(self, mockEnv, monkeypatch, tempDir):
+    """중간 페이지 실패 시 이미 처리한 페이지의 seqUpdate는 유지"""
+    collector = self._makeCollector(monkeypatch, tempDir)
+    collector.fetchApi = Mock(side_effect=[{'seqUpdate': 7, 'items': [{'id': 1}]}, None])
+
+    seqUpdates = {}
+    success, count = collector.collectSingleEndpoint(self.endpointConfig, seqUpdates)
+
+    assert success is False
+    assert seqUpdates['/api/v2/test/updated'] == 7
+
+  def testSinglePageWithoutDrain(self, mockEnv, monkeypatch, tempDir):
+    """drain 모드가 꺼져 있으면 사이클당 한 페이지만 요청"""
+    collector = self._makeCollector(monkeypatch, tempDir, drainMode='false')
+    collector.fetchApi = Mock(return_value={'seqUpdate': 10, 'items': [{'id': 1}]})
+
+    seqUpdates = {}
+    collector.collectSingleEndpoint(self.endpointConfig, seqUpdates)
+
+    assert collector.fetchApi.call_count == 1
+    assert seqUpdates['/api/v2/test/updated'] == 10
+
+  def testLoadEndpointsOptionalDrainColumns(self, mockEnv, monkeypatch, tempDir):
+    """list.csv 선택 컬럼(maxPages, maxSeconds) 로드"""
+    collector = self._makeCollector(monkeypatch, tempDir)
+    collector.csvFile = os.path.join(tempDir, 'list.csv')
+    with open(collector.csvFile, 'w', encoding='utf-8') as f:
+      f.write('endpoint,params,maxPages,maxSeconds\n')
+      f.write('https://test.group-ib.com/api/v2/a/updated,limit=10,5,60\n')
+      f.write('https://test.group-ib.com/api/v2/b/updated,limit=10,,\n')
+
+    endpoints = collector.loadEndpoints()
+
+    assert endpoints[0]['maxPages'] == 5
+    assert endpoints[0]['maxSeconds'] == 60.0
+    assert collector.getDrainLimits(endpoints[1]) == (collector.drainMaxPages,
+                                                       collector.drainMaxSeconds)
+
+
+class TestEndpointSelection:
+  """list.csv 로드 및 엔드포인트 선택 테스트"""
+
+  def _makeCollector(self, tempDir):
+    with patch.object(GroupIBCollector, '_setupLogger'):
+      collector = GroupIBCollector()
+    collector.outputsDir = tempDir
+    collector.seqUpdateFile = os.path.join(tempDir, 'seq_update.json')
+    return collector
+
+  def testLoadEndpointsCsvEdgeCases(self, mockEnv, tempDir):
+    """BOM, 따옴표로 감싼 파라미터, 빈 URL 행, 정수 컬럼의 소수 표기"""
+    collector = self._makeCollector(tempDir)
+    collector.csvFile = os.path.join(tempDir, 'list.csv')
+    with open(collector.csvFile, 'w', encoding='utf-8-sig') as f:
+      f.write('endpoint,params,maxPages\n')
+      f.write('https://test.group-ib.com/api/v2/a/updated,"limit=10&df=1,2",5.0\n')
+      f.write(',limit=10,\n')
+
+    endpoints = collector.loadEndpoints()
+
+    assert len(endpoints) == 1
+    assert endpoints[0]['params'] == {'limit': '10', 'df': '1,2'}
+    assert endpoints[0]['maxPages'] == 5
+
+    with open(collector.csvFile, 'w', encoding='utf-8') as f:
+      f.write('')
+    with pytest.raises(ValueError):
+      collector.loadEndpoints()
+
+  def testSelectEndpoints(self, mockEnv, tempDir):
+    """경로에 패턴이 포함된 엔드포인트만 남김"""
+    collector = self._makeCollector(tempDir)
+    collector.endpoints = [{'endpoint': path, 'url': f"https://test.group-ib.com{path}", 'params': {}}
+                           for path in ('/api/v2/ioc/common/updated', '/api/v2/apt/ioc/updated',
+                                        '/api/v2/hi/threat/updated')]
+
+    selected = collector.selectEndpoints(['ioc/common', 'apt/'])
+    assert [ep['endpoint'] for ep in selected] == ['/api/v2/ioc/common/updated', '/api/v2/apt/ioc/updated']
+    assert collector.endpoints == selected
+    with pytest.raises(ValueError):
+      collector.selectEndpoints(['nothing'])
+
+
+class TestStartup:
+  """시작 경로 테스트"""
+
+  HEAVY_MODULES = ('pandas', 'pyarrow', 'multiprocessing', 'concurrent.futures.process', 'sqlite3',
+                   'http.server', 'src.pipeline', 'src.export', 'src.iocindex', 'src.backfill',
+                   'src.scanner', 'src.metrics', 'src.leases', 'src.dedup')
+
+  def loadedModules(self, code):
+    """하위 프로세스에서 code 실행 후 HEAVY_MODULES 중 불러온 모듈 목록"""
+    projectRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = f"import sys\n{code}\nprint(','.join(n for n in {self.HEAVY_MODULES!r} if n in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', script], cwd=projectRoot, capture_output=True,
+                            text=True, check=True)
+    return [name for name in result.stdout.strip().split(',') if name]
+
+  def testStartupSkipsHeavyImports(self):
+    """수집 시작 경로에서 하위 명령/선택 기능 모듈과 무거운 표준 라이브러리를 불러오지 않음 (단발 실행 시작 시간)"""
+    assert self.loadedModules("import main; main.parseArgs(['--once'])") == []
+
+  def testCollectorSkipsDisabledFeatureImports(self, monkeypatch):
+    """꺼진 기능(중복 제거, 샤딩, 파이프라인, IOC 인덱스, 메트릭 서버)의 모듈은 collector 생성 시 불러오지 않음"""
+    monkeypatch.setenv('GROUPIB_USERNAME', 'test@example.com')
+    monkeypatch.setenv('GROUPIB_API_KEY', 'test_api_key_12345')
+    code = ("from unittest.mock import patch\n"
+            "from src.collector import GroupIBCollector\n"
+            "with patch.object(GroupIBCollector, '_setupLogger'):\n"
+            "  collector = GroupIBCollector()\n"
+            "collector.close()")
+    assert self.loadedModules(code) == ['src.metrics']
+
+
 if __name__ == '__main__':
   pytest.main([__file__, '-v'])
@@ -0,0 +1,163 @@
+"""
+DedupIndex 및 수집 시점 중복 제거 단위 테스트
+
+실행 방법:
+  pytest tests/test_dedup.py -v
+"""
+
+import os
+import json
+import time
+import tempfile
+import pytest
+from unittest.mock import patch
+from src.collector import GroupIBCollector
+from src.codec import JsonCodec
+from src.dedup import DedupIndex, contentHash, recordKey
+
+
+@pytest.fixture
+def tempDir():
+  """임시 디렉토리 생성"""
+  with tempfile.TemporaryDirectory() as tmpdir:
+    yield tmpdir
+
+
+def keys(*records):
+  return [(recordId, contentHash(payload)) for recordId, payload in records]
+
+
+class TestRecordKey:
+  """중복 판별 키 테스트"""
+
+  def testKeyIndependentOfCodecAndKeyOrder(self):
+    """stdlib/orjson 코덱, 키 순서, 변동 필드와 관계없이 같은 내용은 같은 키"""
+    pytest.importorskip('orjson')
+    item = {'id': 'a', 'name': '한글', 'tags': [1, 2.5], 'meta': {'b': 1, 'a': None}}
+    decoded = [JsonCodec(name).loads(JsonCodec(name).dumps(item)) for name in ('stdlib', 'orjson')]
+    reordered = dict(reversed(list(item.items())), seqUpdate=7)
+
+    results = {recordKey(value) for value in decoded + [item, reordered]}
+    assert results == {recordKey(item)}
+    assert recordKey(dict(item, name='other')) != recordKey(item)
+
+
+class TestDedupIndex:
+  """SQLite 인덱스 테스트"""
+
+  def testSkipsUnchangedRecords(self, tempDir):
+    """ID와 내용이 모두 같으면 건너뛰고, 내용이 바뀌면 다시 기록"""
+    index = DedupIndex(tempDir)
+    keep, pending = index.check('ioc', keys(('a', '{"v": 1}'), ('b', '{"v": 2}')))
+    assert keep == [True, True]
+    index.record('ioc', pending)
+
+    keep, _ = index.check('ioc', keys(('a', '{"v": 1}'), ('b', '{"v": 3}'), ('c', '{}')))
+    assert keep == [False, True, True]
+    index.close()
+
+  def testCheckDoesNotRecord(self, tempDir):
+    """record() 전에는 인덱스가 바뀌지 않음 (파일 기록 실패 시 재기록 보장)"""
+    index = DedupIndex(tempDir)
+    index.check('ioc', keys(('a', '{}')))
+    keep, _ = index.check('ioc', keys(('a', '{}')))
+    assert keep == [True]
+    assert index.count('ioc') == 0
+    index.close()
+
+  def testRecordsWithoutIdAndInPageRepeats(self, tempDir):
+    """ID 없는 레코드는 항상 기록, 같은 페이지 안의 반복은 한 번만 기록"""
+    index = DedupIndex(tempDir)
+    keep, pending = index.check('ioc', keys((None, '{}'), (None, '{}'), ('a', '{}'), ('a', '{}')))
+    assert keep == [True, True, True, False]
+    assert len(pending) == 1
+    index.close()
+
+  def testIndexesArePerEndpoint(self, tempDir):
+    """엔드포인트마다 별도 인덱스"""
+    index = DedupIndex(tempDir)
+    index.record('first', keys(('a', '{}')))
+    keep, _ = index.check('second', keys(('a', '{}')))
+    assert keep == [True]
+    assert os.path.exists(os.path.join(tempDir, 'first.sqlite'))
+    index.close()
+
+  def testPruneByRetentionAndMaxEntries(self, tempDir):
+    """보존 기간이 지난 항목과 최대 항목 수 초과분 삭제"""
+    index = DedupIndex(tempDir, retentionDays=1, maxEntries=2)
+    with patch('src.dedup.time.time', return_value=time.time() - 3 * 86400):
+      index.record('ioc', keys(('old', '{}')))
+    for n in range(3):
+      index.record('ioc', keys((f"new{n}", '{}')))
+
+    assert index.prune() == 2
+    assert index.count('ioc') == 2
+    index.close()
+
+    # 다시 열어도 정리 결과 유지
+    reopened = DedupIndex(tempDir)
+    keep, _ = reopened.check('ioc', keys(('old', '{}'), ('new2', '{}')))
+    assert keep == [True, False]
+    reopened.close()
+
+
+class TestCollectorDedup:
+  """collector 중복 제거 통합 테스트"""
+
+  def testSaveToJsonlSkipsRedeliveredRecords(self, monkeypatch, tempDir):
+    """DEDUP_INDEX=true이면 재전달된 동일 레코드는 파일에 다시 쓰지 않음"""
+    monkeypatch.setenv('GROUPIB_USERNAME', 'test@example.com')
+    monkeypatch.setenv('GROUPIB_API_KEY', 'test_api_key_12345')
+    monkeypatch.setenv('DEDUP_INDEX', 'true')
+    with patch.object(GroupIBCollector, '_setupLogger'):
+      collector = GroupIBCollector()
+    collector.outputsDir = tempDir
+    collector.dedupDir = os.path.join(tempDir, 'dedup')
+
+    collector.seqUpdateFile = os.path.join(tempDir, 'seq_update.json')
+
+    endpoint = '/api/v2/ioc/common/updated'
+    seqUpdates = {}
+    pages = [[{'id': 'a', 'v': 1}, {'hash': 'h1'}], [{'id': 'a', 'v': 1}, {'hash': 'h1'}],
+             [{'id': 'a', 'v': 2}, {'value': 'no id'}]]
+    for seqUpdate, items in enumerate(pages, 1):
+      # 인덱스 항목은 커서를 기록할 때 반영됨
+      assert collector.saveToJsonl(endpoint, items, seqUpdate)
+      assert collector.commitSeqUpdate(endpoint, seqUpdates, seqUpdate)
+
+    with open(os.path.join(tempDir, 'ioc_common_updated.jsonl'), encoding='utf-8') as f:
+      records = [json.loads(line) for line in f]
+    assert [(r['seqUpdate'], r['data']) for r in records] == [
+      (1, {'id': 'a', 'v': 1}), (1, {'hash': 'h1'}),
+      (3, {'id': 'a', 'v': 2}), (3, {'value': 'no id'})
+    ]
+    collector.close()
+
+  def testRedeliveryWithNewItemSeqUpdateSkipped(self, monkeypatch, tempDir):
+    """항목별 seqUpdate/갱신 시각만 바뀐 재전달 레코드는 다시 쓰지 않음"""
+    monkeypatch.setenv('GROUPIB_USERNAME', 'test@example.com')
+    monkeypatch.setenv('GROUPIB_API_KEY', 'test_api_key_12345')
+    monkeypatch.setenv('DEDUP_INDEX', 'true')
+    with patch.object(GroupIBCollector, '_setupLogger'):
+      collector = GroupIBCollector()
+    collector.outputsDir = tempDir
+    collector.dedupDir = os.path.join(tempDir, 'dedup')
+    collector.seqUpdateFile = os.path.join(tempDir, 'seq_update.json')
+
+    endpoint = '/api/v2/ioc/common/updated'
+    seqUpdates = {}
+    pages = [[{'id': 'a', 'v': 1, 'seqUpdate': 100, 'dateLastSeen': '2026-10-16T00:00:00Z'}],
+             [{'seqUpdate': 200, 'v': 1, 'id': 'a', 'dateLastSeen': '2026-10-17T00:00:00Z'}],
+             [{'id': 'a', 'v': 2, 'seqUpdate': 300}]]
+    for seqUpdate, items in enumerate(pages, 1):
+      assert collector.saveToJsonl(endpoint, items, seqUpdate)
+      assert collector.commitSeqUpdate(endpoint, seqUpdates, seqUpdate)
+
+    with open(os.path.join(tempDir, 'ioc_common_updated.jsonl'), encoding='utf-8') as f:
+      records = [json.loads(line) for line in f]
+    assert [(r['seqUpdate'], r['data']['seqUpdate']) for r in records] == [(1, 100), (3, 300)]
+    collector.close()
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
@@ -0,0 +1,198 @@
+"""
+PdfDownloadPool 및 PDF 스트리밍/이어받기 단위 테스트
+
+실행 방법:
+  pytest tests/test_downloader.py -v
+"""
+
+import os
+import time
+import tempfile
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from src.collector import GroupIBCollector
+from src.downloader import PdfDownloadPool
+
+
+PDF_BYTES = b'%PDF-1.4\n' + bytes(range(256)) * 400
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+  protocol_version = 'HTTP/1.1'
+  requests = []
+
+  def do_GET(self):
+    rangeHeader = self.headers.get('Range')
+    _RangeHandler.requests.append(rangeHeader)
+    if rangeHeader:
+      start = int(rangeHeader.split('=')[1].rstrip('-'))
+      body = PDF_BYTES[start:]
+      self.send_response(206)
+      self.send_header('Content-Range', f"bytes {start}-{len(PDF_BYTES) - 1}/{len(PDF_BYTES)}")
+    else:
+      body = PDF_BYTES
+      self.send_response(200)
+    self.send_header('Content-Type', 'application/pdf')
+    self.send_header('Content-Length', str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+  def log_message(self, *args):
+    pass
+
+
+@pytest.fixture
+def mockEnv(monkeypatch):
+  """환경 변수 Mock 설정"""
+  monkeypatch.setenv('GROUPIB_USERNAME', 'test@example.com')
+  monkeypatch.setenv('GROUPIB_API_KEY', 'test_api_key_12345')
+  monkeypatch.setenv('RATE_LIMIT_WAIT', '0')
+
+
+@pytest.fixture
+def tempDir():
+  """임시 디렉토리 생성"""
+  with tempfile.TemporaryDirectory() as tmpdir:
+    yield tmpdir
+
+
+@pytest.fixture
+def server():
+  """Range 요청을 지원하는 로컬 PDF 서버"""
+  _RangeHandler.requests = []
+  httpd = ThreadingHTTPServer(('127.0.0.1', 0), _RangeHandler)
+  thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+  thread.start()
+  yield f"http://127.0.0.1:{httpd.server_address[1]}"
+  httpd.shutdown()
+  httpd.server_close()
+
+
+class TestPdfDownloadPool:
+  """PDF 다운로드 워커 풀 테스트"""
+
+  def testSubmitDoesNotBlockCaller(self):
+    """제출은 즉시 반환되고 다운로드는 백그라운드에서 수행"""
+    done = []
+
+    def slowDownload(portalLink, documentId, endpoint):
+      time.sleep(0.2)
+      done.append(documentId)
+      return True
+
+    pool = PdfDownloadPool(slowDownload, workers=4, queueSize=10)
+    startTime = time.monotonic()
+    for n in range(4):
+      pool.submit(f"http://x/{n}", f"doc{n}", '/api/v2/hi/analytic/updated')
+    assert time.monotonic() - startTime < 0.1
+
+    pool.close()
+    assert sorted(done) == ['doc0', 'doc1', 'doc2', 'doc3']
+    assert pool.getStats()['completed'] == 4
+
+  def testDuplicateSubmissionSkipped(self):
+    """처리 중인 문서는 중복 제출되지 않음"""
+    release = threading.Event()
+    calls = []
+
+    def blockingDownload(portalLink, documentId, endpoint):
+      calls.append(documentId)
+      release.wait(2)
+      return True
+
+    pool = PdfDownloadPool(blockingDownload, workers=1, queueSize=10)
+    assert pool.submit('http://x/a', 'doc', '/ep') is True
+    assert pool.submit('http://x/a', 'doc', '/ep') is False
+    release.set()
+    pool.close()
+    assert calls == ['doc']
+
+  def testCloseSharesDeadlineWithFullQueue(self):
+    """대기열이 가득 차도 close(timeout)는 하나의 제한 시간 안에 반환하고 남은 작업은 버림"""
+    release = threading.Event()
+    started = threading.Semaphore(0)
+    calls = []
+
+    def blockingDownload(portalLink, documentId, endpoint):
+      calls.append(documentId)
+      started.release()
+      release.wait(5)
+      return True
+
+    pool = PdfDownloadPool(blockingDownload, workers=2, queueSize=1)
+    for n in range(2):
+      pool.submit(f"http://x/{n}", f"doc{n}", '/ep')
+      assert started.acquire(timeout=2)
+    pool.submit('http://x/2', 'doc2', '/ep')
+
+    startTime = time.monotonic()
+    pool.close(timeout=0.3)
+    assert time.monotonic() - startTime < 0.5
+
+    release.set()
+    for thread in pool._threads:
+      thread.join(2)
+      assert not thread.is_alive()
+    assert sorted(calls) == ['doc0', 'doc1']
+    assert pool.pendingCount() == 0
+
+
+class TestDownloadPdf:
+  """PDF 스트리밍 저장 및 이어받기 테스트"""
+
+  def _makeCollector(self, tempDir):
+    with patch.object(GroupIBCollector, '_setupLogger'):
+      collector = GroupIBCollector()
+    collector.pdfsDir = tempDir
+    collector.pdfChunkSize = 1024
+    return collector
+
+  def testStreamedDownload(self, mockEnv, tempDir, server):
+    """청크 단위로 저장된 파일이 원본과 동일"""
+    collector = self._makeCollector(tempDir)
+
+    assert collector.downloadPdf(f"{server}/doc.pdf", 'doc1', '/api/v2/hi/analytic/updated')
+
+    filepath = os.path.join(tempDir, 'hi_analytic_updated', 'doc1.pdf')
+    with open(filepath, 'rb') as f:
+      assert f.read() == PDF_BYTES
+    assert not os.path.exists(filepath + '.tmp')
+    collector.close()
+
+  def testRangeResume(self, mockEnv, tempDir, server):
+    """중단된 .tmp 파일은 Range 요청으로 이어받음"""
+    collector = self._makeCollector(tempDir)
+    subDir = os.path.join(tempDir, 'hi_analytic_updated')
+    os.makedirs(subDir)
+    with open(os.path.join(subDir, 'doc2.pdf.tmp'), 'wb') as f:
+      f.write(PDF_BYTES[:5000])
+
+    assert collector.downloadPdf(f"{server}/doc.pdf", 'doc2', '/api/v2/hi/analytic/updated')
+
+    assert _RangeHandler.requests == ['bytes=5000-']
+    with open(os.path.join(subDir, 'doc2.pdf'), 'rb') as f:
+      assert f.read() == PDF_BYTES
+    collector.close()
+
+  def testSaveToJsonlDoesNotWaitForPdf(self, mockEnv, tempDir):
+    """JSONL 저장은 PDF 다운로드 완료를 기다리지 않음"""
+    collector = self._makeCollector(tempDir)
+    collector.outputsDir = tempDir
+    release = threading.Event()
+    collector.pdfPool.downloadFunc = lambda *args: release.wait(2)
+
+    items = [{'id': f"doc{n}", 'file': {'portalLink': f"http://x/{n}"}} for n in range(3)]
+    startTime = time.monotonic()
+    assert collector.saveToJsonl('/api/v2/hi/analytic/updated', items, 1) is True
+    assert time.monotonic() - startTime < 0.5
+    assert collector.pdfPool.getStats()['submitted'] == 3
+
+    release.set()
+    collector.close()
+    assert collector.pdfPool.getStats()['completed'] == 3
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
@@ -0,0 +1,194 @@
+"""
+AsyncCollectionEngine 및 RateLimiter 단위 테스트
+
+실행 방법:
+  pytest tests/test_engine.py -v
+"""
+
+import time
+import threading
+import pytest
+from unittest.mock import Mock, patch
+from src.collector import GroupIBCollector
+from src.engine import AsyncCollectionEngine
+from src.ratelimit import RateLimiter, AdaptiveRateLimiter, parseRetryAfter, parseRateLimitReset
+
+
+@pytest.fixture
+def mockEnv(monkeypatch):
+  """환경 변수 Mock 설정"""
+  monkeypatch.setenv('GROUPIB_USERNAME', 'test@example.com')
+  monkeypatch.setenv('GROUPIB_API_KEY', 'test_api_key_12345')
+  monkeypatch.setenv('GROUPIB_BASE_URL', 'https://test.group-ib.com')
+  monkeypatch.setenv('RATE_LIMIT_WAIT', '0')
+
+
+def makeEndpoints(count):
+  return [
+    {'url': f'https://test.group-ib.com/api/v2/ep{n}/updated',
+     'endpoint': f'/api/v2/ep{n}/updated',
+     'params': {'limit': '10'}}
+    for n in range(count)
+  ]
+
+
+class TestAsyncCollectionEngine:
+  """비동기 수집 엔진 테스트"""
+
+  def testEndpointsRunConcurrently(self):
+    """동시 실행 수 제한 안에서 엔드포인트가 겹쳐서 실행됨"""
+    collector = Mock()
+    active = {'now': 0, 'peak': 0}
+    lock = threading.Lock()
+
+    def fakeCollect(endpointConfig, seqUpdates):
+      with lock:
+        active['now'] += 1
+        active['peak'] = max(active['peak'], active['now'])
+      time.sleep(0.1)
+      seqUpdates[endpointConfig['endpoint']] = 1
+      with lock:
+        active['now'] -= 1
+      return True, 5
+
+    collector.collectSingleEndpoint.side_effect = fakeCollect
+    endpoints = makeEndpoints(6)
+    seqUpdates = {}
+
+    startTime = time.monotonic()
+    results = AsyncCollectionEngine(collector, maxConcurrency=3).run(endpoints, seqUpdates)
+    elapsed = time.monotonic() - startTime
+
+    assert active['peak'] == 3
+    assert elapsed < 0.5
+    assert len(seqUpdates) == 6
+    # 결과는 입력 순서를 유지
+    assert [r[0]['endpoint'] for r in results] == [ep['endpoint'] for ep in endpoints]
+
+  def testCollectAllEndpointsWithAsyncEngine(self, mockEnv, monkeypatch):
+    """COLLECTION_ENGINE=async 선택 시 실패 엔드포인트 추적 계약 유지"""
+    monkeypatch.setenv('COLLECTION_ENGINE', 'async')
+    with patch.object(GroupIBCollector, '_setupLogger'):
+      collector = GroupIBCollector()
+    collector.endpoints = makeEndpoints(4)
+    collector.loadSeqUpdate = Mock(return_value={})
+
+    def fakeCollect(endpointConfig, seqUpdates):
+      if endpointConfig['endpoint'] == '/api/v2/ep2/updated':
+        return False, 0
+      seqUpdates[endpointConfig['endpoint']] = 42
+      return True, 1
+
+    collector.collectSingleEndpoint = Mock(side_effect=fakeCollect)
+    seqUpdates = collector.collectAllEndpoints()
+
+    assert len(seqUpdates) == 3
+    assert [ep['endpoint'] for ep in collector.failedEndpoints] == ['/api/v2/ep2/updated']
+
+  def testInvalidEngineRejected(self, mockEnv, monkeypatch):
+    """알 수 없는 엔진 이름은 초기화 시 에러"""
+    monkeypatch.setenv('COLLECTION_ENGINE', 'threads')
+    with patch.object(GroupIBCollector, '_setupLogger'):
+      with pytest.raises(ValueError):
+        GroupIBCollector()
+
+
+class TestRateLimiter:
+  """공유 속도 제한기 테스트"""
+
+  def testMinimumIntervalAcrossThreads(self):
+    """여러 스레드가 공유해도 요청 시작 간 최소 간격 유지"""
+    limiter = RateLimiter(0.05)
+    starts = []
+    lock = threading.Lock()
+
+    def worker():
+      limiter.acquire()
+      with lock:
+        starts.append(time.monotonic())
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for t in threads:
+      t.start()
+    for t in threads:
+      t.join()
+
+    starts.sort()
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert min(gaps) >= 0.04
+
+  def testZeroIntervalDoesNotWait(self):
+    """간격 0이면 대기하지 않음"""
+    limiter = RateLimiter(0)
+    assert limiter.acquire() == 0.0
+    assert limiter.acquire() == 0.0
+
+
+class TestAdaptiveRateLimiter:
+  """AIMD 속도 제한기 테스트"""
+
+  def testParseRetryAfter(self):
+    """초 단위와 HTTP-date 형식 모두 해석"""
+    assert parseRetryAfter({'Retry-After': '7'}) == 7.0
+    assert parseRetryAfter({}) is None
+    assert parseRetryAfter({'Retry-After': 'soon'}) is None
+
+    future = time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime(time.time() + 30))
+    assert 25 <= parseRetryAfter({'Retry-After': future}) <= 31
+
+  def testParseRateLimitReset(self):
+    """남은 요청 수가 0일 때만 Reset까지 대기 (초 또는 Unix time)"""
+    assert parseRateLimitReset({'X-RateLimit-Remaining': '3', 'X-RateLimit-Reset': '10'}) is None
+    assert parseRateLimitReset({'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '10'}) == 10.0
+    epochReset = parseRateLimitReset({'RateLimit-Remaining': '0',
+                                      'RateLimit-Reset': str(int(time.time()) + 20)})
+    assert 18 <= epochReset <= 21
+
+  def testAdditiveIncreaseMultiplicativeDecrease(self):
+    """정상 응답마다 가산 증가(상한까지), 429마다 절반으로 감소(하한까지)"""
+    limiter = AdaptiveRateLimiter(1.0, maxRate=2.0, minRate=0.4, increaseStep=0.5)
+    limiter.recordSuccess()
+    assert limiter.rate == pytest.approx(1.5)
+    for _ in range(5):
+      limiter.recordSuccess()
+    assert limiter.rate == pytest.approx(2.0)
+    assert limiter.minInterval == pytest.approx(0.5)
+
+    limiter.recordThrottle(0)
+    assert limiter.rate == pytest.approx(1.0)
+    limiter._holdUntil = 0.0
+    limiter.recordThrottle(0)
+    limiter._holdUntil = 0.0
+    limiter.recordThrottle(0)
+    assert limiter.rate == pytest.approx(0.4)
+
+  def testConcurrentThrottlesDecreaseOnce(self):
+    """같은 멈춤 구간에 연달아 받은 429는 한 번만 감속"""
+    limiter = AdaptiveRateLimiter(0, maxRate=8.0)
+    limiter.recordThrottle(0.05)
+    limiter.recordThrottle(0.05)
+    assert limiter.rate == pytest.approx(4.0)
+
+  def testThrottlePausesAllCallers(self):
+    """Retry-After 동안 모든 호출자의 acquire가 대기"""
+    limiter = AdaptiveRateLimiter(0, maxPause=0.2)
+    assert limiter.recordThrottle(5) == 0.2
+
+    waits = []
+    threads = [threading.Thread(target=lambda: waits.append(limiter.acquire())) for _ in range(3)]
+    for t in threads:
+      t.start()
+    for t in threads:
+      t.join()
+    assert min(waits) >= 0.1
+
+  def testFixedModeOnlyHonorsPause(self):
+    """가산/승산 비활성화 시 간격은 고정"""
+    limiter = AdaptiveRateLimiter(1.0, increaseStep=0.0, decreaseFactor=1.0)
+    limiter.recordSuccess()
+    limiter.recordThrottle(0)
+    assert limiter.rate == 1.0
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
@@ -0,0 +1,188 @@
+"""
+Parquet 증분 내보내기 단위 테스트
+
+실행 방법:
+  pytest tests/test_export.py -v
+"""
+
+import os
+import sys
+import gzip
+import json
+import tempfile
+import pytest
+from src import export
+from src.codec import JsonCodec
+from src.export import flattenRecord, inferType, coerceValue, iterNewLines, ParquetExporter
+from src.journal import CursorJournal
+from src.scanner import findDatasets
+
+
+@pytest.fixture
+def tempDir():
+  """임시 디렉토리 생성"""
+  with tempfile.TemporaryDirectory() as tmpdir:
+    yield tmpdir
+
+
+def record(seqUpdate, recordId, **data):
+  data = dict({'id': recordId}, **data)
+  return json.dumps({'timestamp': '2026-10-17T01:02:03.000Z', 'source': 'groupib-api',
+                     'endpoint': '/api/v2/ioc/common/updated', 'seqUpdate': seqUpdate,
+                     'data': data}) + '\n'
+
+
+def newLines(outputsDir, state):
+  datasets = findDatasets(outputsDir)
+  return [json.loads(line)['data']['id']
+          for _, _, line in iterNewLines(datasets['ioc_common_updated'], outputsDir, state)]
+
+
+class TestFlatten:
+  """평탄화 및 타입 결정 테스트"""
+
+  def testFlattenRecord(self):
+    """envelope는 _ 접두어, 중첩 값은 JSON 문자열"""
+    row = flattenRecord(json.loads(record(7, 'a', tags=['x'], meta={'k': 1}, score=1.5)),
+                        JsonCodec('stdlib'))
+    assert row['_seqUpdate'] == 7
+    assert row['_endpoint'] == '/api/v2/ioc/common/updated'
+    assert row['id'] == 'a'
+    assert json.loads(row['tags']) == ['x']
+    assert json.loads(row['meta']) == {'k': 1}
+    assert row['score'] == 1.5
+
+  def testInferAndCoerce(self):
+    """정수/실수 혼합은 float64, 그 외 혼합은 string, 맞지 않는 값은 null"""
+    codec = JsonCodec('stdlib')
+    assert inferType([1, None, 2]) == 'int64'
+    assert inferType([1, 2.5]) == 'float64'
+    assert inferType([True, False]) == 'bool'
+    assert inferType([1, 'a']) == 'string'
+    assert inferType([2 ** 70]) == 'string'
+    assert inferType([None]) == 'string'
+
+    assert coerceValue(3, 'float64', codec) == (3.0, False)
+    assert coerceValue('x', 'int64', codec) == (None, True)
+    assert coerceValue(5, 'string', codec) == ('5', False)
+
+
+class TestWatermark:
+  """증분 읽기 테스트"""
+
+  def testActiveFileOffsetAndPartialLine(self, tempDir):
+    """활성 파일은 오프셋부터, 쓰는 중인 마지막 줄은 다음 실행에서"""
+    path = os.path.join(tempDir, 'ioc_common_updated.jsonl')
+    with open(path, 'w', encoding='utf-8') as f:
+      f.write(record(1, 'a') + record(2, 'b') + record(3, 'c')[:20])
+
+    state = {}
+    assert newLines(tempDir, state) == ['a', 'b']
+    assert newLines(tempDir, state) == []
+
+    with open(path, 'a', encoding='utf-8') as f:
+      f.write(record(3, 'c')[20:] + record(4, 'd'))
+    assert newLines(tempDir, state) == ['c', 'd']
+
+  def testRotatedSegmentSkipsExportedRecords(self, tempDir):
+    """회전된 세그먼트에서 이미 내보낸 부분은 seqUpdate로 건너뛰고, 세그먼트는 한 번만 처리"""
+    path = os.path.join(tempDir, 'ioc_common_updated.jsonl')
+    with open(path, 'w', encoding='utf-8') as f:
+      f.write(record(1, 'a') + record(2, 'b'))
+
+    state = {}
+    assert newLines(tempDir, state) == ['a', 'b']
+
+    # 회전: 활성 파일 + 추가분이 압축 세그먼트로, 새 활성 파일 시작
+    segmentDir = os.path.join(tempDir, 'segments', 'ioc_common_updated')
+    os.makedirs(segmentDir)
+    with gzip.open(os.path.join(segmentDir, 'ioc_common_updated-20261017T000000-00000.jsonl.gz'),
+                   'wt', encoding='utf-8') as f:
+      f.write(record(1, 'a') + record(2, 'b') + record(3, 'c'))
+    os.remove(path)
+    with open(path, 'w', encoding='utf-8') as f:
+      f.write(record(4, 'd'))
+
+    assert newLines(tempDir, state) == ['c', 'd']
+    assert newLines(tempDir, state) == []
+    assert state['segments'] == ['ioc_common_updated-20261017T000000-00000']
+
+  def testUncommittedTailNotExportedAfterTruncation(self, tempDir):
+    """커밋된 위치까지만 읽고, 잘린 뒤 다시 자란 꼬리는 레코드 경계부터 읽음"""
+    pytest.importorskip('pyarrow')
+    import pyarrow.dataset as ds
+
+    outputsDir = os.path.join(tempDir, 'outputs')
+    exportDir = os.path.join(tempDir, 'parquet')
+    os.makedirs(outputsDir)
+    seqUpdateFile = os.path.join(tempDir, 'seq_update.json')
+    filename = 'ioc_common_updated.jsonl'
+    path = os.path.join(outputsDir, filename)
+    journal = CursorJournal(seqUpdateFile, compactEvery=0, fsync=False)
+
+    def commit(seqUpdate):
+      journal.record('/api/v2/ioc/common/updated', seqUpdate,
+                     {'file': filename, 'segments': 0, 'offset': os.path.getsize(path)})
+
+    with open(path, 'w', encoding='utf-8') as f:
+      f.write(record(1, 'a') + record(2, 'b'))
+    commit(2)
+    # 커서가 기록되지 않은 페이지
+    with open(path, 'a', encoding='utf-8') as f:
+      f.write(record(3, 'uncommitted-with-a-long-id'))
+
+    exporter = ParquetExporter(outputsDir, exportDir, seqUpdateFile=seqUpdateFile)
+    assert exporter.exportAll()['ioc_common_updated']['records'] == 2
+
+    # 재시작 시 커밋된 위치로 잘라낸 뒤 다시 수집한 페이지 추가 (inode 유지)
+    with open(path, 'r+b') as f:
+      f.truncate(journal.positions['/api/v2/ioc/common/updated']['offset'])
+    with open(path, 'a', encoding='utf-8') as f:
+      f.write(record(3, 'c') + record(4, 'd'))
+    commit(4)
+    journal.close()
+
+    assert exporter.exportAll()['ioc_common_updated'] == {'records': 2, 'files': 1,
+                                                          'malformed': 0, 'typeMismatches': 0}
+    table = ds.dataset(exportDir, partitioning='hive').to_table()
+    assert sorted(table.column('id').to_pylist()) == ['a', 'b', 'c', 'd']
+
+
+class TestParquetExporter:
+  """Parquet 파일 기록 테스트"""
+
+  def testRequiresPyarrow(self, tempDir, monkeypatch):
+    """pyarrow가 없으면 RuntimeError"""
+    monkeypatch.setattr(export, 'pa', None)
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    with pytest.raises(RuntimeError):
+      ParquetExporter(tempDir, os.path.join(tempDir, 'parquet'))
+
+  def testIncrementalExport(self, tempDir):
+    """엔드포인트/날짜 파티션으로 기록, 두 번째 실행은 새 레코드만"""
+    pytest.importorskip('pyarrow')
+    import pyarrow.dataset as ds
+
+    outputsDir = os.path.join(tempDir, 'outputs')
+    exportDir = os.path.join(tempDir, 'parquet')
+    os.makedirs(outputsDir)
+    path = os.path.join(outputsDir, 'ioc_common_updated.jsonl')
+    with open(path, 'w', encoding='utf-8') as f:
+      f.write(record(1, 'a', score=1) + record(2, 'b', score=2.5) + 'not json\n')
+
+    exporter = ParquetExporter(outputsDir, exportDir, batchRows=1)
+    report = exporter.exportAll()
+    assert report['ioc_common_updated'] == {'records': 2, 'files': 2, 'malformed': 1,
+                                            'typeMismatches': 1}
+
+    with open(path, 'a', encoding='utf-8') as f:
+      f.write(record(3, 'c', score=3))
+    assert exporter.exportAll()['ioc_common_updated']['records'] == 1
+
+    table = ds.dataset(exportDir, partitioning='hive').to_table()
+    assert sorted(table.column('id').to_pylist()) == ['a', 'b', 'c']
+    assert {str(date) for date in table.column('date').to_pylist()} == {'2026-10-17'}
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
@@ -0,0 +1,184 @@
+"""
+IOC 조회 인덱스 단위 테스트
+
+실행 방법:
+  pytest tests/test_iocindex.py -v
+"""
+
+import os
+import json
+import tempfile
+import pytest
+from unittest.mock import patch
+from src.streaming import StreamingPageParser
+from src.iocindex import (IocIndex, IocIndexWriter, extractIndicators, indicatorHash,
+                          rebuildIndex, RECORD_SIZE)
+from main import parseArgs
+from src import iocindex
+
+
+@pytest.fixture
+def tempDir():
+  """임시 디렉토리 생성"""
+  with tempfile.TemporaryDirectory() as tmpdir:
+    yield tmpdir
+
+
+class TestExtractIndicators:
+  """지표 추출 테스트"""
+
+  def testNestedFieldsAndLists(self):
+    """중첩 객체/리스트의 지표 필드만 추출, 정규화 및 중복 제거"""
+    item = {
+      'id': 'abc',
+      'indicators': [{'params': {'ipv4': [{'ip': '1.2.3.4', 'countryCode': 'RU'}],
+                                 'domain': 'Evil.Example.COM ', 'hashes': {'md5': 'D41D8CD9'}}}],
+      'cnc': {'url': 'http://evil.example.com/gate', 'domain': 'evil.example.com'},
+      'description': '1.2.3.4 was seen'
+    }
+    assert sorted(extractIndicators(item)) == sorted([
+      '1.2.3.4', 'evil.example.com', 'd41d8cd9', 'http://evil.example.com/gate'])
+
+  def testIgnoresNonIndicatorValues(self):
+    assert extractIndicators({'ip': 5, 'title': 'x', 'domain': ''}) == []
+    assert extractIndicators(None) == []
+
+
+class TestIocIndex:
+  """기록/병합/조회 테스트"""
+
+  def testLookupFromDeltaAndAfterCompaction(self, tempDir):
+    """delta만 있는 상태와 병합 후 모두 같은 결과, 엔드포인트별 최대 seqUpdate 유지"""
+    writer = IocIndexWriter(tempDir, compactEvery=1000)
+    writer.add('/ioc/common', 10, [indicatorHash('1.2.3.4'), indicatorHash('a.com')])
+    writer.add('/malware/cnc', 20, [indicatorHash('1.2.3.4')])
+    writer.add('/ioc/common', 5, [indicatorHash('1.2.3.4')])
+
+    index = IocIndex(tempDir)
+    assert index.lookup(' 1.2.3.4 ') == [('/ioc/common', 10), ('/malware/cnc', 20)]
+    assert index.lookup('A.COM') == [('/ioc/common', 10)]
+    assert index.lookup('5.6.7.8') == []
+
+    assert writer.maybeCompact() == 0
+    assert writer.compact() == 3
+    writer.add('/ioc/common', 30, [indicatorHash('a.com'), indicatorHash('b.com')])
+    writer.close()
+
+    index.refresh()
+    assert os.path.getsize(os.path.join(tempDir, 'delta.bin')) == 2 * RECORD_SIZE
+    assert index.lookup('1.2.3.4') == [('/ioc/common', 10), ('/malware/cnc', 20)]
+    assert index.lookupMany(['a.com', 'b.com', 'c.com']) == {
+      'a.com': [('/ioc/common', 30)], 'b.com': [('/ioc/common', 30)], 'c.com': []}
+    index.close()
+
+  def testManyRecordsMergeSorted(self, tempDir):
+    """여러 번 병합한 대량 레코드 조회"""
+    writer = IocIndexWriter(tempDir)
+    values = [f"10.0.{i // 256}.{i % 256}" for i in range(5000)]
+    writer.add('/ioc/common', 1, [indicatorHash(value) for value in values[::2]])
+    writer.compact()
+    writer.add('/ioc/common', 2, [indicatorHash(value) for value in values[1::2]])
+    assert writer.compact() == 5000
+    writer.close()
+
+    index = IocIndex(tempDir)
+    found = index.lookupMany(values)
+    index.close()
+    assert all(found[value] == [('/ioc/common', 1 + i % 2)] for i, value in enumerate(values))
+
+  def testTornDeltaTailIgnored(self, tempDir):
+    """기록 중 중단되어 잘린 delta 레코드는 조회에서 무시하고 기록기가 제거"""
+    writer = IocIndexWriter(tempDir)
+    writer.add('/ioc/common', 7, [indicatorHash('1.2.3.4')])
+    writer.close()
+    deltaFile = os.path.join(tempDir, 'delta.bin')
+    with open(deltaFile, 'ab') as f:
+      f.write(b'\x01' * 10)
+
+    index = IocIndex(tempDir)
+    assert index.lookup('1.2.3.4') == [('/ioc/common', 7)]
+    index.close()
+
+    IocIndexWriter(tempDir).close()
+    assert os.path.getsize(deltaFile) == RECORD_SIZE
+
+  def testRejectsCorruptIndex(self, tempDir):
+    with open(os.path.join(tempDir, 'index.bin'), 'wb') as f:
+      f.write(b'\0' * 4096)
+    with pytest.raises(ValueError):
+      IocIndex(tempDir)
+
+  def testRebuildFromOutputs(self, tempDir):
+    """수집 데이터에서 대상 엔드포인트만 재구축"""
+    outputsDir = os.path.join(tempDir, 'outputs')
+    os.makedirs(outputsDir)
+    with open(os.path.join(outputsDir, 'ioc_common_updated.jsonl'), 'w', encoding='utf-8') as f:
+      f.write(json.dumps({'endpoint': '/api/v2/ioc/common/updated', 'seqUpdate': 3,
+                          'data': {'ip': '1.2.3.4'}}) + '\n')
+      f.write('{broken\n')
+    with open(os.path.join(outputsDir, 'apt_threat_updated.jsonl'), 'w', encoding='utf-8') as f:
+      f.write(json.dumps({'endpoint': '/api/v2/apt/threat/updated', 'seqUpdate': 4,
+                          'data': {'ip': '5.6.7.8'}}) + '\n')
+
+    indexDir = os.path.join(tempDir, 'index')
+    assert rebuildIndex(outputsDir, indexDir) == 1
+    index = IocIndex(indexDir)
+    assert index.lookup('1.2.3.4') == [('/api/v2/ioc/common/updated', 3)]
+    assert index.lookup('5.6.7.8') == []
+    index.close()
+
+  def testCliLookup(self, tempDir, capsys):
+    """main.py ioc 조회 출력과 종료 코드"""
+    writer = IocIndexWriter(tempDir)
+    writer.add('/ioc/common', 9, [indicatorHash('1.2.3.4')])
+    writer.close()
+
+    args = parseArgs(['ioc', '1.2.3.4', 'unknown.com', '--json', '--index-dir', tempDir])
+    assert iocindex.runLookup(args, tempDir, tempDir) == 1
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert lines == [
+      {'value': '1.2.3.4', 'hits': [{'endpoint': '/ioc/common', 'seqUpdate': 9}]},
+      {'value': 'unknown.com', 'hits': []}]
+
+
+class TestCollectorIocIndex:
+  """collector 연동 테스트"""
+
+  ENV = {'IOC_INDEX': 'true', 'IOC_INDEX_COMPACT_EVERY': '1'}
+
+  def testSavePathsRecordIndicators(self, makeCollector, tempDir):
+    """일반/스트리밍 저장 모두 대상 엔드포인트의 지표를 기록, 사이클 끝에서 병합"""
+    collector = makeCollector(tempDir, **self.ENV)
+    seqUpdates = {}
+    # 인덱스 항목은 커서를 기록할 때 반영됨
+    assert collector.saveToJsonl('/api/v2/ioc/common/updated', [{'ip': '1.2.3.4'}], 100)
+    assert collector.commitSeqUpdate('/api/v2/ioc/common/updated', seqUpdates, 100)
+    assert collector.saveToJsonl('/api/v2/apt/threat/updated', [{'ip': '5.6.7.8'}], 100)
+    assert collector.commitSeqUpdate('/api/v2/apt/threat/updated', seqUpdates, 100)
+
+    body = b'{"items": [{"cnc": {"domain": "evil.example.com"}}], "seqUpdate": 200}'
+    parser = StreamingPageParser(iter([body]))
+    assert collector.saveStreamToJsonl('/api/v2/malware/cnc/updated', parser) == (True, 1, 200)
+    assert collector.commitSeqUpdate('/api/v2/malware/cnc/updated', seqUpdates, 200)
+
+    collector.endpoints = [{'endpoint': '/none', 'url': 'http://x/none', 'params': {}}]
+    with patch.object(collector, '_collectSequential', return_value=[]):
+      collector.collectAllEndpoints()
+    collector.close()
+
+    assert os.path.getsize(os.path.join(collector.iocIndexDir, 'delta.bin')) == 0
+    index = IocIndex(collector.iocIndexDir)
+    assert index.lookup('1.2.3.4') == [('/api/v2/ioc/common/updated', 100)]
+    assert index.lookup('evil.example.com') == [('/api/v2/malware/cnc/updated', 200)]
+    assert index.lookup('5.6.7.8') == []
+    index.close()
+
+  def testDisabledByDefault(self, makeCollector, tempDir):
+    collector = makeCollector(tempDir)
+    assert collector.saveToJsonl('/api/v2/ioc/common/updated', [{'ip': '1.2.3.4'}], 100)
+    collector.close()
+    assert not os.path.exists(collector.iocIndexDir)
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
@@ -0,0 +1,233 @@
+"""
+CursorJournal 단위 테스트
+
+실행 방법:
+  pytest tests/test_journal.py -v
+"""
+
+import os
+import json
+import tempfile
+import pytest
+from unittest.mock import Mock
+from src.journal import CursorJournal
+from src.segments import SegmentStore
+
+
+@pytest.fixture
+def tempDir():
+  """임시 디렉토리 생성"""
+  with tempfile.TemporaryDirectory() as tmpdir:
+    yield tmpdir
+
+
+class TestCursorJournal:
+  """seqUpdate 저널 테스트"""
+
+  def testReplayAfterRecords(self, tempDir):
+    """저널 레코드는 재시작 시 스냅샷 위에 재생됨"""
+    snapshotFile = os.path.join(tempDir, 'seq_update.json')
+    with open(snapshotFile, 'w') as f:
+      json.dump({'/a': 1, '/b': 2}, f)
+
+    journal = CursorJournal(snapshotFile, compactEvery=0)
+    journal.load()
+    journal.record('/a', 10)
+    journal.record('/a', 11)
+    journal.record('/c', 30)
+    journal.close()
+
+    state, replayed, skipped = CursorJournal(snapshotFile).load()
+    assert state == {'/a': 11, '/b': 2, '/c': 30}
+    assert (replayed, skipped) == (3, 0)
+
+  def testTornTailIgnored(self, tempDir):
+    """기록 도중 잘린 마지막 줄은 건너뜀"""
+    snapshotFile = os.path.join(tempDir, 'seq_update.json')
+    journal = CursorJournal(snapshotFile)
+    journal.record('/a', 5)
+    journal.close()
+    with open(journal.journalFile, 'a') as f:
+      f.write('{"endpoint": "/a", "seqUp')
+
+    state, replayed, skipped = CursorJournal(snapshotFile).load()
+    assert state == {'/a': 5}
+    assert skipped == 1
+
+  def testAutoCompaction(self, tempDir):
+    """레코드가 compactEvery개 쌓이면 스냅샷으로 압축 후 저널 비움"""
+    snapshotFile = os.path.join(tempDir, 'seq_update.json')
+    journal = CursorJournal(snapshotFile, compactEvery=3)
+
+    assert journal.record('/a', 1) is False
+    assert journal.record('/b', 2) is False
+    assert journal.record('/a', 3) is True
+
+    with open(snapshotFile) as f:
+      assert json.load(f) == {'/a': 3, '/b': 2}
+    assert os.path.getsize(journal.journalFile) == 0
+
+    journal.record('/b', 4)
+    journal.close()
+    state, replayed, _ = CursorJournal(snapshotFile).load()
+    assert state == {'/a': 3, '/b': 4}
+    assert replayed == 1
+
+  def testReplayIsIdempotentAfterInterruptedCompaction(self, tempDir):
+    """스냅샷 교체 후 저널을 비우기 전에 중단되어도 같은 상태로 복원"""
+    snapshotFile = os.path.join(tempDir, 'seq_update.json')
+    journal = CursorJournal(snapshotFile, compactEvery=0)
+    journal.record('/a', 7)
+    journal.close()
+    journalBytes = open(journal.journalFile).read()
+
+    journal.compact()
+    with open(journal.journalFile, 'w') as f:
+      f.write(journalBytes)
+
+    state, _, _ = CursorJournal(snapshotFile).load()
+    assert state == {'/a': 7}
+
+  def testPositionsReplayedAndKeptAcrossCompaction(self, tempDir):
+    """커서와 함께 기록한 출력 위치는 재생되고 압축 후에도 유지됨"""
+    snapshotFile = os.path.join(tempDir, 'seq_update.json')
+    journal = CursorJournal(snapshotFile, compactEvery=0)
+    journal.record('/a', 1, {'segments': 0, 'offset': 10})
+    journal.record('/b', 2)
+    journal.compact()
+    journal.record('/a', 3, {'segments': 1, 'offset': 4})
+    journal.close()
+
+    with open(snapshotFile) as f:
+      assert json.load(f) == {'/a': 1, '/b': 2}
+    reloaded = CursorJournal(snapshotFile)
+    assert reloaded.load()[0] == {'/a': 3, '/b': 2}
+    assert reloaded.positions == {'/a': {'segments': 1, 'offset': 4}}
+
+
+class TestCollectorJournal:
+  """collector의 페이지 단위 체크포인트 테스트"""
+
+  def testCrashMidCycleKeepsFinishedPages(self, makeCollector, tempDir):
+    """saveSeqUpdate 없이 중단되어도 저장된 페이지의 커서는 복원됨"""
+    collector = makeCollector(tempDir, RATE_LIMIT_WAIT='0', DRAIN_MODE='true')
+    collector.fetchApi = Mock(side_effect=[
+      {'seqUpdate': 100, 'items': [{'id': 1}]},
+      {'seqUpdate': 200, 'items': [{'id': 2}]},
+      None
+    ])
+    config = {'url': 'https://test/api/v2/x/updated', 'endpoint': '/api/v2/x/updated',
+              'params': {'limit': '1'}}
+
+    collector.collectSingleEndpoint(config, collector.loadSeqUpdate())
+
+    restarted = makeCollector(tempDir, RATE_LIMIT_WAIT='0', DRAIN_MODE='true')
+    assert restarted.loadSeqUpdate() == {'/api/v2/x/updated': 200}
+
+
+class TestOutputRecovery:
+  """커서와 함께 커밋한 JSONL 위치로 커밋되지 않은 꼬리를 잘라내는 테스트"""
+
+  ENDPOINT = '/api/v2/x/updated'
+  ENV = {'DRAIN_MODE': 'true'}
+
+  def collect(self, collector, pages):
+    collector.fetchApi = Mock(side_effect=pages)
+    config = {'url': f"https://test{self.ENDPOINT}", 'endpoint': self.ENDPOINT,
+              'params': {'limit': '2'}}
+    seqUpdates = collector.loadSeqUpdate()
+    collector.collectSingleEndpoint(config, seqUpdates)
+    return seqUpdates
+
+  def restart(self, collector, makeCollector, tempDir, **env):
+    """재시작 후 사이클 시작과 같은 순서로 커서 로드 및 복구"""
+    collector.close()
+    restarted = makeCollector(tempDir, **env, **self.ENV)
+    restarted.loadSeqUpdate()
+    restarted.recoverOutputs()
+    restarted.close()
+
+  def testTornPageTruncatedOnRestart(self, makeCollector, tempDir):
+    """페이지 추가 후 커서 기록 전에 중단되면 재시작 시 그 페이지를 잘라냄"""
+    collector = makeCollector(tempDir, **self.ENV)
+    self.collect(collector, [{'seqUpdate': 100, 'items': [{'id': 1}, {'id': 2}]},
+                             {'seqUpdate': 100, 'items': []}])
+    path = os.path.join(tempDir, collector.urlToFilename(self.ENDPOINT))
+    committed = open(path, 'rb').read()
+
+    # 다음 페이지 전체와 다음 페이지의 끊긴 줄이 커서 없이 남은 상황
+    with open(path, 'ab') as f:
+      f.write(b'{"seqUpdate": 200, "data": {"id": 3}}\n{"seqUpdate": 200, "da')
+
+    self.restart(collector, makeCollector, tempDir)
+    assert open(path, 'rb').read() == committed
+
+  def testRecordsWithUnchangedCursorAreCommitted(self, makeCollector, tempDir):
+    """seqUpdate가 그대로인 페이지도 기록한 레코드가 있으면 위치를 커밋"""
+    collector = makeCollector(tempDir, **self.ENV)
+    seqUpdates = self.collect(collector, [{'seqUpdate': 100, 'items': [{'id': 1}]},
+                                          {'seqUpdate': 100, 'items': [{'id': 2}]}])
+    assert seqUpdates == {self.ENDPOINT: 100}
+    path = os.path.join(tempDir, collector.urlToFilename(self.ENDPOINT))
+    size = os.path.getsize(path)
+
+    self.restart(collector, makeCollector, tempDir)
+    assert os.path.getsize(path) == size
+    assert len(open(path).readlines()) == 2
+
+  def testActiveFileAfterRotationIsUncommitted(self, makeCollector, tempDir):
+    """커서 기록 후 세그먼트가 회전했다면 새 활성 파일 전체가 커밋되지 않은 내용"""
+    collector = makeCollector(tempDir, **self.ENV)
+    self.collect(collector, [{'seqUpdate': 100, 'items': [{'id': 1}]},
+                             {'seqUpdate': 100, 'items': []}])
+    filename = collector.urlToFilename(self.ENDPOINT)
+    path = os.path.join(tempDir, filename)
+
+    store = SegmentStore(tempDir, maxBytes=1, maxAgeSeconds=0, compression='none')
+    store.roll(filename)
+    with open(path, 'w') as f:
+      f.write('{"seqUpdate": 200, "data": {"id": 2}}\n')
+
+    self.restart(collector, makeCollector, tempDir)
+    assert os.path.getsize(path) == 0
+    assert len(store.loadManifest(filename)['segments']) == 1
+
+  def testFailedSinkPageTruncatedWithDedupIndex(self, makeCollector, tempDir):
+    """다른 출력 대상 실패로 커서가 전진하지 않은 페이지는 중복 제거 인덱스를 써도 잘라내고 다시 기록"""
+    collector = makeCollector(tempDir, DEDUP_INDEX='true', **self.ENV)
+    self.collect(collector, [{'seqUpdate': 100, 'items': [{'id': 1}]},
+                             {'seqUpdate': 100, 'items': []}])
+    path = os.path.join(tempDir, collector.urlToFilename(self.ENDPOINT))
+    committed = open(path, 'rb').read()
+    collector.close()
+
+    # jsonl에는 추가되었지만 Unix 소켓 전송 실패로 커서가 전진하지 않음
+    failing = makeCollector(tempDir, DEDUP_INDEX='true', SINK_LINGER_MS='10',
+                            OUTPUT_SINKS=f"jsonl,unix:{os.path.join(tempDir, 'missing.sock')}", **self.ENV)
+    seqUpdates = self.collect(failing, [{'seqUpdate': 200, 'items': [{'id': 2}]}])
+    assert seqUpdates == {self.ENDPOINT: 100}
+    assert open(path, 'rb').read() != committed
+
+    self.restart(failing, makeCollector, tempDir, DEDUP_INDEX='true', OUTPUT_SINKS='jsonl')
+    assert open(path, 'rb').read() == committed
+
+    retried = makeCollector(tempDir, DEDUP_INDEX='true', OUTPUT_SINKS='jsonl', **self.ENV)
+    self.collect(retried, [{'seqUpdate': 200, 'items': [{'id': 2}]},
+                           {'seqUpdate': 200, 'items': []}])
+    retried.close()
+    assert [json.loads(line)['data']['id'] for line in open(path)] == [1, 2]
+
+  def testFileShorterThanCommittedIsLeftAlone(self, makeCollector, tempDir):
+    collector = makeCollector(tempDir, **self.ENV)
+    self.collect(collector, [{'seqUpdate': 100, 'items': [{'id': 1}, {'id': 2}]},
+                             {'seqUpdate': 100, 'items': []}])
+    path = os.path.join(tempDir, collector.urlToFilename(self.ENDPOINT))
+    with open(path, 'r+b') as f:
+      f.truncate(5)
+
+    self.restart(collector, makeCollector, tempDir)
+    assert os.path.getsize(path) == 5
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
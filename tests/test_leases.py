@@ -0,0 +1,202 @@
+"""
+엔드포인트 리스 및 샤딩 수집 단위 테스트
+
+실행 방법:
+  pytest tests/test_leases.py -v
+"""
+
+import os
+import json
+import tempfile
+import multiprocessing
+import pytest
+from unittest.mock import patch
+from src.leases import LeaseManager, LeaseLostError
+
+
+ENDPOINTS = [f"/api/v2/feed{i}/updated" for i in range(6)]
+
+
+@pytest.fixture
+def tempDir():
+  """임시 디렉토리 생성"""
+  with tempfile.TemporaryDirectory() as tmpdir:
+    yield tmpdir
+
+
+def claimInProcess(leaseDir, workerId, barrier, results):
+  """별도 프로세스에서 리스 분배 (모든 워커 하트비트 후 재분배)"""
+  leases = LeaseManager(leaseDir, workerId, ttl=60)
+  leases.heartbeat()
+  barrier.wait()
+  leases.rebalance(ENDPOINTS)
+  barrier.wait()
+  results[workerId] = leases.rebalance(ENDPOINTS)
+
+
+class TestLeaseManager:
+  """리스 획득/갱신/만료/커서 테스트"""
+
+  def testExclusiveAcquireAndExpiry(self, tempDir):
+    """보유 중인 리스는 다른 워커가 획득할 수 없고, 만료 후에는 token이 증가하며 넘어감"""
+    a = LeaseManager(tempDir, 'a', ttl=10)
+    b = LeaseManager(tempDir, 'b', ttl=10)
+    endpoint = ENDPOINTS[0]
+
+    assert a.tryAcquire(endpoint, now=100)
+    assert not b.tryAcquire(endpoint, now=105)
+    a.commitCursor(endpoint, 42, now=105)
+
+    assert b.tryAcquire(endpoint, now=116)
+    assert b.loadCursors() == {endpoint: 42}
+    assert b.held[endpoint] == a.held[endpoint] + 1
+
+    # 늦게 깨어난 이전 소유자는 커서를 전진시키거나 리스를 갱신할 수 없음
+    with pytest.raises(LeaseLostError):
+      a.commitCursor(endpoint, 99, now=117)
+    assert not a.owns(endpoint)
+    assert not a.renew(endpoint, now=117)
+
+    b.commitCursor(endpoint, 50, now=117)
+    with open(os.path.join(tempDir, 'api_v2_feed0_updated.json'), encoding='utf-8') as f:
+      assert json.load(f)['seqUpdate'] == 50
+
+  def testReleaseAllowsImmediateTakeover(self, tempDir):
+    a = LeaseManager(tempDir, 'a', ttl=60)
+    b = LeaseManager(tempDir, 'b', ttl=60)
+    assert a.tryAcquire(ENDPOINTS[0])
+    a.close()
+    assert b.tryAcquire(ENDPOINTS[0])
+    assert b.activeWorkers() == ['b']
+
+  def testRebalanceFairShare(self, tempDir):
+    """워커가 늘어나면 초과 리스를 반납하고 새 워커가 획득"""
+    a = LeaseManager(tempDir, 'a', ttl=60)
+    assert a.rebalance(ENDPOINTS, now=100) == ENDPOINTS
+
+    b = LeaseManager(tempDir, 'b', ttl=60)
+    b.heartbeat(now=101)
+    ownedA = a.rebalance(ENDPOINTS, now=102)
+    ownedB = b.rebalance(ENDPOINTS, now=103)
+    assert len(ownedA) == 3 and len(ownedB) == 3
+    assert set(ownedA).isdisjoint(ownedB)
+
+    # b가 죽으면 TTL 후 a가 모두 넘겨받음
+    assert a.rebalance(ENDPOINTS, now=200) == ENDPOINTS
+
+  def testMultiProcessClaimsAreDisjoint(self, tempDir):
+    """여러 프로세스가 동시에 분배해도 각 엔드포인트는 정확히 한 워커에 할당"""
+    context = multiprocessing.get_context('spawn')
+    with context.Manager() as manager:
+      results = manager.dict()
+      barrier = manager.Barrier(3)
+      workers = [context.Process(target=claimInProcess, args=(tempDir, f"w{i}", barrier, results))
+                 for i in range(3)]
+      for worker in workers:
+        worker.start()
+      for worker in workers:
+        worker.join(60)
+      claims = dict(results)
+
+    assert sorted(claims) == ['w0', 'w1', 'w2']
+    owned = [endpoint for endpoints in claims.values() for endpoint in endpoints]
+    assert sorted(owned) == sorted(ENDPOINTS)
+    assert all(len(endpoints) == 2 for endpoints in claims.values())
+
+
+class TestCollectorSharding:
+  """collector 연동 테스트"""
+
+  ENV = {'SHARD_MODE': 'true', 'LEASE_TTL_SECONDS': '60'}
+
+  def shardCollector(self, makeCollector, tempDir, workerId, **env):
+    """workerId 워커의 collector (ENDPOINTS 앞의 두 엔드포인트 수집)"""
+    collector = makeCollector(tempDir, SHARD_WORKER_ID=workerId, **self.ENV, **env)
+    collector.endpoints = [{'endpoint': endpoint, 'url': f"https://example.com{endpoint}",
+                            'params': {'limit': '10'}} for endpoint in ENDPOINTS[:2]]
+    return collector
+
+  def testWorkersSplitEndpointsAndCursors(self, makeCollector, tempDir):
+    """두 워커가 엔드포인트를 나누어 수집하고 커서는 리스에 기록, 소유권을 잃으면 중단"""
+    with open(os.path.join(tempDir, 'seq_update.json'), 'w', encoding='utf-8') as f:
+      json.dump({ENDPOINTS[0]: 10, ENDPOINTS[1]: 20}, f)
+
+    first = self.shardCollector(makeCollector, tempDir, 'first')
+    second = self.shardCollector(makeCollector, tempDir, 'second')
+    second.getLeaseManager().heartbeat()
+
+    pages = {ENDPOINTS[0]: ([{'id': 'a'}], 11), ENDPOINTS[1]: ([{'id': 'b'}], 21)}
+    for collector in (first, second):
+      with patch.object(collector, 'fetchApi', side_effect=lambda url, params: {}), \
+           patch.object(collector, 'extractDataAndSeqUpdate',
+                        side_effect=lambda response, endpoint: pages[endpoint]):
+        seqUpdates = collector.collectAllEndpoints()
+        assert collector.saveSeqUpdate(seqUpdates)
+
+    heldFirst = set(first.getLeaseManager().held)
+    heldSecond = set(second.getLeaseManager().held)
+    assert len(heldFirst) == 1 and len(heldSecond) == 1 and heldFirst != heldSecond
+    assert not os.path.exists(first.seqUpdateFile + '.bak')
+
+    cursors = {}
+    for collector in (first, second):
+      cursors.update(collector.getLeaseManager().loadCursors())
+    assert cursors == {ENDPOINTS[0]: 11, ENDPOINTS[1]: 21}
+
+    # second가 first의 리스를 넘겨받은 뒤에는 first가 커서를 전진시키지 못함
+    endpoint = heldFirst.pop()
+    second.getLeaseManager().tryAcquire(endpoint, now=10 ** 12)
+    config = next(ep for ep in first.endpoints if ep['endpoint'] == endpoint)
+    with patch.object(first, 'fetchApi', return_value={}), \
+         patch.object(first, 'extractDataAndSeqUpdate', return_value=([{'id': 'c'}], 99)):
+      success, _ = first.collectSingleEndpoint(config, {endpoint: pages[endpoint][1]})
+    assert not success
+    assert second.getLeaseManager().loadCursors()[endpoint] == pages[endpoint][1]
+
+    first.close()
+    second.close()
+
+  def testCursorWriteFailureStopsEndpoint(self, makeCollector, tempDir):
+    """리스 커서 파일을 쓰지 못하면 커서를 기록하지 못한 것으로 처리"""
+    collector = self.shardCollector(makeCollector, tempDir, 'first')
+    leases = collector.getLeaseManager()
+    with patch.object(leases, 'commitCursor', side_effect=OSError('disk full')):
+      assert not collector.recordSeqUpdate(ENDPOINTS[0], 11)
+    collector.close()
+
+  def testSaveFailsForUnsavedCursors(self, makeCollector, tempDir):
+    """리스 기록 실패나 보유하지 않은 엔드포인트의 바뀐 커서는 저장 실패로 보고"""
+    collector = self.shardCollector(makeCollector, tempDir, 'first')
+    leases = collector.getLeaseManager()
+    leases.heartbeat()
+    assert leases.tryAcquire(ENDPOINTS[0])
+
+    assert collector.saveSeqUpdate({ENDPOINTS[0]: 5})
+    with patch.object(leases, 'commitCursor', side_effect=OSError('disk full')):
+      assert not collector.saveSeqUpdate({ENDPOINTS[0]: 6})
+    # 보유하지 않은 엔드포인트: 저장된 값과 같으면 건너뛰고, 다르면 실패
+    assert collector.saveSeqUpdate({ENDPOINTS[0]: 5, ENDPOINTS[1]: 0})
+    assert not collector.saveSeqUpdate({ENDPOINTS[0]: 5, ENDPOINTS[1]: 9})
+    collector.close()
+
+  def testIocIndexDisabledInShardMode(self, makeCollector, tempDir):
+    """워커들이 같은 IOC 인덱스를 덮어쓰지 않도록 샤딩 모드에서는 IOC_INDEX를 끔"""
+    collector = self.shardCollector(makeCollector, tempDir, 'first', IOC_INDEX='true')
+    assert not collector.isIocIndexed(ENDPOINTS[0])
+    assert collector.getIocIndexWriter() is None
+    assert not os.path.exists(collector.iocIndexDir)
+    collector.close()
+
+  def testSchedulerAndPageSizeStatePerWorker(self, makeCollector, tempDir):
+    """적응형 스케줄/페이지 크기 상태 파일은 워커마다 따로 저장"""
+    first = self.shardCollector(makeCollector, tempDir, 'first')
+    second = self.shardCollector(makeCollector, tempDir, 'second')
+    assert os.path.basename(first.scheduleFile) == 'schedule.first.json'
+    assert os.path.basename(second.pageSizeFile) == 'page_size.second.json'
+    assert first.scheduleFile != second.scheduleFile
+    first.close()
+    second.close()
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
@@ -0,0 +1,143 @@
+"""
+수집기 메트릭 단위 테스트
+
+실행 방법:
+  pytest tests/test_metrics.py -v
+"""
+
+import os
+import json
+import tempfile
+import threading
+import pytest
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from src.collector import GroupIBCollector
+from src.metrics import Counter, Histogram, CollectorMetrics, MetricsServer
+
+
+@pytest.fixture
+def tempDir():
+  """임시 디렉토리 생성"""
+  with tempfile.TemporaryDirectory() as tmpdir:
+    yield tmpdir
+
+
+class TestMetricTypes:
+  """메트릭 타입 및 텍스트 형식 테스트"""
+
+  def testCounterRendering(self):
+    """레이블 값 이스케이프 및 정렬"""
+    counter = Counter('test_total', '테스트', ('endpoint',))
+    counter.inc('/b')
+    counter.inc('/a"x', amount=2)
+
+    assert counter.render() == [
+      '# HELP test_total 테스트',
+      '# TYPE test_total counter',
+      'test_total{endpoint="/a\\"x"} 2',
+      'test_total{endpoint="/b"} 1'
+    ]
+
+  def testHistogramBucketsAreCumulative(self):
+    """버킷은 누적, +Inf는 전체 개수"""
+    histogram = Histogram('test_seconds', '테스트', ('endpoint',), buckets=(1, 5))
+    for value in (0.5, 3, 3, 10):
+      histogram.observe('/a', value=value)
+
+    lines = histogram.render()
+    assert 'test_seconds_bucket{endpoint="/a",le="1"} 1' in lines
+    assert 'test_seconds_bucket{endpoint="/a",le="5"} 3' in lines
+    assert 'test_seconds_bucket{endpoint="/a",le="+Inf"} 4' in lines
+    assert 'test_seconds_sum{endpoint="/a"} 16.5' in lines
+    assert 'test_seconds_count{endpoint="/a"} 4' in lines
+
+  def testLabelCountChecked(self):
+    """레이블 개수가 맞지 않으면 ValueError"""
+    with pytest.raises(ValueError):
+      Counter('test_total', '테스트', ('endpoint',)).inc()
+
+  def testMetricsServer(self):
+    """/metrics에서 텍스트 형식으로 노출, 경과 시간 게이지는 조회 시점에 계산"""
+    metrics = CollectorMetrics()
+    metrics.lastSuccess.set('/api/v2/a/updated', value=0)
+    server = MetricsServer(metrics, port=0)
+    server.start()
+    try:
+      response = requests.get(f"http://127.0.0.1:{server.port}/metrics")
+    finally:
+      server.close()
+
+    assert response.status_code == 200
+    assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+    assert '# TYPE groupib_cycle_duration_seconds histogram' in response.text
+    assert metrics.sinceLastSuccess.get('/api/v2/a/updated') > 1e9
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+  """첫 요청은 503, 이후 페이지 반환"""
+
+  protocol_version = 'HTTP/1.1'
+  calls = 0
+
+  def do_GET(self):
+    type(self).calls += 1
+    if type(self).calls == 1:
+      body, status = b'{}', 503
+    else:
+      body, status = json.dumps({'items': [{'id': 'a'}, {'id': 'b'}], 'seqUpdate': 42}).encode(), 200
+    self.send_response(status)
+    self.send_header('Content-Length', str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+  def log_message(self, *args):
+    pass
+
+
+class TestCollectorMetrics:
+  """collector 계측 테스트"""
+
+  def testCollectSingleEndpointRecordsMetrics(self, monkeypatch, tempDir):
+    """요청/재시도/페이지/기록/커서/성공 시각 메트릭 기록"""
+    monkeypatch.setenv('GROUPIB_USERNAME', 'test@example.com')
+    monkeypatch.setenv('GROUPIB_API_KEY', 'test_api_key_12345')
+    monkeypatch.setenv('RATE_LIMIT_WAIT', '0')
+
+    _FlakyHandler.calls = 0
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _FlakyHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    with patch.object(GroupIBCollector, '_setupLogger'):
+      collector = GroupIBCollector()
+    collector.outputsDir = tempDir
+    collector.seqUpdateFile = os.path.join(tempDir, 'seq_update.json')
+
+    endpoint = '/api/v2/ioc/common/updated'
+    config = {'url': f"http://127.0.0.1:{httpd.server_address[1]}{endpoint}",
+              'endpoint': endpoint, 'params': {'limit': '2'}}
+    try:
+      with patch.object(collector.stopEvent, 'wait'):
+        assert collector.collectSingleEndpoint(config, {}) == (True, 2)
+    finally:
+      httpd.shutdown()
+      httpd.server_close()
+      collector.close()
+
+    metrics = collector.metrics
+    assert metrics.requests.get(endpoint, '503') == 1
+    assert metrics.requests.get(endpoint, '200') == 1
+    assert metrics.retries.get(endpoint, '5xx') == 1
+    assert metrics.requestDuration.count(endpoint) == 2
+    assert metrics.pageItems.count(endpoint) == 1
+    assert metrics.pageBytes.count(endpoint) == 1
+    assert metrics.recordsWritten.get(endpoint) == 2
+    assert metrics.seqUpdate.get(endpoint) == 42
+    assert metrics.endpointCollections.get(endpoint, 'success') == 1
+    assert metrics.lastSuccess.get(endpoint) > 0
+    assert 'groupib_records_written_total{endpoint="/api/v2/ioc/common/updated"} 2' in metrics.render()
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
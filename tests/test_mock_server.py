@@ -0,0 +1,118 @@
+"""
+벤치마크용 모의 Group-IB 서버 단위 테스트
+
+실행 방법:
+  pytest tests/test_mock_server.py -v
+"""
+
+import os
+import sys
+import json
+import tempfile
+import pytest
+import requests
+from unittest.mock import patch
+from src.collector import GroupIBCollector
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from mock_server import MockGroupIBServer, MockEndpoint, defaultEndpoints, SEQ_BASE
+
+
+@pytest.fixture
+def tempDir():
+  """임시 디렉토리 생성"""
+  with tempfile.TemporaryDirectory() as tmpdir:
+    yield tmpdir
+
+
+@pytest.fixture
+def server():
+  """합성 엔드포인트 3개(items/data/results), 엔드포인트별 항목 25개"""
+  mock = MockGroupIBServer(defaultEndpoints(3, 25, pdfRatio=0.2), pdfBytes=1000)
+  mock.start()
+  yield mock
+  mock.stop()
+
+
+class TestMockServer:
+  """모의 서버 계약 테스트"""
+
+  def testSeqUpdatePaging(self, server):
+    """seqUpdate 이후 limit개씩, 마지막 페이지 뒤에는 빈 페이지"""
+    url = server.baseUrl + '/api/v2/bench/feed1/updated'
+    first = requests.get(url, params={'limit': 10}).json()
+    assert len(first['data']) == 10
+    assert first['seqUpdate'] == SEQ_BASE + 10
+
+    last = requests.get(url, params={'limit': 10, 'seqUpdate': SEQ_BASE + 20}).json()
+    assert len(last['data']) == 5
+    empty = requests.get(url, params={'limit': 10, 'seqUpdate': last['seqUpdate']}).json()
+    assert empty['data'] == [] and empty['seqUpdate'] == last['seqUpdate']
+
+  def testPdfRangeRequests(self, server):
+    """PDF 전체/구간 요청"""
+    page = requests.get(server.baseUrl + '/api/v2/bench/feed0/updated', params={'limit': 25}).json()
+    links = [item['file']['portalLink'] for item in page['items'] if 'file' in item]
+    assert links
+
+    full = requests.get(links[0])
+    assert full.content.startswith(b'%PDF') and len(full.content) == 1000
+    partial = requests.get(links[0], headers={'Range': 'bytes=600-'})
+    assert partial.status_code == 206 and partial.content == full.content[600:]
+
+  def testErrorInjectionIsSeeded(self):
+    """같은 시드면 같은 오류 순서"""
+    statuses = []
+    for _ in range(2):
+      mock = MockGroupIBServer([MockEndpoint('/api/v2/a/updated', 5)], error429Rate=0.3,
+                               error5xxRate=0.3, seed=7)
+      mock.start()
+      statuses.append([requests.get(mock.baseUrl + '/api/v2/a/updated').status_code
+                       for _ in range(20)])
+      mock.stop()
+    assert statuses[0] == statuses[1]
+    assert {200, 429, 503} == set(statuses[0])
+
+  def testCollectorDrainsBacklog(self, server, monkeypatch, tempDir):
+    """drain 모드 수집기가 세 가지 응답 형태의 백로그를 모두 수집"""
+    monkeypatch.setenv('GROUPIB_USERNAME', 'test@example.com')
+    monkeypatch.setenv('GROUPIB_API_KEY', 'test_api_key_12345')
+    monkeypatch.setenv('RATE_LIMIT_WAIT', '0')
+    monkeypatch.setenv('DRAIN_MODE', 'true')
+    with patch.object(GroupIBCollector, '_setupLogger'):
+      collector = GroupIBCollector()
+    collector.outputsDir = tempDir
+    collector.pdfsDir = tempDir
+    collector.seqUpdateFile = os.path.join(tempDir, 'seq_update.json')
+
+    for path in sorted(server.endpoints):
+      config = {'url': server.baseUrl + path, 'endpoint': path, 'params': {'limit': '10'},
+                'maxPages': None, 'maxSeconds': None}
+      assert collector.collectSingleEndpoint(config, {}) == (True, 25)
+    collector.close()
+
+  def testRecordAndReplay(self, server, tempDir):
+    """녹화한 응답을 upstream 없이 그대로 재생 (본문의 upstream URL은 재생 서버 주소로 교체)"""
+    cassetteDir = os.path.join(tempDir, 'cassette')
+    recorder = MockGroupIBServer([], recordDir=cassetteDir, upstream=server.baseUrl)
+    recorder.start()
+    recorded = requests.get(recorder.baseUrl + '/api/v2/bench/feed0/updated',
+                            params={'limit': 25}).json()
+    recorder.stop()
+    server.stop()
+
+    player = MockGroupIBServer([], replayDir=cassetteDir)
+    player.start()
+    # 쿼리 파라미터 순서와 무관하게 같은 응답
+    replayed = requests.get(player.baseUrl + '/api/v2/bench/feed0/updated?limit=25').json()
+    missing = requests.get(player.baseUrl + '/api/v2/bench/feed0/updated?limit=5')
+    player.stop()
+
+    assert replayed['items'][0]['id'] == recorded['items'][0]['id']
+    assert json.dumps(replayed).count(player.baseUrl) == json.dumps(recorded).count(recorder.baseUrl)
+    assert missing.status_code == 404
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
@@ -0,0 +1,147 @@
+"""
+PageSizeTuner 및 페이지 크기 자동 조정 단위 테스트
+
+실행 방법:
+  pytest tests/test_pagesize.py -v
+"""
+
+import os
+import json
+import tempfile
+import threading
+import pytest
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+from urllib.parse import urlparse, parse_qs
+from src.pagesize import PageSizeTuner
+
+
+@pytest.fixture
+def tempDir():
+  """임시 디렉토리 생성"""
+  with tempfile.TemporaryDirectory() as tmpdir:
+    yield tmpdir
+
+
+class TestPageSizeTuner:
+  """limit 계산 테스트"""
+
+  def makeTuner(self, tempDir, **kwargs):
+    options = dict(targetSeconds=2.0, targetBytes=100000, minLimit=10, maxLimit=1000)
+    options.update(kwargs)
+    return PageSizeTuner(os.path.join(tempDir, 'page_size.json'), **options)
+
+  def testGrowsTowardTargetAtMostDouble(self):
+    """빠르고 작은 가득 찬 페이지는 최대 두 배까지 증가"""
+    tuner = self.makeTuner(tempfile.gettempdir())
+    assert tuner.getLimit('/a', 100) == 100
+    assert tuner.update('/a', 100, 100, 0.1, 1000) == 200
+    # 목표에 가까우면 목표값으로 (0.5초 → 2초 목표면 400)
+    assert tuner.update('/a', 200, 200, 1.0, 2000) == 400
+
+  def testShrinksOnSlowOrLargePages(self):
+    """응답 시간이나 바이트 예산을 넘으면 절반까지 감소"""
+    tuner = self.makeTuner(tempfile.gettempdir())
+    tuner.getLimit('/a', 400)
+    assert tuner.update('/a', 400, 400, 2.5, 1000) == 320
+    assert tuner.update('/a', 320, 320, 0.1, 1000000) == 160
+
+  def testPartialPageDoesNotGrowAndBoundsApply(self):
+    """가득 차지 않은 페이지는 늘리지 않고, 엔드포인트별 범위 적용"""
+    tuner = self.makeTuner(tempfile.gettempdir())
+    assert tuner.getLimit('/a', 5000, minLimit=50, maxLimit=300) == 300
+    assert tuner.update('/a', 300, 20, 0.01, 100) == 300
+    assert tuner.update('/a', 300, 20, 10.0, 100) == 150
+    assert tuner.recordTimeout('/a', 60) == 50
+    assert tuner.update('/a', 50, 0, 30.0, 0) == 50
+
+  def testPersistence(self, tempDir):
+    """학습한 값은 변경이 있을 때만 저장되고 재시작 후 유지"""
+    tuner = self.makeTuner(tempDir)
+    assert tuner.save() is False
+    tuner.getLimit('/a', 100)
+    tuner.update('/a', 100, 100, 0.1, 1000)
+    assert tuner.save() is True
+
+    restored = self.makeTuner(tempDir)
+    restored.load()
+    assert restored.getLimit('/a', 100) == 200
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+  """요청한 limit만큼 항목을 반환 (압축 없음)"""
+
+  protocol_version = 'HTTP/1.1'
+  limits = []
+
+  def do_GET(self):
+    limit = int(parse_qs(urlparse(self.path).query)['limit'][0])
+    type(self).limits.append(limit)
+    items = [{'id': str(n), 'pad': 'x' * 80} for n in range(limit)]
+    body = json.dumps({'items': items, 'seqUpdate': 1}).encode()
+    self.send_response(200)
+    self.send_header('Content-Length', str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+  def log_message(self, *args):
+    pass
+
+
+class TestCollectorPageSize:
+  """collector 연동 테스트"""
+
+  ENV = {'RATE_LIMIT_WAIT': '0', 'PAGE_SIZE_AUTOTUNE': 'true', 'PAGE_SIZE_TARGET_BYTES': '5000',
+         'PAGE_SIZE_MIN': '5'}
+
+  def testLearnedLimitAppliedAndSaved(self, makeCollector, tempDir):
+    """바이트 예산을 넘는 페이지 후 다음 요청의 limit 축소, seqUpdate와 함께 저장"""
+    collector = makeCollector(tempDir, **self.ENV)
+    _PageHandler.limits = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _PageHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    endpoint = '/api/v2/ioc/common/updated'
+    config = {'url': f"http://127.0.0.1:{httpd.server_address[1]}{endpoint}",
+              'endpoint': endpoint, 'params': {'limit': '200'}}
+    try:
+      seqUpdates = {}
+      collector.collectSingleEndpoint(config, seqUpdates)
+      collector.collectSingleEndpoint(config, seqUpdates)
+      collector.saveSeqUpdate(seqUpdates)
+    finally:
+      httpd.shutdown()
+      httpd.server_close()
+      collector.close()
+
+    assert _PageHandler.limits == [200, 100]
+    with open(collector.pageSizeFile, 'r', encoding='utf-8') as f:
+      assert json.load(f) == {endpoint: 50}
+
+  def testTimeoutRetriesWithSmallerPage(self, makeCollector, tempDir):
+    """타임아웃 재시도는 절반 크기의 페이지로 요청"""
+    collector = makeCollector(tempDir, **self.ENV)
+    ok = Mock(status_code=200, headers={}, content=b'{"items": [], "seqUpdate": 1}')
+    ok.timing = {'bytes': 30, 'connect': 0, 'ttfb': 0, 'transfer': 0, 'total': 0.01, 'reused': True}
+    ok.url = 'https://tap.group-ib.com/api/v2/ioc/common/updated'
+    sentLimits = []
+
+    def fakeGet(url, params=None, **kwargs):
+      sentLimits.append(params['limit'])
+      if len(sentLimits) == 1:
+        raise requests.exceptions.Timeout()
+      return ok
+
+    config = {'url': ok.url, 'endpoint': '/api/v2/ioc/common/updated', 'params': {'limit': '400'}}
+    with patch.object(collector.transport, 'get', side_effect=fakeGet), \
+         patch.object(collector.stopEvent, 'wait'):
+      assert collector.collectSingleEndpoint(config, {}) == (True, 0)
+    collector.close()
+
+    assert sentLimits == ['400', '200']
+    assert config['params'] == {'limit': '400'}
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
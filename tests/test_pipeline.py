@@ -0,0 +1,126 @@
+"""
+페이지 파이프라인 단위 테스트
+
+실행 방법:
+  pytest tests/test_pipeline.py -v
+"""
+
+import os
+import json
+import tempfile
+import pytest
+from unittest.mock import Mock, patch
+from src.pipeline import decodePage
+from src.streaming import splitResponse
+
+
+@pytest.fixture
+def tempDir():
+  """임시 디렉토리 생성"""
+  with tempfile.TemporaryDirectory() as tmpdir:
+    yield tmpdir
+
+
+def makeResponse(items, seqUpdate):
+  response = Mock(status_code=200, headers={})
+  response.content = json.dumps({'items': items, 'seqUpdate': seqUpdate}).encode('utf-8')
+  return response
+
+
+class TestDecodePage:
+  """디코딩 단계 테스트"""
+
+  def testSplitResponse(self):
+    assert splitResponse({'data': {'id': 1}, 'seqUpdate': 5}) == ([{'id': 1}], 5, 'data')
+    assert splitResponse({'seqUpdate': 5}) == ([], 5, None)
+
+  def testDecodePage(self):
+    """항목 직렬화, envelope 접두어, 중복 판별 키, 지표, PDF 링크"""
+    content = json.dumps({'items': [
+      {'id': 'a', 'ip': '1.2.3.4'},
+      {'id': 'b', 'file': {'portalLink': 'https://portal/b.pdf'}}
+    ], 'seqUpdate': 77}).encode('utf-8')
+    page = decodePage(content, '/api/v2/ioc/common/updated', 'stdlib', '2025-01-01T00:00:00.000Z',
+                      withRecordKeys=True, withIndicators=True)
+
+    assert page['seqUpdate'] == 77 and page['itemCount'] == 2 and page['errors'] == []
+    record = json.loads(page['prefix'] + page['payloads'][0] + '}')
+    assert record == {'timestamp': '2025-01-01T00:00:00.000Z', 'source': 'groupib-api',
+                      'endpoint': '/api/v2/ioc/common/updated', 'seqUpdate': 77,
+                      'data': {'id': 'a', 'ip': '1.2.3.4'}}
+    assert [key[0] for key in page['recordKeys']] == ['a', 'b']
+    assert len(page['digests']) == 1
+    assert page['pdfLinks'] == [('https://portal/b.pdf', 'b')]
+
+  def testInvalidJson(self):
+    with pytest.raises(ValueError):
+      decodePage(b'{broken', '/x', 'stdlib', '')
+
+
+class TestCollectorPipeline:
+  """collector 연동 테스트 (프로세스 풀 사용)"""
+
+  ENDPOINT = '/api/v2/ioc/common/updated'
+
+  ENV = {'RATE_LIMIT_WAIT': '0', 'PIPELINE': 'true', 'PIPELINE_WORKERS': '2', 'PIPELINE_QUEUE_SIZE': '1',
+         'DRAIN_MODE': 'true', 'PDF_WORKERS': '0'}
+
+  def pages(self):
+    return [makeResponse([{'id': f"{page}-{i}"} for i in range(3)], 100 + page)
+            for page in range(3)] + [makeResponse([], 102)]
+
+  def testPagesWrittenAndCommittedInOrder(self, makeCollector, tempDir):
+    """드레인한 페이지가 순서대로 기록되고 커서가 마지막 페이지까지 전진"""
+    collector = makeCollector(tempDir, **self.ENV)
+    config = {'url': f"https://example.com{self.ENDPOINT}", 'endpoint': self.ENDPOINT,
+              'params': {'limit': '3'}}
+    seqUpdates = {}
+    committed = []
+    recordSeqUpdate = collector.recordSeqUpdate
+
+    def recordInOrder(endpoint, seqUpdate, position=None):
+      committed.append(seqUpdate)
+      return recordSeqUpdate(endpoint, seqUpdate, position)
+
+    try:
+      with patch.object(collector, 'requestApi', side_effect=self.pages()), \
+           patch.object(collector, 'recordSeqUpdate', side_effect=recordInOrder):
+        assert collector.collectSingleEndpoint(config, seqUpdates) == (True, 9)
+    finally:
+      collector.close()
+
+    assert seqUpdates == {self.ENDPOINT: 102}
+    assert committed == [100, 101, 102]
+    with open(os.path.join(tempDir, collector.urlToFilename(self.ENDPOINT)), encoding='utf-8') as f:
+      records = [json.loads(line) for line in f]
+    assert [record['data']['id'] for record in records] == [f"{p}-{i}" for p in range(3) for i in range(3)]
+    assert [record['seqUpdate'] for record in records] == [100] * 3 + [101] * 3 + [102] * 3
+
+  def testWriteFailureStopsCursor(self, makeCollector, tempDir):
+    """기록에 실패한 페이지 이후로는 커서를 전진시키지 않음"""
+    collector = makeCollector(tempDir, **self.ENV)
+    config = {'url': f"https://example.com{self.ENDPOINT}", 'endpoint': self.ENDPOINT,
+              'params': {'limit': '3'}}
+    seqUpdates = {self.ENDPOINT: 99}
+    writePayloads = collector.writePayloads
+
+    def failSecondPage(endpoint, seqUpdate, *args, **kwargs):
+      if seqUpdate == 101:
+        return False
+      return writePayloads(endpoint, seqUpdate, *args, **kwargs)
+
+    try:
+      with patch.object(collector, 'requestApi', side_effect=self.pages()), \
+           patch.object(collector, 'writePayloads', side_effect=failSecondPage):
+        success, _ = collector.collectSingleEndpoint(config, seqUpdates)
+    finally:
+      collector.close()
+
+    assert not success
+    assert seqUpdates == {self.ENDPOINT: 100}
+    with open(os.path.join(tempDir, collector.urlToFilename(self.ENDPOINT)), encoding='utf-8') as f:
+      assert {json.loads(line)['seqUpdate'] for line in f} == {100}
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
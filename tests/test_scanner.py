@@ -0,0 +1,116 @@
+"""
+중복/무결성 검사기 단위 테스트
+
+실행 방법:
+  pytest tests/test_scanner.py -v
+"""
+
+import os
+import gzip
+import json
+import tempfile
+import pytest
+from src import scanner
+
+
+@pytest.fixture
+def tempDir():
+  """임시 디렉토리 생성"""
+  with tempfile.TemporaryDirectory() as tmpdir:
+    yield tmpdir
+
+
+def record(seqUpdate, data):
+  return json.dumps({'timestamp': 't', 'source': 'groupib-api', 'endpoint': '/e',
+                     'seqUpdate': seqUpdate, 'data': data}) + '\n'
+
+
+@pytest.fixture
+def outputsDir(tempDir):
+  """중복 3건, 손상된 줄 2건이 있는 출력 디렉토리 (회전된 gzip 세그먼트 포함)"""
+  outputs = os.path.join(tempDir, 'outputs')
+  segmentDir = os.path.join(outputs, 'segments', 'ioc_common_updated')
+  os.makedirs(segmentDir)
+
+  with gzip.open(os.path.join(segmentDir, 'ioc_common_updated-1-00001.jsonl.gz'), 'wt') as f:
+    for n in range(100):
+      f.write(record(1, {'id': f"ioc-{n}"}))
+
+  with open(os.path.join(outputs, 'ioc_common_updated.jsonl'), 'w') as f:
+    for n in range(98, 200):
+      f.write(record(2, {'id': f"ioc-{n}"}))
+    f.write(record(2, {'hash': 'ioc-150'}))
+    f.write('{"broken": \n')
+    f.write(record(3, {'id': 'torn'})[:-5])
+
+  with open(os.path.join(outputs, 'apt_threat_updated.jsonl'), 'w') as f:
+    for n in range(50):
+      f.write(record(7, {'id': n + 1, 'value': 'x' * 50}))
+    f.write(record(7, {'no': 'id'}))
+
+  return outputs
+
+
+class TestScanner:
+  """검사 결과 테스트"""
+
+  @pytest.mark.parametrize('workers', [1, 2])
+  def testReportsDuplicatesAndMalformedLines(self, outputsDir, workers):
+    """구간/샤드 분할과 관계없이 같은 결과"""
+    report = scanner.scanOutputs(outputsDir, workers=workers, rangeBytes=1000,
+                                 shardInputBytes=2000)
+
+    ioc = report['ioc_common_updated']
+    assert ioc['files'] == 2
+    assert ioc['records'] == 203
+    assert ioc['unique'] == 200
+    assert ioc['duplicates'] == 3
+    assert ioc['malformed'] == 2
+    assert ioc['seqUpdates'] == {1: 100, 2: 103}
+    assert any('@' in sample for sample in ioc['malformedSamples'])
+
+    apt = report['apt_threat_updated']
+    assert (apt['records'], apt['withId'], apt['duplicates'], apt['malformed']) == (51, 50, 0, 0)
+
+  def testRangesCoverEveryLineOnce(self, tempDir):
+    """구간 경계에 걸친 줄도 한 번씩만 처리"""
+    with open(os.path.join(tempDir, 'a.jsonl'), 'w') as f:
+      for n in range(500):
+        f.write(record(n, {'id': n + 1}))
+
+    for rangeBytes in (1, 97, 4096, 10 ** 9):
+      report = scanner.scanOutputs(tempDir, workers=1, rangeBytes=rangeBytes)
+      assert report['a']['records'] == 500
+      assert report['a']['unique'] == 500
+
+  def testRunScanExitCodes(self, outputsDir, tempDir, capsys):
+    """문제가 있으면 1, 없으면 0, 검사 실패 시 2"""
+    parser = scanner.argparse.ArgumentParser()
+    scanner.addArguments(parser)
+
+    assert scanner.runScan(parser.parse_args(['--workers', '1']), outputsDir) == 1
+    assert '손상된 줄: 2개' in capsys.readouterr().out
+
+    cleanDir = os.path.join(tempDir, 'clean')
+    os.makedirs(cleanDir)
+    with open(os.path.join(cleanDir, 'a.jsonl'), 'w') as f:
+      f.write(record(1, {'id': 1}))
+    assert scanner.runScan(parser.parse_args(['--workers', '1', '--json']), cleanDir) == 0
+    assert json.loads(capsys.readouterr().out)['a']['unique'] == 1
+
+    assert scanner.runScan(parser.parse_args([]), os.path.join(tempDir, 'missing')) == 2
+
+  def testDuplicateRatioThreshold(self, outputsDir):
+    """허용 비율 이하의 중복은 통과 (손상된 줄은 항상 실패)"""
+    report = scanner.scanOutputs(outputsDir, workers=1)
+    del report['ioc_common_updated']
+    assert not scanner.hasProblems(report)
+
+    report = scanner.scanOutputs(outputsDir, workers=1)
+    report['ioc_common_updated']['malformed'] = 0
+    assert scanner.hasProblems(report, maxDuplicateRatio=0.01)
+    assert not scanner.hasProblems(report, maxDuplicateRatio=0.05)
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
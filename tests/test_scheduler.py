@@ -0,0 +1,150 @@
+"""
+PollScheduler 및 적응형 수집 스케줄 단위 테스트
+
+실행 방법:
+  pytest tests/test_scheduler.py -v
+"""
+
+import os
+import tempfile
+import pytest
+from unittest.mock import patch
+from src.collector import GroupIBCollector
+from src.scheduler import PollScheduler, DeadlineTicker
+
+
+@pytest.fixture
+def tempDir():
+  """임시 디렉토리 생성"""
+  with tempfile.TemporaryDirectory() as tmpdir:
+    yield tmpdir
+
+
+def endpoint(path, minMinutes=None, maxMinutes=None):
+  return {'url': f"https://test.group-ib.com{path}", 'endpoint': path, 'params': {},
+          'minMinutes': minMinutes, 'maxMinutes': maxMinutes}
+
+
+class TestPollScheduler:
+  """스케줄 계산 테스트"""
+
+  def makeScheduler(self, tempDir, **kwargs):
+    options = dict(defaultInterval=1800, minInterval=60, maxInterval=3600,
+                   targetItems=100, alpha=0.5)
+    options.update(kwargs)
+    return PollScheduler(os.path.join(tempDir, 'schedule.json'), **options)
+
+  def testHotAndColdFeedsDiverge(self, tempDir):
+    """유입이 많은 피드는 짧게, 없는 피드는 최대 간격으로"""
+    scheduler = self.makeScheduler(tempDir)
+    hot, cold = endpoint('/hot'), endpoint('/cold')
+
+    # 첫 수집은 유입량 추정 없이 기본 간격
+    assert scheduler.update(hot, True, 5000, now=0) == 1800
+    assert scheduler.update(cold, True, 0, now=0) == 1800
+
+    # 1800초 동안 900건 → 0.5건/초 → 100건까지 200초
+    assert scheduler.update(hot, True, 900, now=1800) == pytest.approx(200)
+    assert scheduler.update(cold, True, 0, now=1800) == 3600
+
+  def testEwmaSmoothsBursts(self, tempDir):
+    """한 번의 급증은 EWMA로 완화"""
+    scheduler = self.makeScheduler(tempDir)
+    feed = endpoint('/feed')
+    scheduler.update(feed, True, 0, now=0)
+    scheduler.update(feed, True, 100, now=1000)    # 0.1건/초
+    interval = scheduler.update(feed, True, 1000, now=2000)  # 관측 1건/초, EWMA 0.55건/초
+    assert interval == pytest.approx(100 / 0.55)
+
+  def testPerEndpointBoundsAndFailure(self, tempDir):
+    """list.csv 최소/최대 간격 적용, 실패 시 최소 간격 뒤 재시도 (추정값 유지)"""
+    scheduler = self.makeScheduler(tempDir)
+    feed = endpoint('/feed', minMinutes=10, maxMinutes=20)
+    scheduler.update(feed, True, 0, now=0)
+    assert scheduler.update(feed, True, 0, now=100) == 1200
+    assert scheduler.update(feed, True, 100000, now=200) == 600
+
+    rate = scheduler.state['/feed']['rate']
+    assert scheduler.update(feed, False, 0, now=300) == 600
+    assert scheduler.state['/feed']['rate'] == rate
+
+  def testDueEndpointsOrderedAndPersisted(self, tempDir):
+    """수집 시각이 된 엔드포인트만 이른 순서로 반환, 상태는 재시작 후 유지"""
+    scheduler = self.makeScheduler(tempDir)
+    a, b, c = endpoint('/a'), endpoint('/b'), endpoint('/c')
+    scheduler.update(a, False, 0, now=50)    # 110에 수집
+    scheduler.update(b, False, 0, now=0)     # 60에 수집
+
+    assert [ep['endpoint'] for ep in scheduler.dueEndpoints([a, b, c], now=120)] == ['/c', '/b', '/a']
+    assert [ep['endpoint'] for ep in scheduler.dueEndpoints([a, b, c], now=70)] == ['/c', '/b']
+    scheduler.save()
+
+    restored = self.makeScheduler(tempDir)
+    restored.load()
+    assert restored.nextDue('/a') == 110
+    assert restored.secondsUntilNextDue([a, b], now=100) == 0
+    assert restored.secondsUntilNextDue([a], now=100) == 10
+
+
+class TestCollectorSchedule:
+  """collector 연동 테스트"""
+
+  def testCollectDueSubset(self, monkeypatch, tempDir):
+    """선택한 엔드포인트만 수집하고 다음 수집 시각 저장, 다른 엔드포인트의 실패 기록은 유지"""
+    monkeypatch.setenv('GROUPIB_USERNAME', 'test@example.com')
+    monkeypatch.setenv('GROUPIB_API_KEY', 'test_api_key_12345')
+    monkeypatch.setenv('ADAPTIVE_SCHEDULE', 'true')
+
+    with patch.object(GroupIBCollector, '_setupLogger'):
+      collector = GroupIBCollector()
+    collector.outputsDir = tempDir
+    collector.seqUpdateFile = os.path.join(tempDir, 'seq_update.json')
+    collector.scheduleFile = os.path.join(tempDir, 'schedule.json')
+
+    a, b = endpoint('/api/v2/a/updated'), endpoint('/api/v2/b/updated')
+    collector.endpoints = [a, b]
+    collector.failedEndpoints = [b]
+
+    with patch.object(collector, 'collectSingleEndpoint', return_value=(True, 3)) as mockCollect:
+      collector.collectAllEndpoints([a])
+    collector.close()
+
+    assert [call[0][0]['endpoint'] for call in mockCollect.call_args_list] == ['/api/v2/a/updated']
+    assert collector.failedEndpoints == [b]
+    assert os.path.exists(collector.scheduleFile)
+    assert collector.getScheduler().nextDue('/api/v2/a/updated') > 0
+    assert collector.getScheduler().nextDue('/api/v2/b/updated') == 0
+
+
+
+class TestDeadlineTicker:
+  """고정 주기 마감 시각 테스트"""
+
+  def testNoDriftWhenCycleTakesTime(self):
+    """사이클 소요 시간과 관계없이 시작 시각 + k × 주기에 맞춤"""
+    ticker = DeadlineTicker(1800, start=0)
+    assert ticker.next(now=700) == (1800, 0)
+    assert ticker.next(now=1800 + 1200) == (3600, 0)
+    assert ticker.next(now=3600 + 10) == (5400, 0)
+
+  def testCoalesceMissedCycles(self):
+    """놓친 시각들은 한 번으로 합쳐 바로 시작하고, 이후에는 원래 격자로 복귀"""
+    ticker = DeadlineTicker(1800, 'coalesce', start=0)
+    assert ticker.next(now=1900) == (1900, 0)
+    assert ticker.next(now=3700 + 3600) == (7300, 2)
+    assert ticker.next(now=7400) == (9000, 0)
+
+  def testSkipMissedCycles(self):
+    """놓친 시각은 건너뛰고 다음 격자 시각까지 대기"""
+    ticker = DeadlineTicker(1800, 'skip', start=0)
+    assert ticker.next(now=1900) == (3600, 1)
+    assert ticker.next(now=3700) == (5400, 0)
+    assert ticker.next(now=9100) == (10800, 2)
+
+  def testInvalidPolicy(self):
+    with pytest.raises(ValueError):
+      DeadlineTicker(1800, 'later')
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
@@ -0,0 +1,136 @@
+"""
+SegmentStore 단위 테스트
+
+실행 방법:
+  pytest tests/test_segments.py -v
+"""
+
+import os
+import json
+import time
+import tempfile
+import pytest
+from unittest.mock import patch
+from src.collector import GroupIBCollector
+from src.segments import SegmentStore, openSegment, extractSeqUpdate
+
+
+FILENAME = 'ioc_common_updated.jsonl'
+
+
+@pytest.fixture
+def tempDir():
+  """임시 디렉토리 생성"""
+  with tempfile.TemporaryDirectory() as tmpdir:
+    yield tmpdir
+
+
+def appendRecords(outputsDir, seqUpdate, count):
+  with open(os.path.join(outputsDir, FILENAME), 'a', encoding='utf-8') as f:
+    for n in range(count):
+      record = {'timestamp': 't', 'source': 'groupib-api', 'endpoint': '/e',
+                'seqUpdate': seqUpdate, 'data': {'id': n, 'seqUpdate': 1}}
+      f.write(json.dumps(record) + '\n')
+
+
+class TestSegmentStore:
+  """세그먼트 회전 테스트"""
+
+  def testRollBySizeCompressesAndRecordsManifest(self, tempDir):
+    """크기 상한을 넘으면 닫고 gzip 압축, manifest에 범위/건수/크기 기록"""
+    store = SegmentStore(tempDir, maxBytes=1000, maxAgeSeconds=0, compression='gzip')
+
+    store.prepareActive(FILENAME)
+    appendRecords(tempDir, 100, 10)
+    appendRecords(tempDir, 200, 10)
+    entry = store.prepareActive(FILENAME)
+
+    assert entry['records'] == 20
+    assert (entry['seqUpdateMin'], entry['seqUpdateMax']) == (100, 200)
+    assert entry['file'].endswith('.jsonl.gz')
+    assert entry['bytes'] < entry['rawBytes']
+    assert not os.path.exists(os.path.join(tempDir, FILENAME))
+
+    segmentPath = os.path.join(store.segmentDir(FILENAME), entry['file'])
+    with openSegment(segmentPath) as f:
+      assert sum(1 for _ in f) == 20
+
+  def testNoRollBelowLimits(self, tempDir):
+    """상한 이하에서는 회전하지 않음"""
+    store = SegmentStore(tempDir, maxBytes=10 ** 6, maxAgeSeconds=3600, compression='gzip')
+    store.prepareActive(FILENAME)
+    appendRecords(tempDir, 1, 3)
+
+    assert store.prepareActive(FILENAME) is None
+    assert store.listSegments(FILENAME) == [os.path.join(tempDir, FILENAME)]
+
+  def testRollByAge(self, tempDir):
+    """활성 세그먼트가 최대 유지 시간을 넘으면 회전"""
+    store = SegmentStore(tempDir, maxBytes=0, maxAgeSeconds=60, compression='none')
+    store.prepareActive(FILENAME)
+    appendRecords(tempDir, 5, 2)
+
+    with patch('src.segments.time.time', return_value=time.time() + 120):
+      entry = store.prepareActive(FILENAME)
+
+    assert entry is not None and entry['records'] == 2
+
+  def testListSegmentsSkipsOlderRanges(self, tempDir):
+    """manifest의 seqUpdate 범위로 필요 없는 세그먼트 건너뛰기"""
+    store = SegmentStore(tempDir, maxBytes=1, maxAgeSeconds=0, compression='gzip')
+    for seqUpdate in (10, 20, 30):
+      store.prepareActive(FILENAME)
+      appendRecords(tempDir, seqUpdate, 1)
+    store.roll(FILENAME)
+
+    paths = store.listSegments(FILENAME, minSeqUpdate=20)
+    assert len(paths) == 2
+    assert len(store.listSegments(FILENAME)) == 3
+
+  def testOrphanRecovered(self, tempDir):
+    """회전 도중 중단되어 manifest에 없는 원본 세그먼트 복구"""
+    store = SegmentStore(tempDir, maxBytes=10 ** 6, maxAgeSeconds=0, compression='gzip')
+    segmentDir = store.segmentDir(FILENAME)
+    os.makedirs(segmentDir)
+    appendRecords(tempDir, 7, 4)
+    os.replace(os.path.join(tempDir, FILENAME), os.path.join(segmentDir, 'orphan.jsonl'))
+
+    store.prepareActive(FILENAME)
+
+    segments = store.loadManifest(FILENAME)['segments']
+    assert [s['file'] for s in segments] == ['orphan.jsonl.gz']
+    assert segments[0]['records'] == 4
+
+  def testExtractSeqUpdateUsesEnvelope(self):
+    """envelope의 seqUpdate를 data 안의 같은 키보다 먼저 찾음"""
+    line = '{"timestamp": "t", "seqUpdate": 42, "data": {"seqUpdate": 1}}'
+    assert extractSeqUpdate(line) == 42
+
+
+class TestCollectorSegments:
+  """collector 세그먼트 회전 통합 테스트"""
+
+  def testSaveToJsonlRollsSegments(self, monkeypatch, tempDir):
+    """SEGMENT_ROTATION=true이면 saveToJsonl이 크기 상한에서 회전"""
+    monkeypatch.setenv('GROUPIB_USERNAME', 'test@example.com')
+    monkeypatch.setenv('GROUPIB_API_KEY', 'test_api_key_12345')
+    monkeypatch.setenv('SEGMENT_ROTATION', 'true')
+    monkeypatch.setenv('SEGMENT_MAX_BYTES', '100')
+    monkeypatch.setenv('SEGMENT_COMPRESSION', 'gzip')
+    with patch.object(GroupIBCollector, '_setupLogger'):
+      collector = GroupIBCollector()
+    collector.outputsDir = tempDir
+
+    endpoint = '/api/v2/ioc/common/updated'
+    for seqUpdate in (1, 2, 3):
+      collector.saveToJsonl(endpoint, [{'id': seqUpdate}], seqUpdate)
+
+    manifest = collector.getSegmentStore().loadManifest(FILENAME)
+    assert [s['seqUpdateMax'] for s in manifest['segments']] == [1, 2]
+    with open(os.path.join(tempDir, FILENAME)) as f:
+      assert json.loads(f.readline())['seqUpdate'] == 3
+    collector.close()
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
@@ -0,0 +1,66 @@
+"""
+종료 신호 처리 단위 테스트
+
+실행 방법:
+  pytest tests/test_shutdown.py -v
+"""
+
+import os
+import signal
+import pytest
+from unittest.mock import Mock, patch
+from src.shutdown import GracefulShutdown
+
+
+class TestGracefulShutdown:
+  """SIGTERM/SIGINT 처리 테스트"""
+
+  def testFirstSignalRequestsStop(self):
+    """첫 신호는 종료 요청과 새 요청 중단만 하고, 대기는 즉시 깨어남"""
+    onStop = Mock()
+    shutdown = GracefulShutdown(graceSeconds=60, onStop=onStop)
+    shutdown.install()
+    try:
+      assert not shutdown.wait(0)
+      assert shutdown.remaining() is None
+      os.kill(os.getpid(), signal.SIGTERM)
+      assert shutdown.wait(5)
+      assert shutdown.requested and shutdown.reason == 'SIGTERM'
+      onStop.assert_called_once()
+      assert 0 < shutdown.remaining() <= 60
+    finally:
+      shutdown.finish()
+    assert signal.getsignal(signal.SIGTERM) is signal.SIG_DFL
+
+  def testSecondSignalInterruptsImmediately(self):
+    shutdown = GracefulShutdown(graceSeconds=60)
+    shutdown.install()
+    try:
+      os.kill(os.getpid(), signal.SIGINT)
+      shutdown.wait(5)
+      with pytest.raises(KeyboardInterrupt):
+        os.kill(os.getpid(), signal.SIGINT)
+        shutdown.wait(5)
+    finally:
+      shutdown.finish()
+
+  def testGracePeriodExpiryForcesExit(self):
+    """유예 시간 안에 끝나지 않으면 강제 종료"""
+    shutdown = GracefulShutdown(graceSeconds=0.05)
+    with patch('src.shutdown.os._exit') as forceExit:
+      shutdown.request('SIGTERM')
+      shutdown._watchdog.join(5)
+    forceExit.assert_called_once_with(1)
+
+  def testFinishCancelsWatchdog(self):
+    shutdown = GracefulShutdown(graceSeconds=0.05)
+    with patch('src.shutdown.os._exit') as forceExit:
+      shutdown.request('SIGTERM')
+      watchdog = shutdown._watchdog
+      shutdown.finish()
+      watchdog.join(5)
+    forceExit.assert_not_called()
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
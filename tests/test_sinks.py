@@ -0,0 +1,317 @@
+"""
+출력 대상(sink) 단위 테스트
+
+실행 방법:
+  pytest tests/test_sinks.py -v
+"""
+
+import io
+import os
+import json
+import time
+import socket
+import tempfile
+import threading
+import socketserver
+import pytest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import Mock, patch
+from src.sinks import (BatchingSink, HttpBulkSink, SinkError, StdoutSink, UnixSocketSink, buildSinks,
+                       validateSpecs)
+from src.writer import JsonlWriter
+
+
+@pytest.fixture
+def tempDir():
+  """임시 디렉토리 생성"""
+  with tempfile.TemporaryDirectory() as tmpdir:
+    yield tmpdir
+
+
+class RecordingSink(BatchingSink):
+  """전송한 배치를 기록하고, fail에 포함된 레코드가 있으면 실패"""
+
+  name = 'recording'
+
+  def __init__(self, fail=(), gate=None, **kwargs):
+    self.batches = []
+    self.fail = set(fail)
+    self.gate = gate
+    super().__init__(**kwargs)
+
+  def send(self, batch):
+    if self.gate is not None:
+      self.gate.wait(5)
+    if self.fail & set(batch):
+      raise OSError('receiver down')
+    self.batches.append(list(batch))
+
+
+@pytest.fixture
+def unixReceiver(tempDir):
+  """받은 줄을 모으는 로컬 Unix 소켓 수신기"""
+  received = []
+  path = os.path.join(tempDir, 'sink.sock')
+
+  class Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+      for line in self.rfile:
+        received.append(json.loads(line))
+
+  server = socketserver.ThreadingUnixStreamServer(path, Handler)
+  server.daemon_threads = True
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  yield path, received
+  server.shutdown()
+  server.server_close()
+
+
+@pytest.fixture
+def httpReceiver():
+  """NDJSON 일괄 POST 수신기 (statuses 순서대로 응답, 이후 200)"""
+  state = {'bodies': [], 'statuses': []}
+
+  class Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+      body = self.rfile.read(int(self.headers['Content-Length']))
+      status = state['statuses'].pop(0) if state['statuses'] else 200
+      if status == 200:
+        state['bodies'].append((self.headers['Content-Type'], body))
+      self.send_response(status)
+      self.send_header('Content-Length', '0')
+      self.end_headers()
+
+    def log_message(self, *args):
+      pass
+
+  httpd = HTTPServer(('127.0.0.1', 0), Handler)
+  threading.Thread(target=httpd.serve_forever, daemon=True).start()
+  yield f"http://127.0.0.1:{httpd.server_address[1]}/bulk", state
+  httpd.shutdown()
+  httpd.server_close()
+
+
+def waitFor(condition, timeout=5.0):
+  deadline = time.monotonic() + timeout
+  while not condition() and time.monotonic() < deadline:
+    time.sleep(0.01)
+  return condition()
+
+
+class TestBatchingSink:
+  """배치/확인/역압 테스트"""
+
+  def testBatchSizeAndLinger(self):
+    """배치가 차면 바로, 남은 레코드는 대기 시간 후 전송하고 페이지는 마지막 배치 전송 후 완료"""
+    sink = RecordingSink(batchSize=3, linger=0.2)
+    first = sink.submit('/e', 'e.jsonl', ['a\n', 'b\n', 'c\n', 'd\n'])
+    assert waitFor(lambda: len(sink.batches) == 1)
+    assert not first.done()
+
+    first.result(timeout=5)
+    assert sink.batches == [['a\n', 'b\n', 'c\n'], ['d\n']]
+    assert sink.submit('/e', 'e.jsonl', []).result(timeout=1) is None
+    sink.close()
+
+  def testPagesShareBatchAndFailTogether(self):
+    """같은 배치에 담긴 페이지는 함께 실패하고, 이후 페이지는 다시 전송"""
+    sink = RecordingSink(fail={'bad\n'}, batchSize=10, linger=0.05)
+    first = sink.submit('/e', 'e.jsonl', ['ok\n'])
+    second = sink.submit('/e', 'e.jsonl', ['bad\n'])
+    with pytest.raises(SinkError):
+      first.result(timeout=5)
+    with pytest.raises(SinkError):
+      second.result(timeout=5)
+
+    assert sink.submit('/e', 'e.jsonl', ['later\n']).result(timeout=5) is None
+    assert sink.batches == [['later\n']]
+    sink.close()
+
+  def testBoundedBufferBlocksSubmit(self):
+    """전송 대기 레코드가 가득 차면 submit이 멈춤"""
+    gate = threading.Event()
+    sink = RecordingSink(gate=gate, batchSize=1, linger=0, maxBuffered=2)
+    submitted = threading.Event()
+
+    def produce():
+      sink.submit('/e', 'e.jsonl', [f"{i}\n" for i in range(10)])
+      submitted.set()
+
+    threading.Thread(target=produce, daemon=True).start()
+    assert not submitted.wait(0.3)
+    gate.set()
+    assert submitted.wait(5)
+    sink.close()
+    assert [batch[0] for batch in sink.batches] == [f"{i}\n" for i in range(10)]
+
+  def testCancelledPageIsNotSent(self):
+    """확인 대기 시간이 지나 취소한 페이지의 남은 레코드는 나중에 전송하지 않음"""
+    gate = threading.Event()
+    sink = RecordingSink(gate=gate, batchSize=1, linger=0)
+    first = sink.submit('/e', 'e.jsonl', ['a\n'])
+    second = sink.submit('/e', 'e.jsonl', ['b\n', 'c\n'])
+    assert second.cancel()
+    gate.set()
+
+    first.result(timeout=5)
+    assert sink.submit('/e', 'e.jsonl', ['d\n']).result(timeout=5) is None
+    sink.close()
+    assert sink.batches == [['a\n'], ['d\n']]
+
+  def testStdoutSink(self):
+    stream = io.StringIO()
+    sink = StdoutSink(stream=stream, batchSize=2, linger=0.01)
+    sink.submit('/e', 'e.jsonl', ['{"a":1}\n', '{"a":2}\n', '{"a":3}\n']).result(timeout=5)
+    sink.close()
+    assert stream.getvalue() == '{"a":1}\n{"a":2}\n{"a":3}\n'
+
+
+class TestNetworkSinks:
+  """로컬 수신기 대상 전송 테스트"""
+
+  def testUnixSocketSink(self, unixReceiver):
+    path, received = unixReceiver
+    sink = UnixSocketSink(path, batchSize=2, linger=0.01)
+    sink.submit('/e', 'e.jsonl', [json.dumps({'id': i}) + '\n' for i in range(5)]).result(timeout=5)
+    sink.close()
+    assert waitFor(lambda: len(received) == 5)
+    assert [record['id'] for record in received] == list(range(5))
+
+  def testUnixSocketUnavailable(self, tempDir):
+    sink = UnixSocketSink(os.path.join(tempDir, 'missing.sock'), linger=0)
+    with pytest.raises(SinkError):
+      sink.submit('/e', 'e.jsonl', ['x\n']).result(timeout=5)
+    sink.close()
+
+  def testHttpBulkSinkRetriesServerErrors(self, httpReceiver):
+    url, state = httpReceiver
+    state['statuses'] = [503]
+    stopEvent = threading.Event()
+    sink = HttpBulkSink(url, retries=1, stopEvent=stopEvent, batchSize=100, linger=0.01)
+    with patch.object(stopEvent, 'wait', return_value=False) as mockWait:
+      sink.submit('/e', 'e.jsonl', ['{"a":1}\n', '{"a":2}\n']).result(timeout=5)
+    sink.close()
+    mockWait.assert_called_once_with(1)
+    assert state['bodies'] == [('application/x-ndjson', b'{"a":1}\n{"a":2}\n')]
+
+  def testHttpBulkSinkStopsRetryOnShutdown(self, httpReceiver):
+    """종료 요청 후에는 백오프를 기다리지 않고 실패"""
+    url, state = httpReceiver
+    state['statuses'] = [503]
+    stopEvent = threading.Event()
+    stopEvent.set()
+    sink = HttpBulkSink(url, retries=3, stopEvent=stopEvent, linger=0)
+    startTime = time.monotonic()
+    with pytest.raises(SinkError):
+      sink.submit('/e', 'e.jsonl', ['x\n']).result(timeout=5)
+    assert time.monotonic() - startTime < 0.5
+    sink.close()
+    assert state['bodies'] == []
+
+  def testHttpBulkSinkSkipsCancelledRetry(self, httpReceiver):
+    """재시도 대기 중 페이지가 취소되면 다시 전송하지 않음"""
+    url, state = httpReceiver
+    state['statuses'] = [503]
+    stopEvent = threading.Event()
+    sink = HttpBulkSink(url, retries=3, stopEvent=stopEvent, linger=0)
+    futures = []
+
+    def cancelDuringBackoff(timeout):
+      futures[0].cancel()
+      return False
+
+    with patch.object(stopEvent, 'wait', side_effect=cancelDuringBackoff):
+      futures.append(sink.submit('/e', 'e.jsonl', ['x\n']))
+      assert sink.submit('/e', 'e.jsonl', ['y\n']).result(timeout=5) is None
+    sink.close()
+    assert futures[0].cancelled()
+    assert state['bodies'] == [('application/x-ndjson', b'y\n')]
+
+  def testHttpBulkSinkRejectedBatch(self, httpReceiver):
+    """4xx는 재시도하지 않고 실패"""
+    url, state = httpReceiver
+    state['statuses'] = [400]
+    sink = HttpBulkSink(url, retries=3, linger=0)
+    with pytest.raises(SinkError):
+      sink.submit('/e', 'e.jsonl', ['x\n']).result(timeout=5)
+    sink.close()
+    assert state['bodies'] == []
+
+  def testSpecs(self, tempDir):
+    validateSpecs(['jsonl', 'stdout', 'unix:/tmp/x.sock', 'https://siem/bulk'])
+    with pytest.raises(ValueError):
+      validateSpecs(['kafka://broker'])
+    with pytest.raises(ValueError):
+      buildSinks([], JsonlWriter(tempDir))
+
+
+class TestCollectorSinks:
+  """collector 연동 테스트"""
+
+  ENDPOINT = '/api/v2/ioc/common/updated'
+
+  ENV = {'DRAIN_MODE': 'true', 'SINK_LINGER_MS': '10'}
+
+  def config(self):
+    return {'url': f"https://example.com{self.ENDPOINT}", 'endpoint': self.ENDPOINT,
+            'params': {'limit': '2'}}
+
+  def testRecordsReachEverySink(self, makeCollector, tempDir, unixReceiver):
+    """파일과 소켓 모두 같은 envelope 레코드를 받고 커서가 전진"""
+    path, received = unixReceiver
+    collector = makeCollector(tempDir, OUTPUT_SINKS=f"jsonl,unix:{path}", **self.ENV)
+    collector.fetchApi = Mock(side_effect=[{'seqUpdate': 10, 'items': [{'id': 1}, {'id': 2}]},
+                                           {'seqUpdate': 10, 'items': []}])
+    seqUpdates = {}
+    try:
+      assert collector.collectSingleEndpoint(self.config(), seqUpdates) == (True, 2)
+    finally:
+      collector.close()
+
+    assert seqUpdates == {self.ENDPOINT: 10}
+    with open(os.path.join(tempDir, collector.urlToFilename(self.ENDPOINT)), encoding='utf-8') as f:
+      fileRecords = [json.loads(line) for line in f]
+    assert waitFor(lambda: len(received) == 2)
+    assert received == fileRecords
+    assert [record['data']['id'] for record in received] == [1, 2]
+
+  def testCursorWaitsForEverySink(self, makeCollector, tempDir):
+    """한 대상이라도 받지 못하면 커서를 전진시키지 않음"""
+    collector = makeCollector(tempDir, OUTPUT_SINKS=f"jsonl,unix:{os.path.join(tempDir, 'missing.sock')}",
+                              **self.ENV)
+    collector.fetchApi = Mock(return_value={'seqUpdate': 10, 'items': [{'id': 1}]})
+    seqUpdates = {self.ENDPOINT: 5}
+    try:
+      success, _ = collector.collectSingleEndpoint(self.config(), seqUpdates)
+    finally:
+      collector.close()
+
+    assert not success
+    assert seqUpdates == {self.ENDPOINT: 5}
+
+  def testAckTimeoutCancelsPendingRecords(self, makeCollector, tempDir):
+    """확인 대기 시간을 넘긴 페이지는 취소되어 다음 사이클 재수집과 중복 전달되지 않음"""
+    collector = makeCollector(tempDir, OUTPUT_SINKS='jsonl', SINK_ACK_TIMEOUT='0.2', **self.ENV)
+    gate = threading.Event()
+    slow = RecordingSink(gate=gate, batchSize=1, linger=0)
+    sinks = collector.getSinks()
+    sinks.append(slow)
+    try:
+      with pytest.raises(SinkError):
+        collector.deliverLines(self.ENDPOINT, 'e.jsonl', ['a\n', 'b\n'])
+      gate.set()
+      collector.deliverLines(self.ENDPOINT, 'e.jsonl', ['c\n'])
+    finally:
+      collector.close()
+
+    # 이미 전송 중이던 a만 전달되고, 취소된 b는 버려짐
+    assert ['b\n'] not in slow.batches
+    assert slow.batches[-1] == ['c\n']
+
+  def testInvalidSinkRejectedAtStartup(self, makeCollector, tempDir):
+    with pytest.raises(ValueError):
+      makeCollector(tempDir, OUTPUT_SINKS='jsonl,kafka://broker', **self.ENV)
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
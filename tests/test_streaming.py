@@ -0,0 +1,147 @@
+"""
+StreamingPageParser 및 스트리밍 수집 단위 테스트
+
+실행 방법:
+  pytest tests/test_streaming.py -v
+"""
+
+import os
+import json
+import tempfile
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from src.collector import GroupIBCollector
+from src.streaming import StreamingPageParser
+
+
+def chunked(data: bytes, size: int):
+  return (data[i:i + size] for i in range(0, len(data), size))
+
+
+class TestStreamingPageParser:
+  """증분 파서 테스트"""
+
+  @pytest.mark.parametrize('chunkSize', [1, 7, 64, 100000])
+  def testItemsAndSeqUpdateAnyChunking(self, chunkSize):
+    """청크 경계와 관계없이 항목과 seqUpdate를 정확히 파싱"""
+    document = {
+      'count': 3,
+      'items': [{'id': 'a', 'score': 12345}, {'id': '한글', 'tags': [1, 2.5, None, True]}, {'id': 'c'}],
+      'seqUpdate': 1699999999999
+    }
+    body = json.dumps(document, ensure_ascii=False, indent=1).encode('utf-8')
+
+    parser = StreamingPageParser(chunked(body, chunkSize))
+    items = list(parser.iterItems())
+
+    assert items == document['items']
+    assert parser.seqUpdate == 1699999999999
+    assert parser.dataKey == 'items'
+    assert parser.itemCount == 3
+
+  def testDataFieldAndNonListValue(self):
+    """data 필드 및 리스트가 아닌 값 처리 (extractDataAndSeqUpdate와 동일)"""
+    parser = StreamingPageParser([b'{"seqUpdate": 5, "data": {"id": 1}}'])
+    assert list(parser.iterItems()) == [{'id': 1}]
+    assert parser.seqUpdate == 5
+
+    parser = StreamingPageParser([b'{"seqUpdate": 0, "results": []}'])
+    assert list(parser.iterItems()) == []
+    assert parser.dataKey == 'results'
+
+  def testMissingDataField(self):
+    """데이터 필드가 없으면 항목 없이 seqUpdate만 기록"""
+    parser = StreamingPageParser([b'{"seqUpdate": 9, "count": 0}'])
+    assert list(parser.iterItems()) == []
+    assert parser.dataKey is None
+    assert parser.seqUpdate == 9
+
+  def testTruncatedBodyRaises(self):
+    """본문이 중간에 끊기면 ValueError"""
+    parser = StreamingPageParser(chunked(b'{"items": [{"id": 1}, {"id": 2', 5))
+    with pytest.raises(ValueError):
+      list(parser.iterItems())
+
+  def testBufferStaysBounded(self):
+    """페이지 크기와 관계없이 버퍼는 항목 하나 + 청크 수준으로 유지"""
+    items = [{'id': n, 'value': 'x' * 100} for n in range(5000)]
+    body = json.dumps({'items': items, 'seqUpdate': 1}).encode()
+    parser = StreamingPageParser(chunked(body, 4096))
+
+    maxBuffer = 0
+    for _ in parser.iterItems():
+      maxBuffer = max(maxBuffer, len(parser._buf))
+
+    assert parser.itemCount == 5000
+    assert maxBuffer < 4096 * 3
+    assert len(body) > 100 * maxBuffer
+
+
+PAGE = {'count': 2, 'items': [{'id': 'x1', 'ip': '1.1.1.1'}, {'id': 'x2', 'ip': '2.2.2.2'}], 'seqUpdate': 777}
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+  protocol_version = 'HTTP/1.1'
+
+  def do_GET(self):
+    body = json.dumps(PAGE).encode()
+    self.send_response(200)
+    self.send_header('Content-Type', 'application/json')
+    self.send_header('Content-Length', str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+  def log_message(self, *args):
+    pass
+
+
+@pytest.fixture
+def server():
+  """로컬 API 서버"""
+  httpd = ThreadingHTTPServer(('127.0.0.1', 0), _PageHandler)
+  thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+  thread.start()
+  yield f"http://127.0.0.1:{httpd.server_address[1]}"
+  httpd.shutdown()
+  httpd.server_close()
+
+
+class TestStreamingCollection:
+  """STREAMING_PARSE=true 수집 테스트"""
+
+  def testStreamingMatchesBufferedOutput(self, monkeypatch, server):
+    """스트리밍 모드 출력은 기존 방식과 동일한 레코드 형식"""
+    monkeypatch.setenv('GROUPIB_USERNAME', 'test@example.com')
+    monkeypatch.setenv('GROUPIB_API_KEY', 'test_api_key_12345')
+    monkeypatch.setenv('RATE_LIMIT_WAIT', '0')
+    monkeypatch.setenv('PDF_WORKERS', '0')
+
+    outputs = {}
+    for mode in ('false', 'true'):
+      monkeypatch.setenv('STREAMING_PARSE', mode)
+      with patch.object(GroupIBCollector, '_setupLogger'):
+        collector = GroupIBCollector()
+      with tempfile.TemporaryDirectory() as tmpdir:
+        collector.outputsDir = tmpdir
+        collector.seqUpdateFile = os.path.join(tmpdir, 'seq_update.json')
+        config = {'url': f"{server}/api/v2/ioc/common/updated",
+                  'endpoint': '/api/v2/ioc/common/updated', 'params': {'limit': '2'}}
+        seqUpdates = {}
+        success, count = collector.collectSingleEndpoint(config, seqUpdates)
+        assert (success, count) == (True, 2)
+        assert seqUpdates['/api/v2/ioc/common/updated'] == 777
+
+        with open(os.path.join(tmpdir, 'ioc_common_updated.jsonl'), encoding='utf-8') as f:
+          records = [json.loads(line) for line in f]
+        for record in records:
+          record.pop('timestamp')
+        outputs[mode] = records
+      collector.close()
+
+    assert outputs['true'] == outputs['false']
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
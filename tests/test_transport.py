@@ -0,0 +1,98 @@
+"""
+HttpTransport 단위 테스트 (로컬 HTTP 서버 사용)
+
+실행 방법:
+  pytest tests/test_transport.py -v
+"""
+
+import gzip
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.transport import HttpTransport
+
+
+PAYLOAD = json.dumps({'seqUpdate': 1, 'items': [{'id': n, 'type': 'ioc'} for n in range(500)]}).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+  protocol_version = 'HTTP/1.1'
+
+  def do_GET(self):
+    body = PAYLOAD
+    self.send_response(200)
+    self.send_header('Content-Type', 'application/json')
+    if 'gzip' in self.headers.get('Accept-Encoding', ''):
+      body = gzip.compress(body)
+      self.send_header('Content-Encoding', 'gzip')
+    self.send_header('Content-Length', str(len(body)))
+    self.send_header('X-Auth', self.headers.get('Authorization', ''))
+    self.end_headers()
+    self.wfile.write(body)
+
+  def log_message(self, *args):
+    pass
+
+
+@pytest.fixture
+def server():
+  """로컬 테스트 서버"""
+  httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+  thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+  thread.start()
+  yield f"http://127.0.0.1:{httpd.server_address[1]}"
+  httpd.shutdown()
+  httpd.server_close()
+
+
+class TestHttpTransport:
+  """HTTP 전송 객체 테스트"""
+
+  def testConnectionReuseAndTiming(self, server):
+    """keep-alive 연결 재사용 및 타이밍 기록"""
+    transport = HttpTransport({'Authorization': 'Basic abc'}, poolSize=2, timeout=5)
+
+    first = transport.get(f"{server}/api/v2/test")
+    second = transport.get(f"{server}/api/v2/test")
+
+    assert first.timing['reused'] is False
+    assert first.timing['connect'] > 0
+    assert second.timing['reused'] is True
+    assert second.timing['connect'] == 0.0
+    for key in ('ttfb', 'transfer', 'total'):
+      assert second.timing[key] >= 0
+    assert transport.getStats()['requests'] == 2
+    assert transport.getStats()['newConnections'] == 1
+    # 캐시된 헤더가 전송됨
+    assert second.headers['X-Auth'] == 'Basic abc'
+    transport.close()
+
+  def testGzipNegotiation(self, server):
+    """gzip 응답은 압축된 크기로 집계되고 자동 해제됨"""
+    transport = HttpTransport({'Accept-Encoding': 'gzip, deflate'}, poolSize=1, timeout=5)
+
+    response = transport.get(f"{server}/api/v2/test")
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.json()['items'][499]['id'] == 499
+    assert response.timing['bytes'] < len(PAYLOAD)
+    transport.close()
+
+  def testStreamingTiming(self, server):
+    """스트리밍 응답은 소비 후 전송 시간이 채워짐"""
+    transport = HttpTransport({'Accept-Encoding': 'identity'}, poolSize=1, timeout=5)
+
+    response = transport.get(f"{server}/api/v2/test", stream=True)
+    assert response.timing['transfer'] is None
+
+    body = b''.join(transport.iterContent(response, chunkSize=1024))
+
+    assert body == PAYLOAD
+    assert response.timing['bytes'] == len(PAYLOAD)
+    assert response.timing['transfer'] is not None
+    transport.close()
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])
@@ -0,0 +1,142 @@
+"""
+JSONL 그룹 커밋 기록기 단위 테스트
+
+실행 방법:
+  pytest tests/test_writer.py -v
+"""
+
+import os
+import json
+import tempfile
+import pytest
+from unittest.mock import Mock, patch
+from src.writer import JsonlWriter
+
+
+@pytest.fixture
+def tempDir():
+  """임시 디렉토리 생성"""
+  with tempfile.TemporaryDirectory() as tmpdir:
+    yield tmpdir
+
+
+def readLines(path):
+  with open(path, encoding='utf-8') as f:
+    return f.readlines()
+
+
+class TestJsonlWriter:
+  """핸들 캐시/회전/fsync 정책 테스트"""
+
+  def testPageIsOneWriteAndHandleReused(self, tempDir):
+    writer = JsonlWriter(tempDir)
+    written, seconds = writer.append('a.jsonl', ['{"id":1}\n', '{"id":"한"}\n'])
+    handle = writer._handles['a.jsonl']
+    with patch.object(handle.file, 'write', wraps=handle.file.write) as write:
+      writer.append('a.jsonl', ['{"id":2}\n', '{"id":3}\n'])
+    writer.close()
+
+    assert written == len('{"id":1}\n{"id":"한"}\n'.encode('utf-8'))
+    assert seconds >= 0
+    assert write.call_count == 1
+    assert readLines(os.path.join(tempDir, 'a.jsonl')) == [
+      '{"id":1}\n', '{"id":"한"}\n', '{"id":2}\n', '{"id":3}\n']
+
+  def testReopensAfterRotation(self, tempDir):
+    """경로가 다른 파일로 바뀌면 다음 기록 전에 다시 엶"""
+    writer = JsonlWriter(tempDir)
+    writer.append('a.jsonl', ['old\n'])
+    os.replace(os.path.join(tempDir, 'a.jsonl'), os.path.join(tempDir, 'a.1.jsonl'))
+    writer.append('a.jsonl', ['new\n'])
+    writer.close()
+
+    assert readLines(os.path.join(tempDir, 'a.1.jsonl')) == ['old\n']
+    assert readLines(os.path.join(tempDir, 'a.jsonl')) == ['new\n']
+
+  def testLeastRecentHandleEvicted(self, tempDir):
+    writer = JsonlWriter(tempDir, maxHandles=2)
+    for name in ('a.jsonl', 'b.jsonl', 'a.jsonl', 'c.jsonl'):
+      writer.append(name, [f"{name}\n"])
+    assert sorted(writer.openFiles()) == ['a.jsonl', 'c.jsonl']
+    writer.append('b.jsonl', ['again\n'])
+    writer.close()
+    assert readLines(os.path.join(tempDir, 'b.jsonl')) == ['b.jsonl\n', 'again\n']
+
+  def testFsyncPolicies(self, tempDir):
+    with patch('src.writer.os.fsync') as fsync:
+      writer = JsonlWriter(tempDir, durability='none')
+      writer.append('a.jsonl', ['x\n'])
+      writer.close()
+      assert fsync.call_count == 0
+
+      writer = JsonlWriter(tempDir, durability='page')
+      writer.append('a.jsonl', ['x\n'])
+      writer.append('a.jsonl', ['y\n'])
+      assert fsync.call_count == 2
+      writer.close()
+      assert fsync.call_count == 2
+
+  def testIntervalFsyncBatchesPages(self, tempDir):
+    """interval 정책은 간격이 지난 커밋에서 변경된 파일만 fsync"""
+    with patch('src.writer.os.fsync') as fsync, patch('src.writer.time.monotonic') as monotonic:
+      monotonic.return_value = 100.0
+      writer = JsonlWriter(tempDir, durability='interval', syncInterval=1.0)
+      writer.append('a.jsonl', ['1\n'])
+      writer.append('b.jsonl', ['2\n'])
+      assert fsync.call_count == 0
+
+      monotonic.return_value = 101.5
+      writer.append('a.jsonl', ['3\n'])
+      assert fsync.call_count == 2
+
+      writer.sync()
+      assert fsync.call_count == 2
+      writer.append('b.jsonl', ['4\n'])
+      writer.close()
+      assert fsync.call_count == 3
+
+  def testInvalidDurability(self, tempDir):
+    with pytest.raises(ValueError):
+      JsonlWriter(tempDir, durability='always')
+
+
+class TestCollectorWriter:
+  """collector 연동 테스트"""
+
+  ENDPOINT = '/api/v2/ioc/common/updated'
+
+  def testCommitMetricsAndFsyncBeforeCursor(self, makeCollector, tempDir):
+    """page 정책은 커서 전진 전에 페이지를 fsync하고 바이트/소요 시간을 기록"""
+    collector = makeCollector(tempDir, DRAIN_MODE='true', JSONL_FSYNC='page')
+    collector.fetchApi = Mock(side_effect=[{'seqUpdate': 10, 'items': [{'id': 1}, {'id': 2}]},
+                                           {'seqUpdate': 10, 'items': []}])
+    config = {'url': f"https://example.com{self.ENDPOINT}", 'endpoint': self.ENDPOINT,
+              'params': {'limit': '2'}}
+    path = os.path.join(tempDir, collector.urlToFilename(self.ENDPOINT))
+    synced = []
+
+    def recordFsync(fd):
+      # 커서 파일 등 다른 fsync와 구분하기 위해 fsync한 시점의 JSONL 크기를 기록
+      if os.path.samestat(os.fstat(fd), os.stat(path)):
+        synced.append(os.fstat(fd).st_size)
+
+    seqUpdates = {}
+    try:
+      with patch('src.writer.os.fsync', side_effect=recordFsync):
+        assert collector.collectSingleEndpoint(config, seqUpdates) == (True, 2)
+    finally:
+      collector.close()
+
+    assert synced == [os.path.getsize(path)]
+    assert [json.loads(line)['data']['id'] for line in readLines(path)] == [1, 2]
+    assert collector.metrics.bytesWritten.get(self.ENDPOINT) == os.path.getsize(path)
+    assert 'groupib_write_commit_seconds_count{endpoint="%s"} 1' % self.ENDPOINT \
+      in collector.metrics.render()
+
+  def testInvalidFsyncRejectedAtStartup(self, makeCollector, tempDir):
+    with pytest.raises(ValueError):
+      makeCollector(tempDir, DRAIN_MODE='true', JSONL_FSYNC='always')
+
+
+if __name__ == '__main__':
+  pytest.main([__file__, '-v'])